@@ -0,0 +1,380 @@
+"""
+Local complaint classifier (TF-IDF + logistic regression).
+
+Primary classification path for analyze_complaint. Trained from the complaints
+table plus synthetic examples generated from the ai_utils keyword dictionaries,
+saved as a versioned pickle artifact and loaded once at startup.
+
+CLI:
+    python -m backend.ai_model train [--compare-llm 50]
+    python -m backend.ai_model evaluate --compare-llm 50
+"""
+import os
+import pickle
+import random
+import time
+import threading
+from datetime import datetime
+
+# Bump when the artifact layout or feature pipeline changes; old artifacts are ignored
+ARTIFACT_VERSION = 1
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+DEFAULT_ARTIFACT_PATH = os.path.join(ARTIFACT_DIR, f"complaint_classifier_v{ARTIFACT_VERSION}.pkl")
+
+PRIORITIES = ["Critical", "High", "Medium", "Low"]
+
+_model = None
+_model_lock = threading.Lock()
+_load_attempted = False
+
+
+def _artifact_path(path: str = None) -> str:
+    if path:
+        return path
+    try:
+        from .config import settings
+        if settings.AI_LOCAL_MODEL_PATH:
+            return settings.AI_LOCAL_MODEL_PATH
+    except Exception:
+        pass
+    return DEFAULT_ARTIFACT_PATH
+
+
+class LocalComplaintClassifier:
+    """
+    Shared TF-IDF vectorizer feeding two linear models (category, priority).
+    """
+
+    def __init__(self, vectorizer, category_model, priority_model, metadata: dict):
+        self.vectorizer = vectorizer
+        self.category_model = category_model
+        self.priority_model = priority_model
+        self.metadata = metadata
+
+    def predict_many(self, texts):
+        X = self.vectorizer.transform([t.lower() for t in texts])
+        cat_proba = self.category_model.predict_proba(X)
+        pri_proba = self.priority_model.predict_proba(X)
+        cat_idx = cat_proba.argmax(axis=1)
+        pri_idx = pri_proba.argmax(axis=1)
+
+        results = []
+        for i in range(len(texts)):
+            cat_conf = float(cat_proba[i, cat_idx[i]])
+            pri_conf = float(pri_proba[i, pri_idx[i]])
+            results.append({
+                "category": str(self.category_model.classes_[cat_idx[i]]),
+                "priority": str(self.priority_model.classes_[pri_idx[i]]),
+                "category_confidence": cat_conf,
+                "priority_confidence": pri_conf,
+                "confidence": min(cat_conf, pri_conf)
+            })
+        return results
+
+    def predict(self, text: str) -> dict:
+        return self.predict_many([text])[0]
+
+
+# ============ LOADING ============
+
+def load_model(path: str = None):
+    """
+    Loads the artifact into the process-wide singleton.
+    Returns the classifier, or None if no compatible artifact exists.
+    """
+    global _model, _load_attempted
+    path = _artifact_path(path)
+    with _model_lock:
+        _load_attempted = True
+        if not os.path.exists(path):
+            print(f"[AI Model] No local classifier artifact at {path}. Using LLM/rule-based path.")
+            _model = None
+            return None
+        try:
+            with open(path, "rb") as f:
+                artifact = pickle.load(f)
+            if artifact.get("version") != ARTIFACT_VERSION:
+                print(f"[AI Model] Artifact version {artifact.get('version')} != {ARTIFACT_VERSION}. Ignoring; retrain required.")
+                _model = None
+                return None
+            _model = LocalComplaintClassifier(
+                artifact["vectorizer"], artifact["category_model"], artifact["priority_model"], artifact["metadata"]
+            )
+            meta = artifact["metadata"]
+            print(f"[AI Model] Loaded local classifier v{ARTIFACT_VERSION} "
+                  f"(trained {meta.get('trained_at')}, {meta.get('n_samples')} samples)")
+            return _model
+        except Exception as e:
+            print(f"[AI Model] Failed to load classifier: {e}")
+            _model = None
+            return None
+
+
+def get_model():
+    """Returns the loaded classifier, loading it on first use if startup did not."""
+    if not _load_attempted:
+        load_model()
+    return _model
+
+
+def predict(text: str):
+    """Local prediction, or None when no model is available."""
+    model = get_model()
+    if model is None:
+        return None
+    try:
+        return model.predict(text)
+    except Exception as e:
+        print(f"[AI Model] Prediction failed: {e}")
+        return None
+
+
+def predict_batch(texts):
+    """Local predictions for many texts in one sparse-matrix pass (list of None when no model)."""
+    model = get_model()
+    if model is None or not texts:
+        return [None] * len(texts)
+    try:
+        return model.predict_many(texts)
+    except Exception as e:
+        print(f"[AI Model] Batch prediction failed: {e}")
+        return [None] * len(texts)
+
+
+# ============ TRAINING ============
+
+_PLACES = ["near my house", "in ward 12", "on Main Road", "behind the market", "in our colony",
+           "opposite the school", "at sector 4", "near the bus stand", ""]
+_TEMPLATES = [
+    "{kw}", "{kw} {place}", "there is a {kw} problem {place}", "{kw} issue {place} since last week",
+    "please fix the {kw} {place}", "{pri} {kw} {place}", "{kw} {place}. {pri}", "complaint regarding {kw} {place}",
+]
+_GENERAL_TEXTS = [
+    "need information about my application status", "request for birth certificate",
+    "property tax bill is wrong", "no response from the municipal office",
+    "staff at the counter was rude", "want to update my address in records",
+    "ration card not issued yet", "pension not received this month",
+]
+
+
+def synthetic_samples(per_keyword: int = 4, seed: int = 13):
+    """
+    Generates labelled examples from the keyword dictionaries.
+    Labels come from the rule-based classifiers so the model starts
+    aligned with existing behaviour.
+    """
+    from .ai_utils import INDIA_GOVT_DEPARTMENTS, PRIORITY_KEYWORDS, scan_keywords, priority_from_hits
+
+    rng = random.Random(seed)
+    priority_words = [kw for kws in PRIORITY_KEYWORDS.values() for kw in kws] + [""] * 20
+    samples = []
+    for dept_name, dept_info in INDIA_GOVT_DEPARTMENTS.items():
+        for kw in dept_info["keywords"]:
+            for _ in range(per_keyword):
+                text = rng.choice(_TEMPLATES).format(kw=kw, place=rng.choice(_PLACES), pri=rng.choice(priority_words))
+                samples.append((text, dept_name, priority_from_hits(scan_keywords(text))))
+    for text in _GENERAL_TEXTS:
+        for _ in range(per_keyword):
+            full = f"{text} {rng.choice(_PLACES)}".strip()
+            samples.append((full, "General", priority_from_hits(scan_keywords(full))))
+    return samples
+
+
+def complaint_samples(db):
+    """Labelled examples from the complaints table (known categories/priorities only)."""
+    from . import models
+    from .ai_utils import INDIA_GOVT_DEPARTMENTS
+
+    valid_categories = set(INDIA_GOVT_DEPARTMENTS) | {"General"}
+    rows = db.query(
+        models.Complaint.title, models.Complaint.description,
+        models.Complaint.category, models.Complaint.priority
+    ).all()
+    return [
+        (f"{r.title or ''} {r.description or ''}".strip(), r.category, r.priority)
+        for r in rows
+        if r.category in valid_categories and r.priority in PRIORITIES
+    ]
+
+
+def train(samples, test_size: float = 0.2, seed: int = 13):
+    """
+    Fits the vectorizer and both linear models.
+    Returns (classifier, report dict).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+
+    texts = [s[0].lower() for s in samples]
+    categories = [s[1] for s in samples]
+    priorities = [s[2] for s in samples]
+
+    idx_train, idx_test = train_test_split(list(range(len(texts))), test_size=test_size, random_state=seed)
+
+    def fit(indices):
+        vec = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=1)
+        X = vec.fit_transform([texts[i] for i in indices])
+        cat = LogisticRegression(max_iter=2000, C=10.0).fit(X, [categories[i] for i in indices])
+        pri = LogisticRegression(max_iter=2000, C=10.0).fit(X, [priorities[i] for i in indices])
+        return vec, cat, pri
+
+    # Holdout evaluation
+    vec, cat, pri = fit(idx_train)
+    X_test = vec.transform([texts[i] for i in idx_test])
+    report = {
+        "holdout_size": len(idx_test),
+        "category_accuracy": float((cat.predict(X_test) == [categories[i] for i in idx_test]).mean()),
+        "priority_accuracy": float((pri.predict(X_test) == [priorities[i] for i in idx_test]).mean()),
+    }
+
+    # Final model on all samples
+    vec, cat, pri = fit(range(len(texts)))
+    import sklearn
+    metadata = {
+        "trained_at": datetime.utcnow().isoformat(),
+        "n_samples": len(texts),
+        "sklearn_version": sklearn.__version__,
+        **report
+    }
+    return LocalComplaintClassifier(vec, cat, pri, metadata), report
+
+
+def save_model(classifier: LocalComplaintClassifier, path: str = None) -> str:
+    path = _artifact_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "vectorizer": classifier.vectorizer,
+        "category_model": classifier.category_model,
+        "priority_model": classifier.priority_model,
+        "metadata": classifier.metadata,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(artifact, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+# ============ EVALUATION ============
+
+def measure_latency(classifier: LocalComplaintClassifier, texts):
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        classifier.predict(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": sum(timings) / len(timings),
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0],
+    }
+
+
+def compare_with_llm(classifier: LocalComplaintClassifier, texts):
+    """
+    Treats Gemini's labels as ground truth; reports local accuracy and latency for both.
+    """
+    from .ai_utils import classify_complaint_with_llm, INDIA_GOVT_DEPARTMENTS
+
+    agree_cat = agree_pri = labelled = 0
+    llm_ms = []
+    local_ms = []
+    for text in texts:
+        start = time.perf_counter()
+        llm = classify_complaint_with_llm(text)
+        llm_ms.append((time.perf_counter() - start) * 1000)
+        if not llm:
+            continue
+
+        start = time.perf_counter()
+        local = classifier.predict(text)
+        local_ms.append((time.perf_counter() - start) * 1000)
+
+        # Map free-text LLM category onto our department keys (same rule as analyze_complaint)
+        llm_category = "General"
+        for name in INDIA_GOVT_DEPARTMENTS:
+            if name.lower() in llm["category"].lower() or llm["category"].lower() in name.lower():
+                llm_category = name
+                break
+
+        labelled += 1
+        agree_cat += local["category"] == llm_category
+        agree_pri += local["priority"] == llm["priority"]
+
+    return {
+        "llm_labelled": labelled,
+        "category_accuracy_vs_llm": agree_cat / labelled if labelled else None,
+        "priority_accuracy_vs_llm": agree_pri / labelled if labelled else None,
+        "llm_mean_ms": sum(llm_ms) / len(llm_ms) if llm_ms else None,
+        "local_mean_ms": sum(local_ms) / len(local_ms) if local_ms else None,
+    }
+
+
+def _print_report(title: str, report: dict):
+    print(f"\n--- {title} ---")
+    for key, value in report.items():
+        if isinstance(value, float):
+            print(f"  {key}: {value:.3f}")
+        else:
+            print(f"  {key}: {value}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train / evaluate the local complaint classifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train_cmd = sub.add_parser("train", help="Retrain from the complaints table + keyword dictionaries")
+    train_cmd.add_argument("--out", default=None, help="Artifact path (default: settings / backend/artifacts)")
+    train_cmd.add_argument("--no-db", action="store_true", help="Train on synthetic keyword samples only")
+    train_cmd.add_argument("--compare-llm", type=int, default=0, metavar="N",
+                           help="Score N complaints with Gemini and report accuracy/latency against its labels")
+
+    eval_cmd = sub.add_parser("evaluate", help="Evaluate the saved artifact")
+    eval_cmd.add_argument("--path", default=None)
+    eval_cmd.add_argument("--compare-llm", type=int, default=20, metavar="N")
+
+    args = parser.parse_args(argv)
+
+    db_texts = []
+    db = None
+    if not getattr(args, "no_db", False):
+        from .database import SessionLocal
+        db = SessionLocal()
+
+    try:
+        samples = synthetic_samples()
+        if db is not None:
+            real = complaint_samples(db)
+            print(f"[AI Model] {len(real)} labelled complaints from the database")
+            samples += real
+            db_texts = [s[0] for s in real]
+
+        if args.command == "train":
+            classifier, report = train(samples)
+            path = save_model(classifier, args.out)
+            print(f"[AI Model] Saved artifact v{ARTIFACT_VERSION} to {path}")
+            _print_report("HOLDOUT ACCURACY", report)
+        else:
+            classifier = load_model(args.path)
+            if classifier is None:
+                print("No artifact to evaluate. Run `python -m backend.ai_model train` first.")
+                return 1
+
+        latency_texts = db_texts or [s[0] for s in samples[:500]]
+        _print_report("LOCAL LATENCY", measure_latency(classifier, latency_texts))
+
+        if args.compare_llm:
+            llm_texts = (db_texts or [s[0] for s in samples])[:args.compare_llm]
+            _print_report(f"AGAINST LLM LABELS ({len(llm_texts)} texts)", compare_with_llm(classifier, llm_texts))
+    finally:
+        if db is not None:
+            db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
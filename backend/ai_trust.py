@@ -1,38 +1,46 @@
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from .models import Complaint
+from .config import settings
+from .models import Complaint, ComplaintSignature
+from .utils import minhash, velocity
 import json
+import threading
 
-def detect_trust_anomalies(db: Session, title: str, description: str, user_id: int):
+def detect_trust_anomalies(db: Session, title: str, description: str, user_id: int, complaint_id: int = None,
+                           department_id: int = None, location: str = None, submitted_at: datetime = None):
     """
     Analyzes complaint for patterns indicating spam, duplication, or unusual velocity.
+    `complaint_id` excludes the complaint itself when it is already stored (background enrichment),
+    `submitted_at` is its creation time (velocity windows end there instead of now).
+    `department_id` / `location` scope the cross-citizen similar-report check.
     Returns (trust_score: float, flags: list[str])
     """
     flags = []
     trust_score = 1.0 # Start perfect
-    
-    # 1. Velocity Check (Rapid submission)
-    five_mins_ago = datetime.utcnow() - timedelta(minutes=5)
-    recent_count = db.query(Complaint).filter(
-        Complaint.owner_id == user_id, 
-        Complaint.created_at >= five_mins_ago
-    ).count()
-    
-    if recent_count >= 2:
-        flags.append("High Velocity (Multiple submissions < 5m)")
-        trust_score -= 0.15 * recent_count
-        
-    # 2. Duplicate Content Check (Simple exact match for now)
-    # In production, use Vector DB or Fuzzy Match
-    duplicate = db.query(Complaint).filter(
-        Complaint.description == description,
-        Complaint.owner_id == user_id
-    ).first()
-    
-    if duplicate:
-        flags.append("Duplicate Content (Identical description exists)")
+
+    # 1. Velocity Check (Rapid submission; in-memory sliding windows, no DB query)
+    tracker = get_velocity_tracker()
+    if complaint_id is not None:
+        # Idempotent; covers complaints submitted through another worker process
+        tracker.record(user_id, complaint_id, submitted_at)
+    for seconds, count, limit in tracker.exceeded(user_id, at=submitted_at, exclude_id=complaint_id):
+        flags.append(f"High Velocity ({count} other submissions < {velocity.window_label(seconds)})")
+        # Each window over its limit costs 0.15, plus 0.15 per submission beyond it
+        trust_score -= 0.15 * (count - limit + 1)
+
+    # 2. Near-Duplicate Content Check (MinHash signatures + LSH index, sub-linear)
+    matches = find_near_duplicates(db, description, user_id, department_id, location, exclude_id=complaint_id)
+
+    if matches["user"]:
+        flags.append(f"Duplicate Content (Near-identical to own complaint {_format_matches(matches['user'])})")
         trust_score -= 0.4
-        
+
+    # Other citizens reporting the same issue nearby: informational, no penalty
+    if matches["ward"]:
+        flags.append(f"Similar Reports (Same ward: {_format_matches(matches['ward'])})")
+    if matches["department"]:
+        flags.append(f"Similar Reports (Same department: {_format_matches(matches['department'])})")
+
     # 3. Spam / Low Quality Check
     if len(description) < 15:
         flags.append("Low Info (Description too short)")
@@ -40,8 +48,147 @@ def detect_trust_anomalies(db: Session, title: str, description: str, user_id: i
     elif len(set(description)) < 5: # "asdfasdf" check
         flags.append("Possible Spam (Repetitive characters)")
         trust_score -= 0.5
-        
+
     # Cap score
     trust_score = max(0.0, min(1.0, trust_score))
-    
+
     return trust_score, json.dumps(flags) if flags else None
+
+def _format_matches(matches) -> str:
+    """[(12, 0.91), (40, 0.78)] -> '#12 J=0.91, #40 J=0.78'"""
+    return ", ".join(f"#{complaint_id} J={jaccard:.2f}" for complaint_id, jaccard in matches)
+
+
+# ============ SUBMISSION VELOCITY ============
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+def get_velocity_tracker() -> velocity.VelocityTracker:
+    """Process-wide tracker (Settings.VELOCITY_WINDOWS / VELOCITY_BACKEND)."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = velocity.build_tracker(settings)
+    return _tracker
+
+def record_submission(complaint: Complaint):
+    """Counts a new complaint towards its user's velocity windows (call after commit)."""
+    get_velocity_tracker().record(complaint.user_id, complaint.id, complaint.created_at)
+
+def warm_velocity_tracker(db: Session) -> int:
+    """Startup: replays the submissions of the longest window from the DB."""
+    tracker = get_velocity_tracker()
+    since = datetime.utcnow() - timedelta(seconds=tracker.horizon)
+    rows = db.query(Complaint.user_id, Complaint.id, Complaint.created_at).filter(
+        Complaint.created_at >= since
+    ).order_by(Complaint.created_at).all()
+    for user_id, complaint_id, created_at in rows:
+        tracker.record(user_id, complaint_id, created_at)
+    print(f"[AI Trust] Velocity tracker warmed: {len(rows)} submissions ({tracker.backend.name})")
+    return len(rows)
+
+
+# ============ NEAR-DUPLICATE INDEX ============
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_duplicate_index(db: Session) -> minhash.NearDuplicateIndex:
+    """
+    Process-wide LSH index. Each call first loads signatures stored since the
+    last call (by this or another worker process), so the index stays current.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = minhash.NearDuplicateIndex()
+        _sync(db, _index)
+    return _index
+
+def _sync(db: Session, index: minhash.NearDuplicateIndex, batch_size: int = 50000):
+    query = db.query(
+        ComplaintSignature.id, ComplaintSignature.complaint_id, ComplaintSignature.signature,
+        Complaint.user_id, Complaint.department_id, Complaint.location
+    ).join(Complaint, Complaint.id == ComplaintSignature.complaint_id)
+    while True:
+        rows = query.filter(ComplaintSignature.id > index.last_row_id).order_by(ComplaintSignature.id).limit(batch_size).all()
+        if not rows:
+            break
+        index.add_many(
+            [r.complaint_id for r in rows],
+            [minhash.from_bytes(r.signature) for r in rows],
+            [r.user_id for r in rows],
+            [r.department_id for r in rows],
+            [r.location for r in rows],
+            defer=True
+        )
+        index.last_row_id = rows[-1].id
+    index.merge()  # small catch-ups go to the delta dicts, large loads sort once
+
+def load_duplicate_index(db: Session) -> minhash.NearDuplicateIndex:
+    """Startup: builds the index from complaint_signatures."""
+    index = get_duplicate_index(db)
+    print(f"[AI Trust] Near-duplicate index loaded: {len(index)} signatures")
+    return index
+
+def find_near_duplicates(db: Session, description: str, user_id: int = None, department_id: int = None,
+                         location: str = None, exclude_id: int = None) -> dict:
+    """
+    Complaints whose description is a near-duplicate (estimated Jaccard >= NEAR_DUP_THRESHOLD),
+    grouped by scope: {"user": [(id, jaccard)], "ward": [...], "department": [...]}.
+    """
+    sig = minhash.signature(description)
+    if sig is None:
+        return {"user": [], "ward": [], "department": []}
+    threshold, limit = settings.NEAR_DUP_THRESHOLD, settings.NEAR_DUP_MAX_MATCHES
+    return get_duplicate_index(db).query(
+        sig, user_id=user_id, department_id=department_id, location=location,
+        exclude_id=exclude_id, threshold=threshold, limit=limit
+    )
+
+def record_signature(db: Session, complaint: Complaint):
+    """
+    Stores the complaint's signature (caller commits); idempotent.
+    The in-memory index picks it up on its next sync.
+    """
+    sig = minhash.signature(complaint.description)
+    if sig is None:
+        return None
+    existing = db.query(ComplaintSignature).filter(ComplaintSignature.complaint_id == complaint.id).first()
+    if existing:
+        return existing
+    row = ComplaintSignature(complaint_id=complaint.id, signature=minhash.to_bytes(sig))
+    db.add(row)
+    return row
+
+def backfill_signatures(db: Session, batch_size: int = 1000) -> int:
+    """Signs complaints stored before near-duplicate detection existed. Returns the count."""
+    total = 0
+    last_id = 0
+    while True:
+        pending = db.query(Complaint).outerjoin(
+            ComplaintSignature, ComplaintSignature.complaint_id == Complaint.id
+        ).filter(
+            ComplaintSignature.id.is_(None), Complaint.id > last_id
+        ).order_by(Complaint.id).limit(batch_size).all()
+        if not pending:
+            return total
+        total += sum(1 for complaint in pending if record_signature(db, complaint) is not None)
+        db.commit()
+        last_id = pending[-1].id
+
+
+if __name__ == "__main__":
+    # python -m backend.ai_trust backfill
+    import sys
+    from .database import SessionLocal
+    if sys.argv[1:2] == ["backfill"]:
+        session = SessionLocal()
+        try:
+            print(f"Signed {backfill_signatures(session)} complaints")
+        finally:
+            session.close()
+    else:
+        print("Usage: python -m backend.ai_trust backfill")
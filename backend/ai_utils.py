@@ -1,5 +1,10 @@
-from textblob import TextBlob
 import random
+from .utils.keyword_matcher import TaggedKeywordMatcher, DEPARTMENT, PRIORITY, INTENSIFIER, EMERGENCY
+from . import ai_model
+from .utils.sentiment import polarity as sentiment_polarity, polarity_many as sentiment_polarity_many
+from .llm_provider import get_llm_provider, CircuitOpenError, LLMBudgetExceeded
+from .utils.llm_cache import get_classification_cache, cache_key, prompt_version
+from .utils.rule_engine import get_rule_engine
 
 # India Government Department Mapping (Comprehensive)
 INDIA_GOVT_DEPARTMENTS = {
@@ -82,42 +87,49 @@ PRIORITY_KEYWORDS = {
 # Generic Intensifiers (Do not assign Priority directly, but boost relevant categories)
 RISK_INTENSIFIERS = ["severe", "major", "hazardous", "serious", "high risk", "heavy"]
 
-def classify_priority(text: str) -> str:
+# Women Safety Emergency Keywords (used by the women safety chatbot)
+EMERGENCY_KEYWORDS = [
+    "help", "unsafe", "followed", "someone is following me", 
+    "emergency", "danger", "harassment", "scared", "please help me"
+]
+
+PRIORITY_ORDER = ["Critical", "High", "Medium"]
+
+def _build_keyword_matcher() -> TaggedKeywordMatcher:
     """
-    Classifies complaint priority based on keywords and severity indicators.
-    Returns: Critical, High, Medium, or Low
+    Compiles every keyword dictionary above into one automaton (built once at import).
     """
-    text_lower = text.lower()
-    
-    # Check for critical keywords
-    for keyword in PRIORITY_KEYWORDS["Critical"]:
-        if keyword in text_lower:
-            return "Critical"
-    
-    # Check for high priority keywords
-    for keyword in PRIORITY_KEYWORDS["High"]:
-        if keyword in text_lower:
-            return "High"
-    
-    # Check for medium priority keywords
-    for keyword in PRIORITY_KEYWORDS["Medium"]:
-        if keyword in text_lower:
-            return "Medium"
-    
-    # Default to Low
-    return "Low"
+    tagged = []
+    for dept_name, dept_info in INDIA_GOVT_DEPARTMENTS.items():
+        tagged.extend((kw, DEPARTMENT, dept_name) for kw in dept_info["keywords"])
+    for tier, keywords in PRIORITY_KEYWORDS.items():
+        tagged.extend((kw, PRIORITY, tier) for kw in keywords)
+    tagged.extend((kw, INTENSIFIER, None) for kw in RISK_INTENSIFIERS)
+    tagged.extend((kw, EMERGENCY, None) for kw in EMERGENCY_KEYWORDS)
+    return TaggedKeywordMatcher(tagged)
 
-def categorize_department(text: str) -> dict:
+KEYWORD_MATCHER = _build_keyword_matcher()
+
+def scan_keywords(text: str):
     """
-    Categorizes complaint into India Government Department.
-    Returns department info with name, full name, and assigned officer.
+    Single pass over the text. Returns KeywordHits tagged with
+    department scores, priority tiers, intensifier and emergency flags.
     """
-    text_lower = text.lower()
+    return KEYWORD_MATCHER.scan(text)
+
+def priority_from_hits(hits) -> str:
+    for tier in PRIORITY_ORDER:
+        if tier in hits.priorities:
+            return tier
+    return "Low"
+
+def department_from_hits(hits) -> dict:
     max_score = 0
     detected_dept = None
     
+    # Iterate in dictionary order so ties resolve exactly as before
     for dept_name, dept_info in INDIA_GOVT_DEPARTMENTS.items():
-        score = sum(1 for keyword in dept_info["keywords"] if keyword in text_lower)
+        score = hits.departments.get(dept_name, 0)
         if score > max_score:
             max_score = score
             detected_dept = {
@@ -138,29 +150,38 @@ def categorize_department(text: str) -> dict:
     
     return detected_dept
 
-def classify_complaint_with_llm(text: str, location: str = "Unknown") -> dict:
+def classify_priority(text: str) -> str:
     """
-    Uses Gemini AI to intelligently classify complaint priority and category.
-    Focuses on contextual severity (e.g., 'garbage' is not critical even if 'urgent' is used).
+    Classifies complaint priority based on keywords and severity indicators.
+    Returns: Critical, High, Medium, or Low
+    """
+    return priority_from_hits(scan_keywords(text))
+
+def categorize_department(text: str) -> dict:
     """
+    Categorizes complaint into India Government Department.
+    Returns department info with name, full name, and assigned officer.
+    """
+    return department_from_hits(scan_keywords(text))
+
+def local_confidence_threshold() -> float:
+    """Confidence below which the local model defers to the LLM (Settings.AI_LOCAL_CONFIDENCE_THRESHOLD)."""
     try:
-        import google.generativeai as genai
-        import json
-        if not settings.STT_API_KEY or (settings.STT_API_KEY.startswith("AIzaSyCX") and len(settings.STT_API_KEY) < 20):
-            print("[TERMINAL LOG] STT_API_KEY is null or contains placeholder text. AI features will be limited.")
-            return None
-            
-        print(f"[AI] Calling Gemini API with key ending in ...{settings.STT_API_KEY[-4:]}")
-        genai.configure(api_key=settings.STT_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest')
-        
-        prompt = f"""
-        Analyze this citizen grievance for a government database.
-        
-        Complaint: "{text}"
-        Location: "{location}"
-        
-        Task:
+        from .config import settings
+        return settings.AI_LOCAL_CONFIDENCE_THRESHOLD
+    except Exception:
+        return 0.6
+
+def hedge_budget_seconds():
+    """Latency budget for interactive LLM calls (Settings.LLM_HEDGE_BUDGET_MS, None = wait)."""
+    try:
+        from .config import settings
+        budget_ms = settings.LLM_HEDGE_BUDGET_MS
+    except Exception:
+        budget_ms = 400
+    return budget_ms / 1000 if budget_ms else None
+
+CLASSIFICATION_RULES = """        Task:
         1. Identify the Government Department (e.g., Sanitation, Roads, Electricity).
         2. Assign Priority (Critical, High, Medium, Low).
            - CRITICAL: Life-threatening (Live wire, fire, massive flood, explosion).
@@ -185,7 +206,15 @@ def classify_complaint_with_llm(text: str, location: str = "Unknown") -> dict:
            
         3. Provide brief reasoning (1 sentence).
         
-        Return ONLY valid JSON:
+"""
+
+CLASSIFICATION_PROMPT = """
+        Analyze this citizen grievance for a government database.
+        
+        Complaint: "{text}"
+        Location: "{location}"
+        
+""" + CLASSIFICATION_RULES + """        Return ONLY valid JSON:
         {{
             "category": "Department Name",
             "priority": "Critical/High/Medium/Low",
@@ -193,100 +222,328 @@ def classify_complaint_with_llm(text: str, location: str = "Unknown") -> dict:
             "reasoning": "Reason here"
         }}
         """
+
+# Many complaints in one prompt (/helper/scan-text/batch); results share the per-item cache
+BATCH_CLASSIFICATION_PROMPT = """
+        Analyze these citizen grievances for a government database.
+        Each line is: <id>. <complaint text as a JSON string> (Location: <location>)
+        
+{complaints}
         
-        response = model.generate_content(prompt)
-        content = response.text.strip()
+        Apply the task below to EVERY complaint independently.
         
-        # Clean markdown code blocks if present
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
+""" + CLASSIFICATION_RULES + """        Return ONLY a valid JSON array with exactly one object per complaint:
+        [
+            {{"id": 1, "category": "Department Name", "priority": "Critical/High/Medium/Low", "confidence": 0.0-1.0, "reasoning": "Reason here"}}
+        ]
+        """
+
+# Cache entries are keyed on this; editing the prompt invalidates them automatically
+CLASSIFICATION_PROMPT_VERSION = prompt_version(CLASSIFICATION_PROMPT + BATCH_CLASSIFICATION_PROMPT)
+
+def _strip_code_fence(content: str) -> str:
+    content = content.strip()
+    # Clean markdown code blocks if present
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+def _valid_classification(result) -> bool:
+    return isinstance(result, dict) and "priority" in result and "category" in result
+
+def _parse_classification(content: str):
+    import json
+    result = json.loads(_strip_code_fence(content))
+    
+    # Validate keys
+    if _valid_classification(result):
+        return result
+    return None
+
+def classify_complaint_with_llm(text: str, location: str = "Unknown", budget_seconds: float = None) -> dict:
+    """
+    Uses Gemini AI to intelligently classify complaint priority and category.
+    Focuses on contextual severity (e.g., 'garbage' is not critical even if 'urgent' is used).
+    Results are cached (in-process LRU + SQLite) by normalized text, location and prompt version.
+    
+    Returns None (caller falls back to rules) when the circuit breaker is open or,
+    with `budget_seconds`, when Gemini is slower than the budget. A late answer
+    still lands in the cache for the next request.
+    """
+    cache = get_classification_cache()
+    key = cache_key(text, location, CLASSIFICATION_PROMPT_VERSION)
+    cached = cache.get(key)
+    if cached:
+        return cached
+    
+    def store(content: str):
+        result = _parse_classification(content)
+        if result:
+            cache.set(key, result, CLASSIFICATION_PROMPT_VERSION)
+        return result
+    
+    try:
+        provider = get_llm_provider()
+        if not provider.is_configured():
+            print("[TERMINAL LOG] STT_API_KEY is null or contains placeholder text. AI features will be limited.")
+            return None
             
-        result = json.loads(content.strip())
+        print(f"[AI] Calling Gemini API ({provider.model_name})")
+        prompt = CLASSIFICATION_PROMPT.format(text=text, location=location)
         
-        # Validate keys
-        if "priority" in result and "category" in result:
-            return result
-        return None
+        content = provider.generate(prompt, call_site="classify",
+                                    budget_seconds=budget_seconds, on_late_result=store)
+        return store(content)
         
+    except (CircuitOpenError, LLMBudgetExceeded) as e:
+        print(f"[AI] Using rule-based classification: {e}")
+        return None
     except Exception as e:
         print(f"[AI] LLM Classification Failed: {e}")
         return None
 
-def transcribe_audio(audio_bytes: bytes, lang: str = "en-IN") -> str:
+def classify_complaints_with_llm_batch(texts, location: str = "Unknown", chunk_size: int = None) -> list:
+    """
+    Batch variant of classify_complaint_with_llm: cache hits are served directly,
+    misses are packed `chunk_size` per Gemini prompt. Returns one result (or None) per text.
+    """
+    import json
+    cache = get_classification_cache()
+    results = [None] * len(texts)
+    pending = {}  # cache key -> indices sharing that text
+    for i, text in enumerate(texts):
+        key = cache_key(text, location, CLASSIFICATION_PROMPT_VERSION)
+        cached = cache.get(key)
+        if cached:
+            results[i] = cached
+        else:
+            pending.setdefault(key, []).append(i)
+    if not pending:
+        return results
+    
+    provider = get_llm_provider()
+    if not provider.is_configured():
+        print("[TERMINAL LOG] STT_API_KEY is null or contains placeholder text. AI features will be limited.")
+        return results
+    
+    if chunk_size is None:
+        try:
+            from .config import settings
+            chunk_size = settings.AI_BATCH_LLM_CHUNK_SIZE
+        except Exception:
+            chunk_size = 25
+    
+    keys = list(pending)
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        lines = [f"        {n}. {json.dumps(texts[pending[key][0]])} (Location: {location})"
+                 for n, key in enumerate(chunk, 1)]
+        prompt = BATCH_CLASSIFICATION_PROMPT.format(complaints="\n".join(lines))
+        try:
+            print(f"[AI] Calling Gemini API ({provider.model_name}) for {len(chunk)} complaints")
+            items = json.loads(_strip_code_fence(provider.generate(prompt, call_site="classify_batch")))
+        except CircuitOpenError as e:
+            print(f"[AI] Using rule-based classification: {e}")
+            break
+        except Exception as e:
+            print(f"[AI] Batch LLM Classification Failed: {e}")
+            continue
+        
+        # Match answers to prompts by their 1-based id; an id out of range or given twice
+        # is ambiguous, so those prompts are left to the per-item fallback
+        by_id = {}
+        for item in items if isinstance(items, list) else []:
+            if not _valid_classification(item):
+                continue
+            try:
+                n = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= n <= len(chunk):
+                by_id[n] = None if n in by_id else item
+        for n, item in by_id.items():
+            if item is None:
+                continue
+            key = chunk[n - 1]
+            result = {k: v for k, v in item.items() if k != "id"}
+            cache.set(key, result, CLASSIFICATION_PROMPT_VERSION)
+            for i in pending[key]:
+                results[i] = result
+    return results
+
+def transcribe_audio(audio_bytes: bytes, lang: str = "en-IN", mime_type: str = "audio/webm", timings: dict = None) -> str:
     """
-    Transcribes audio using Gemini 1.5 Flash.
+    Transcribes audio using the configured Gemini model (Settings.GEMINI_MODEL).
     Supports multilingual input based on the lang parameter.
+    The audio is uploaded straight from memory; `timings` (if given) receives
+    "upload" and "generate" durations in seconds.
     """
     try:
-        import google.generativeai as genai
-        from .config import settings
-        import tempfile
-        import os
+        import io
+        import time
         
-        if not settings.STT_API_KEY:
+        provider = get_llm_provider()
+        if not provider.api_key:
             print("[TERMINAL LOG] ERROR: STT_API_KEY is NULL. Transcription cannot proceed.")
             return "Transcription failed: Missing STT_API_KEY"
 
-        if settings.STT_API_KEY.startswith("AIzaSyCX") and len(settings.STT_API_KEY) < 25:
+        if not provider.is_configured():
              print("[TERMINAL LOG] WARNING: Detected PLACEHOLDER STT_API_KEY. Transcription likely to fail.")
 
-        genai.configure(api_key=settings.STT_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest')
-
-        # Save audio to temporary file for Gemini consumption
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-            tmp.write(audio_bytes)
-            tmp_path = tmp.name
-
         try:
-            import time
-            start_time = time.time()
+            start_time = time.perf_counter()
             
-            # Upload file to Gemini
-            print(f"[AI] Uploading audio to Gemini... ({len(audio_bytes)} bytes)")
-            audio_file = genai.upload_file(path=tmp_path, mime_type="audio/webm")
-            upload_done = time.time()
+            # Upload buffer to Gemini (no temp file)
+            print(f"[AI] Uploading audio to Gemini... ({len(audio_bytes)} bytes, {mime_type})")
+            audio_file = provider.upload_file(io.BytesIO(audio_bytes), mime_type=mime_type, call_site="transcribe_upload")
+            upload_done = time.perf_counter()
             print(f"[AI] Upload complete in {upload_done - start_time:.2f}s")
             
             prompt = f"Transcribe this audio accurately. The language is likely {lang} but may be mixed. Return ONLY the transcribed text."
             print(f"[AI] Generating transcription for {lang}...")
             
-            # Pass timeout to generate_content
-            response = model.generate_content(
-                [prompt, audio_file],
-                request_options={"timeout": 30} # 30s max for AI response
-            )
+            transcript = provider.generate([prompt, audio_file], call_site="transcribe", timeout=30) # 30s max for AI response
             
-            gen_done = time.time()
+            gen_done = time.perf_counter()
             print(f"[AI] Generation complete in {gen_done - upload_done:.2f}s. Total: {gen_done - start_time:.2f}s")
+            if timings is not None:
+                timings["upload"] = upload_done - start_time
+                timings["generate"] = gen_done - upload_done
             
-            return response.text.strip()
+            return transcript.strip()
         except Exception as api_err:
             error_str = str(api_err)
             if "API_KEY_INVALID" in error_str or "400" in error_str:
                 return "TRANSCRIPTION_ERROR: Invalid or restricted API Key. Please check backend config."
             raise api_err
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
                 
     except Exception as e:
         print(f"[AI] Transcription Failed: {e}")
         return f"Transcription error: Technical issue or invalid API configuration."
 
 
-def analyze_complaint(text: str):
+def rule_based_classification(text: str, hits=None):
+    """
+    Keyword + heuristic classification (no model, no network).
+    Returns (dept_info, priority).
+    """
+    dept_info, priority, _ = explain_rule_based_classification(text, hits)
+    return dept_info, priority
+
+def explain_rule_based_classification(text: str, hits=None):
+    """
+    rule_based_classification plus the ids of the priority rules that fired
+    (utils/heuristic_rules.py, group "priority").
+    Returns (dept_info, priority, rule_ids).
+    """
+    if hits is None:
+        hits = scan_keywords(text)
+    
+    dept_info = department_from_hits(hits)
+    priority = priority_from_hits(hits)
+    
+    # Smart Heuristics: category-specific priority boosts (Public Safety floor,
+    # live wires, failed signals, risk intensifiers in dangerous categories)
+    rules = get_rule_engine()
+    fired = rules.evaluate("priority", rules.scan(text), dept_info["category"], priority, hits.intensified)
+    for rule in fired:
+        priority = rule["set_priority"]
+    
+    return dept_info, priority, [rule["id"] for rule in fired]
+
+def provisional_analysis(text: str) -> dict:
+    """
+    Instant rule-based analysis used at submission time.
+    The background enrichment job later replaces it with the full analyze_complaint result.
+    """
+    dept_info, priority = rule_based_classification(text)
+    return {
+        "category": dept_info["category"],
+        "department_full_name": dept_info["full_name"],
+        "assigned_officer_type": dept_info["officer"],
+        "priority": priority,
+        "urgency": priority,
+        "sentiment_score": None,
+        "confidence": dept_info["confidence"]
+    }
+
+def analyze_complaint(text: str, hits=None, llm_budget_seconds: float = None):
     """
     Comprehensive complaint analysis with priority, category, sentiment, and department.
+    `hits` may be passed in when the caller already scanned the text.
+    `llm_budget_seconds` enables hedged mode: rules answer if the LLM is slower than that.
+    """
+    if hits is None:
+        hits = scan_keywords(text)
+    
+    # 1. Local trained model first (in-process, no network)
+    # 2. LLM only when the local model is missing or not confident enough
+    local_result = ai_model.predict(text)
+    use_local = local_result is not None and local_result["confidence"] >= local_confidence_threshold()
+    ai_result = None if use_local else classify_complaint_with_llm(text, budget_seconds=llm_budget_seconds)
+    
+    # 3. Sentiment Analysis (-1.0 to 1.0)
+    return _build_analysis(text, hits, local_result if use_local else None, ai_result, sentiment_polarity(text))
+
+def analyze_complaints_batch(texts, use_llm: bool = False, hits=None) -> list:
+    """
+    analyze_complaint for many texts: one local-model pass over a sparse matrix,
+    bulk sentiment, and (if `use_llm`) packed Gemini prompts for the low-confidence rest.
+    With use_llm=False the low-confidence items take the rule-based path, exactly as
+    analyze_complaint does when the LLM is unavailable.
     """
-    blob = TextBlob(text)
+    if hits is None:
+        hits = [scan_keywords(text) for text in texts]
+    local_results = ai_model.predict_batch(texts)
+    threshold = local_confidence_threshold()
+    local_results = [r if r is not None and r["confidence"] >= threshold else None for r in local_results]
     
-    # 1. Try AI Classification first (Smart Contextual)
-    ai_result = classify_complaint_with_llm(text)
+    ai_results = [None] * len(texts)
+    if use_llm:
+        need_llm = [i for i, r in enumerate(local_results) if r is None]
+        if need_llm:
+            llm_results = classify_complaints_with_llm_batch([texts[i] for i in need_llm])
+            for i, result in zip(need_llm, llm_results):
+                ai_results[i] = result
     
-    if ai_result:
+    sentiments = sentiment_scores(texts)
+    return [
+        _build_analysis(texts[i], hits[i], local_results[i], ai_results[i], sentiments[i])
+        for i in range(len(texts))
+    ]
+
+def sentiment_scores(texts) -> list:
+    """Polarity (-1.0 to 1.0) for each text; duplicates are scored once."""
+    return sentiment_polarity_many(texts)
+
+def _build_analysis(text: str, hits, local_result, ai_result, sentiment: float) -> dict:
+    """
+    Shared tail of analyze_complaint / analyze_complaints_batch.
+    `local_result` is only passed when it cleared the confidence threshold.
+    """
+    rules_fired = []
+    if local_result is not None:
+        dept = INDIA_GOVT_DEPARTMENTS.get(local_result["category"])
+        if dept:
+            dept_info = {
+                "category": local_result["category"],
+                "full_name": dept["full_name"],
+                "officer": dept["officer"],
+                "confidence": local_result["category_confidence"]
+            }
+        else:
+            dept_info = {
+                "category": "General",
+                "full_name": "General Grievance Cell",
+                "officer": "Municipal Officer",
+                "confidence": local_result["category_confidence"]
+            }
+        priority = local_result["priority"]
+        confidence = local_result["confidence"]
+        
+    elif ai_result:
         # Map AI Category to internal keys if possible, or use AI's raw string if close
         # For safety, let's look up our rigid map to find the best officer match for the AI category
         best_dept_match = None
@@ -304,43 +561,16 @@ def analyze_complaint(text: str):
             dept_info = best_dept_match
         else:
             # Fallback for dept but keep AI priority
-            dept_info = categorize_department(text)
+            dept_info = department_from_hits(hits)
             
         priority = ai_result["priority"]
         confidence = ai_result.get("confidence", 0.9)
         
     else:
         # Fallback to Rule-Based
-        dept_info = categorize_department(text)
-        priority = classify_priority(text)
-        
-        # Smart Heuristic 1: If category is Public Safety, bump Low/Medium to High
-        if dept_info["category"] == "Public Safety & Law Enforcement" and priority in ["Low", "Medium"]:
-             priority = "High"
-
-        if dept_info["category"] == "Electricity & Power Supply" and priority == "Low":
-             if any(w in text.lower() for w in ["wire", "spark", "current", "pole", "hanging"]):
-                 priority = "High"
-
-        if dept_info["category"] == "Traffic & Road Safety" and priority == "Low":
-             if any(w in text.lower() for w in ["signal", "light", "not working", "stuck", "jam"]):
-                 priority = "High"
-
-        # Smart Heuristic 4: Risk Intensifiers only boost dangerous categories
-        # Categories allowed to jump to High on adjectives alone: Roads (accident risk), Electricity, Safety
-        DANGEROUS_CATEGORIES = ["Roads & Public Works", "Electricity & Power Supply", "Public Safety & Law Enforcement", "Traffic & Road Safety"]
-        
-        if dept_info["category"] in DANGEROUS_CATEGORIES and priority == "Medium":
-            if any(w in text.lower() for w in RISK_INTENSIFIERS):
-                priority = "High"
-                
-        # Sanitation/Water/Parks should NOT jump to High just because of "serious/major" (unless specific High keywords matched)
-             
+        dept_info, priority, rules_fired = explain_rule_based_classification(text, hits)
         confidence = dept_info["confidence"]
     
-    # 3. Sentiment Analysis (-1.0 to 1.0)
-    sentiment = blob.sentiment.polarity
-    
     # 4. Legacy urgency (for backward compatibility)
     urgency_map = {
         "Critical": "Critical",
@@ -357,7 +587,8 @@ def analyze_complaint(text: str):
         "priority": priority,
         "urgency": urgency,  # Legacy field
         "sentiment_score": sentiment,
-        "confidence": confidence
+        "confidence": confidence,
+        "rules_fired": rules_fired
     }
 
 
@@ -369,26 +600,20 @@ def generate_complaint_summary(complaint) -> str:
     2. Validate Quality (Check for repetition, length)
     3. Fallback to LLM (Gemini) if rules fail to abstract
     """
-    text = f"{complaint.title}. {complaint.description}".lower()
-    
-    # --- 1. Rule-Based Semantic Inference ---
-    insights = []
-    
-    # Risk Detection
-    if any(w in text for w in ["accident", "injury", "death", "casualty", "hurt"]):
-        insights.append("poses a public safety risk")
-    elif any(w in text for w in ["wire", "shock", "current", "spark"]):
-        insights.append("presents an electrocution hazard")
+    summary = rule_based_summary(complaint)
+    if summary:
+        return summary
         
-    # Location Severity
-    if any(w in text for w in ["highway", "nh16", "nh-16", "national highway", "main road", "traffic"]):
-        insights.append("on a high-traffic route")
-    
-    # Priority Emphasis
-    if complaint.priority == "Critical":
-        insights.append("requires immediate attention")
-    elif complaint.priority == "High":
-        insights.append("needs prompt maintenance")
+    # --- 5. Forced LLM Fallback ---
+    return force_llm_summary(complaint)
+
+def rule_based_summary(complaint):
+    """
+    Steps 1-4 of generate_complaint_summary: the rule-based candidate,
+    or None when it fails the quality check and the LLM is needed.
+    """
+    # --- 1. Rule-Based Semantic Inference (risk, location severity, priority emphasis) ---
+    insights = [rule["insight"] for rule in summary_rules(complaint)]
         
     # --- 2. Construct Candidate Summary ---
     candidate_summary = ""
@@ -413,24 +638,30 @@ def generate_complaint_summary(complaint) -> str:
     # --- 4. Final Decision ---
     if not should_force_llm:
         return candidate_summary
-        
-    # --- 5. Forced LLM Fallback ---
-    return force_llm_summary(complaint)
+    return None
+
+SUMMARY_RULE_GROUPS = ("summary.risk", "summary.location", "summary.priority")
 
-def force_llm_summary(complaint) -> str:
+def summary_rules(complaint) -> list:
+    """Summary rules (utils/heuristic_rules.py) that fire for a complaint, in insight order."""
+    rules = get_rule_engine()
+    hits = rules.scan(f"{complaint.title}. {complaint.description}")
+    return [
+        rule
+        for group in SUMMARY_RULE_GROUPS
+        for rule in rules.evaluate(group, hits, priority=complaint.priority)
+    ]
+
+def force_llm_summary(complaint, raise_errors: bool = False) -> str:
     """
     Calls Gemini API to generate an abstractive summary.
-    Falls back to robust extraction if API fails.
+    Falls back to robust extraction if API fails
+    (raise_errors: re-raise instead when the API is configured, so a background job can retry).
     """
     try:
-        import google.generativeai as genai
-        from .config import settings
-        
-        if not settings.STT_API_KEY:
+        provider = get_llm_provider()
+        if not provider.is_configured():
             raise ValueError("No API Key")
-            
-        genai.configure(api_key=settings.STT_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest')
         
         prompt = f"""
         You are assisting a government officer.
@@ -449,8 +680,7 @@ def force_llm_summary(complaint) -> str:
         Priority: {complaint.priority}
         """
         
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = provider.generate(prompt, call_site="summary").strip()
         
         # Safety cleanup
         if text.startswith("Summary:"):
@@ -459,6 +689,8 @@ def force_llm_summary(complaint) -> str:
         return text
         
     except Exception as e:
+        if raise_errors and get_llm_provider().is_configured():
+            raise
         print(f"LLM Summary Failed: {e}")
         # Final Fail-Safe: Advanced Extraction
         # Extract Noun Phrases + Action verbs logic not implemented fully, 
@@ -471,18 +703,90 @@ def generate_analysis_response(text: str):
     Generates the full AI Analysis Payload for the frontend.
     Includes Reasoning, ERT, and Confidence.
     """
-    analysis = analyze_complaint(text)
+    hits = scan_keywords(text)
+    analysis = analyze_complaint(text, hits=hits, llm_budget_seconds=hedge_budget_seconds())
+    return _analysis_payload(analysis, hits)
+
+def generate_analysis_responses(texts, use_llm: bool = False) -> list:
+    """
+    Batch variant of generate_analysis_response (same payload per text).
+    """
+    hits = [scan_keywords(text) for text in texts]
+    analyses = analyze_complaints_batch(texts, use_llm=use_llm, hits=hits)
+    return [_analysis_payload(analysis, text_hits) for analysis, text_hits in zip(analyses, hits)]
+
+def _draft_setting(name: str, default):
+    try:
+        from .config import settings
+        return getattr(settings, name)
+    except Exception:
+        return default
+
+_draft_store = None
+
+def get_draft_store():
+    global _draft_store
+    if _draft_store is None:
+        from .utils.draft_sessions import DraftSessionStore
+        _draft_store = DraftSessionStore(
+            KEYWORD_MATCHER,
+            max_sessions=_draft_setting("DRAFT_SESSION_MAX", 1000),
+            ttl_seconds=_draft_setting("DRAFT_SESSION_TTL_SECONDS", 1800)
+        )
+    return _draft_store
+
+def generate_draft_analysis_response(draft_id: str, text: str, final: bool = False):
+    """
+    generate_analysis_response for live typing.
+    Keyword hits and token counts are carried over from the draft's previous text,
+    so only the edited tail is rescanned. The LLM is asked at most once per draft:
+    when the local model is unsure and the classification has stopped changing
+    (or the client marks the draft `final`). Its answer comes back through the
+    classification cache and refines every later update of the draft.
+    """
+    session = get_draft_store().get(draft_id)
+    with session.lock:
+        session.update(text)
+        hits = session.scan.hits()
+        
+        local_result = ai_model.predict(text)
+        use_local = local_result is not None and local_result["confidence"] >= local_confidence_threshold()
+        
+        if session.llm_requested and session.llm_result is None:
+            # Late answer from the hedged call lands in the cache
+            session.llm_result = get_classification_cache().get(
+                cache_key(session.llm_text, "Unknown", CLASSIFICATION_PROMPT_VERSION)
+            )
+        ai_result = None
+        if not use_local and session.llm_result_applies():
+            ai_result = session.llm_result
+        
+        analysis = _build_analysis(text, hits, local_result if use_local else None, ai_result, sentiment_polarity(text))
+        stable = session.observe_label((analysis["category"], analysis["priority"]))
+        
+        ready = final or (
+            stable >= _draft_setting("DRAFT_STABLE_UPDATES", 2)
+            and session.word_count >= _draft_setting("DRAFT_LLM_MIN_WORDS", 8)
+        )
+        if not use_local and not session.llm_requested and ready:
+            session.llm_requested = True
+            session.llm_text = session.scan.text
+            session.llm_result = classify_complaint_with_llm(text, budget_seconds=hedge_budget_seconds())
+            if session.llm_result:
+                analysis = _build_analysis(text, hits, None, session.llm_result, analysis["sentiment_score"])
     
+    return _analysis_payload(analysis, hits)
+
+def _analysis_payload(analysis: dict, hits) -> dict:
     # 1. Generate Reasoning (Heuristic)
     reasoning = []
-    text_lower = text.lower()
     
     # Keyword matches
     keywords_found = []
     if analysis["category"] != "General":
         dept_info = INDIA_GOVT_DEPARTMENTS.get(analysis["category"], {})
         for kw in dept_info.get("keywords", []):
-            if kw in text_lower:
+            if kw in hits.keywords:
                 keywords_found.append(kw)
                 if len(keywords_found) >= 3: break
     
@@ -495,6 +799,10 @@ def generate_analysis_response(text: str):
     elif analysis["priority"] == "High":
         reasoning.append("Classified as High priority due to severity indicators")
         
+    # Heuristic rules that changed the priority (rule-based path)
+    if analysis.get("rules_fired"):
+        reasoning.append(f"Rules applied: {', '.join(analysis['rules_fired'])}")
+        
     # Sentiment Reasoning
     if analysis["sentiment_score"] < -0.3:
         reasoning.append("Negative sentiment indicates user frustration/urgency")
@@ -48,6 +48,16 @@ async def log_requests(request: Request, call_next):
     # print(f"DEBUG RESPONSE: {response.status_code}")
     return response
 
+# Optimistic locking (Complaint.version): a complaint changed by another request
+# or worker between our read and our write is a conflict, not a server error
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    print(f"⚠️ Concurrent update conflict on {request.method} {request.url.path}: {exc}")
+    return JSONResponse(status_code=409, content={"detail": "This record was changed by someone else. Reload and retry."})
+
 # Include Routes
 app.include_router(auth_routes.router)
 app.include_router(complaint_routes.router)
@@ -72,7 +82,70 @@ async def startup_event():
         print("[STARTUP] STT_API_KEY status: MISSING/PLACEHOLDER (Transcription will fail)")
     else:
         print("[STARTUP] STT_API_KEY status: CONFIGURED (Ready for AI features)")
-    pass
+
+    # Load the local complaint classifier once (primary classification path)
+    from . import ai_model
+    ai_model.load_model()
+
+    # Department registry, velocity tracker, near-duplicate LSH index and incident
+    # vector index (kept current afterwards by commits, submissions and enrichment)
+    from . import ai_trust, departments, incidents
+    from .database import SessionLocal
+    db = SessionLocal()
+    try:
+        departments.load_department_registry(db)
+    except Exception as e:
+        print(f"[STARTUP] Department registry not loaded: {e}")
+    try:
+        ai_trust.warm_velocity_tracker(db)
+    except Exception as e:
+        print(f"[STARTUP] Velocity tracker not warmed: {e}")
+    try:
+        ai_trust.load_duplicate_index(db)
+    except Exception as e:
+        print(f"[STARTUP] Near-duplicate index not loaded: {e}")
+    try:
+        incidents.load_incident_index(db)
+    except Exception as e:
+        print(f"[STARTUP] Incident index not loaded: {e}")
+    finally:
+        db.close()
+
+    # Officer workload heaps (auto-assignment), kept current from commits + reconciliation
+    from . import workload
+    try:
+        workload.start()
+    except Exception as e:
+        print(f"[STARTUP] Workload heaps not loaded, assignment uses DB queries: {e}")
+
+    # SLA breach sweeper: flags complaints as their deadlines pass
+    from . import sla
+    try:
+        sla.start()
+    except Exception as e:
+        print(f"[STARTUP] SLA sweeper not started: {e}")
+
+    # Tiered SLA escalation (officer warning, department head, admin queue) + outbox delivery
+    from . import escalation
+    try:
+        escalation.start()
+    except Exception as e:
+        print(f"[STARTUP] SLA escalation not started: {e}")
+
+    # Background workers for AI enrichment and officer summaries (handlers register on import)
+    from . import job_queue, enrichment, summaries
+    job_queue.start_workers()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from . import escalation, job_queue, sla, workload
+    from .utils import audio
+    job_queue.stop_workers()
+    workload.stop()
+    sla.stop()
+    escalation.stop()
+    audio.shutdown_transcode_pool()
 
 
 @app.get("/")
@@ -0,0 +1,201 @@
+"""
+Bulk auto-assignment of the unassigned backlog (POST /admin/complaints/auto-assign).
+
+Reads the backlog (unassigned, not archived, not closed), the active
+officers and their current load in three queries, plans a balanced
+assignment in memory (utils/assignment_planner.py) and writes it in one
+transaction: one executemany UPDATE of the complaints and batched INSERTs
+of their history, audit and timeline rows. The officer summaries are
+warmed by a single backfill run that fans out in the background.
+
+The writes go through Core, so the workload heaps (workload.py) get the new
+loads through defer_adjust, applied on commit.
+"""
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, insert, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .utils.assignment_logic import ACTIVE_STATUSES
+from .utils.assignment_planner import BacklogItem, AssignmentPlan, plan_assignments, work_units
+from .utils.escalation_policy import sla_window
+from .utils.sql_chunks import chunks
+
+
+class BacklogChanged(Exception):
+    """Some complaints were assigned by someone else between planning and writing."""
+
+
+def load_backlog(db: Session, department_id: int = None, claim: bool = False) -> list:
+    """
+    With claim, the rows are locked for this transaction (Postgres FOR UPDATE
+    SKIP LOCKED): complaints another worker is assigning right now are left to it.
+    """
+    query = db.query(
+        models.Complaint.id, models.Complaint.department_id, models.Complaint.priority,
+        models.Complaint.location, models.Complaint.created_at
+    ).filter(
+        models.Complaint.assigned_officer_id == None,
+        models.Complaint.is_archived == False,
+        models.Complaint.closed_at == None
+    )
+    if department_id is not None:
+        query = query.filter(models.Complaint.department_id == department_id)
+    if claim:
+        query = query.with_for_update(skip_locked=True, of=models.Complaint)
+    from . import escalation
+    policies = escalation.get_policies(db)
+    hours = {}  # department id -> priority -> SLA hours (escalation policy)
+    items = []
+    for row in query.all():
+        if row[1] not in hours:
+            hours[row[1]] = policies.hours_by_priority(row[1])
+        items.append(BacklogItem(*row, hours[row[1]]))
+    return items
+
+
+def load_officers(db: Session, department_id: int = None) -> dict:
+    """officer id -> (department id, ward, name, designation, employee id) of active officers."""
+    query = db.query(
+        models.Officer.id, models.Officer.department_id, models.Officer.ward,
+        models.Officer.name, models.Officer.designation, models.Officer.employee_id
+    ).filter(models.Officer.status == "Active")
+    if department_id is not None:
+        query = query.filter(models.Officer.department_id == department_id)
+    return {row[0]: tuple(row[1:]) for row in query.all()}
+
+
+def current_loads(db: Session) -> dict:
+    """
+    officer id -> (open complaints, load units), one grouped query. Units are
+    weighted with the escalation policy hours of each complaint's department
+    and priority, like the backlog items (load_backlog), so existing and new
+    load are comparable.
+    """
+    rows = db.query(
+        models.Complaint.assigned_officer_id, models.Complaint.department_id, models.Complaint.priority,
+        func.count(models.Complaint.id)
+    ).filter(
+        models.Complaint.assigned_officer_id != None,
+        models.Complaint.status.in_(ACTIVE_STATUSES)
+    ).group_by(
+        models.Complaint.assigned_officer_id, models.Complaint.department_id, models.Complaint.priority
+    ).all()
+    from . import escalation
+    policies = escalation.get_policies(db)
+    loads = {}
+    for officer_id, department_id, priority, count in rows:
+        total, units = loads.get(officer_id, (0, 0.0))
+        hours = policies.lookup(department_id, priority).sla_hours
+        loads[officer_id] = (total + count, units + count * work_units(hours))
+    return loads
+
+
+def plan_backlog(db: Session, department_id: int = None, claim: bool = False):
+    """(plan, officers) for the current backlog; nothing is written (claim: see load_backlog)."""
+    officers = load_officers(db, department_id)
+    plan = plan_assignments(
+        load_backlog(db, department_id, claim),
+        [(o, info[0], info[1]) for o, info in officers.items()],
+        current_loads(db),
+        ward_penalty=settings.AUTO_ASSIGN_WARD_PENALTY
+    )
+    return plan, officers
+
+
+def apply_plan(db: Session, plan: AssignmentPlan, officers: dict, admin: models.User) -> int:
+    """
+    Writes the plan in the caller's transaction (caller commits).
+    Raises BacklogChanged if any complaint is no longer unassigned.
+    """
+    if not plan.assignments:
+        return 0
+    from . import escalation
+    now = datetime.utcnow()
+    table = models.Complaint.__table__
+    policies = escalation.get_policies(db)
+    params = []
+    for cid, oid, hours, _ in plan.assignments:
+        item = plan.items[cid]
+        window = sla_window(policies.lookup(item.department_id, item.priority)._replace(sla_hours=hours), now)
+        params.append({
+            "_id": cid, "_officer": oid, "_hours": hours, "_deadline": window["sla_deadline"],
+            "_warn": window["sla_warn_at"], "_admin": window["sla_admin_at"]
+        })
+    result = db.execute(
+        update(table).where(
+            table.c.id == bindparam("_id"),
+            table.c.assigned_officer_id == None
+        ).values(
+            assigned_officer_id=bindparam("_officer"),
+            assigned_at=now,
+            assigned_by_admin_id=admin.id,
+            status="ASSIGNED",
+            sla_hours=bindparam("_hours"),
+            sla_deadline=bindparam("_deadline"),
+            sla_warn_at=bindparam("_warn"),
+            sla_admin_at=bindparam("_admin"),
+            escalation_level=0,
+            next_escalation_at=bindparam("_warn"),
+            updated_at=now,
+            version=table.c.version + 1  # sessions holding the old version now fail their version check
+        ),
+        params
+    )
+    ids = [a[0] for a in plan.assignments]
+    updated = result.rowcount
+    if not db.get_bind().dialect.supports_sane_multi_rowcount:
+        updated = sum(db.query(func.count(models.Complaint.id)).filter(
+            models.Complaint.id.in_(chunk),
+            models.Complaint.assigned_at == now,
+            models.Complaint.assigned_by_admin_id == admin.id
+        ).scalar() for chunk in chunks(ids))
+    if updated != len(ids):
+        raise BacklogChanged(f"{len(ids) - updated} complaint(s) were assigned meanwhile")
+
+    has_timeline = set()  # (complaint_id, status) is unique
+    for chunk in chunks(ids):
+        has_timeline.update(cid for (cid,) in db.query(models.GrievanceTimeline.complaint_id).filter(
+            models.GrievanceTimeline.complaint_id.in_(chunk),
+            models.GrievanceTimeline.status == "ASSIGNED"
+        ))
+
+    history, audit, timeline = [], [], []
+    for cid, oid, hours, _ in plan.assignments:
+        _, _, name, designation, employee_id = officers[oid]
+        history.append({
+            "complaint_id": cid,
+            "action": f"Auto-assigned to {name} ({designation}) - SLA: {hours}h",
+            "performed_by": admin.email,
+            "timestamp": now
+        })
+        audit.append({
+            "admin_id": admin.id,
+            "action": f"Auto-assigned complaint #{cid} to officer {employee_id}",
+            "target_resource": f"complaint:{cid}",
+            "target_id": cid,
+            "created_at": now
+        })
+        if cid not in has_timeline:
+            timeline.append({
+                "complaint_id": cid,
+                "status": "ASSIGNED",
+                "updated_by": "ADMIN",
+                "remarks": f"Assigned to {name} ({designation})",
+                "timestamp": now,
+                "is_public_visible": True
+            })
+    db.execute(insert(models.ComplaintHistory.__table__), history)
+    db.execute(insert(models.AdminAuditLog.__table__), audit)
+    if timeline:
+        db.execute(insert(models.GrievanceTimeline.__table__), timeline)
+
+    from . import sla, summaries, workload
+    summaries.start_backfill(db, admin.email, complaint_ids=ids)
+    sla.defer_schedule(db, [(p["_id"], p["_deadline"]) for p in params])
+    for officer_id, count in Counter(a[1] for a in plan.assignments).items():
+        workload.defer_adjust(db, officer_id, count)
+    return len(ids)
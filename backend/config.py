@@ -21,6 +21,113 @@ class Settings(BaseSettings):
     STT_API_KEY: Optional[str] = None
     GEMINI_API_KEY: Optional[str] = None
 
+    # LLM Provider (shared Gemini client for every call site)
+    GEMINI_MODEL: str = "gemini-flash-latest"
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+
+    # LLM Circuit Breaker (falls back to keyword rules while open)
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive failures/slow calls before opening
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 5.0
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+    LLM_BREAKER_HALF_OPEN_CALLS: int = 1
+    # Hedged mode for interactive analysis (/helper/scan-text): rule-based answer if the LLM is slower
+    LLM_HEDGE_BUDGET_MS: Optional[int] = 400
+
+    # Local Complaint Classifier (TF-IDF + linear model)
+    # The LLM is only consulted when the local model's confidence is below this threshold
+    AI_LOCAL_MODEL_PATH: Optional[str] = None  # Defaults to backend/artifacts/complaint_classifier_v<N>.pkl
+    AI_LOCAL_CONFIDENCE_THRESHOLD: float = 0.6
+
+    # LLM Classification Cache (in-process LRU + SQLite)
+    LLM_CACHE_PATH: Optional[str] = None  # Defaults to backend/artifacts/llm_cache.db
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Background Job Queue (AI enrichment after complaint submission)
+    JOB_WORKERS: int = 2
+
+    # Async AI Calls (dedicated thread pool, separate from FastAPI's default)
+    AI_MAX_CONCURRENCY: int = 16  # Pool size and in-flight limit
+    AI_SCAN_TIMEOUT_SECONDS: float = 10.0
+    AI_TRANSCRIBE_TIMEOUT_SECONDS: float = 60.0
+
+    # Voice Upload (/helper/transcribe)
+    AI_TRANSCRIBE_MAX_BYTES: int = 10 * 1024 * 1024  # Hard cap; larger uploads get 413
+    AI_TRANSCRIBE_CHUNK_BYTES: int = 256 * 1024
+    AI_TRANSCRIBE_DOWNSAMPLE: bool = False  # Re-encode to 16 kHz mono Opus before upload (needs ffmpeg)
+    AI_TRANSCODE_WORKERS: int = 2
+
+    # Live-typing draft sessions (/helper/scan-text with draft_id)
+    DRAFT_SESSION_MAX: int = 1000
+    DRAFT_SESSION_TTL_SECONDS: int = 1800
+    DRAFT_STABLE_UPDATES: int = 2  # Unchanged classifications before the one LLM refinement
+    DRAFT_LLM_MIN_WORDS: int = 8
+
+    # Sentiment: "lexicon" (compiled, default) or "textblob" (compatibility, imported lazily)
+    SENTIMENT_BACKEND: str = "lexicon"
+
+    # Batch Classification (/helper/scan-text/batch)
+    AI_BATCH_MAX_ITEMS: int = 5000
+    AI_BATCH_TIMEOUT_SECONDS: float = 120.0
+    AI_BATCH_LLM_CHUNK_SIZE: int = 25  # Complaints packed into one Gemini prompt
+
+    # Heuristic rule table (summary + priority rules), hot-reloaded on change
+    AI_RULES_PATH: Optional[str] = None  # Defaults to backend/utils/heuristic_rules.py
+    AI_RULES_RELOAD_SECONDS: float = 5.0  # How often the file's mtime is checked
+
+    # Submission velocity (trust scoring, utils/velocity.py)
+    VELOCITY_WINDOWS: str = "1m:2,5m:2,1d:10"  # window:limit - flag at >= limit other submissions in the window
+    VELOCITY_BACKEND: str = "memory"  # "memory" (per process, warmed at startup) or "redis" (shared by workers)
+    VELOCITY_REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/0 (needs the redis package)
+    VELOCITY_MAX_EVENTS: int = 64  # Ring buffer size per user (memory backend)
+
+    # Near-duplicate detection (MinHash/LSH, ai_trust)
+    NEAR_DUP_THRESHOLD: float = 0.5  # Estimated Jaccard of description 5-gram shingles
+    NEAR_DUP_MAX_MATCHES: int = 5  # Complaint ids reported per scope (user / ward / department)
+
+    # Incident clusters (hashed-embedding vector index, incidents.py)
+    INCIDENT_SIMILARITY: float = 0.45  # Cosine needed to link a complaint to an open one in the same department + ward
+    INCIDENT_WINDOW_HOURS: int = 72  # Only complaints this recent are candidates
+    INCIDENT_TOP_K: int = 5  # Nearest complaints checked per new complaint
+    INCIDENT_INDEX_DIR: str = ""  # Where the memory-mapped vector file goes (default: system temp dir)
+
+    # Officer workload heaps for auto-assignment (workload.py)
+    WORKLOAD_RECONCILE_SECONDS: float = 60.0  # Compare with the DB and correct drift (0 = off)
+
+    # Department registry for resolve_department (departments.py)
+    DEPARTMENT_REGISTRY_TTL_SECONDS: float = 300.0  # Reload to see departments added by other worker processes
+
+    # Optimistic locking on complaints (utils/optimistic.py)
+    ASSIGN_CONFLICT_ATTEMPTS: int = 3  # Read-check-write attempts when another session changed the complaint
+    SQLITE_WAL: bool = True  # journal_mode=WAL: readers don't block the writer (multiple workers)
+
+    # SLA breach sweeper (sla.py)
+    SLA_SWEEP_BATCH: int = 500  # Complaints flagged per UPDATE + commit
+    SLA_MAX_SLEEP_SECONDS: float = 300.0  # Longest sleep between sweeps when no deadline is near
+    SLA_RESCAN_SECONDS: float = 600.0  # Indexed catch-up for deadlines set by other worker processes (0 = off)
+
+    # Admin dashboard overview (dashboard_stats.py)
+    ADMIN_STATS_CACHE_SECONDS: float = 5.0  # Reuse /admin/stats for a burst of requests (0 = always recompute)
+
+    # Officer performance analytics (officer_performance.py)
+    OFFICER_PERFORMANCE_CACHE_SECONDS: float = 30.0  # Reuse results per filter / sort / page (0 = always recompute)
+
+    # Tiered SLA escalation + notification outbox (escalation.py)
+    ESCALATION_INTERVAL_SECONDS: float = 60.0  # Escalation worker run interval (0 = off)
+    ESCALATION_BATCH: int = 1000  # Complaints escalated per UPDATE + commit
+    ESCALATION_POLICY_TTL_SECONDS: float = 300.0  # Reload to see policies changed by other worker processes
+    OUTBOX_DELIVERY_BATCH: int = 100  # Notifications sent per delivery round
+
+    # Bulk auto-assignment of the backlog (bulk_assignment.py)
+    AUTO_ASSIGN_WARD_PENALTY: float = 2.0  # Extra load (in Medium complaints) accepted to keep a complaint in its ward
+
+    # Officer summary pre-generation (on assignment + admin backfill)
+    SUMMARY_BATCH_SIZE: int = 20  # Complaints per backfill job
+    SUMMARY_LLM_RATE_PER_MINUTE: float = 20.0  # Token bucket for LLM summaries (per process)
+    SUMMARY_LLM_BURST: int = 5
+
     # Database (example)
     DATABASE_URL: Optional[AnyUrl] = Field(None, env="DATABASE_URL")
 
@@ -0,0 +1,120 @@
+"""
+Admin dashboard overview (GET /admin/stats) in one aggregate query.
+
+Every figure is a conditional SUM(CASE ...) over one scan of complaints,
+the average resolution time is computed by the database
+(duration_seconds: julianday on SQLite, EXTRACT(EPOCH ...) on Postgres)
+and the active officer count is a scalar subquery of the same statement.
+Results are reused for ADMIN_STATS_CACHE_SECONDS, and concurrent requests
+in a burst wait for the one computing them instead of each running it.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, extract, func, select, text
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+
+# Same status groups as the per-figure queries this replaced
+PROCESSED_STATUSES = ["RESOLVED", "Closed by Citizen", "Work Completed", "Action Completed"]
+
+_cache = None  # (expires at, stats)
+_lock = threading.Lock()
+
+
+def duration_seconds(start, end, dialect_name: str):
+    """SQL expression for `end - start` in seconds, or None when the dialect has no known form."""
+    if dialect_name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400.0
+    if dialect_name == "postgresql":
+        return extract("epoch", end - start)
+    if dialect_name in ("mysql", "mariadb"):
+        return func.timestampdiff(text("SECOND"), start, end)
+    return None
+
+
+def stats_query(dialect_name: str, now: datetime):
+    c = models.Complaint.__table__.c
+    first_day_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    first_day_last_month = (first_day_this_month - timedelta(days=1)).replace(day=1)
+    processed = c.status.in_(PROCESSED_STATUSES)
+
+    def count_if(*conditions):
+        return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+
+    columns = [
+        func.count().label("total"),
+        count_if(processed).label("total_processed"),
+        count_if(processed, c.closed_at >= first_day_last_month, c.closed_at < first_day_this_month).label("last_month_processed"),
+        count_if(c.priority == "Critical").label("critical"),
+        count_if(c.sla_breached == True).label("sla_breached"),
+        count_if(c.assigned_officer_id == None, c.is_archived == False).label("unassigned"),
+        select(func.count(models.Officer.id)).where(models.Officer.status == "Active").scalar_subquery().label("active_officers")
+    ]
+    seconds = duration_seconds(c.created_at, c.closed_at, dialect_name)
+    if seconds is not None:
+        # Resolved with both timestamps, positive duration only (clock skew guard)
+        timed = and_(processed, c.closed_at != None, c.created_at != None, c.closed_at > c.created_at)
+        columns.append(func.avg(case((timed, seconds))).label("avg_seconds"))
+    return select(*columns).select_from(models.Complaint.__table__)
+
+
+def _avg_seconds_in_python(db: Session):
+    """Dialects without a duration expression: the two timestamps of resolved complaints only."""
+    total, count = 0.0, 0
+    for created_at, closed_at in db.query(models.Complaint.created_at, models.Complaint.closed_at).filter(
+        models.Complaint.status.in_(PROCESSED_STATUSES), models.Complaint.closed_at != None
+    ).yield_per(10000):
+        if created_at and closed_at and closed_at > created_at:
+            total += (closed_at - created_at).total_seconds()
+            count += 1
+    return total / count if count else None
+
+
+def compute_stats(db: Session, now: datetime = None) -> dict:
+    now = now or datetime.now()
+    dialect_name = db.get_bind().dialect.name
+    row = db.execute(stats_query(dialect_name, now)).mappings().one()
+    avg_seconds = row["avg_seconds"] if "avg_seconds" in row else _avg_seconds_in_python(db)
+
+    total = row["total"]
+    total_processed = row["total_processed"]
+    last_month_processed = row["last_month_processed"]
+    total_growth = 0
+    if last_month_processed > 0:
+        total_growth = ((total_processed - last_month_processed) / last_month_processed) * 100
+    resolution_rate = (total_processed / total) * 100 if total > 0 else 0
+    avg_resolution_time = round(float(avg_seconds) / 3600, 1) if avg_seconds is not None else 0
+
+    return {
+        "total": total,
+        "total_processed": total_processed,
+        "total_growth": round(total_growth, 1),
+        "pending": max(total - total_processed, 0),  # Strictly total - processed (no "floating" statuses)
+        "resolved": total_processed,  # Map resolved to processed for frontend consistency
+        "resolution_rate": round(resolution_rate, 1),
+        "avg_resolution_time": avg_resolution_time,
+        "critical": row["critical"],
+        "sla_breached": row["sla_breached"],
+        "unassigned": row["unassigned"],
+        "active_officers": row["active_officers"]
+    }
+
+
+def get_stats(db: Session) -> dict:
+    """compute_stats, reused for ADMIN_STATS_CACHE_SECONDS (one computation per burst of requests)."""
+    global _cache
+    ttl = settings.ADMIN_STATS_CACHE_SECONDS
+    cached = _cache
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    with _lock:
+        if _cache and _cache[0] > time.monotonic():
+            return _cache[1]
+        stats = compute_stats(db)
+        if ttl > 0:
+            _cache = (time.monotonic() + ttl, stats)
+        return stats
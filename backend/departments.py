@@ -0,0 +1,73 @@
+"""
+Process-wide department registry (utils/department_registry.py).
+
+Loaded at startup with one query. Any Session that commits a created,
+edited or deleted Department drops it, and the next lookup reloads it.
+Departments changed by another worker process are picked up after
+DEPARTMENT_REGISTRY_TTL_SECONDS.
+"""
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .utils import commit_hooks
+from .utils.department_registry import DepartmentRegistry
+
+_registry = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _build(db: Session) -> DepartmentRegistry:
+    from .ai_utils import INDIA_GOVT_DEPARTMENTS
+    from .utils.assignment_logic import DEPARTMENT_MAP
+    rows = db.query(models.Department.id, models.Department.name).order_by(models.Department.id).all()
+    return DepartmentRegistry(rows, INDIA_GOVT_DEPARTMENTS, DEPARTMENT_MAP)
+
+
+def get_registry(db: Session) -> DepartmentRegistry:
+    """The loaded registry; (re)loads it when missing, invalidated or older than the TTL."""
+    global _registry, _loaded_at
+    registry = _registry
+    if registry is not None and time.monotonic() - _loaded_at < settings.DEPARTMENT_REGISTRY_TTL_SECONDS:
+        return registry
+    with _lock:
+        if _registry is None or time.monotonic() - _loaded_at >= settings.DEPARTMENT_REGISTRY_TTL_SECONDS:
+            _registry = _build(db)
+            _loaded_at = time.monotonic()
+        return _registry
+
+
+def load_department_registry(db: Session) -> DepartmentRegistry:
+    """Startup: loads the registry now instead of on the first complaint."""
+    invalidate()
+    registry = get_registry(db)
+    print(f"[Departments] Registry loaded: {len(registry)} departments, "
+          f"General Grievance Cell {'#' + str(registry.general.id) if registry.general else 'missing'}")
+    return registry
+
+
+def invalidate():
+    global _registry
+    with _lock:
+        _registry = None
+
+
+# ============ INVALIDATION (every Session) ============
+
+def _collect(session) -> list:
+    # dirty: column edits only, not a complaint joining department.complaints
+    return [obj.id for obj in (*session.new, *session.deleted) if isinstance(obj, models.Department)] or [
+        obj.id for obj in session.dirty
+        if isinstance(obj, models.Department) and session.is_modified(obj, include_collections=False)
+    ]
+
+
+def _apply(session, changed_ids):
+    invalidate()
+
+
+commit_hooks.register(Session, "departments", _collect, _apply)
@@ -0,0 +1,143 @@
+"""
+Background AI enrichment for newly submitted complaints.
+
+create_complaint stores the complaint with a provisional rule-based
+classification and enqueues a `complaint_enrichment` job. A worker then runs
+the full analysis (local model / LLM), sentiment, trust scoring, incident
+linking and auto-assignment, and writes the results and timeline entries back.
+"""
+import logging
+from sqlalchemy.orm import Session
+
+from . import models, ai_utils, ai_trust, incidents
+from .job_queue import register_handler, enqueue, job_payload
+from .utils.assignment_logic import resolve_department, assign_to_best_officer
+
+logger = logging.getLogger(__name__)
+
+ENRICHMENT_JOB = "complaint_enrichment"
+
+
+def enqueue_enrichment(db: Session, complaint: models.Complaint, manual_priority: bool = False,
+                       idempotency_key: str = None) -> models.BackgroundJob:
+    """
+    Queues enrichment for a complaint (caller commits).
+    """
+    return enqueue(
+        db,
+        ENRICHMENT_JOB,
+        idempotency_key or f"{ENRICHMENT_JOB}:{complaint.id}",
+        complaint_id=complaint.id,
+        payload={"manual_priority": manual_priority}
+    )
+
+
+def _confidence(value) -> float:
+    """LLM confidence as a float ("0.9" -> 0.9); 0.0 when it is not a number ("high", None)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _sentiment_label(score: float) -> str:
+    if score is None:
+        return "Unknown"
+    if score < -0.1:
+        return "Negative"
+    if score > 0.1:
+        return "Positive"
+    return "Neutral"
+
+
+@register_handler(ENRICHMENT_JOB)
+def enrich_complaint(db: Session, job: models.BackgroundJob):
+    """
+    Idempotent: re-running overwrites the AI fields with fresh values and
+    skips timeline entries / assignment that already happened.
+    """
+    complaint = db.query(models.Complaint).filter(models.Complaint.id == job.complaint_id).first()
+    if not complaint:
+        logger.warning(f"Enrichment: complaint #{job.complaint_id} no longer exists. Skipping.")
+        return
+
+    payload = job_payload(job)
+    combined_text = f"{complaint.title} {complaint.description}"
+
+    # 1. Full classification + sentiment (local model -> LLM -> rules)
+    analysis = ai_utils.analyze_complaint(combined_text)
+
+    # 2. AI Trust Intelligence
+    trust_score = 1.0
+    trust_flags = None
+    try:
+        trust_score, trust_flags = ai_trust.detect_trust_anomalies(
+            db, complaint.title, complaint.description, complaint.user_id, complaint_id=complaint.id,
+            department_id=complaint.department_id, location=complaint.location,
+            submitted_at=complaint.created_at
+        )
+        if trust_flags:
+            print(f"[AI Trust] Flags Detected: {trust_flags} (Score: {trust_score})")
+    except Exception as e:
+        db.rollback()
+        print(f"[WARN] Trust Analysis Failed: {e}")
+        # Fail-safe: Proceed with perfect trust
+
+    # 3. Write results back
+    confidence = _confidence(analysis.get("confidence"))
+    complaint.category = analysis["category"]
+    complaint.sentiment_score = analysis["sentiment_score"]
+    complaint.urgency_level = analysis["urgency"]
+    if not payload.get("manual_priority"):
+        complaint.priority = analysis["priority"]
+    complaint.ai_trust_score = trust_score
+    complaint.ai_trust_flags = trust_flags
+
+    # Re-route only while nobody has picked the complaint up yet
+    if not complaint.assigned_officer_id:
+        department = resolve_department(db, analysis.get("department_full_name"), combined_text)
+        if department:
+            complaint.department_id = department.id
+
+    # Same issue already reported nearby? Join its incident (and its officer)
+    incidents.attach_to_incident(db, complaint)
+
+    # Signature for future near-duplicate checks (indexed with the final department)
+    ai_trust.record_signature(db, complaint)
+
+    ai_row = db.query(models.AIAnalysis).filter(models.AIAnalysis.complaint_id == complaint.id).first()
+    if not ai_row:
+        ai_row = models.AIAnalysis(complaint_id=complaint.id)
+        db.add(ai_row)
+    ai_row.original_text = combined_text
+    ai_row.detected_category = analysis["category"]
+    ai_row.confidence_score = confidence
+    ai_row.sentiment_label = _sentiment_label(analysis["sentiment_score"])
+
+    # Timeline: internal marker (unique per complaint/status, so retries don't duplicate it)
+    already_logged = db.query(models.GrievanceTimeline).filter(
+        models.GrievanceTimeline.complaint_id == complaint.id,
+        models.GrievanceTimeline.status == "AI_CLASSIFIED"
+    ).first()
+    if not already_logged:
+        db.add(models.GrievanceTimeline(
+            complaint_id=complaint.id,
+            status="AI_CLASSIFIED",
+            updated_by="SYSTEM",
+            remarks=f"AI classified as {analysis['category']} / {complaint.priority} priority "
+                    f"(confidence {confidence:.2f})",
+            is_public_visible=False
+        ))
+
+    db.commit()
+
+    print(f"[OK] Complaint #{complaint.id} enriched:")
+    print(f"   Priority: {complaint.priority}")
+    print(f"   Category: {analysis['category']}")
+    print(f"   Department: {analysis.get('department_full_name', 'N/A')}")
+    print(f"   Confidence: {confidence:.2f}")
+
+    # 4. Automatic Officer Assignment (idempotent: skips already-assigned complaints,
+    #    including ones that joined an incident's officer above)
+    if complaint.department_id and not complaint.assigned_officer_id:
+        assign_to_best_officer(db, complaint.id, complaint.department_id)
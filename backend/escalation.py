@@ -0,0 +1,337 @@
+"""
+Tiered SLA escalation (utils/escalation_policy.py): officer warning at 80%
+of the SLA, department head at breach, admin queue at 2x.
+
+SLA hours and thresholds come from the escalation_policies table (cached
+like the department registry, dropped when a policy change commits) and
+are stored on the complaint when it is assigned (apply_sla). A worker
+thread runs the tiers every ESCALATION_INTERVAL_SECONDS. Each tier is a
+batched stage: one UPDATE ... WHERE id IN (SELECT ... LIMIT n) RETURNING
+moves up to ESCALATION_BATCH due complaints to the tier (guarded by the
+level, so concurrent workers never escalate a complaint twice), then the
+history rows and outbox notifications of the whole batch are inserted at
+once and committed with it. deliver_outbox sends them afterwards.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .summaries import CLOSED_STATUSES
+from .utils import commit_hooks
+from .utils.escalation_policy import (
+    ADMIN, DEPT_HEAD, NEXT_COLUMN, TIER_COLUMNS, TIER_NAMES, TIERS, WARN,
+    PolicyTable, TierMetrics, pick_head, sla_window
+)
+
+logger = logging.getLogger(__name__)
+
+ADMIN_QUEUE = "ADMIN_QUEUE"  # outbox recipient of the admin tier
+
+_policies = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+metrics = {tier: TierMetrics() for tier in TIERS}
+delivery = TierMetrics()  # outbox delivery (escalated = notifications sent)
+
+
+# ============ POLICIES ============
+
+def get_policies(db: Session) -> PolicyTable:
+    """The policy table; (re)loaded when missing, invalidated or older than ESCALATION_POLICY_TTL_SECONDS."""
+    global _policies, _loaded_at
+    ttl = settings.ESCALATION_POLICY_TTL_SECONDS
+    policies = _policies
+    if policies is not None and time.monotonic() - _loaded_at < ttl:
+        return policies
+    with _lock:
+        if _policies is None or time.monotonic() - _loaded_at >= ttl:
+            from .utils.assignment_logic import SLA_HOURS
+            rows = db.query(
+                models.EscalationPolicy.department_id, models.EscalationPolicy.priority,
+                models.EscalationPolicy.sla_hours, models.EscalationPolicy.warn_pct,
+                models.EscalationPolicy.admin_multiple
+            ).all()
+            _policies = PolicyTable(rows, SLA_HOURS)
+            _loaded_at = time.monotonic()
+        return _policies
+
+
+def invalidate():
+    global _policies
+    with _lock:
+        _policies = None
+
+
+def apply_sla(db: Session, complaint: models.Complaint, start: datetime = None) -> dict:
+    """Sets the complaint's SLA deadline and escalation thresholds from its policy (assignment / reassignment)."""
+    window = sla_window(get_policies(db).lookup(complaint.department_id, complaint.priority), start)
+    for column, value in window.items():
+        setattr(complaint, column, value)
+    return window
+
+
+def _collect(session) -> list:
+    return [obj for obj in (*session.new, *session.dirty, *session.deleted) if isinstance(obj, models.EscalationPolicy)]
+
+
+def _apply(session, changed):
+    invalidate()
+
+
+commit_hooks.register(Session, "escalation_policies", _collect, _apply)
+
+
+# ============ TIERS ============
+
+def _due(table, tier: int, now: datetime):
+    """Complaints due for `tier`: next_escalation_at range (index), then the tier's own threshold."""
+    return (
+        table.c.next_escalation_at <= now,
+        table.c.escalation_level < tier,
+        table.c[TIER_COLUMNS[tier]] <= now,
+        table.c.is_archived == False,
+        table.c.status.notin_(CLOSED_STATUSES)
+    )
+
+
+def _recipients(db: Session) -> tuple:
+    """(officer id -> (name, email, designation), department id -> head officer id), one query."""
+    rows = db.query(
+        models.Officer.id, models.Officer.designation, models.Officer.department_id,
+        models.Officer.name, models.Officer.email
+    ).filter(models.Officer.status == "Active").all()
+    officers = {row[0]: (row[3], row[4], row[1]) for row in rows}
+    by_department = {}
+    for row in rows:
+        by_department.setdefault(row[2], []).append(row)
+    heads = {department_id: pick_head(members)[0] for department_id, members in by_department.items()}
+    return officers, heads
+
+
+def _notification(tier, row, officers, heads, now):
+    complaint_id, officer_id, department_id, title, priority, sla_hours, deadline = row
+    if tier == WARN:
+        to = officer_id
+        subject = f"SLA warning: complaint #{complaint_id} is due {deadline:%Y-%m-%d %H:%M} UTC"
+    elif tier == DEPT_HEAD:
+        to = heads.get(department_id)
+        subject = f"SLA breached: complaint #{complaint_id} ({priority}, {sla_hours}h) is overdue"
+    else:
+        to = None
+        subject = f"Escalated to admins: complaint #{complaint_id} is past twice its {sla_hours}h SLA"
+    email = officers.get(to, (None, None, None))[1]
+    handler = officers.get(officer_id, ("unassigned",))[0]
+    return {
+        "kind": TIER_NAMES[tier],
+        "complaint_id": complaint_id,
+        "recipient_officer_id": to,
+        "recipient": ADMIN_QUEUE if tier == ADMIN else email,
+        "subject": subject,
+        "body": f"{title}\nPriority: {priority}, SLA {sla_hours}h, deadline {deadline:%Y-%m-%d %H:%M} UTC\nAssigned to: {handler}",
+        "dedupe_key": f"sla:{complaint_id}:{tier}:{deadline:%Y%m%d%H%M%S}",
+        "status": "PENDING",
+        "attempts": 0,
+        "created_at": now
+    }
+
+
+def run_tier(db: Session, tier: int, now: datetime = None, recipients: tuple = None) -> int:
+    """Escalates every complaint due for `tier`, one committed batch of ESCALATION_BATCH at a time."""
+    table = models.Complaint.__table__
+    now = now or datetime.utcnow()
+    batch = settings.ESCALATION_BATCH
+    officers, heads = recipients or _recipients(db)
+    next_column = NEXT_COLUMN[tier]
+    returning = (table.c.id, table.c.assigned_officer_id, table.c.department_id, table.c.title,
+                 table.c.priority, table.c.sla_hours, table.c.sla_deadline)
+    total = 0
+    while True:
+        start = time.perf_counter()
+        due = select(table.c.id).where(*_due(table, tier, now)).limit(batch)
+        stmt = update(table).where(table.c.id.in_(due.scalar_subquery()), *_due(table, tier, now)).values(
+            escalation_level=tier,
+            next_escalation_at=table.c[next_column] if next_column else None
+        )
+        if db.get_bind().dialect.update_returning:
+            rows = db.execute(stmt.returning(*returning)).all()
+        else:
+            ids = list(db.execute(due).scalars())
+            rows = db.execute(select(*returning).where(table.c.id.in_(ids), *_due(table, tier, now))).all()
+            result = db.execute(update(table).where(table.c.id.in_([r[0] for r in rows]), *_due(table, tier, now)).values(
+                escalation_level=tier,
+                next_escalation_at=table.c[next_column] if next_column else None
+            ))
+            if result.rowcount != len(rows):
+                # Another worker escalated some of them since our read: re-read from its committed state
+                db.rollback()
+                continue
+        if not rows:
+            db.rollback()
+            return total
+
+        notifications = [_notification(tier, row, officers, heads, now) for row in rows]
+        db.execute(insert(models.NotificationOutbox.__table__), notifications)
+        db.execute(insert(models.ComplaintHistory.__table__), [
+            {"complaint_id": n["complaint_id"], "action": f"SLA escalation: {n['subject']}", "performed_by": "SYSTEM", "timestamp": now}
+            for n in notifications
+        ])
+        db.commit()
+        total += len(rows)
+        metrics[tier].record(len(rows), len(notifications), time.perf_counter() - start)
+        if len(rows) < batch:
+            return total
+
+
+def clear_closed(db: Session, now: datetime = None) -> int:
+    """Closed / archived complaints leave the next_escalation_at range once they come due."""
+    table = models.Complaint.__table__
+    now = now or datetime.utcnow()
+    result = db.execute(update(table).where(
+        table.c.next_escalation_at <= now,
+        (table.c.is_archived == True) | table.c.status.in_(CLOSED_STATUSES)
+    ).values(next_escalation_at=None))
+    db.commit()
+    return result.rowcount
+
+
+def run_pipeline(db: Session, now: datetime = None) -> dict:
+    """All tiers, highest first (a complaint already past 2x only reaches the admin queue). Tier name -> escalated."""
+    now = now or datetime.utcnow()
+    clear_closed(db, now)
+    recipients = _recipients(db)
+    return {TIER_NAMES[tier]: run_tier(db, tier, now, recipients) for tier in (ADMIN, DEPT_HEAD, WARN)}
+
+
+def report(db: Session, now: datetime = None, limit: int = 50) -> dict:
+    """Dry run: what run_pipeline would escalate now, per tier and department. Nothing is written."""
+    table = models.Complaint.__table__
+    now = now or datetime.utcnow()
+    tiers = {}
+    claimed = set()
+    for tier in (ADMIN, DEPT_HEAD, WARN):
+        rows = db.execute(select(table.c.id, table.c.department_id, table.c.assigned_officer_id).where(
+            *_due(table, tier, now)
+        ).order_by(table.c[TIER_COLUMNS[tier]])).all()
+        rows = [r for r in rows if r[0] not in claimed]  # taken by a higher tier first
+        claimed.update(r[0] for r in rows)
+        by_department = {}
+        for _, department_id, _ in rows:
+            by_department[department_id] = by_department.get(department_id, 0) + 1
+        tiers[TIER_NAMES[tier]] = {
+            "count": len(rows),
+            "by_department": [{"department_id": d, "count": c} for d, c in sorted(by_department.items(), key=lambda x: -x[1])],
+            "complaint_ids": [r[0] for r in rows[:limit]]
+        }
+    return {"as_of": now, "dry_run": True, "tiers": tiers, "pending_notifications": pending_notifications(db)}
+
+
+def metrics_report() -> dict:
+    return {
+        "tiers": {TIER_NAMES[tier]: metrics[tier].to_dict() for tier in TIERS},
+        "delivery": delivery.to_dict(),
+        "worker_running": _worker is not None
+    }
+
+
+# ============ OUTBOX DELIVERY ============
+
+def pending_notifications(db: Session) -> int:
+    return db.query(func.count(models.NotificationOutbox.id)).filter(models.NotificationOutbox.status == "PENDING").scalar()
+
+
+def send(notification: models.NotificationOutbox):
+    """Delivery hook. No mail / SMS provider is configured yet: logs the notification."""
+    print(f"📨 [{notification.kind}] to {notification.recipient or 'officer #' + str(notification.recipient_officer_id)}: {notification.subject}")
+
+
+def deliver_outbox(db: Session, limit: int = None) -> int:
+    """Sends up to `limit` pending notifications (claimed with SKIP LOCKED on Postgres). Returns how many were sent."""
+    limit = limit or settings.OUTBOX_DELIVERY_BATCH
+    start = time.perf_counter()
+    pending = db.query(models.NotificationOutbox).filter(
+        models.NotificationOutbox.status == "PENDING"
+    ).order_by(models.NotificationOutbox.id).limit(limit).with_for_update(skip_locked=True).all()
+    sent = 0
+    for notification in pending:
+        notification.attempts = (notification.attempts or 0) + 1
+        try:
+            send(notification)
+            notification.status = "SENT"
+            notification.sent_at = datetime.utcnow()
+            sent += 1
+        except Exception as e:
+            notification.last_error = str(e)
+            if notification.attempts >= 5:
+                notification.status = "FAILED"
+    db.commit()
+    if pending:
+        delivery.record(sent, len(pending), time.perf_counter() - start)
+    return sent
+
+
+# ============ WORKER THREAD ============
+
+class EscalationWorker:
+    """Daemon thread: run_pipeline + outbox delivery every `interval` seconds."""
+
+    def __init__(self, session_factory, interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="sla-escalation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            db = self.session_factory()
+            try:
+                escalated = run_pipeline(db)
+                if any(escalated.values()):
+                    logger.info(f"SLA escalation: {escalated}")
+                while deliver_outbox(db) and not self._stop.is_set():
+                    pass
+            except Exception as e:
+                db.rollback()
+                logger.error(f"SLA escalation failed: {e}")
+            finally:
+                db.close()
+
+
+_worker = None
+
+
+def start(session_factory=None, interval: float = None):
+    """Starts the escalation worker (startup)."""
+    global _worker
+    from .database import SessionLocal
+    session_factory = session_factory or SessionLocal
+    interval = interval if interval is not None else settings.ESCALATION_INTERVAL_SECONDS
+    if _worker is None and interval:
+        _worker = EscalationWorker(session_factory, interval)
+        _worker.start()
+    return _worker
+
+
+def stop():
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
@@ -0,0 +1,186 @@
+"""
+Incident clusters: many citizens reporting the same issue.
+
+When a transformer blows, dozens of near-identical complaints arrive from
+one ward. During enrichment each complaint is embedded (utils/vector_index.py)
+and compared with the recent complaints of its department + ward. Above
+INCIDENT_SIMILARITY it joins the matched complaint's Incident (created on the
+first match) and goes to the officer already handling it (with its own SLA,
+like any assignment), instead of being load-balanced as a new assignment.
+
+The vector index is per process and rebuilt from the DB: it follows the
+ComplaintSignature id cursor (a signature is recorded once enrichment has
+fixed the department), like the near-duplicate index in ai_trust.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .summaries import CLOSED_STATUSES
+from .utils import vector_index
+from .utils.assignment_logic import assign_officer
+from .utils.minhash import ward_key
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _window_start() -> datetime:
+    return datetime.utcnow() - timedelta(hours=settings.INCIDENT_WINDOW_HOURS)
+
+
+def get_incident_index(db: Session) -> vector_index.IncidentVectorIndex:
+    """Process-wide index, first caught up with complaints enriched since the last call."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = vector_index.IncidentVectorIndex(settings.INCIDENT_INDEX_DIR or None)
+        _sync(db, _index)
+    return _index
+
+
+def _sync(db: Session, index: vector_index.IncidentVectorIndex, batch_size: int = 5000):
+    # Complaints that left the window are never matched again: drop them from the index
+    dropped = index.evict_before(_window_start())
+    if dropped:
+        print(f"[Incidents] Evicted {dropped} complaints older than {settings.INCIDENT_WINDOW_HOURS}h from the vector index")
+    query = db.query(
+        models.ComplaintSignature.id, models.Complaint.id.label("complaint_id"), models.Complaint.title,
+        models.Complaint.description, models.Complaint.department_id, models.Complaint.location,
+        models.Complaint.created_at
+    ).join(models.Complaint, models.Complaint.id == models.ComplaintSignature.complaint_id).filter(
+        models.Complaint.created_at >= _window_start()
+    )
+    while True:
+        rows = query.filter(models.ComplaintSignature.id > index.last_row_id).order_by(
+            models.ComplaintSignature.id
+        ).limit(batch_size).all()
+        if not rows:
+            return
+        for row in rows:
+            vector = vector_index.embed(f"{row.title} {row.description}")
+            if vector is not None:
+                index.add(row.complaint_id, vector, row.department_id, row.location, row.created_at)
+        index.last_row_id = rows[-1].id
+
+
+def load_incident_index(db: Session) -> vector_index.IncidentVectorIndex:
+    """Startup: embeds the complaints of the last INCIDENT_WINDOW_HOURS."""
+    index = get_incident_index(db)
+    print(f"[Incidents] Vector index loaded: {len(index)} recent complaints")
+    return index
+
+
+def find_similar(db: Session, complaint: models.Complaint) -> list:
+    """[(complaint_id, cosine)] of recent complaints in the same department + ward, best first."""
+    vector = vector_index.embed(f"{complaint.title} {complaint.description}")
+    if vector is None:
+        return []
+    try:
+        index = get_incident_index(db)
+    except Exception as e:
+        print(f"[Incidents] Index unavailable, skipping incident check: {e}")
+        return []
+    return index.query(
+        vector, complaint.department_id, complaint.location, exclude_id=complaint.id,
+        since=_window_start(), k=settings.INCIDENT_TOP_K,
+        min_score=settings.INCIDENT_SIMILARITY
+    )
+
+
+def attach_to_incident(db: Session, complaint: models.Complaint):
+    """
+    Links the complaint to the incident of its most similar open complaint
+    (caller commits). Returns the Incident, or None when nothing matched.
+    Idempotent: an already linked complaint is left as is.
+    """
+    if complaint.incident_id:
+        return complaint.incident
+    for match_id, score in find_similar(db, complaint):
+        match = db.query(models.Complaint).filter(models.Complaint.id == match_id).first()
+        if not match or match.is_archived or match.status in CLOSED_STATUSES:
+            continue
+
+        incident = match.incident
+        if incident is None:
+            incident = models.Incident(
+                department_id=match.department_id,
+                ward=ward_key(match.location),
+                title=match.title,
+                lead_complaint_id=match.id,
+                complaint_count=1,
+                first_reported_at=match.created_at,
+                last_reported_at=match.created_at
+            )
+            db.add(incident)
+            db.flush()
+            match.incident_id = incident.id
+
+        complaint.incident_id = incident.id
+        incident.complaint_count = (incident.complaint_count or 1) + 1
+        incident.last_reported_at = complaint.created_at or datetime.utcnow()
+
+        # Same officer as the report it duplicates; no new load-balanced assignment
+        if match.assigned_officer_id and not complaint.assigned_officer_id:
+            complaint.assigned_by_admin_id = None  # System assignment
+            assign_officer(db, complaint, match.assigned_officer_id)
+            db.add(models.ComplaintHistory(
+                complaint_id=complaint.id,
+                action=f"Assigned to officer #{match.assigned_officer_id} with incident #{incident.id} - SLA: {complaint.sla_hours}h",
+                performed_by="SYSTEM"
+            ))
+
+        db.add(models.GrievanceTimeline(
+            complaint_id=complaint.id,
+            status="INCIDENT_LINKED",
+            updated_by="SYSTEM",
+            remarks=f"Linked to incident #{incident.id}: similar to complaint #{match.id} (similarity {score:.2f})"
+        ))
+        print(f"[Incidents] Complaint #{complaint.id} linked to incident #{incident.id} via #{match.id} ({score:.2f})")
+        return incident
+    return None
+
+
+def incident_summary(incident: models.Incident, members: list) -> dict:
+    open_members = [c for c in members if c.status not in CLOSED_STATUSES and not c.is_archived]
+    return {
+        "id": incident.id,
+        "title": incident.title,
+        "department_id": incident.department_id,
+        "department": incident.department.name if incident.department else None,
+        "ward": incident.ward,
+        "lead_complaint_id": incident.lead_complaint_id,
+        "complaint_count": incident.complaint_count,
+        "open_count": len(open_members),
+        "status": "OPEN" if open_members else "CLOSED",
+        "officer_ids": sorted({c.assigned_officer_id for c in members if c.assigned_officer_id}),
+        "first_reported_at": incident.first_reported_at,
+        "last_reported_at": incident.last_reported_at,
+        "complaint_ids": [c.id for c in members],
+    }
+
+
+def list_incidents(db: Session, department_id: int = None, status: str = None, skip: int = 0, limit: int = 50) -> list:
+    """Incidents by most recent report, with their member complaints (one query for all members)."""
+    query = db.query(models.Incident)
+    if department_id:
+        query = query.filter(models.Incident.department_id == department_id)
+    if status:
+        with_open_members = db.query(models.Complaint.incident_id).filter(
+            models.Complaint.incident_id.isnot(None),
+            models.Complaint.status.notin_(CLOSED_STATUSES),
+            models.Complaint.is_archived == False
+        )
+        is_open = models.Incident.id.in_(with_open_members)
+        query = query.filter(is_open if status.upper() == "OPEN" else ~is_open)
+    incidents = query.order_by(models.Incident.last_reported_at.desc()).offset(skip).limit(limit).all()
+    members = {}
+    if incidents:
+        for complaint in db.query(models.Complaint).filter(
+            models.Complaint.incident_id.in_([i.id for i in incidents])
+        ).order_by(models.Complaint.created_at).all():
+            members.setdefault(complaint.incident_id, []).append(complaint)
+    return [incident_summary(i, members.get(i.id, [])) for i in incidents]
@@ -0,0 +1,246 @@
+"""
+Durable DB-backed job queue with an in-process worker pool.
+
+Producers call enqueue() inside their own transaction (so the job commits
+atomically with the rows it refers to) and notify() after commit.
+Workers claim jobs with a compare-and-set UPDATE, run the registered handler
+in a fresh session, and retry failures with exponential backoff.
+"""
+import json
+import logging
+import random
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+# A RUNNING job whose lease is older than this is assumed orphaned (worker crashed) and reclaimed
+LEASE_SECONDS = 300
+MAX_BACKOFF_SECONDS = 300
+
+JOB_HANDLERS = {}
+
+
+def register_handler(job_type: str):
+    """
+    Decorator: registers `fn(db, job)` as the handler for `job_type`.
+    The handler may commit; raising marks the attempt as failed.
+    """
+    def decorator(fn):
+        JOB_HANDLERS[job_type] = fn
+        return fn
+    return decorator
+
+
+def enqueue(db: Session, job_type: str, idempotency_key: str, complaint_id: int = None,
+            payload: dict = None, max_attempts: int = 5, delay_seconds: float = 0) -> models.BackgroundJob:
+    """
+    Adds a job to the session (caller commits). If a job with the same
+    idempotency key already exists, that job is returned instead.
+    """
+    existing = db.query(models.BackgroundJob).filter(
+        models.BackgroundJob.idempotency_key == idempotency_key
+    ).first()
+    if existing:
+        return existing
+
+    job = models.BackgroundJob(
+        job_type=job_type,
+        idempotency_key=idempotency_key,
+        complaint_id=complaint_id,
+        payload=json.dumps(payload) if payload else None,
+        status=PENDING,
+        attempts=0,
+        max_attempts=max_attempts,
+        available_at=datetime.utcnow() + timedelta(seconds=delay_seconds)
+    )
+    db.add(job)
+    return job
+
+
+def job_payload(job: models.BackgroundJob) -> dict:
+    return json.loads(job.payload) if job.payload else {}
+
+
+def claim_next(db: Session, worker_id: str, job_types=None):
+    """
+    Claims the oldest runnable job. Returns the job id, or None if the queue is empty.
+    Safe across threads and processes: the UPDATE only succeeds if the row
+    is still in the state we read.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=LEASE_SECONDS)
+    Job = models.BackgroundJob
+
+    query = db.query(Job.id, Job.status, Job.attempts).filter(
+        or_(
+            and_(Job.status == PENDING, Job.available_at <= now),
+            and_(Job.status == RUNNING, Job.locked_at < stale_before)
+        )
+    )
+    if job_types:
+        query = query.filter(Job.job_type.in_(job_types))
+    candidates = query.order_by(Job.available_at).limit(5).all()
+
+    for job_id, status, attempts in candidates:
+        updated = db.query(Job).filter(
+            Job.id == job_id,
+            Job.status == status,
+            Job.attempts == attempts
+        ).update({
+            Job.status: RUNNING,
+            Job.attempts: attempts + 1,
+            Job.locked_at: now,
+            Job.locked_by: worker_id,
+            Job.updated_at: now
+        }, synchronize_session=False)
+        db.commit()
+        if updated == 1:
+            return job_id
+    return None
+
+
+def run_job(session_factory, job_id: int):
+    """
+    Executes one claimed job in its own session and records the outcome.
+    """
+    db = session_factory()
+    try:
+        job = db.query(models.BackgroundJob).filter(models.BackgroundJob.id == job_id).first()
+        if not job:
+            return
+        handler = JOB_HANDLERS.get(job.job_type)
+        try:
+            if not handler:
+                raise RuntimeError(f"No handler registered for job type '{job.job_type}'")
+            handler(db, job)
+            db.refresh(job)
+            job.status = DONE
+            job.last_error = None
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            logger.info(f"Job #{job_id} ({job.job_type}) done after {job.attempts} attempt(s)")
+        except Exception as e:
+            db.rollback()
+            job = db.query(models.BackgroundJob).filter(models.BackgroundJob.id == job_id).first()
+            job.last_error = str(e)[:2000]
+            if job.attempts >= job.max_attempts:
+                job.status = FAILED
+                job.finished_at = datetime.utcnow()
+                logger.error(f"Job #{job_id} ({job.job_type}) failed permanently: {e}")
+            else:
+                backoff = min(MAX_BACKOFF_SECONDS, 2 ** job.attempts) * (0.5 + random.random())
+                job.status = PENDING
+                job.available_at = datetime.utcnow() + timedelta(seconds=backoff)
+                logger.warning(f"Job #{job_id} ({job.job_type}) attempt {job.attempts} failed: {e}. Retrying in {backoff:.1f}s")
+            db.commit()
+    finally:
+        db.close()
+
+
+class WorkerPool:
+    """
+    Fixed pool of daemon threads draining the job queue.
+    """
+
+    def __init__(self, session_factory, size: int = 2, poll_interval: float = 1.0, job_types=None):
+        self.session_factory = session_factory
+        self.size = size
+        self.poll_interval = poll_interval
+        self.job_types = job_types
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        host = socket.gethostname()
+        for i in range(self.size):
+            worker_id = f"{host}:{id(self)}:{i}"
+            t = threading.Thread(target=self._loop, args=(worker_id,), name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"Started {self.size} job worker(s)")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Wake idle workers immediately (called after a producer commits)."""
+        self._wake.set()
+
+    def _loop(self, worker_id: str):
+        while not self._stop.is_set():
+            job_id = None
+            db = self.session_factory()
+            try:
+                job_id = claim_next(db, worker_id, self.job_types)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Job claim failed: {e}")
+            finally:
+                db.close()
+
+            if job_id is not None:
+                run_job(self.session_factory, job_id)
+                continue
+
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+_pool = None
+
+
+def start_workers(size: int = None):
+    """Starts the process-wide worker pool (idempotent)."""
+    global _pool
+    from .database import SessionLocal
+    if size is None:
+        from .config import settings
+        size = settings.JOB_WORKERS
+    if _pool is None:
+        _pool = WorkerPool(SessionLocal, size=size)
+    _pool.start()
+    return _pool
+
+
+def stop_workers():
+    if _pool is not None:
+        _pool.stop()
+
+
+def notify():
+    if _pool is not None:
+        _pool.notify()
+
+
+def job_status(job: models.BackgroundJob) -> dict:
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "last_error": job.last_error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at
+    }
@@ -0,0 +1,345 @@
+"""
+Single Gemini provider shared by every LLM call site.
+
+The SDK is configured and the GenerativeModel built once per process, so the
+underlying HTTP/gRPC connection is reused. Model name, timeout and retry
+policy come from Settings; every call records latency and token usage per
+call site for monitoring (GET /helper/llm/stats).
+"""
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+TOKEN_BUCKETS = [100, 250, 500, 1000, 2000, 4000, 8000]
+
+
+class LLMNotConfigured(Exception):
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling Gemini while the breaker is open."""
+    pass
+
+
+class LLMBudgetExceeded(Exception):
+    """Hedged call did not answer within its latency budget (a started call keeps running in the background)."""
+    pass
+
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures (calls slower than
+    `slow_call_seconds` count as failures). While open every call is rejected;
+    after `open_seconds` up to `half_open_max_calls` trial calls are let through.
+    A successful trial closes the breaker, a failed one re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, slow_call_seconds: float = 5.0,
+                 open_seconds: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_calls = 0
+        self.trips = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at >= self.open_seconds:
+                    self.state = HALF_OPEN
+                    self.trial_calls = 0
+                else:
+                    self.rejected += 1
+                    raise CircuitOpenError("LLM circuit breaker is open")
+            if self.state == HALF_OPEN:
+                if self.trial_calls >= self.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError("LLM circuit breaker is half-open (trial in progress)")
+                self.trial_calls += 1
+
+    def record(self, duration: float, success: bool):
+        with self._lock:
+            failed = not success or duration > self.slow_call_seconds
+            if not failed:
+                self.consecutive_failures = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    logger.info("[LLM] Circuit breaker closed (trial call succeeded)")
+                return
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._trip()
+
+    def _trip(self):
+        if self.state != OPEN:
+            self.trips += 1
+            logger.warning(f"[LLM] Circuit breaker OPEN after {self.consecutive_failures} failure(s)/slow call(s)")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "trips": self.trips,
+                "rejected_calls": self.rejected,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "slow_call_seconds": self.slow_call_seconds,
+                "open_seconds": self.open_seconds,
+                "seconds_until_half_open": (
+                    max(0.0, round(self.open_seconds - (time.monotonic() - self.opened_at), 1))
+                    if self.state == OPEN else None
+                )
+            }
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0,
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class CallSiteMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedged = 0  # Calls that missed their latency budget
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.output_tokens = Histogram(TOKEN_BUCKETS)
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "latency_ms": self.latency_ms.to_dict(),
+            "prompt_tokens": self.prompt_tokens.to_dict(),
+            "output_tokens": self.output_tokens.to_dict()
+        }
+
+
+def _is_transient(error: Exception) -> bool:
+    """Rate limits, timeouts and 5xx are worth retrying; bad keys/prompts are not."""
+    try:
+        from google.api_core import exceptions as gexc
+        transient = (gexc.ResourceExhausted, gexc.ServiceUnavailable, gexc.DeadlineExceeded,
+                     gexc.InternalServerError, gexc.TooManyRequests, gexc.GatewayTimeout)
+        if isinstance(error, transient):
+            return True
+    except ImportError:
+        pass
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+class LLMProvider:
+    def __init__(self, api_key: str, model_name: str, timeout: float = 30.0,
+                 max_retries: int = 2, retry_base_seconds: float = 0.5, breaker: CircuitBreaker = None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+        self._genai = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+
+    def is_configured(self) -> bool:
+        key = self.api_key
+        return bool(key) and not (key.startswith("AIzaSyCX") and len(key) < 25)
+
+    def _client(self):
+        """Configures the SDK and builds the model once."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if not self.is_configured():
+                        raise LLMNotConfigured("Gemini API key is missing or a placeholder")
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._genai = genai
+                    self._model = genai.GenerativeModel(self.model_name)
+                    logger.info(f"LLM provider ready: {self.model_name}")
+        return self._genai, self._model
+
+    def _site(self, call_site: str) -> CallSiteMetrics:
+        with self._metrics_lock:
+            if call_site not in self._metrics:
+                self._metrics[call_site] = CallSiteMetrics()
+            return self._metrics[call_site]
+
+    def _with_retries(self, call_site: str, fn):
+        metrics = self._site(call_site)
+        attempt = 0
+        while True:
+            self.breaker.before_call()  # Raises CircuitOpenError while open
+            start = time.perf_counter()
+            try:
+                result = fn()
+                elapsed = time.perf_counter() - start
+                self.breaker.record(elapsed, success=True)
+                with self._metrics_lock:
+                    metrics.calls += 1
+                    metrics.latency_ms.observe(elapsed * 1000)
+                return result
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                self.breaker.record(elapsed, success=False)
+                with self._metrics_lock:
+                    metrics.calls += 1
+                    metrics.errors += 1
+                    metrics.latency_ms.observe(elapsed * 1000)
+                if attempt >= self.max_retries or not _is_transient(e):
+                    raise
+                # Full jitter: sleep uniformly in [0, base * 2^attempt]
+                delay = random.uniform(0, self.retry_base_seconds * (2 ** attempt))
+                attempt += 1
+                with self._metrics_lock:
+                    metrics.retries += 1
+                logger.warning(f"[LLM] {call_site} attempt {attempt} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def generate(self, contents, call_site: str = "default", timeout: float = None,
+                 budget_seconds: float = None, on_late_result=None) -> str:
+        """
+        Runs generate_content and returns the response text.
+        `contents` is a prompt string or a list of parts (e.g. [prompt, uploaded_file]).
+
+        Hedged mode: with `budget_seconds`, raises LLMBudgetExceeded if Gemini has not
+        answered in time so the caller can use its rule-based result. A call still
+        waiting for a pool worker is cancelled; one already running keeps going and
+        `on_late_result(text)` receives its answer (e.g. to warm a cache).
+        """
+        if budget_seconds is None:
+            return self._generate(contents, call_site, timeout)
+
+        future = self._hedge_pool.submit(self._generate, contents, call_site, timeout)
+        try:
+            return future.result(timeout=budget_seconds)
+        except FuturesTimeout:
+            metrics = self._site(call_site)
+            with self._metrics_lock:
+                metrics.hedged += 1
+            # Still queued behind slow calls: drop it rather than call Gemini later
+            if future.cancel():
+                raise LLMBudgetExceeded(f"{call_site} exceeded {budget_seconds * 1000:.0f}ms budget (not started)")
+            if on_late_result:
+                def deliver(f):
+                    if not f.cancelled() and f.exception() is None:
+                        try:
+                            on_late_result(f.result())
+                        except Exception as e:
+                            logger.warning(f"[LLM] Late result handler failed: {e}")
+                future.add_done_callback(deliver)
+            raise LLMBudgetExceeded(f"{call_site} exceeded {budget_seconds * 1000:.0f}ms budget")
+
+    def _generate(self, contents, call_site: str, timeout: float = None) -> str:
+        _, model = self._client()
+        response = self._with_retries(
+            call_site,
+            lambda: model.generate_content(contents, request_options={"timeout": timeout or self.timeout})
+        )
+        self._record_usage(call_site, response)
+        return response.text
+
+    def upload_file(self, source, mime_type: str, call_site: str = "upload"):
+        """`source` is a file path or a binary file object (e.g. io.BytesIO), rewound on retry."""
+        genai, _ = self._client()
+
+        def upload():
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return genai.upload_file(path=source, mime_type=mime_type)
+
+        return self._with_retries(call_site, upload)
+
+    def _record_usage(self, call_site: str, response):
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return
+        metrics = self._site(call_site)
+        with self._metrics_lock:
+            metrics.prompt_tokens.observe(getattr(usage, "prompt_token_count", 0) or 0)
+            metrics.output_tokens.observe(getattr(usage, "candidates_token_count", 0) or 0)
+
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            return {
+                "model": self.model_name,
+                "configured": self.is_configured(),
+                "timeout_seconds": self.timeout,
+                "max_retries": self.max_retries,
+                "circuit_breaker": self.breaker.stats(),
+                "call_sites": {site: m.to_dict() for site, m in self._metrics.items()}
+            }
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> LLMProvider:
+    """Process-wide provider built from Settings."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                from .config import settings
+                _provider = LLMProvider(
+                    api_key=settings.STT_API_KEY or settings.GEMINI_API_KEY,
+                    model_name=settings.GEMINI_MODEL,
+                    timeout=settings.LLM_TIMEOUT_SECONDS,
+                    max_retries=settings.LLM_MAX_RETRIES,
+                    retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+                    breaker=CircuitBreaker(
+                        failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+                        slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+                        open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+                        half_open_max_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS
+                    )
+                )
+    return _provider
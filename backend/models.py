@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, Float, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, Float, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.orm import relationship as sql_relationship
 from datetime import datetime
 from .database import Base
@@ -145,6 +145,10 @@ class Complaint(Base):
     sla_hours = Column(Integer, nullable=True)  # Based on priority: Critical=24, High=48, Medium=120, Low=168
     sla_deadline = Column(DateTime, nullable=True)  # assigned_at + sla_hours
     sla_breached = Column(Boolean, default=False)  # Auto-flagged when past deadline
+    sla_warn_at = Column(DateTime, nullable=True)  # Officer warning (policy warn_pct of the SLA)
+    sla_admin_at = Column(DateTime, nullable=True)  # Admin escalation queue (policy admin_multiple x SLA)
+    escalation_level = Column(Integer, default=0, server_default="0")  # 0 none, 1 officer warned, 2 department head, 3 admin queue
+    next_escalation_at = Column(DateTime, nullable=True)  # Threshold of the next tier, NULL when none is left (escalation.py)
     
     user_id = Column(Integer, ForeignKey("users.id"))
     owner = sql_relationship("User", back_populates="complaints")
@@ -154,10 +158,74 @@ class Complaint(Base):
     
     assigned_officer = sql_relationship("Officer", back_populates="assigned_complaints")
 
+    # Incident cluster: many citizens reporting the same issue (incidents.py)
+    incident_id = Column(Integer, ForeignKey("incidents.id"), nullable=True, index=True)
+    incident = sql_relationship("Incident", back_populates="complaints")
+
     ai_analysis = sql_relationship("AIAnalysis", back_populates="complaint", uselist=False)
     officer_ai_summary = sql_relationship("ComplaintAISummary", back_populates="complaint", uselist=False)
     history = sql_relationship("ComplaintHistory", back_populates="complaint")
 
+    # Optimistic locking: every ORM UPDATE is "... WHERE id = ? AND version = <read>" and bumps it
+    # (StaleDataError when another session changed the complaint first, see utils/optimistic.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # Officer load: COUNT(*) WHERE assigned_officer_id = ? AND status IN (...) GROUP BY officer
+        Index('idx_complaints_officer_status', 'assigned_officer_id', 'status'),
+        # SLA: WHERE sla_breached = 0 AND sla_deadline <= ? (sweeper catch-up, breached listings)
+        Index('idx_complaints_sla_breached_deadline', 'sla_breached', 'sla_deadline'),
+        # Escalation tiers: WHERE next_escalation_at <= ? (only complaints due for a tier)
+        Index('idx_complaints_next_escalation', 'next_escalation_at'),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+class EscalationPolicy(Base):
+    """
+    SLA hours and escalation thresholds per department and priority
+    (utils/escalation_policy.py). NULL department / priority = any.
+    """
+    __tablename__ = "escalation_policies"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    priority = Column(String, nullable=True)  # Critical, High, Medium, Low
+    sla_hours = Column(Integer, nullable=False)
+    warn_pct = Column(Float, default=0.8)  # Officer warning at this share of the SLA
+    admin_multiple = Column(Float, default=2.0)  # Admin queue at this multiple of the SLA
+    updated_by = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('department_id', 'priority', name='uq_escalation_policy_department_priority'),
+    )
+
+class NotificationOutbox(Base):
+    """
+    Notifications waiting for delivery (escalation.py). Written in the same
+    transaction as the change they announce, delivered afterwards.
+    """
+    __tablename__ = "notification_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String)  # officer_warning, department_head, admin_queue
+    complaint_id = Column(Integer, ForeignKey("complaints.id"), nullable=True)
+    recipient_officer_id = Column(Integer, ForeignKey("officers.id"), nullable=True)  # NULL = admins
+    recipient = Column(String, nullable=True)  # Email, or ADMIN_QUEUE
+    subject = Column(String)
+    body = Column(Text)
+    dedupe_key = Column(String, unique=True)  # complaint + tier + deadline
+    status = Column(String, default="PENDING")  # PENDING, SENT, FAILED
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Delivery: WHERE status = 'PENDING' ORDER BY id
+        Index('idx_outbox_status_id', 'status', 'id'),
+    )
+
 class ComplaintHistory(Base):
     __tablename__ = "complaint_history"
     
@@ -240,3 +308,68 @@ class GrievanceTimeline(Base):
 
 # Add relationship to Complaint model
 Complaint.timeline = sql_relationship("GrievanceTimeline", back_populates="complaint", order_by="GrievanceTimeline.timestamp")
+
+class BackgroundJob(Base):
+    """
+    Durable DB-backed job queue (AI enrichment and other deferred work).
+    Workers claim rows with a compare-and-set on status; failed jobs are retried with backoff.
+    """
+    __tablename__ = "background_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, index=True)  # e.g. "complaint_enrichment"
+    idempotency_key = Column(String, unique=True, index=True)  # One job per key, re-enqueues are no-ops
+    complaint_id = Column(Integer, ForeignKey("complaints.id"), nullable=True, index=True)
+    payload = Column(Text, nullable=True)  # JSON
+    
+    status = Column(String, default="PENDING")  # PENDING, RUNNING, DONE, FAILED
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=5)
+    last_error = Column(Text, nullable=True)
+    
+    available_at = Column(DateTime, default=datetime.utcnow)  # Retry backoff: not claimable before this
+    locked_at = Column(DateTime, nullable=True)  # Lease start; stale RUNNING jobs are reclaimed
+    locked_by = Column(String, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Claim query: WHERE status = ? AND available_at <= ? ORDER BY available_at
+        Index('idx_jobs_status_available', 'status', 'available_at'),
+    )
+
+
+class ComplaintSignature(Base):
+    """
+    MinHash signature of a complaint description (utils/minhash.py, 128 bytes).
+    Loaded into the in-memory LSH index at startup for near-duplicate detection (ai_trust).
+    """
+    __tablename__ = "complaint_signatures"
+    
+    id = Column(Integer, primary_key=True, index=True)  # Insertion order: index catch-up cursor
+    complaint_id = Column(Integer, ForeignKey("complaints.id"), unique=True, index=True)
+    signature = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Incident(Base):
+    """
+    One real-world issue reported by several citizens (e.g. a blown transformer).
+    Similar complaints in the same department + ward are linked to it during
+    enrichment and share the officer already handling it (incidents.py).
+    """
+    __tablename__ = "incidents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True, index=True)
+    ward = Column(String, nullable=True)  # utils.minhash.ward_key(location)
+    title = Column(String)  # Title of the first complaint
+    lead_complaint_id = Column(Integer)  # First report
+    complaint_count = Column(Integer, default=1)
+    first_reported_at = Column(DateTime, default=datetime.utcnow)
+    last_reported_at = Column(DateTime, default=datetime.utcnow)
+    
+    department = sql_relationship("Department")
+    complaints = sql_relationship("Complaint", back_populates="incident")
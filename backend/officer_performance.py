@@ -0,0 +1,186 @@
+"""
+Officer performance analytics (GET /admin/analytics/officer-performance,
+GET /admin/officers/{id}/performance) in one grouped query.
+
+One statement returns every officer's assigned, resolved and breached
+counts with the average and p90 resolution hours: officers LEFT JOIN two
+derived tables grouped by officer, one for the counts and average and one
+ranking each officer's resolution times with window functions (p90 by
+linear interpolation, like Postgres percentile_cont). Filtering by
+department, sorting and pagination happen in the same statement. Results
+are cached for OFFICER_PERFORMANCE_CACHE_SECONDS per set of parameters.
+Dialects without a duration expression (dashboard_stats.duration_seconds)
+get the counts from the statement and the times from the two timestamp
+columns, read in Python.
+"""
+import threading
+import time
+
+from sqlalchemy import and_, case, cast, func, Integer, literal, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .dashboard_stats import duration_seconds
+
+# Same status groups as the per-officer queries this replaced: the average
+# has always counted only RESOLVED / Closed by Citizen
+RESOLVED_STATUSES = ["RESOLVED", "Closed by Citizen", "Action Completed"]
+TIMED_STATUSES = ["RESOLVED", "Closed by Citizen"]
+PERCENTILE = 0.9
+
+SORT_KEYS = ("officer_id", "officer_name", "assigned_count", "resolved_count",
+             "sla_breach_count", "avg_resolution_hours", "p90_resolution_hours")
+TIME_KEYS = ("avg_resolution_hours", "p90_resolution_hours")
+MAX_CACHED = 256
+
+_cache = {}  # parameters -> (expires at, rows)
+_lock = threading.Lock()
+
+
+def performance_query(dialect_name: str, department_id: int = None, officer_id: int = None,
+                      sort: str = "officer_id", descending: bool = False, skip: int = 0, limit: int = None):
+    c = models.Complaint.__table__.c
+    o = models.Officer.__table__.c
+    seconds = duration_seconds(c.created_at, c.closed_at, dialect_name)
+    timed = and_(c.status.in_(TIMED_STATUSES), c.closed_at != None, c.created_at != None)
+
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    counts = select(
+        c.assigned_officer_id.label("officer_id"),
+        func.count().label("assigned"),
+        count_if(c.status.in_(RESOLVED_STATUSES)).label("resolved"),
+        count_if(c.sla_breached == True).label("breached"),
+        *([func.avg(case((timed, seconds / 3600.0))).label("avg_hours")] if seconds is not None else [])
+    ).where(c.assigned_officer_id != None).group_by(c.assigned_officer_id).subquery("counts")
+
+    columns = {
+        "officer_id": o.id,
+        "officer_name": o.name,
+        "assigned_count": func.coalesce(counts.c.assigned, 0),
+        "resolved_count": func.coalesce(counts.c.resolved, 0),
+        "sla_breach_count": func.coalesce(counts.c.breached, 0)
+    }
+    joined = models.Officer.__table__.outerjoin(counts, counts.c.officer_id == o.id)
+    if seconds is not None:
+        p90 = _p90_subquery(c, seconds / 3600.0, timed)
+        joined = joined.outerjoin(p90, p90.c.officer_id == o.id)
+        columns["avg_resolution_hours"] = func.coalesce(counts.c.avg_hours, literal(0.0))
+        columns["p90_resolution_hours"] = func.coalesce(p90.c.p90_hours, literal(0.0))
+    else:
+        # No duration expression: compute_performance fills the times in from Python
+        columns["avg_resolution_hours"] = columns["p90_resolution_hours"] = literal(0.0)
+
+    query = select(
+        *(column.label(name) for name, column in columns.items()),
+        o.designation, o.department_id
+    ).select_from(joined)
+    if department_id is not None:
+        query = query.where(o.department_id == department_id)
+    if officer_id is not None:
+        query = query.where(o.id == officer_id)
+    if seconds is None and sort in TIME_KEYS:
+        return query.order_by(o.id)  # sorted and paginated in Python
+    key = columns[sort]
+    query = query.order_by(key.desc() if descending else key.asc(), o.id)
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def _p90_subquery(c, hours, timed):
+    """Per officer p90 of `hours`: ranked with window functions, linear interpolation."""
+    ranked = select(
+        c.assigned_officer_id.label("officer_id"),
+        hours.label("hours"),
+        (func.row_number().over(partition_by=c.assigned_officer_id, order_by=hours) - 1).label("rank"),
+        func.count().over(partition_by=c.assigned_officer_id).label("n")
+    ).where(c.assigned_officer_id != None, timed).subquery("ranked")
+    position = PERCENTILE * (ranked.c.n - 1)
+    lower = cast(position, Integer)  # floor (position >= 0)
+    lower_value = func.max(case((ranked.c.rank == lower, ranked.c.hours)))
+    upper_value = func.max(case((ranked.c.rank == lower + 1, ranked.c.hours)))
+    fraction = func.max(position - lower)
+    return select(
+        ranked.c.officer_id,
+        (lower_value + (func.coalesce(upper_value, lower_value) - lower_value) * fraction).label("p90_hours")
+    ).group_by(ranked.c.officer_id).subquery("p90")
+
+
+def _percentile(values: list, fraction: float) -> float:
+    """Linear interpolation between the closest ranks of sorted `values` (as the SQL form)."""
+    position = fraction * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _times_in_python(db: Session, rows: list, sort: str = "officer_id", descending: bool = False,
+                     skip: int = 0, limit: int = None, **filters) -> list:
+    """Dialects without a duration expression: average / p90 from the two timestamp columns."""
+    hours = {row["officer_id"]: [] for row in rows}
+    for officer_id, created_at, closed_at in db.query(
+        models.Complaint.assigned_officer_id, models.Complaint.created_at, models.Complaint.closed_at
+    ).filter(
+        models.Complaint.assigned_officer_id != None,
+        models.Complaint.status.in_(TIMED_STATUSES),
+        models.Complaint.closed_at != None, models.Complaint.created_at != None
+    ).yield_per(10000):
+        if officer_id in hours:
+            hours[officer_id].append((closed_at - created_at).total_seconds() / 3600)
+    for row in rows:
+        values = sorted(hours[row["officer_id"]])
+        if values:
+            row["avg_resolution_hours"] = round(sum(values) / len(values), 1)
+            row["p90_resolution_hours"] = round(_percentile(values, PERCENTILE), 1)
+    if sort in TIME_KEYS:  # the query returned every officer by id
+        rows.sort(key=lambda row: row[sort], reverse=descending)
+        rows = rows[skip:skip + limit if limit is not None else None]
+    return rows
+
+
+def compute_performance(db: Session, **params) -> list:
+    """One dict per officer (OfficerPerformance fields), see performance_query for the parameters."""
+    dialect_name = db.get_bind().dialect.name
+    rows = db.execute(performance_query(dialect_name, **params)).mappings().all()
+    results = [
+        {
+            "officer_id": row["officer_id"],
+            "officer_name": row["officer_name"],
+            "designation": row["designation"],
+            "department_id": row["department_id"],
+            "assigned_count": row["assigned_count"],
+            "resolved_count": row["resolved_count"],
+            "avg_resolution_hours": round(float(row["avg_resolution_hours"]), 1),
+            "p90_resolution_hours": round(float(row["p90_resolution_hours"]), 1),
+            "sla_breach_count": row["sla_breach_count"]
+        }
+        for row in rows
+    ]
+    if duration_seconds(models.Complaint.created_at, models.Complaint.closed_at, dialect_name) is None:
+        results = _times_in_python(db, results, **params)
+    return results
+
+
+def get_performance(db: Session, **params) -> list:
+    """compute_performance, cached for OFFICER_PERFORMANCE_CACHE_SECONDS per set of parameters."""
+    ttl = settings.OFFICER_PERFORMANCE_CACHE_SECONDS
+    if ttl <= 0:
+        return compute_performance(db, **params)
+    key = tuple(sorted(params.items()))
+    cached = _cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    with _lock:
+        cached = _cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        rows = compute_performance(db, **params)
+        if len(_cache) >= MAX_CACHED:
+            _cache.clear()
+        _cache[key] = (time.monotonic() + ttl, rows)
+        return rows
@@ -5,6 +5,7 @@ from typing import List
 from datetime import datetime, timedelta
 from .. import models, database, schemas
 from ..utils import jwt_utils
+from ..utils.assignment_logic import assign_officer
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -64,14 +65,6 @@ def get_current_admin(request: Request, db: Session = Depends(database.get_db)):
     raise HTTPException(status_code=403, detail="Admin access required")
 
 
-# SLA Hours Mapping (India Govt Standard)
-SLA_HOURS = {
-    "Critical": 24,
-    "High": 48,
-    "Medium": 120,  # 5 days
-    "Low": 168  # 7 days
-}
-
 # ============ OFFICER MANAGEMENT ============
 
 @router.post("/officers", response_model=schemas.OfficerResponse)
@@ -214,107 +207,38 @@ def get_officer_performance(
     """
     Get officer performance metrics
     """
-    officer = db.query(models.Officer).filter(models.Officer.id == officer_id).first()
-    
-    if not officer:
-        raise HTTPException(status_code=404, detail="Officer not found")
-    
-    # Count assigned complaints
-    assigned_count = db.query(models.Complaint).filter(
-        models.Complaint.assigned_officer_id == officer_id
-    ).count()
-    
-    # Count resolved
-    resolved_count = db.query(models.Complaint).filter(
-        models.Complaint.assigned_officer_id == officer_id,
-        models.Complaint.status.in_(["RESOLVED", "Closed by Citizen", "Action Completed"])
-    ).count()
-    
-    # SLA breaches
-    sla_breach_count = db.query(models.Complaint).filter(
-        models.Complaint.assigned_officer_id == officer_id,
-        models.Complaint.sla_breached == True
-    ).count()
-    
-    # Average resolution time (simplified)
-    # Average resolution time
-    resolved_complaints = db.query(models.Complaint).filter(
-        models.Complaint.assigned_officer_id == officer_id,
-        models.Complaint.status.in_(["RESOLVED", "Closed by Citizen"]),
-        models.Complaint.closed_at != None
-    ).all()
+    from .. import officer_performance
 
-    total_hours = 0
-    count_with_time = 0
-    for c in resolved_complaints:
-        if c.created_at and c.closed_at:
-            diff = c.closed_at - c.created_at
-            total_hours += diff.total_seconds() / 3600
-            count_with_time += 1
-    
-    avg_hours = round(total_hours / count_with_time, 1) if count_with_time > 0 else 0
-    
-    return schemas.OfficerPerformance(
-        officer_id=officer.id,
-        officer_name=officer.name,
-        designation=officer.designation,
-        assigned_count=assigned_count,
-        resolved_count=resolved_count,
-        avg_resolution_hours=avg_hours,
-        sla_breach_count=sla_breach_count
-    )
+    rows = officer_performance.get_performance(db, officer_id=officer_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Officer not found")
+    return schemas.OfficerPerformance(**rows[0])
 
 @router.get("/analytics/officer-performance", response_model=List[schemas.OfficerPerformance])
-def get_all_officer_performance(db: Session = Depends(database.get_db)):
+def get_all_officer_performance(
+    department_id: int = None,
+    sort_by: str = "officer_id",
+    order: str = "asc",
+    skip: int = 0,
+    limit: int = None,
+    db: Session = Depends(database.get_db)
+):
     """
-    Get performance list for ALL officers
+    Get performance list for ALL officers (one grouped query; filter by department,
+    sort by any metric, paginate with skip / limit)
     """
-    officers = db.query(models.Officer).all()
-    results = []
-    
-    for officer in officers:
-        assigned_count = db.query(models.Complaint).filter(
-            models.Complaint.assigned_officer_id == officer.id
-        ).count()
-        
-        resolved_count = db.query(models.Complaint).filter(
-            models.Complaint.assigned_officer_id == officer.id,
-            models.Complaint.status.in_(["RESOLVED", "Closed by Citizen", "Action Completed"])
-        ).count()
-        
-        sla_breach_count = db.query(models.Complaint).filter(
-            models.Complaint.assigned_officer_id == officer.id,
-            models.Complaint.sla_breached == True
-        ).count()
-        
-        # Calc Avg Time for this officer
-        resolved_complaints = db.query(models.Complaint).filter(
-            models.Complaint.assigned_officer_id == officer.id,
-            models.Complaint.status.in_(["RESOLVED", "Closed by Citizen"]),
-            models.Complaint.closed_at != None
-        ).all()
-
-        total_hours = 0
-        count_with_time = 0
-        for c in resolved_complaints:
-            if c.created_at and c.closed_at:
-                diff = c.closed_at - c.created_at
-                total_hours += diff.total_seconds() / 3600
-                count_with_time += 1
-        
-        avg_hours = round(total_hours / count_with_time, 1) if count_with_time > 0 else 0
-        
-        results.append(schemas.OfficerPerformance(
-            officer_id=officer.id,
-            officer_name=officer.name,
-            designation=officer.designation,
-            assigned_count=assigned_count,
-            resolved_count=resolved_count,
-            avg_resolution_hours=avg_hours,
-            sla_breach_count=sla_breach_count
-        ))
-    
-    return results
+    from .. import officer_performance
+
+    if sort_by not in officer_performance.SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {', '.join(officer_performance.SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+
+    rows = officer_performance.get_performance(
+        db, department_id=department_id, sort=sort_by, descending=order == "desc", skip=skip, limit=limit
+    )
+    return [schemas.OfficerPerformance(**row) for row in rows]
+
 @router.get("/complaints", response_model=List[schemas.ComplaintResponse])
 def list_complaints(
     skip: int = 0,
@@ -361,88 +285,94 @@ def assign_complaint(
     Assign complaint to ONE specific officer
     India Govt Compliance - Strict single-officer assignment
     """
-    # Get complaint
-    complaint = db.query(models.Complaint).filter(
-        models.Complaint.id == complaint_id
-    ).first()
-    
-    if not complaint:
-        raise HTTPException(status_code=404, detail="Complaint not found")
-    
-    # Check if already assigned
-    if complaint.assigned_officer_id:
-        raise HTTPException(
-            status_code=400, 
-            detail="Complaint already assigned. Use reassign endpoint instead."
-        )
-    
-    # Get officer
-    officer = db.query(models.Officer).filter(
-        models.Officer.id == assignment.officer_id
-    ).first()
+    from ..utils.optimistic import retry_on_conflict, ConflictError
+
+    def attempt():
+        # Get complaint
+        complaint = db.query(models.Complaint).filter(
+            models.Complaint.id == complaint_id
+        ).first()
+    
+        if not complaint:
+            raise HTTPException(status_code=404, detail="Complaint not found")
+    
+        # Check if already assigned
+        if complaint.assigned_officer_id:
+            raise HTTPException(
+                status_code=400, 
+                detail="Complaint already assigned. Use reassign endpoint instead."
+            )
     
-    if not officer:
-        raise HTTPException(status_code=404, detail="Officer not found")
+        # Get officer
+        officer = db.query(models.Officer).filter(
+            models.Officer.id == assignment.officer_id
+        ).first()
     
-    # Check officer status
-    if officer.status != "Active":
-        raise HTTPException(status_code=400, detail=f"Officer is {officer.status}")
+        if not officer:
+            raise HTTPException(status_code=404, detail="Officer not found")
     
-    # Assign
-    complaint.assigned_officer_id = assignment.officer_id
-    complaint.assigned_at = datetime.utcnow()
-    complaint.assigned_by_admin_id = current_admin.id
-    complaint.status = "Assigned"
+        # Check officer status
+        if officer.status != "Active":
+            raise HTTPException(status_code=400, detail=f"Officer is {officer.status}")
     
-    # Set/override priority if provided
-    if assignment.priority:
-        complaint.priority = assignment.priority
+        # Set/override priority if provided (before the SLA is computed from it)
+        if assignment.priority:
+            complaint.priority = assignment.priority
     
-    # Calculate SLA
-    priority = complaint.priority or "Medium"
-    complaint.sla_hours = SLA_HOURS.get(priority, 120)
-    complaint.sla_deadline = datetime.utcnow() + timedelta(hours=complaint.sla_hours)
+        # Assign: SLA + escalation thresholds from the department / priority policy,
+        # officer summary queued; version checked before the rows below
+        complaint.assigned_by_admin_id = current_admin.id
+        assign_officer(db, complaint, assignment.officer_id, status="Assigned")
     
-    # Create history
-    history = models.ComplaintHistory(
-        complaint_id=complaint_id,
-        action=f"Assigned to {officer.name} ({officer.designation}) - SLA: {complaint.sla_hours}h",
-        performed_by=current_admin.email
-    )
-    db.add(history)
+        # Create history
+        history = models.ComplaintHistory(
+            complaint_id=complaint_id,
+            action=f"Assigned to {officer.name} ({officer.designation}) - SLA: {complaint.sla_hours}h",
+            performed_by=current_admin.email
+        )
+        db.add(history)
     
-    # Audit log
-    audit_log = models.AdminAuditLog(
-        admin_id=current_admin.id,
-        action=f"Assigned complaint #{complaint_id} to officer {officer.employee_id}",
-        target_resource=f"complaint:{complaint_id}"
-    )
-    db.add(audit_log)
+        # Audit log
+        audit_log = models.AdminAuditLog(
+            admin_id=current_admin.id,
+            action=f"Assigned complaint #{complaint_id} to officer {officer.employee_id}",
+            target_resource=f"complaint:{complaint_id}"
+        )
+        db.add(audit_log)
 
-    # Timeline: Assigned to Officer
-    timeline_entry = models.GrievanceTimeline(
-        complaint_id=complaint_id,
-        status="ASSIGNED",
-        updated_by="ADMIN",
-        remarks=f"Assigned to {officer.name} ({officer.designation})"
-    )
-    db.add(timeline_entry)
-    
-    db.commit()
-    
-    print(f"📋 Complaint #{complaint_id} assigned to {officer.name} by {current_admin.email}")
-    
-    return {
-        "message": "Grievance assigned successfully",
-        "complaint_id": complaint_id,
-        "officer": {
-            "id": officer.id,
-            "name": officer.name,
-            "designation": officer.designation
-        },
-        "sla_hours": complaint.sla_hours,
-        "sla_deadline": complaint.sla_deadline
-    }
+        # Timeline: Assigned to Officer
+        timeline_entry = models.GrievanceTimeline(
+            complaint_id=complaint_id,
+            status="ASSIGNED",
+            updated_by="ADMIN",
+            remarks=f"Assigned to {officer.name} ({officer.designation})"
+        )
+        db.add(timeline_entry)
+    
+        from .. import job_queue
+        db.commit()
+        job_queue.notify()
+    
+        print(f"📋 Complaint #{complaint_id} assigned to {officer.name} by {current_admin.email}")
+    
+        return {
+            "message": "Grievance assigned successfully",
+            "complaint_id": complaint_id,
+            "officer": {
+                "id": officer.id,
+                "name": officer.name,
+                "designation": officer.designation
+            },
+            "sla_hours": complaint.sla_hours,
+            "sla_deadline": complaint.sla_deadline
+        }
+
+    # Version-checked commit: if another worker changed the complaint meanwhile,
+    # run the checks again against its change
+    try:
+        return retry_on_conflict(db, attempt)
+    except ConflictError:
+        raise HTTPException(status_code=409, detail="Complaint is being changed by someone else, please retry")
 
 @router.put("/complaints/{complaint_id}/reassign")
 def reassign_complaint(
@@ -455,176 +385,112 @@ def reassign_complaint(
     Reassign complaint to different officer
     Mandatory reason for India Govt audit compliance
     """
-    # Get complaint
-    complaint = db.query(models.Complaint).filter(
-        models.Complaint.id == complaint_id
-    ).first()
-    
-    if not complaint:
-        raise HTTPException(status_code=404, detail="Complaint not found")
-    
-    if not complaint.assigned_officer_id:
-        raise HTTPException(status_code=400, detail="Complaint not assigned yet")
+    from ..utils.optimistic import retry_on_conflict, ConflictError
+
+    def attempt():
+        # Get complaint
+        complaint = db.query(models.Complaint).filter(
+            models.Complaint.id == complaint_id
+        ).first()
+    
+        if not complaint:
+            raise HTTPException(status_code=404, detail="Complaint not found")
+    
+        if not complaint.assigned_officer_id:
+            raise HTTPException(status_code=400, detail="Complaint not assigned yet")
+    
+        # Validate reason length
+        if len(reassignment.reason) < 10:
+            raise HTTPException(
+                status_code=400, 
+                detail="Reassignment reason must be at least 10 characters"
+            )
     
-    # Validate reason length
-    if len(reassignment.reason) < 10:
-        raise HTTPException(
-            status_code=400, 
-            detail="Reassignment reason must be at least 10 characters"
+        # Get new officer
+        new_officer = db.query(models.Officer).filter(
+            models.Officer.id == reassignment.new_officer_id
+        ).first()
+    
+        if not new_officer:
+            raise HTTPException(status_code=404, detail="New officer not found")
+    
+        if new_officer.status != "Active":
+            raise HTTPException(status_code=400, detail=f"Officer is {new_officer.status}")
+    
+        # Store previous officer
+        old_officer_id = complaint.assigned_officer_id
+        old_officer = db.query(models.Officer).filter(models.Officer.id == old_officer_id).first()
+    
+        # Reassign
+        complaint.previous_officer_id = old_officer_id
+        complaint.reassignment_reason = reassignment.reason
+        complaint.reassignment_count += 1
+        # Resets the SLA and escalation tiers, queues the new officer's summary (reuses the
+        # memo if the description is unchanged); a concurrent reassignment makes this attempt start over
+        assign_officer(db, complaint, reassignment.new_officer_id, status=None)
+    
+        # History
+        history = models.ComplaintHistory(
+            complaint_id=complaint_id,
+            action=f"Reassigned from {old_officer.name if old_officer else 'Unknown'} to {new_officer.name}. Reason: {reassignment.reason}",
+            performed_by=current_admin.email
         )
+        db.add(history)
     
-    # Get new officer
-    new_officer = db.query(models.Officer).filter(
-        models.Officer.id == reassignment.new_officer_id
-    ).first()
-    
-    if not new_officer:
-        raise HTTPException(status_code=404, detail="New officer not found")
-    
-    if new_officer.status != "Active":
-        raise HTTPException(status_code=400, detail=f"Officer is {new_officer.status}")
-    
-    # Store previous officer
-    old_officer_id = complaint.assigned_officer_id
-    old_officer = db.query(models.Officer).filter(models.Officer.id == old_officer_id).first()
-    
-    # Reassign
-    complaint.previous_officer_id = old_officer_id
-    complaint.assigned_officer_id = reassignment.new_officer_id
-    complaint.reassignment_reason = reassignment.reason
-    complaint.reassignment_count += 1
-    complaint.assigned_at = datetime.utcnow()  # Reset SLA
-    complaint.sla_deadline = datetime.utcnow() + timedelta(hours=complaint.sla_hours)
-    
-    # History
-    history = models.ComplaintHistory(
-        complaint_id=complaint_id,
-        action=f"Reassigned from {old_officer.name if old_officer else 'Unknown'} to {new_officer.name}. Reason: {reassignment.reason}",
-        performed_by=current_admin.email
-    )
-    db.add(history)
-    
-    # Audit
-    audit_log = models.AdminAuditLog(
-        admin_id=current_admin.id,
-        action=f"Reassigned complaint #{complaint_id} from {old_officer_id} to {reassignment.new_officer_id}",
-        target_resource=f"complaint:{complaint_id}"
-    )
-    db.add(audit_log)
-
-    # Timeline: Reassigned (counts as new assignment)
-    timeline_entry = models.GrievanceTimeline(
-        complaint_id=complaint_id,
-        status="ASSIGNED",
-        updated_by="ADMIN",
-        remarks=f"Reassigned to {new_officer.name}. Reason: {reassignment.reason}"
-    )
-    db.add(timeline_entry)
+        # Audit
+        audit_log = models.AdminAuditLog(
+            admin_id=current_admin.id,
+            action=f"Reassigned complaint #{complaint_id} from {old_officer_id} to {reassignment.new_officer_id}",
+            target_resource=f"complaint:{complaint_id}"
+        )
+        db.add(audit_log)
 
+        # Timeline: Reassigned (counts as new assignment; one ASSIGNED event per complaint,
+        # later reassignments are in the history and audit log)
+        already_assigned_event = db.query(models.GrievanceTimeline.id).filter(
+            models.GrievanceTimeline.complaint_id == complaint_id,
+            models.GrievanceTimeline.status == "ASSIGNED"
+        ).first()
+        if not already_assigned_event:
+            timeline_entry = models.GrievanceTimeline(
+                complaint_id=complaint_id,
+                status="ASSIGNED",
+                updated_by="ADMIN",
+                remarks=f"Reassigned to {new_officer.name}. Reason: {reassignment.reason}"
+            )
+            db.add(timeline_entry)
     
-    db.commit()
+        from .. import job_queue
+        db.commit()
+        job_queue.notify()
     
-    print(f"🔄 Complaint #{complaint_id} reassigned by {current_admin.email}")
+        print(f"🔄 Complaint #{complaint_id} reassigned by {current_admin.email}")
     
-    return {
-        "message": "Grievance reassigned successfully",
-        "complaint_id": complaint_id,
-        "from_officer": old_officer.name if old_officer else "Unknown",
-        "to_officer": new_officer.name,
-        "reason": reassignment.reason
-    }
+        return {
+            "message": "Grievance reassigned successfully",
+            "complaint_id": complaint_id,
+            "from_officer": old_officer.name if old_officer else "Unknown",
+            "to_officer": new_officer.name,
+            "reason": reassignment.reason
+        }
+
+    # Version-checked commit: if another worker changed the complaint meanwhile,
+    # run the checks again against its change
+    try:
+        return retry_on_conflict(db, attempt)
+    except ConflictError:
+        raise HTTPException(status_code=409, detail="Complaint is being changed by someone else, please retry")
 
 # ============ ANALYTICS & DASHBOARD ============
 
 @router.get("/stats")
 def get_dashboard_stats(db: Session = Depends(database.get_db)):
     """
-    Dashboard overview metrics
-    """
-    total = db.query(models.Complaint).count()
-    pending = db.query(models.Complaint).filter(
-        models.Complaint.status.in_(["NEW", "Assigned", "IN_PROGRESS", "Pending"])
-    ).count()
-    resolved = db.query(models.Complaint).filter(
-        models.Complaint.status.in_(["RESOLVED", "Closed by Citizen"])
-    ).count()
-    critical = db.query(models.Complaint).filter(
-        models.Complaint.priority == "Critical"
-    ).count()
-    sla_breached = db.query(models.Complaint).filter(
-        models.Complaint.sla_breached == True
-    ).count()
-    unassigned = db.query(models.Complaint).filter(
-        models.Complaint.assigned_officer_id == None,
-        models.Complaint.is_archived == False
-    ).count()
-    
-    # Calculate trends and rates
-    now = datetime.now()
-    first_day_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    first_day_last_month = (first_day_this_month - timedelta(days=1)).replace(day=1)
-    
-    # Total Processed (Resolved + Closed)
-    # Ensure this query captures ALL non-pending states for accuracy
-    total_processed = db.query(models.Complaint).filter(
-        models.Complaint.status.in_(["RESOLVED", "Closed by Citizen", "Work Completed", "Action Completed"])
-    ).count()
-
-    # CRITICAL DATA SYNC: Pending must strictly be Total - Processed
-    # This avoids "floating" complaints that don't appear in either category due to status mismatches
-    pending = total - total_processed
-    if pending < 0: pending = 0 # Safety guard
-
-    # Last Month Processed
-    last_month_processed = db.query(models.Complaint).filter(
-        models.Complaint.status.in_(["RESOLVED", "Closed by Citizen", "Work Completed", "Action Completed"]),
-        models.Complaint.closed_at >= first_day_last_month,
-        models.Complaint.closed_at < first_day_this_month
-    ).count()
-
-    total_growth = 0
-    if last_month_processed > 0:
-        total_growth = ((total_processed - last_month_processed) / last_month_processed) * 100
-
-    # Resolution Rate
-    resolution_rate = 0
-    if total > 0:
-        resolution_rate = (total_processed / total) * 100
-
-    # Avg Resolution Time
-    resolved_complaints = db.query(models.Complaint).filter(
-        models.Complaint.status.in_(["RESOLVED", "Closed by Citizen", "Work Completed", "Action Completed"]),
-        models.Complaint.closed_at != None
-    ).all()
-
-    total_hours = 0
-    count_with_time = 0
-    for c in resolved_complaints:
-        if c.created_at and c.closed_at:
-            diff = c.closed_at - c.created_at
-            # Guard against negative time (server clock skew)
-            seconds = diff.total_seconds()
-            if seconds > 0:
-                total_hours += seconds / 3600
-                count_with_time += 1
-    
-    avg_resolution_time = 0
-    if count_with_time > 0:
-        avg_resolution_time = round(total_hours / count_with_time, 1)
+    Dashboard overview metrics (one aggregate query, cached for a few seconds)
+    """
+    from .. import dashboard_stats
 
-    return {
-        "total": total,
-        "total_processed": total_processed,
-        "total_growth": round(total_growth, 1),
-        "pending": pending,
-        "resolved": total_processed, # Map resolved to processed for frontend consistency
-        "resolution_rate": round(resolution_rate, 1),
-        "avg_resolution_time": avg_resolution_time,
-        "critical": critical,
-        "sla_breached": sla_breached,
-        "unassigned": unassigned,
-        "active_officers": db.query(models.Officer).filter(models.Officer.status == "Active").count()
-    }
+    return dashboard_stats.get_stats(db)
 
 @router.get("/complaints/unassigned", response_model=List[schemas.ComplaintResponse])
 def get_unassigned_complaints(
@@ -639,6 +505,45 @@ def get_unassigned_complaints(
         models.Complaint.is_archived == False
     ).all()
 
+@router.post("/complaints/auto-assign")
+def auto_assign_backlog(
+    dry_run: bool = False,
+    department_id: int = None,
+    limit: int = 1000,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """
+    Assign every unassigned, non-archived complaint in one transaction,
+    balancing officer load (weighted by priority / SLA) and preferring the
+    complaint's ward. dry_run returns the plan without writing it;
+    `limit` caps the assignments listed in the response.
+    """
+    from .. import bulk_assignment, job_queue
+
+    plan, officers = bulk_assignment.plan_backlog(db, department_id, claim=not dry_run)
+    result = plan.to_dict(limit)
+    result["dry_run"] = dry_run
+    if dry_run or not plan.assignments:
+        return result
+
+    try:
+        bulk_assignment.apply_plan(db, plan, officers, current_admin)
+        db.add(models.AdminAuditLog(
+            admin_id=current_admin.id,
+            action=f"Bulk auto-assigned {len(plan.assignments)} complaints"
+                   + (f" in department {department_id}" if department_id is not None else ""),
+            target_resource="complaints:auto-assign"
+        ))
+        db.commit()
+    except bulk_assignment.BacklogChanged as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Backlog changed during assignment, retry: {e}")
+    job_queue.notify()
+
+    print(f"📋 Bulk auto-assigned {len(plan.assignments)} complaints by {current_admin.email}")
+    return result
+
 @router.get("/complaints/sla-breached", response_model=List[schemas.ComplaintResponse])
 def get_sla_breached_complaints(
     db: Session = Depends(database.get_db),
@@ -651,6 +556,88 @@ def get_sla_breached_complaints(
         models.Complaint.sla_breached == True
     ).order_by(models.Complaint.sla_deadline).all()
 
+# ============ SLA ESCALATION ============
+
+@router.get("/escalation-policies", response_model=List[schemas.EscalationPolicyResponse])
+def list_escalation_policies(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """SLA hours + escalation thresholds per department / priority (unlisted ones use the built-in SLA hours)"""
+    return db.query(models.EscalationPolicy).order_by(
+        models.EscalationPolicy.department_id, models.EscalationPolicy.priority
+    ).all()
+
+@router.put("/escalation-policies", response_model=schemas.EscalationPolicyResponse)
+def upsert_escalation_policy(
+    policy: schemas.EscalationPolicyRequest,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Create or update the policy of a department / priority (applies to assignments made from now on)"""
+    if policy.sla_hours <= 0 or not 0 < policy.warn_pct < 1 or policy.admin_multiple <= 1:
+        raise HTTPException(status_code=400, detail="Need sla_hours > 0, 0 < warn_pct < 1 and admin_multiple > 1")
+    if policy.department_id is not None and not db.query(models.Department.id).filter(
+        models.Department.id == policy.department_id
+    ).first():
+        raise HTTPException(status_code=404, detail="Department not found")
+
+    row = db.query(models.EscalationPolicy).filter(
+        models.EscalationPolicy.department_id.is_(None) if policy.department_id is None
+        else models.EscalationPolicy.department_id == policy.department_id,
+        models.EscalationPolicy.priority.is_(None) if policy.priority is None
+        else models.EscalationPolicy.priority == policy.priority
+    ).first()
+    if not row:
+        row = models.EscalationPolicy(department_id=policy.department_id, priority=policy.priority)
+        db.add(row)
+    row.sla_hours = policy.sla_hours
+    row.warn_pct = policy.warn_pct
+    row.admin_multiple = policy.admin_multiple
+    row.updated_by = current_admin.email
+    db.add(models.AdminAuditLog(
+        admin_id=current_admin.id,
+        action=f"Set escalation policy (department {policy.department_id or 'any'}, priority {policy.priority or 'any'}): "
+               f"{policy.sla_hours}h, warn at {policy.warn_pct:.0%}, admin queue at {policy.admin_multiple}x",
+        target_resource="escalation_policy"
+    ))
+    db.commit()
+    db.refresh(row)
+    return row
+
+@router.get("/escalations/report")
+def get_escalation_report(
+    limit: int = 50,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Dry run: complaints the next escalation run would move to each tier, per department (nothing is written)"""
+    from .. import escalation
+
+    return escalation.report(db, limit=limit)
+
+@router.get("/escalations/metrics")
+def get_escalation_metrics(current_admin: models.User = Depends(get_current_admin)):
+    """Escalation pipeline throughput per tier and outbox delivery (this process, since startup)"""
+    from .. import escalation
+
+    return escalation.metrics_report()
+
+@router.get("/escalations/queue", response_model=List[schemas.ComplaintResponse])
+def get_escalation_queue(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Admin escalation queue: open complaints past twice their SLA, most overdue first"""
+    from .. import escalation
+    from ..summaries import CLOSED_STATUSES
+
+    return db.query(models.Complaint).filter(
+        models.Complaint.escalation_level >= escalation.ADMIN,
+        models.Complaint.is_archived == False,
+        models.Complaint.status.notin_(CLOSED_STATUSES)
+    ).order_by(models.Complaint.sla_deadline).all()
+
 @router.get("/heatmap")
 def get_heatmap_data(db: Session = Depends(database.get_db)):
     complaints = db.query(models.Complaint.location, models.Complaint.urgency_level).all()
@@ -769,6 +756,149 @@ def get_audit_logs(
         for log in logs
     ]
 
+# ============ OFFICER AI SUMMARY BACKFILL ============
+
+@router.post("/ai-summaries/backfill")
+def backfill_ai_summaries(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """
+    Pre-generate officer AI summaries for all open assigned complaints.
+    Runs in background batches; poll the returned run for progress.
+    """
+    from .. import summaries, job_queue
+
+    run = summaries.start_backfill(db, current_admin.email)
+    db.add(models.AdminAuditLog(
+        admin_id=current_admin.id,
+        action=f"Started AI summary backfill run #{run.id}",
+        target_resource=f"job:{run.id}"
+    ))
+    db.commit()
+    job_queue.notify()
+
+    return summaries.backfill_progress(db, run)
+
+@router.get("/ai-summaries/backfill/{run_id}")
+def get_ai_summary_backfill(
+    run_id: int,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Progress of an AI summary backfill run"""
+    from .. import summaries
+
+    run = db.query(models.BackgroundJob).filter(
+        models.BackgroundJob.id == run_id,
+        models.BackgroundJob.job_type == summaries.BACKFILL_JOB
+    ).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Backfill run not found")
+
+    return summaries.backfill_progress(db, run)
+
+# ============ OFFICER WORKLOAD ============
+
+@router.get("/workload/consistency")
+def check_workload_consistency(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Divergence between the in-memory officer workload (auto-assignment) and the DB"""
+    from .. import workload
+
+    return workload.check(db)
+
+@router.post("/workload/reconcile")
+def reconcile_workload(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Reset the in-memory officer workload from the DB now (also runs periodically)"""
+    from .. import workload
+
+    report = workload.check(db, repair=True)
+    db.add(models.AdminAuditLog(
+        admin_id=current_admin.id,
+        action=f"Reconciled officer workload ({report['divergent_count']} divergent)",
+        target_resource="workload"
+    ))
+    db.commit()
+    return report
+
+# ============ INCIDENT CLUSTERS ============
+
+@router.get("/incidents")
+def list_incidents(
+    department_id: int = None,
+    status: str = None,
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """
+    Incident clusters (same issue reported by several citizens), newest first.
+    status: OPEN (some member complaint still open) or CLOSED
+    """
+    from .. import incidents
+
+    return incidents.list_incidents(db, department_id=department_id, status=status, skip=skip, limit=limit)
+
+@router.get("/incidents/{incident_id}")
+def get_incident(
+    incident_id: int,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Incident cluster with its member complaints"""
+    from .. import incidents
+
+    incident = db.query(models.Incident).filter(models.Incident.id == incident_id).first()
+    if not incident:
+        raise HTTPException(status_code=404, detail="Incident not found")
+
+    members = db.query(models.Complaint).filter(
+        models.Complaint.incident_id == incident.id
+    ).order_by(models.Complaint.created_at).all()
+    return {
+        **incidents.incident_summary(incident, members),
+        "complaints": [schemas.ComplaintResponse.model_validate(c) for c in members]
+    }
+
+# ============ HEURISTIC RULES ============
+
+@router.get("/ai-rules")
+def get_ai_rules(
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """Active heuristic rule table (summary + priority rules)"""
+    from ..utils.rule_engine import get_rule_engine
+
+    engine = get_rule_engine()
+    return {**engine.info(), "rule_ids": [rule["id"] for rule in engine.rules]}
+
+@router.post("/ai-rules/reload")
+def reload_ai_rules(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin)
+):
+    """
+    Recompile the heuristic rule table now (it is also picked up automatically on change).
+    A table that fails to compile is rejected and the previous version stays active.
+    """
+    from ..utils.rule_engine import reload_rules
+
+    engine = reload_rules()
+    db.add(models.AdminAuditLog(
+        admin_id=current_admin.id,
+        action=f"Reloaded heuristic rules v{engine.version}",
+        target_resource="ai-rules"
+    ))
+    db.commit()
+    return engine.info()
+
 @router.put("/assign/{complaint_id}/{dept_id}")
 def assign_department(
     complaint_id: int, 
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Request
 from pydantic import BaseModel
-from typing import List
-from ..ai_utils import generate_analysis_response
+from typing import List, Optional
+from ..ai_utils import (
+    generate_analysis_response, generate_analysis_responses, generate_draft_analysis_response, get_draft_store
+)
+from ..config import settings
+from ..utils.ai_executor import run_ai_call, get_ai_executor, AICallTimeout, ClientDisconnected
 
 router = APIRouter(prefix="/helper", tags=["Helper"])
 
@@ -9,8 +13,41 @@ router = APIRouter(prefix="/helper", tags=["Helper"])
 async def ping_helper():
     return {"status": "helper_active"}
 
+@router.get("/llm-cache/stats")
+async def llm_cache_stats():
+    """
+    Hit/miss counters for the LLM classification cache.
+    """
+    from ..utils.llm_cache import get_classification_cache
+    return get_classification_cache().stats()
+
+@router.get("/llm/stats")
+async def llm_provider_stats():
+    """
+    Per-call-site latency and token histograms, hedge counts and circuit breaker state
+    (state, trips, rejected calls) for the shared Gemini provider.
+    """
+    from ..llm_provider import get_llm_provider
+    return get_llm_provider().stats()
+
+@router.get("/ai-executor/stats")
+async def ai_executor_stats():
+    """
+    In-flight / waiting counts for the dedicated AI thread pool.
+    """
+    return get_ai_executor().stats()
+
+@router.get("/drafts/stats")
+async def draft_session_stats():
+    """
+    Live-typing draft sessions: active/evicted counts and characters processed.
+    """
+    return get_draft_store().stats()
+
 class AIAnalysisRequest(BaseModel):
     description: str
+    draft_id: Optional[str] = None  # Client-generated id for incremental analysis while typing
+    final: bool = False  # Draft is done (e.g. field blurred): allow the one LLM refinement now
 
 class AIAnalysisResponse(BaseModel):
     category: str
@@ -21,7 +58,7 @@ class AIAnalysisResponse(BaseModel):
     reasoning: List[str]
 
 @router.post("/scan-text", response_model=AIAnalysisResponse)
-async def analyze_complaint_endpoint(payload: AIAnalysisRequest):
+async def analyze_complaint_endpoint(payload: AIAnalysisRequest, request: Request):
     """
     Analyzes complaint description in real-time.
     Returns structured AI insights including Department, Priority, ERT, and Reasoning.
@@ -38,9 +75,20 @@ async def analyze_complaint_endpoint(payload: AIAnalysisRequest):
         }
         
     try:
-        # Calls the heuristic/LLM hybrid function
-        result = generate_analysis_response(payload.description)
+        # Calls the heuristic/LLM hybrid function on the AI pool (never on the event loop)
+        if payload.draft_id:
+            result = await run_ai_call(
+                generate_draft_analysis_response, payload.draft_id[:64], payload.description, final=payload.final,
+                timeout=settings.AI_SCAN_TIMEOUT_SECONDS, request=request
+            )
+        else:
+            result = await run_ai_call(
+                generate_analysis_response, payload.description,
+                timeout=settings.AI_SCAN_TIMEOUT_SECONDS, request=request
+            )
         return result
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client disconnected")
     except Exception as e:
         print(f"AI Analysis Failed: {e}")
         # Graceful Fallback
@@ -53,21 +101,110 @@ async def analyze_complaint_endpoint(payload: AIAnalysisRequest):
             "reasoning": ["AI analysis temporarily unavailable"]
         }
 
-from fastapi import UploadFile, File, Form
+class AIBatchAnalysisRequest(BaseModel):
+    descriptions: List[str]
+    use_llm: bool = False  # Pack low-confidence items into batched Gemini prompts
+
+class AIBatchAnalysisResponse(BaseModel):
+    count: int
+    results: List[AIAnalysisResponse]
+
+@router.post("/scan-text/batch", response_model=AIBatchAnalysisResponse)
+async def analyze_complaints_batch_endpoint(payload: AIBatchAnalysisRequest, request: Request):
+    """
+    Analyzes many descriptions at once (call-centre intake, data migrations).
+    Each result matches what /scan-text returns for that description when the
+    LLM is unavailable; with use_llm, uncertain items are sent to Gemini in packed prompts.
+    """
+    if len(payload.descriptions) > settings.AI_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.AI_BATCH_MAX_ITEMS} descriptions per batch"
+        )
+
+    results = [None] * len(payload.descriptions)
+    valid = [i for i, d in enumerate(payload.descriptions) if d and len(d.strip()) >= 5]
+    for i in set(range(len(results))) - set(valid):
+        results[i] = {
+            "category": "General",
+            "department": "General Grievance Cell",
+            "priority": "Medium",
+            "ert": "3-5 days",
+            "confidence": 0,
+            "reasoning": ["Description too short for analysis"]
+        }
+
+    try:
+        analyzed = await run_ai_call(
+            generate_analysis_responses, [payload.descriptions[i] for i in valid], use_llm=payload.use_llm,
+            timeout=settings.AI_BATCH_TIMEOUT_SECONDS, request=request
+        )
+    except AICallTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client disconnected")
+
+    for i, result in zip(valid, analyzed):
+        results[i] = result
+    return {"count": len(results), "results": results}
+
+from fastapi import UploadFile, File, Form, Response
 from ..ai_utils import transcribe_audio
+from ..utils.audio import downsample_for_transcription
+import time
+
+def _server_timing(timings: dict) -> str:
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
 
 @router.post("/transcribe")
 async def transcribe_endpoint(
+    request: Request,
+    response: Response,
     audio: UploadFile = File(...),
     lang: str = Form("en-IN")
 ):
     """
     Receives audio blob, transcribes using backend LLM, and returns text.
     Bypasses unreliable browser Web Speech API.
+    The upload is read in chunks up to AI_TRANSCRIBE_MAX_BYTES, optionally downsampled,
+    and sent to Gemini from memory. Stage timings are returned in the Server-Timing header.
     """
+    timings = {}
     try:
-        content = await audio.read()
-        text = transcribe_audio(content, lang=lang)
+        started = time.perf_counter()
+        content = bytearray()
+        while True:
+            chunk = await audio.read(settings.AI_TRANSCRIBE_CHUNK_BYTES)
+            if not chunk:
+                break
+            content.extend(chunk)
+            if len(content) > settings.AI_TRANSCRIBE_MAX_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Audio exceeds {settings.AI_TRANSCRIBE_MAX_BYTES / (1024 * 1024):.1f} MB limit"
+                )
+        timings["receive"] = time.perf_counter() - started
+        mime_type = audio.content_type or "audio/webm"
+
+        if settings.AI_TRANSCRIBE_DOWNSAMPLE:
+            started = time.perf_counter()
+            downsampled = await downsample_for_transcription(content, workers=settings.AI_TRANSCODE_WORKERS)
+            if downsampled:
+                content, mime_type = downsampled
+            timings["transcode"] = time.perf_counter() - started
+
+        text = await run_ai_call(
+            transcribe_audio, content, lang=lang, mime_type=mime_type, timings=timings,
+            timeout=settings.AI_TRANSCRIBE_TIMEOUT_SECONDS, request=request
+        )
+        response.headers["Server-Timing"] = _server_timing(timings)
+        response.headers["X-Audio-Bytes"] = str(len(content))
         return {"transcript": text}
+    except HTTPException:
+        raise
+    except AICallTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client disconnected")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from .. import models, schemas, database, ai_utils, ai_trust
+from .. import models, schemas, database, ai_utils, ai_trust, enrichment, job_queue
 from ..utils import jwt_utils
-from ..utils.assignment_logic import resolve_department, assign_to_best_officer
+from ..utils.assignment_logic import resolve_department
 
 # ... (rest of imports)
 
@@ -16,37 +17,46 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+def _complaint_for_key(db: Session, job_key: str):
+    """Complaint already created under this Idempotency-Key, if any."""
+    existing_job = db.query(models.BackgroundJob).filter(
+        models.BackgroundJob.idempotency_key == job_key
+    ).first()
+    if existing_job:
+        return db.query(models.Complaint).filter(models.Complaint.id == existing_job.complaint_id).first()
+    return None
+
 @router.post("/", response_model=schemas.ComplaintResponse)
 def create_complaint(
     complaint: schemas.ComplaintCreate, 
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(jwt_utils.get_current_active_user)
+    current_user: models.User = Depends(jwt_utils.get_current_active_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
+    """
+    Stores the complaint immediately with a provisional rule-based classification.
+    LLM re-classification, sentiment, trust scoring and auto-assignment run in the
+    background job queue; poll GET /api/complaints/{id}/enrichment for progress.
+    """
     try:
-        # AI-powered analysis of complaint text
-        combined_text = f"{complaint.title} {complaint.description}"
-        analysis = ai_utils.analyze_complaint(combined_text)
+        # Idempotent retries: same client key -> same complaint
+        job_key = f"complaint-create:{current_user.id}:{idempotency_key}" if idempotency_key else None
+        if job_key:
+            existing = _complaint_for_key(db, job_key)
+            if existing:
+                return existing
         
-        # AI Trust Intelligence Pattern Detection
-        trust_score = 1.0
-        trust_flags = None
-        try:
-            trust_score, trust_flags = ai_trust.detect_trust_anomalies(
-                db, complaint.title, complaint.description, current_user.id
-            )
-            if trust_flags:
-                print(f"[AI Trust] Flags Detected: {trust_flags} (Score: {trust_score})")
-        except Exception as e:
-            print(f"[WARN] Trust Analysis Failed: {e}")
-            # Fail-safe: Proceed with perfect trust
+        # Provisional rule-based classification (no network, no model)
+        combined_text = f"{complaint.title} {complaint.description}"
+        analysis = ai_utils.provisional_analysis(combined_text)
         
-        # Use manual priority if provided, otherwise use AI classification
+        # Use manual priority if provided, otherwise use provisional classification
         final_priority = complaint.priority if complaint.priority else analysis["priority"]
         
         # Auto-assign department based on category
         department = resolve_department(db, analysis.get("department_full_name"), combined_text)
         
-        # Create complaint with AI-classified fields
+        # Create complaint with provisional fields
         new_complaint = models.Complaint(
             title=complaint.title,
             description=complaint.description,
@@ -54,16 +64,13 @@ def create_complaint(
             category=analysis["category"],
             sentiment_score=analysis["sentiment_score"],
             urgency_level=analysis["urgency"],
-            priority=final_priority,  # AI-classified or manual
+            priority=final_priority,
             user_id=current_user.id,
             status="NEW",
-            department_id=department.id if department else None,
-            ai_trust_score=trust_score,
-            ai_trust_flags=trust_flags
+            department_id=department.id if department else None
         )
         db.add(new_complaint)
-        db.commit()
-        db.refresh(new_complaint)
+        db.flush()
         
         # Timeline: Complaint Submitted
         timeline_entry = models.GrievanceTimeline(
@@ -73,30 +80,66 @@ def create_complaint(
             remarks="Grievance filed successfully"
         )
         db.add(timeline_entry)
+        
+        # Background AI enrichment (committed atomically with the complaint)
+        job = enrichment.enqueue_enrichment(
+            db, new_complaint, manual_priority=bool(complaint.priority), idempotency_key=job_key
+        )
+        if job.complaint_id != new_complaint.id:
+            # A retry with the same key committed since the check above
+            db.rollback()
+            return _complaint_for_key(db, job_key)
         db.commit()
+        db.refresh(new_complaint)
+        job_queue.notify()
+        ai_trust.record_submission(new_complaint)
         
-        print(f"[OK] Complaint created with AI classification:")
-        print(f"   Priority: {final_priority}")
-        print(f"   Category: {analysis['category']}")
-        print(f"   Department: {analysis.get('department_full_name', 'N/A')}")
-        print(f"   Confidence: {analysis['confidence']:.2f}")
-
-        # --- Automatic Officer Assignment ---
-        try:
-            if department:
-                assign_to_best_officer(db, new_complaint.id, department.id)
-        except Exception as e:
-            # Silently fail, log error, do not affect response
-            print(f"[WARN] Auto-assignment failed: {e}")
-            pass
-        # ------------------------------------
+        print(f"[OK] Complaint #{new_complaint.id} created (provisional: {analysis['category']} / {final_priority}). Enrichment queued.")
         
         return new_complaint
+    except IntegrityError as e:
+        db.rollback()
+        # Concurrent retry with the same key committed first: return its complaint
+        existing = _complaint_for_key(db, job_key) if job_key else None
+        if existing:
+            return existing
+        print(f"ERROR CREATING COMPLAINT: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create complaint: {str(e)}")
     except Exception as e:
         db.rollback()
         print(f"ERROR CREATING COMPLAINT: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create complaint: {str(e)}")
 
+@router.get("/{complaint_id}/enrichment")
+def get_enrichment_status(
+    complaint_id: int,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(jwt_utils.get_current_active_user)
+):
+    """
+    Poll the background AI enrichment status for a complaint.
+    """
+    complaint = db.query(models.Complaint).filter(models.Complaint.id == complaint_id).first()
+    if not complaint:
+        raise HTTPException(status_code=404, detail="Complaint not found")
+    if complaint.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    job = db.query(models.BackgroundJob).filter(
+        models.BackgroundJob.complaint_id == complaint_id,
+        models.BackgroundJob.job_type == enrichment.ENRICHMENT_JOB
+    ).order_by(models.BackgroundJob.id.desc()).first()
+    
+    return {
+        "complaint_id": complaint_id,
+        "enrichment": job_queue.job_status(job) if job else None,
+        "category": complaint.category,
+        "priority": complaint.priority,
+        "department_id": complaint.department_id,
+        "assigned_officer_id": complaint.assigned_officer_id,
+        "ai_trust_score": complaint.ai_trust_score
+    }
+
 @router.get("/active", response_model=List[schemas.ComplaintResponse])
 def get_active_complaints(
     skip: int = 0, 
@@ -168,6 +211,7 @@ def get_complaint_status(
         "id": complaint.id,
         "status": complaint.status,
         "title": complaint.title, # Optional: verify context
+        "incident_id": complaint.incident_id, # Other citizens reported the same issue
         "updated_at": complaint.updated_at
     }
 
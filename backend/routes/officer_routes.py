@@ -256,10 +256,10 @@ def get_complaint_ai_summary(
     """
     Get or Generate AI Summary.
     Strategy: Cache-First (Hash of description).
-    Rate Limit: 5 req/hour implemented via cache stickiness (if hash same, invalidates cost).
+    Usually pre-generated by a background job when the complaint was assigned;
+    generated here only if that has not run yet or the description changed.
     """
-    import hashlib
-    from .. import ai_utils
+    from .. import summaries
     
     # 1. Verify Assignment
     complaint = db.query(models.Complaint).filter(
@@ -270,39 +270,10 @@ def get_complaint_ai_summary(
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found or not assigned")
 
-    # 2. Calculate Hash
-    desc_content = f"{complaint.title}{complaint.description}".encode('utf-8')
-    current_hash = hashlib.sha256(desc_content).hexdigest()
-    
-    # 3. Check Cache (DB)
-    cached_summary = db.query(models.ComplaintAISummary).filter(
-        models.ComplaintAISummary.complaint_id == complaint_id
-    ).first()
-    
-    if cached_summary and cached_summary.description_hash == current_hash:
-        return {"summary": cached_summary.summary_text, "source": "cache"}
-        
-    # 4. Generate New (If hash mismatch or no summary)
-    # Rate Limit Check (Optional simple guard: if cached_summary exists and < 1 min old?)
-    # For now, Hash mismatch implies content change, so generation is valid.
-    
+    # 2. Cached (hash of title + description) or generate now
     try:
-        new_text = ai_utils.generate_complaint_summary(complaint)
-        
-        if not cached_summary:
-            cached_summary = models.ComplaintAISummary(
-                complaint_id=complaint_id,
-                summary_text=new_text,
-                description_hash=current_hash
-            )
-            db.add(cached_summary)
-        else:
-            cached_summary.summary_text = new_text
-            cached_summary.description_hash = current_hash
-            cached_summary.generated_at = datetime.utcnow()
-            
-        db.commit()
-        return {"summary": new_text, "source": "generated"}
+        summary_text, source = summaries.ensure_summary(db, complaint)
+        return {"summary": summary_text, "source": source}
         
     except Exception as e:
         print(f"AI Generation Failed: {e}")
@@ -2,26 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
-from .. import models, schemas, database, config
+from .. import models, schemas, database
+from ..ai_utils import scan_keywords
+from ..llm_provider import get_llm_provider
 from ..utils import jwt_utils
-import google.generativeai as genai
 import logging
 
-# Configure Gemini
-genai.configure(api_key=config.settings.STT_API_KEY)
-model = genai.GenerativeModel("gemini-pro")
-
 router = APIRouter(prefix="/women-safety", tags=["Women Safety"])
 
-# Emergency Keywords
-EMERGENCY_KEYWORDS = [
-    "help", "unsafe", "followed", "someone is following me", 
-    "emergency", "danger", "harassment", "scared", "please help me"
-]
-
+# Emergency Keywords live in ai_utils so they share the compiled keyword matcher
 def check_for_emergency(text: str) -> bool:
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in EMERGENCY_KEYWORDS)
+    return scan_keywords(text).emergency
 
 def create_emergency_complaint(db: Session, user: models.User, location: str = "Unknown", metadata: str = None):
     # Find Women Safety Department
@@ -87,8 +78,7 @@ Guidelines:
 
 Response:
 """
-            ai_response = model.generate_content(prompt)
-            response_text = ai_response.text
+            response_text = get_llm_provider().generate(prompt, call_site="women_safety_chat")
         except Exception as e:
             logging.error(f"Gemini AI Error: {e}")
             response_text = "I am here to help. Please tell me more about your grievance."
@@ -83,6 +83,7 @@ class ComplaintResponse(ComplaintBase):
     created_at: datetime
     department_id: Optional[int] = None
     department: Optional[DepartmentResponse] = None
+    incident_id: Optional[int] = None  # Incident cluster this complaint belongs to
     history: List[ComplaintHistoryResponse] = []
 
     class Config:
@@ -161,6 +162,21 @@ class ReassignComplaintRequest(BaseModel):
     new_officer_id: int
     reason: str  # Mandatory for India Govt compliance
 
+# SLA Escalation Schemas
+class EscalationPolicyRequest(BaseModel):
+    department_id: Optional[int] = None  # None = all departments
+    priority: Optional[str] = None  # None = all priorities
+    sla_hours: int
+    warn_pct: float = 0.8  # Officer warning at this share of the SLA
+    admin_multiple: float = 2.0  # Admin queue at this multiple of the SLA
+
+class EscalationPolicyResponse(EscalationPolicyRequest):
+    id: int
+    updated_by: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    class Config:
+        from_attributes = True
+
 # Analytics Schemas
 class OfficerPerformance(BaseModel):
     officer_id: int
@@ -170,6 +186,8 @@ class OfficerPerformance(BaseModel):
     resolved_count: int
     avg_resolution_hours: float
     sla_breach_count: int
+    p90_resolution_hours: float = 0.0
+    department_id: Optional[int] = None
 
 # Timeline Schemas
 class TimelineEventRequest(BaseModel):
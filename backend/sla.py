@@ -0,0 +1,302 @@
+"""
+SLA breach sweeper: sets Complaint.sla_breached when sla_deadline passes.
+
+At startup the deadlines of open, not yet breached complaints are loaded
+into a DeadlineSchedule (utils/deadline_schedule.py). A daemon thread
+sleeps until the earliest one, then flips the due complaints in batched
+UPDATE ... RETURNING statements and writes a history row and an internal
+SLA_BREACHED timeline event for each. Schedule entries are only hints: the
+UPDATE re-checks deadline, status and sla_breached, so a complaint closed
+or given a later deadline elsewhere is not flipped (and is rescheduled
+from the DB). Several worker processes can sweep at once: only the one
+whose UPDATE flips a row writes its entries.
+
+Deadlines set or changed afterwards (assign, reassign, closing, archiving)
+are collected from the ORM at flush and scheduled after commit, like the
+workload heaps (workload.py); Core writes use defer_schedule. Changes
+committed by other processes are picked up by an indexed catch-up query
+every SLA_RESCAN_SECONDS (idx_complaints_sla_breached_deadline).
+
+The flip does not bump Complaint.version: no read-check-write depends on
+sla_breached, so open sessions editing the complaint are not made to retry.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import inspect, insert, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .summaries import CLOSED_STATUSES
+from .utils import commit_hooks
+from .utils.deadline_schedule import EPOCH, DeadlineSchedule, to_timestamp
+from .utils.sql_chunks import chunks
+
+logger = logging.getLogger(__name__)
+
+BREACH_STATUS = "SLA_BREACHED"  # GrievanceTimeline status
+TRACKED = ("sla_deadline", "status", "is_archived", "sla_breached")
+
+_schedule = DeadlineSchedule()
+_sweeper = None
+
+
+def get_schedule() -> DeadlineSchedule:
+    return _schedule
+
+
+def _open_filter(table):
+    return (
+        table.c.sla_breached == False,
+        table.c.sla_deadline != None,
+        table.c.is_archived == False,
+        table.c.status.notin_(CLOSED_STATUSES)
+    )
+
+
+def load_schedule(db: Session) -> DeadlineSchedule:
+    """Loads the deadlines of every open, not yet breached complaint."""
+    table = models.Complaint.__table__
+    rows = db.execute(table.select().with_only_columns(table.c.id, table.c.sla_deadline).where(*_open_filter(table))).all()
+    _schedule.load([r[0] for r in rows], [to_timestamp(r[1]) for r in rows])
+    print(f"[SLA] Scheduled {len(rows)} open deadlines")
+    return _schedule
+
+
+def catch_up(db: Session, now: datetime = None) -> int:
+    """
+    Schedules complaints already past their deadline that this process has
+    not seen (committed by other workers): one range scan on the
+    (sla_breached, sla_deadline) index.
+    """
+    table = models.Complaint.__table__
+    now = now or datetime.utcnow()
+    rows = db.execute(table.select().with_only_columns(table.c.id, table.c.sla_deadline).where(
+        *_open_filter(table), table.c.sla_deadline <= now
+    )).all()
+    for complaint_id, deadline in rows:
+        _schedule.schedule(complaint_id, to_timestamp(deadline))
+    return len(rows)
+
+
+def mark_breached(db: Session, ids: list, now: datetime = None) -> list:
+    """
+    Flips sla_breached for those of `ids` that are open and past their
+    deadline, writes their history + timeline rows and reschedules the
+    others from the DB (caller commits). Returns the flipped ids.
+    """
+    table = models.Complaint.__table__
+    now = now or datetime.utcnow()
+    flipped = []
+    for chunk in chunks(ids):
+        guard = update(table).where(table.c.id.in_(chunk), *_open_filter(table), table.c.sla_deadline <= now)
+        if db.get_bind().dialect.update_returning:
+            rows = db.execute(guard.values(sla_breached=True).returning(
+                table.c.id, table.c.sla_deadline, table.c.sla_hours
+            )).all()
+        else:
+            rows = db.execute(table.select().with_only_columns(table.c.id, table.c.sla_deadline, table.c.sla_hours).where(
+                table.c.id.in_(chunk), *_open_filter(table), table.c.sla_deadline <= now
+            )).all()
+            db.execute(guard.values(sla_breached=True))
+        flipped.extend(rows)
+
+        # Not due after all (deadline moved, closed, breached elsewhere): take the current state
+        done = {row[0] for row in rows}
+        rest = [c for c in chunk if c not in done]
+        if rest:
+            for complaint_id, deadline in db.execute(table.select().with_only_columns(table.c.id, table.c.sla_deadline).where(
+                table.c.id.in_(rest), *_open_filter(table)
+            )):
+                _schedule.schedule(complaint_id, to_timestamp(deadline))
+
+    if not flipped:
+        return []
+    ids = [row[0] for row in flipped]
+    has_event = set()  # (complaint_id, status) is unique in the timeline
+    for chunk in chunks(ids):
+        has_event.update(c for (c,) in db.query(models.GrievanceTimeline.complaint_id).filter(
+            models.GrievanceTimeline.complaint_id.in_(chunk),
+            models.GrievanceTimeline.status == BREACH_STATUS
+        ))
+    db.execute(insert(models.ComplaintHistory.__table__), [
+        {
+            "complaint_id": complaint_id,
+            "action": f"SLA breached: {sla_hours or '?'}h deadline {deadline:%Y-%m-%d %H:%M} UTC passed",
+            "performed_by": "SYSTEM",
+            "timestamp": now
+        }
+        for complaint_id, deadline, sla_hours in flipped
+    ])
+    timeline = [
+        {
+            "complaint_id": complaint_id,
+            "status": BREACH_STATUS,
+            "updated_by": "SYSTEM",
+            "remarks": f"Resolution deadline ({sla_hours or '?'}h SLA) passed",
+            "timestamp": now,
+            "is_public_visible": False
+        }
+        for complaint_id, deadline, sla_hours in flipped if complaint_id not in has_event
+    ]
+    if timeline:
+        db.execute(insert(models.GrievanceTimeline.__table__), timeline)
+    return ids
+
+
+def sweep_due(db: Session, now: datetime = None) -> int:
+    """Marks every scheduled complaint due by `now`, in committed batches of SLA_SWEEP_BATCH."""
+    now = now or datetime.utcnow()
+    batch = settings.SLA_SWEEP_BATCH
+    due_by = int((now - EPOCH).total_seconds())  # rounded down: every id handed out is past its deadline
+    total = 0
+    while True:
+        ids = _schedule.pop_due(due_by, batch)
+        if not ids:
+            return total
+        try:
+            total += len(mark_breached(db, ids, now))
+            db.commit()
+        except Exception:
+            db.rollback()
+            for complaint_id in ids:  # retried on the next wake-up
+                _schedule.schedule(complaint_id, to_timestamp(now))
+            raise
+
+
+# ============ CHANGE TRACKING (commit hooks) ============
+
+def _collect(session) -> list:
+    changes = []
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, models.Complaint):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in TRACKED):
+            continue
+        values = state.dict
+        if obj in session.new:  # unset columns are NULL / their default
+            values = {"sla_deadline": None, "is_archived": False, "sla_breached": False, **values}
+        if (values.get("status") in CLOSED_STATUSES or values.get("is_archived")
+                or values.get("sla_breached") or ("sla_deadline" in values and values["sla_deadline"] is None)):
+            changes.append((obj.id, None))
+        elif all(name in values for name in TRACKED):
+            changes.append((obj.id, values["sla_deadline"]))
+        else:
+            changes.append((obj.id, "check"))  # unknown fields: let the sweep re-read it now
+    for obj in session.deleted:
+        if isinstance(obj, models.Complaint):
+            changes.append((obj.id, None))
+    return changes
+
+
+def _apply(session, changes):
+    scheduled = False
+    for complaint_id, deadline in changes:
+        if deadline is None:
+            _schedule.cancel(complaint_id)
+            continue
+        _schedule.schedule(complaint_id, to_timestamp(datetime.utcnow() if deadline == "check" else deadline))
+        scheduled = True
+    if scheduled and _sweeper is not None:
+        _sweeper.wake()  # may now be due earlier than it sleeps
+
+
+def defer_schedule(session, deadlines):
+    """[(complaint id, sla_deadline)] written with Core / bulk SQL, scheduled once the session commits."""
+    commit_hooks.defer(session, "sla", deadlines)
+
+
+def install(session_factory):
+    """Schedules the committed deadline changes of sessions made by `session_factory`."""
+    commit_hooks.register(session_factory, "sla", _collect, _apply)
+
+
+# ============ SWEEPER THREAD ============
+
+class SLASweeper:
+    """Sleeps until the next deadline (at most SLA_MAX_SLEEP_SECONDS), then sweeps."""
+
+    def __init__(self, session_factory, max_sleep: float, rescan_every: float):
+        self.session_factory = session_factory
+        self.max_sleep = max_sleep
+        self.rescan_every = rescan_every
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_rescan = time.monotonic()
+        self.breached = 0
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="sla-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            next_deadline = _schedule.next_deadline()
+            wait = self.max_sleep if next_deadline is None else min(self.max_sleep, next_deadline - time.time())
+            if wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                if wait < self.max_sleep or self._stop.is_set():
+                    continue
+            db = self.session_factory()
+            try:
+                if self.rescan_every and time.monotonic() - self._last_rescan >= self.rescan_every:
+                    found = catch_up(db)
+                    self._last_rescan = time.monotonic()
+                    if found:
+                        logger.info(f"SLA catch-up scheduled {found} overdue complaint(s)")
+                flipped = sweep_due(db)
+                if flipped:
+                    self.breached += flipped
+                    logger.info(f"SLA breached: {flipped} complaint(s)")
+            except Exception as e:
+                logger.error(f"SLA sweep failed: {e}")
+                self._stop.wait(5)
+            finally:
+                db.close()
+
+
+def start(session_factory=None, max_sleep: float = None, rescan_every: float = None):
+    """Installs the change listeners, loads the deadlines and starts the sweeper (startup)."""
+    global _sweeper
+    from .database import SessionLocal
+    session_factory = session_factory or SessionLocal
+    install(session_factory)
+    db = session_factory()
+    try:
+        load_schedule(db)
+    finally:
+        db.close()
+    if _sweeper is None:
+        _sweeper = SLASweeper(
+            session_factory,
+            max_sleep if max_sleep is not None else settings.SLA_MAX_SLEEP_SECONDS,
+            rescan_every if rescan_every is not None else settings.SLA_RESCAN_SECONDS
+        )
+        _sweeper.start()
+    return _sweeper
+
+
+def stop():
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.stop()
+        _sweeper = None
@@ -0,0 +1,248 @@
+"""
+Officer AI summaries, generated ahead of time.
+
+Assignment (auto, admin assign, reassign) enqueues an `officer_summary` job in
+the same transaction, so the summary is usually ready before the officer opens
+the complaint. Summaries are memoized in ComplaintAISummary by a hash of
+title + description; an unchanged complaint is never summarized twice.
+
+Jobs carry a batch of complaint ids. Rule-based summaries are free; LLM
+summaries draw from a token bucket (SUMMARY_LLM_RATE_PER_MINUTE). When the
+bucket is empty (or the LLM circuit breaker is open) the job re-enqueues its
+remaining ids with a delay instead of blocking a worker.
+"""
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from . import models, ai_utils
+from .config import settings
+from .job_queue import register_handler, enqueue, job_payload, notify, PENDING, RUNNING, DONE, FAILED
+from .utils.sql_chunks import chunks
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_JOB = "officer_summary"
+BACKFILL_JOB = "officer_summary_backfill"
+
+CLOSED_STATUSES = ["RESOLVED", "VERIFIED", "Closed by Citizen", "Work Completed", "Action Completed"]
+
+
+def description_hash(complaint: models.Complaint) -> str:
+    """SHA256 of title + description (the ComplaintAISummary memo key)."""
+    return hashlib.sha256(f"{complaint.title}{complaint.description}".encode('utf-8')).hexdigest()
+
+
+class RateLimiter:
+    """
+    Token bucket shared by the summary workers of this process.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Takes a token and returns 0, or returns the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+
+_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(
+            settings.SUMMARY_LLM_RATE_PER_MINUTE,
+            settings.SUMMARY_LLM_BURST
+        )
+    return _limiter
+
+
+def ensure_summary(db: Session, complaint: models.Complaint, llm_gate=None):
+    """
+    Returns (summary_text, source) where source is "cache" or "generated".
+    `llm_gate()` is consulted before an LLM call; if it returns a positive delay
+    the summary is not generated and (None, delay) is returned instead.
+    With a gate (background jobs) LLM errors propagate so the job is retried
+    rather than memoizing the extraction fallback.
+    """
+    current_hash = description_hash(complaint)
+    cached = db.query(models.ComplaintAISummary).filter(
+        models.ComplaintAISummary.complaint_id == complaint.id
+    ).first()
+    if cached and cached.description_hash == current_hash:
+        return cached.summary_text, "cache"
+
+    text = ai_utils.rule_based_summary(complaint)
+    if not text:
+        if llm_gate is not None:
+            delay = llm_gate()
+            if delay > 0:
+                return None, delay
+        text = ai_utils.force_llm_summary(complaint, raise_errors=llm_gate is not None)
+
+    if not cached:
+        cached = models.ComplaintAISummary(complaint_id=complaint.id)
+        db.add(cached)
+    cached.summary_text = text
+    cached.description_hash = current_hash
+    cached.generated_at = datetime.utcnow()
+    db.commit()
+    return text, "generated"
+
+
+def _llm_gate() -> float:
+    from .llm_provider import get_llm_provider
+    breaker = get_llm_provider().breaker.stats()
+    if breaker["state"] == "OPEN":
+        return max(1.0, breaker["seconds_until_half_open"] or 1.0)
+    return get_rate_limiter().try_acquire()
+
+
+def enqueue_summary(db: Session, complaint: models.Complaint) -> models.BackgroundJob:
+    """
+    Queues pre-generation for an assigned complaint (caller commits, then job_queue.notify()).
+    Keyed on the description hash, so reassigning an unchanged complaint reuses the job.
+    """
+    return enqueue(
+        db,
+        SUMMARY_JOB,
+        f"{SUMMARY_JOB}:{complaint.id}:{description_hash(complaint)[:16]}",
+        complaint_id=complaint.id,
+        payload={"complaint_ids": [complaint.id]}
+    )
+
+
+@register_handler(SUMMARY_JOB)
+def generate_summaries(db: Session, job: models.BackgroundJob):
+    payload = job_payload(job)
+    ids = payload.get("complaint_ids", [])
+    generated = cached = skipped = 0
+
+    for position, complaint_id in enumerate(ids):
+        complaint = db.query(models.Complaint).filter(models.Complaint.id == complaint_id).first()
+        if not complaint or not complaint.assigned_officer_id or complaint.status in CLOSED_STATUSES:
+            skipped += 1
+            continue
+
+        text, outcome = ensure_summary(db, complaint, llm_gate=_llm_gate)
+        if text is None:
+            # Rate limited: hand the rest to a delayed continuation job
+            run_id = payload.get("backfill_run")
+            prefix = _batch_key(run_id, payload.get("batch")) if run_id else SUMMARY_JOB
+            enqueue(
+                db,
+                SUMMARY_JOB,
+                f"{prefix}:continue:{job.id}",
+                payload={**payload, "complaint_ids": ids[position:]},
+                delay_seconds=outcome
+            )
+            db.commit()
+            logger.info(f"Summary job #{job.id}: rate limited, {len(ids) - position} deferred by {outcome:.1f}s")
+            break
+        if outcome == "cache":
+            cached += 1
+        else:
+            generated += 1
+
+    logger.info(f"Summary job #{job.id}: {generated} generated, {cached} already fresh, {skipped} skipped")
+
+
+def open_complaint_ids(db: Session):
+    return [row[0] for row in db.query(models.Complaint.id).filter(
+        models.Complaint.assigned_officer_id.isnot(None),
+        models.Complaint.status.notin_(CLOSED_STATUSES),
+        models.Complaint.is_archived == False
+    ).order_by(models.Complaint.id).all()]
+
+
+def start_backfill(db: Session, requested_by: str, complaint_ids: list = None) -> models.BackgroundJob:
+    """
+    Creates a backfill run over all open assigned complaints, or the given ones
+    (caller commits). The run's job fans out into SUMMARY_BATCH_SIZE-sized summary jobs.
+    """
+    ids = open_complaint_ids(db) if complaint_ids is None else list(complaint_ids)
+    run = enqueue(
+        db,
+        BACKFILL_JOB,
+        f"{BACKFILL_JOB}:{datetime.utcnow().isoformat()}",
+        payload={"complaint_ids": ids, "requested_by": requested_by}
+    )
+    db.flush()
+    return run
+
+
+def _batch_key(run_id: int, batch: int) -> str:
+    return f"{SUMMARY_JOB}:backfill:{run_id}:{batch}"
+
+
+@register_handler(BACKFILL_JOB)
+def fan_out_backfill(db: Session, job: models.BackgroundJob):
+    ids = job_payload(job).get("complaint_ids", [])
+    size = settings.SUMMARY_BATCH_SIZE
+    for batch, start in enumerate(range(0, len(ids), size)):
+        enqueue(
+            db,
+            SUMMARY_JOB,
+            _batch_key(job.id, batch),
+            payload={"complaint_ids": ids[start:start + size], "backfill_run": job.id, "batch": batch}
+        )
+    db.commit()
+    notify()
+    logger.info(f"Summary backfill #{job.id}: {len(ids)} complaints in batches of {size}")
+
+
+def backfill_progress(db: Session, run: models.BackgroundJob) -> dict:
+    """
+    Progress of a backfill run: how many of its complaints have an up-to-date
+    summary, plus the state of its batch jobs.
+    """
+    ids = job_payload(run).get("complaint_ids", [])
+    Job = models.BackgroundJob
+    batch_jobs = db.query(Job.status).filter(
+        Job.job_type == SUMMARY_JOB,
+        Job.idempotency_key.like(f"{SUMMARY_JOB}:backfill:{run.id}:%")
+    ).all()
+    jobs = {status: 0 for status in (PENDING, RUNNING, DONE, FAILED)}
+    for (status,) in batch_jobs:
+        jobs[status] = jobs.get(status, 0) + 1
+
+    fresh = 0
+    for chunk in chunks(ids):
+        rows = db.query(
+            models.Complaint.title, models.Complaint.description, models.ComplaintAISummary.description_hash
+        ).join(
+            models.ComplaintAISummary, models.ComplaintAISummary.complaint_id == models.Complaint.id
+        ).filter(models.Complaint.id.in_(chunk)).all()
+        fresh += sum(
+            1 for title, description, memo in rows
+            if memo == hashlib.sha256(f"{title}{description}".encode('utf-8')).hexdigest()
+        )
+
+    total = len(ids)
+    return {
+        "run_id": run.id,
+        "status": run.status,
+        "requested_by": job_payload(run).get("requested_by"),
+        "created_at": run.created_at,
+        "total": total,
+        "summarized": fresh,
+        "percent": round(100.0 * fresh / total, 1) if total else 100.0,
+        "batch_jobs": jobs
+    }
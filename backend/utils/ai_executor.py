@@ -0,0 +1,115 @@
+"""
+Async bridge for blocking AI calls (Gemini SDK, file I/O).
+
+Blocking calls run on a dedicated thread pool, sized independently of
+FastAPI/AnyIO's default pool so slow AI work cannot starve sync endpoints.
+An asyncio semaphore bounds in-flight calls, every call has a timeout, and
+callers can pass the Request so the work is abandoned when the client disconnects.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 16
+DISCONNECT_POLL_SECONDS = 0.25
+
+
+class AICallTimeout(Exception):
+    pass
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class AIExecutor:
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ai-call")
+        self._semaphores = {}  # event loop -> Semaphore (asyncio primitives are loop-bound)
+        self.in_flight = 0
+        self.waiting = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = sem
+        return sem
+
+    async def run(self, fn, *args, timeout: float = 30.0, request: Request = None, **kwargs):
+        """
+        Runs `fn(*args, **kwargs)` on the AI pool.
+        Raises AICallTimeout if it (including queueing) exceeds `timeout`,
+        ClientDisconnected if `request`'s client goes away first.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        sem = self._semaphore()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(sem.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise AICallTimeout(f"No AI worker available within {timeout}s")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        future = loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+        watcher = asyncio.ensure_future(self._watch_disconnect(request)) if request is not None else None
+        try:
+            waiters = {future} | ({watcher} if watcher else set())
+            remaining = max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait(waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+            if future in done:
+                return future.result()
+            # The worker thread cannot be interrupted; we stop waiting and drop its result
+            future.cancel()
+            if watcher in done:
+                logger.info(f"Client disconnected; abandoning {getattr(fn, '__name__', fn)}")
+                raise ClientDisconnected()
+            raise AICallTimeout(f"{getattr(fn, '__name__', fn)} exceeded {timeout}s")
+        finally:
+            if watcher:
+                watcher.cancel()
+            self.in_flight -= 1
+            sem.release()
+
+    @staticmethod
+    async def _watch_disconnect(request: Request):
+        while not await request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting
+        }
+
+
+_executor = None
+
+
+def get_ai_executor() -> AIExecutor:
+    global _executor
+    if _executor is None:
+        try:
+            from ..config import settings
+            _executor = AIExecutor(settings.AI_MAX_CONCURRENCY)
+        except Exception:
+            _executor = AIExecutor()
+    return _executor
+
+
+async def run_ai_call(fn, *args, timeout: float = 30.0, request: Request = None, **kwargs):
+    """Shorthand for get_ai_executor().run(...)."""
+    return await get_ai_executor().run(fn, *args, timeout=timeout, request=request, **kwargs)
@@ -1,13 +1,14 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, and_
 from .. import models
 import logging
+from datetime import datetime
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-# Copied from backend/routes/complaint_routes.py to avoid circular imports or refactoring issues
-# Ideally this would be in a shared config, but constraints prevent refactoring.
+# Keyword fallback for resolve_department (first keyword found in the text decides);
+# resolved to department ids once by the department registry (departments.py)
 DEPARTMENT_MAP = {
     "water": "Water Supply Department",
     "leak": "Water Supply Department",
@@ -29,103 +30,117 @@ DEPARTMENT_MAP = {
 
 ACTIVE_STATUSES = ["NEW", "ASSIGNED", "IN_PROGRESS"]
 
-def resolve_department(db: Session, ai_department_name: str, complaint_text: str) -> models.Department:
+# SLA Hours Mapping (India Govt Standard)
+SLA_HOURS = {
+    "Critical": 24,
+    "High": 48,
+    "Medium": 120,  # 5 days
+    "Low": 168  # 7 days
+}
+
+def resolve_department(db: Session, ai_department_name: str, complaint_text: str):
     """
     Resolves the correct department for a complaint.
     Logic:
-    1. Check if AI-suggested department exists in DB.
+    1. AI-suggested department (name in any case, or an INDIA_GOVT_DEPARTMENTS category).
     2. Fallback to keyword matching using DEPARTMENT_MAP.
-    3. Fallback to "General Grievance Cell".
+    3. Fallback to "General Grievance Cell" (None if it does not exist).
+    Dict lookups in the cached department registry (departments.py): no queries once loaded.
+    Returns a DepartmentRef (id, name).
     """
-    department = None
-    
-    # 1. Try AI Department Name
-    if ai_department_name:
-        department = db.query(models.Department).filter(
-            func.lower(models.Department.name) == ai_department_name.lower()
-        ).first()
-        
-    if department:
-        return department
-
-    # 2. Fallback to Keyword Matching
-    text_lower = complaint_text.lower()
-    dept_name = None
-    
-    for keyword, name in DEPARTMENT_MAP.items():
-        if keyword in text_lower:
-            dept_name = name
-            break
-            
-    if dept_name:
-        department = db.query(models.Department).filter(models.Department.name == dept_name).first()
-        if department:
-            return department
-
-    # 3. Fallback to General Grievance Cell
-    department = db.query(models.Department).filter(models.Department.name == "General Grievance Cell").first()
-    
-    # If General Grievance Cell doesn't exist, we might need to create it or handle it.
-    # The existing code in complaint_routes.py creates it if missing.
-    # To be safe and idempotent, we return whatever we found or None if truly nothing exists (unlikely if DB seeded).
-    
-    return department
+    from .. import departments
+    return departments.get_registry(db).resolve(ai_department_name, complaint_text)
+
+def officer_load_query(db: Session, department_id: int):
+    """
+    Active officers of a department with their load (active complaints), least loaded first.
+    One grouped query: officers LEFT JOIN their active complaints (idx_complaints_officer_status);
+    ties go to the lower officer id.
+    """
+    load = func.count(models.Complaint.id)
+    return db.query(models.Officer, load.label("load")).outerjoin(
+        models.Complaint,
+        and_(
+            models.Complaint.assigned_officer_id == models.Officer.id,
+            models.Complaint.status.in_(ACTIVE_STATUSES)
+        )
+    ).filter(
+        models.Officer.department_id == department_id,
+        models.Officer.status == "Active"
+    ).group_by(models.Officer.id).order_by(load, models.Officer.id)
+
+def all_officer_loads(db: Session) -> list:
+    """(officer id, department id, status, load) for every officer, in one grouped query."""
+    load = func.count(models.Complaint.id)
+    return db.query(
+        models.Officer.id, models.Officer.department_id, models.Officer.status, load
+    ).outerjoin(
+        models.Complaint,
+        and_(
+            models.Complaint.assigned_officer_id == models.Officer.id,
+            models.Complaint.status.in_(ACTIVE_STATUSES)
+        )
+    ).group_by(models.Officer.id).all()
+
+def least_loaded_officer(db: Session, department_id: int):
+    """(officer, load) with the fewest active complaints, or None if the department has no active officers."""
+    row = officer_load_query(db, department_id).first()
+    return (row[0], row[1]) if row else None
+
+def assign_officer(db: Session, complaint: models.Complaint, officer_id: int, status: str = "ASSIGNED"):
+    """
+    Points the complaint at an officer with what every assignment path needs
+    (caller writes its history / timeline rows and commits): assigned_at, the
+    SLA deadline and escalation thresholds of its policy, and the officer's
+    pre-generated AI summary. `status=None` keeps the current status (reassignment).
+    Flushes before the summary job, so a concurrent change fails the version
+    check first (see utils/optimistic.py).
+    """
+    from .. import escalation, summaries
+
+    complaint.assigned_officer_id = officer_id
+    complaint.assigned_at = datetime.utcnow()
+    if status:
+        complaint.status = status
+    escalation.apply_sla(db, complaint, complaint.assigned_at)
+    db.flush()
+    summaries.enqueue_summary(db, complaint)
 
 def assign_to_best_officer(db: Session, complaint_id: int, department_id: int):
     """
     Auto-assigns a complaint to the officer with the lowest load in the department.
+    Returns the officer id, or None when nothing was assigned. Safe against
+    concurrent assignment: the complaint row is claimed with FOR UPDATE SKIP
+    LOCKED (Postgres) and written with a version check (retried on conflict).
     """
     logger.info(f"Attempting auto-assignment for Complaint #{complaint_id} in Department #{department_id}")
-    
-    try:
-        # Start Transaction
-        
-        # 1. Idempotency Guard
-        complaint = db.query(models.Complaint).filter(models.Complaint.id == complaint_id).first()
+    from .. import workload, job_queue
+    from .optimistic import retry_on_conflict
+
+    def attempt():
+        # 1. Idempotency Guard (a row locked by another assigner is skipped, not waited for)
+        complaint = db.query(models.Complaint).filter(
+            models.Complaint.id == complaint_id
+        ).with_for_update(skip_locked=True).first()
         if not complaint:
-            logger.warning(f"Complaint #{complaint_id} not found.")
-            return
+            logger.warning(f"Complaint #{complaint_id} not found (or being assigned by another worker).")
+            return None
 
         if complaint.assigned_officer_id:
             logger.info(f"Complaint #{complaint_id} already assigned to Officer #{complaint.assigned_officer_id}. Skipping.")
-            return
-
-        # 2. Find Candidate Officers in Department
-        # Must be Active
-        officers = db.query(models.Officer).filter(
-            models.Officer.department_id == department_id,
-            models.Officer.status == "Active" 
-        ).all()
-        
-        if not officers:
-            logger.info(f"No active officers found for Department #{department_id}. Assignment skipped.")
-            return
-            
-        logger.info(f"Found {len(officers)} active officers.")
+            return None
 
-        # 3. Calculate Load
-        best_officer = None
-        min_load = float('inf')
-        
-        for officer in officers:
-            load = db.query(models.Complaint).filter(
-                models.Complaint.assigned_officer_id == officer.id,
-                models.Complaint.status.in_(ACTIVE_STATUSES)
-            ).count()
-            # logger.debug(f"Officer {officer.id} ...") # Optional debug
-            
-            if load < min_load:
-                min_load = load
-                best_officer = officer
-        
-        if not best_officer:
-             logger.warning(f"Could not determine best officer for Department #{department_id}.")
-             return
+        # 2 + 3. Least-loaded active officer in the department (in-memory workload heap)
+        best = workload.least_loaded_officer_id(db, department_id)
+        if not best:
+            logger.info(f"No active officers found for Department #{department_id}. Assignment skipped.")
+            return None
+        best_officer_id, min_load = best
+        workload.reserve(db, best_officer_id)
 
-        # 4. Assign
-        complaint.assigned_officer_id = best_officer.id
-        complaint.status = "ASSIGNED"
+        # 4. Assign (SLA, officer summary; version-checked flush)
         complaint.assigned_by_admin_id = None # System assignment
+        assign_officer(db, complaint, best_officer_id)
         
         # 5. Timeline Entry
         timeline_entry = models.GrievanceTimeline(
@@ -139,10 +154,15 @@ def assign_to_best_officer(db: Session, complaint_id: int, department_id: int):
         # 6. Commit
         db.commit()
         db.refresh(complaint)
+        job_queue.notify()
         
-        logger.info(f"Successfully auto-assigned Complaint #{complaint_id} to Officer #{best_officer.id} (Load: {min_load})")
+        logger.info(f"Successfully auto-assigned Complaint #{complaint_id} to Officer #{best_officer_id} (Load: {min_load})")
+        return best_officer_id
 
+    try:
+        return retry_on_conflict(db, attempt)
     except Exception as e:
         db.rollback()
         logger.error(f"DB Error during auto-assignment: {str(e)}")
+        return None
 
@@ -0,0 +1,132 @@
+"""
+Balanced assignment of the unassigned backlog to active officers (bulk_assignment.py).
+
+Officer load is measured in units of work: a complaint counts
+REFERENCE_HOURS / its SLA hours (Medium = 1, Critical = 5, Low ~ 0.7), for
+the open complaints an officer already has as well as the new ones.
+Complaints are taken earliest SLA deadline first (created_at + SLA hours,
+so priority and age both count), and each goes to the officer of its
+department with the lowest load. An officer of the complaint's ward wins
+unless they carry more than `ward_penalty` units above the least-loaded
+officer elsewhere in the department.
+
+Officers sit in min-heaps per department and per (department, ward)
+(load_heap.DepartmentHeap), so planning is O(m log n) for m complaints.
+This is greedy list scheduling, not an exact optimum: an exact solver
+(Hungarian / min-cost flow) over m x n costs is far too slow at 50k x 500.
+"""
+import time
+from datetime import datetime, timedelta
+
+from .load_heap import DepartmentHeap
+from .minhash import ward_key
+
+REFERENCE_HOURS = 120  # Medium priority SLA = one unit of work
+DEFAULT_SLA_HOURS = 120
+
+
+class BacklogItem:
+    __slots__ = ("id", "department_id", "priority", "ward", "sla_hours", "due")
+
+    def __init__(self, complaint_id, department_id, priority, location, created_at, sla_hours_map):
+        self.id = complaint_id
+        self.department_id = department_id
+        self.priority = priority or "Medium"
+        self.ward = ward_key(location) if location else None
+        self.sla_hours = sla_hours_map.get(self.priority, DEFAULT_SLA_HOURS)
+        self.due = (created_at or datetime.utcnow()) + timedelta(hours=self.sla_hours)
+
+
+def work_units(sla_hours) -> float:
+    return REFERENCE_HOURS / (sla_hours or DEFAULT_SLA_HOURS)
+
+
+class AssignmentPlan:
+    def __init__(self):
+        self.assignments = []  # (complaint id, officer id, sla hours, ward match)
+        self.skipped = {"no_department": [], "no_active_officers": []}
+        self.officers = {}  # officer id -> {"department_id", "current_load", "new_assignments", "load_units"}
+        self.items = {}  # complaint id -> BacklogItem
+        self.planning_ms = 0.0
+
+    def to_dict(self, limit: int = 1000) -> dict:
+        """Summary + the first `limit` assignments (JSON-ready)."""
+        touched = [
+            {"officer_id": o, **stats, "projected_load": stats["current_load"] + stats["new_assignments"]}
+            for o, stats in self.officers.items() if stats["new_assignments"]
+        ]
+        touched.sort(key=lambda s: (s["department_id"] or 0, s["officer_id"]))
+        for stats in touched:
+            stats["load_units"] = round(stats["load_units"], 2)
+        return {
+            "backlog": len(self.assignments) + sum(len(ids) for ids in self.skipped.values()),
+            "assigned": len(self.assignments),
+            "ward_matches": sum(1 for a in self.assignments if a[3]),
+            "skipped": {reason: len(ids) for reason, ids in self.skipped.items()},
+            "skipped_ids": {reason: ids[:limit] for reason, ids in self.skipped.items() if ids},
+            "planning_ms": round(self.planning_ms, 1),
+            "officers": touched,
+            "assignments": [
+                {
+                    "complaint_id": cid,
+                    "officer_id": oid,
+                    "priority": self.items[cid].priority,
+                    "sla_hours": hours,
+                    "ward_match": match
+                }
+                for cid, oid, hours, match in self.assignments[:limit]
+            ]
+        }
+
+
+def plan_assignments(items, officers, loads, ward_penalty: float = 2.0) -> AssignmentPlan:
+    """
+    items: BacklogItems. officers: (officer id, department id, ward) of active officers.
+    loads: officer id -> (open complaints, load units).
+    """
+    start = time.perf_counter()
+    plan = AssignmentPlan()
+    heaps = {}  # (department id, ward key or None) -> DepartmentHeap
+    officer_ward = {}
+    units = {}
+    for officer_id, department_id, ward in officers:
+        count, load = loads.get(officer_id, (0, 0.0))
+        key = ward_key(ward) if ward else None
+        officer_ward[officer_id] = key
+        units[officer_id] = load
+        plan.officers[officer_id] = {
+            "department_id": department_id, "current_load": count, "new_assignments": 0, "load_units": load
+        }
+        heaps.setdefault((department_id, None), DepartmentHeap()).set(officer_id, load)
+        if key:
+            heaps.setdefault((department_id, key), DepartmentHeap()).set(officer_id, load)
+
+    for item in sorted(items, key=lambda i: (i.due, i.id)):
+        plan.items[item.id] = item
+        if not item.department_id:
+            plan.skipped["no_department"].append(item.id)
+            continue
+        department = heaps.get((item.department_id, None))
+        best = department.peek() if department else None
+        if not best:
+            plan.skipped["no_active_officers"].append(item.id)
+            continue
+
+        officer_id, load = best
+        if item.ward and officer_ward[officer_id] != item.ward:
+            local = heaps.get((item.department_id, item.ward))
+            local_best = local.peek() if local else None
+            if local_best and local_best[1] <= load + ward_penalty:
+                officer_id, load = local_best
+
+        load = units[officer_id] = load + work_units(item.sla_hours)
+        department.set(officer_id, load)
+        if officer_ward[officer_id]:
+            heaps[(item.department_id, officer_ward[officer_id])].set(officer_id, load)
+        stats = plan.officers[officer_id]
+        stats["new_assignments"] += 1
+        stats["load_units"] = load
+        plan.assignments.append((item.id, officer_id, item.sla_hours, bool(item.ward) and officer_ward[officer_id] == item.ward))
+
+    plan.planning_ms = (time.perf_counter() - start) * 1000
+    return plan
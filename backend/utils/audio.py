@@ -0,0 +1,80 @@
+"""
+Optional server-side audio downsampling before transcription.
+
+Voice notes from the browser arrive as 48 kHz stereo WebM/Opus. Re-encoding to
+16 kHz mono Opus (what speech models use anyway) shrinks the Gemini upload
+several times. ffmpeg runs with stdin/stdout pipes (no temp files) inside a
+small process pool so codec work never runs in the API process.
+Enabled with Settings.AI_TRANSCRIBE_DOWNSAMPLE; skipped when ffmpeg is missing.
+"""
+import asyncio
+import logging
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+OPUS_MIME_TYPE = "audio/ogg"
+FFMPEG_ARGS = [
+    "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+    "-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "24k", "-application", "voip",
+    "-f", "ogg", "pipe:1"
+]
+
+
+def transcode_to_opus(data: bytes, timeout: float = 30.0) -> bytes:
+    """Runs in a pool process: returns 16 kHz mono Ogg/Opus bytes."""
+    result = subprocess.run(
+        ["ffmpeg"] + FFMPEG_ARGS, input=bytes(data),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout, check=False
+    )
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip()[:500] or "ffmpeg failed")
+    return result.stdout
+
+
+_pool = None
+_ffmpeg = None
+
+
+def ffmpeg_available() -> bool:
+    global _ffmpeg
+    if _ffmpeg is None:
+        _ffmpeg = shutil.which("ffmpeg") is not None
+        if not _ffmpeg:
+            logger.warning("ffmpeg not found; audio downsampling disabled")
+    return _ffmpeg
+
+
+def get_transcode_pool(workers: int = 2) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def shutdown_transcode_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def downsample_for_transcription(data, workers: int = 2, timeout: float = 30.0):
+    """
+    Returns (bytes, mime_type) of the 16 kHz mono Opus version,
+    or None if ffmpeg is unavailable or transcoding failed (caller keeps the original).
+    """
+    if not ffmpeg_available():
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        transcoded = await asyncio.wait_for(
+            loop.run_in_executor(get_transcode_pool(workers), transcode_to_opus, data, timeout),
+            timeout + 5
+        )
+        return transcoded, OPUS_MIME_TYPE
+    except Exception as e:
+        logger.warning(f"Audio downsampling failed, uploading original: {e}")
+        return None
@@ -0,0 +1,70 @@
+"""
+Apply-on-commit hooks for in-process state that follows ORM writes.
+
+A module registers a named hook on a session class or factory: at every
+flush its collector turns the session's pending objects into changes, kept
+in session.info; after the commit its applier receives everything collected
+(plus changes deferred by Core / bulk SQL writes), and a rollback drops
+them. Caches and in-memory indexes therefore only ever see committed
+changes. One set of listeners per target serves all of its hooks.
+"""
+import logging
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_KEY = "commit_hooks"
+_hooks = {}  # target -> {name: (collect, apply)}, applied in registration order
+
+
+def register(target, name: str, collect, apply):
+    """
+    `collect(session)` returns the changes of one flush (a list, may be empty);
+    `apply(session, changes)` runs after a commit that collected or deferred any.
+    Registering a name again replaces its functions (idempotent).
+    """
+    hooks = _hooks.get(target)
+    if hooks is None:
+        hooks = _hooks[target] = {}
+        event.listen(target, "after_flush", lambda session, flush_context: _collect(session, hooks))
+        event.listen(target, "after_commit", lambda session: _apply(session, hooks))
+        event.listen(target, "after_rollback", lambda session: _discard(session, hooks))
+    hooks[name] = (collect, apply)
+
+
+def is_registered(target, name: str) -> bool:
+    return name in _hooks.get(target, ())
+
+
+def defer(session, name: str, changes):
+    """Changes written without ORM history (Core / bulk SQL), applied with the hook's others on commit."""
+    session.info.setdefault(_KEY, {}).setdefault(name, []).extend(changes)
+
+
+def _collect(session, hooks):
+    for name, (collect, _) in hooks.items():
+        changes = collect(session)
+        if changes:
+            defer(session, name, changes)
+
+
+def _apply(session, hooks):
+    pending = session.info.get(_KEY)
+    if not pending:
+        return
+    for name, (_, apply) in hooks.items():
+        changes = pending.pop(name, None)
+        if changes:
+            try:
+                apply(session, changes)
+            except Exception:
+                # Already committed: a failing hook must not fail the request or skip the others
+                logger.exception(f"Commit hook '{name}' failed")
+
+
+def _discard(session, hooks):
+    pending = session.info.get(_KEY)
+    if pending:
+        for name in hooks:
+            pending.pop(name, None)
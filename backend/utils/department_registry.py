@@ -0,0 +1,73 @@
+"""
+In-process lookup tables for routing a complaint to a Department
+(assignment_logic.resolve_department, kept fresh by departments.py).
+
+Built from the departments table in one query, then resolution is dict
+lookups: case-folded names, aliases (INDIA_GOVT_DEPARTMENTS category ->
+its full_name's department), the DEPARTMENT_MAP keywords with their
+department resolved up front, and the General Grievance Cell.
+"""
+from collections import namedtuple
+
+GENERAL_GRIEVANCE_CELL = "General Grievance Cell"
+
+# What resolve_department returns: callers only need the id (and name for logs)
+DepartmentRef = namedtuple("DepartmentRef", ["id", "name"])
+
+
+def _fold(name: str) -> str:
+    return name.lower()
+
+
+class DepartmentRegistry:
+    def __init__(self, rows, govt_departments: dict = None, keyword_map: dict = None):
+        """
+        rows: (id, name) of every department, lowest id first (wins on case-insensitive clashes).
+        govt_departments: ai_utils.INDIA_GOVT_DEPARTMENTS. keyword_map: DEPARTMENT_MAP.
+        """
+        self.by_id = {}
+        self.by_name = {}
+        for department_id, name in rows:
+            ref = DepartmentRef(department_id, name)
+            self.by_id[department_id] = ref
+            if name:
+                self.by_name.setdefault(_fold(name), ref)
+
+        self.aliases = {}
+        for category, info in (govt_departments or {}).items():
+            ref = self.by_name.get(_fold(info.get("full_name", "")))
+            if ref:
+                self.aliases.setdefault(_fold(category), ref)
+
+        # In DEPARTMENT_MAP order: the first keyword in the text decides, even if its department is missing
+        self.keywords = [(keyword, self.by_name.get(_fold(name))) for keyword, name in (keyword_map or {}).items()]
+        self.general = self.by_name.get(_fold(GENERAL_GRIEVANCE_CELL))
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def lookup(self, name: str):
+        """Department by name (any case) or alias, or None."""
+        if not name:
+            return None
+        key = _fold(name)
+        return self.by_name.get(key) or self.aliases.get(key)
+
+    def resolve(self, ai_department_name: str, complaint_text: str):
+        """
+        1. AI-suggested department (name or alias)
+        2. First DEPARTMENT_MAP keyword in the text
+        3. General Grievance Cell (None if it does not exist)
+        """
+        department = self.lookup(ai_department_name)
+        if department:
+            return department
+
+        text_lower = (complaint_text or "").lower()
+        for keyword, department in self.keywords:
+            if keyword in text_lower:
+                if department:
+                    return department
+                break
+
+        return self.general
@@ -0,0 +1,139 @@
+"""
+Per-draft analysis state for live typing in the complaint form.
+
+The form sends the whole description every few hundred ms with a client-generated
+draft id. Each DraftSession keeps the keyword automaton state and word-token
+counts for the text it last saw, so an update only processes the characters
+after the first edit (usually just the appended delta). Sessions live in a
+bounded LRU with an idle TTL.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .keyword_matcher import IncrementalScan, TaggedKeywordMatcher
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class DraftSession:
+    def __init__(self, draft_id: str, matcher: TaggedKeywordMatcher):
+        self.draft_id = draft_id
+        self.scan = IncrementalScan(matcher)
+        self.lock = threading.Lock()
+        self.updates = 0
+        self.chars_processed = 0
+        self.touched_at = time.monotonic()
+
+        # Word tokens of the current text: (end offset, token), plus counts
+        self._tokens = []
+        self.token_counts = {}
+
+        # Stability tracking / one-shot LLM refinement
+        self.last_label = None
+        self.stable_updates = 0
+        self.llm_requested = False
+        self.llm_text = None
+        self.llm_result = None
+
+    @property
+    def word_count(self) -> int:
+        return len(self._tokens)
+
+    def update(self, text: str) -> int:
+        """Applies the new text; returns the number of characters (re)processed."""
+        previous = self.scan.text
+        processed = self.scan.update(text)
+        lowered = self.scan.text
+        start = len(lowered) - processed
+
+        # A token ending before the first changed character cannot change
+        # (the character after it is a non-word char in the unchanged prefix).
+        tokens = self._tokens
+        while tokens and tokens[-1][0] >= start:
+            _, token = tokens.pop()
+            self.token_counts[token] -= 1
+            if not self.token_counts[token]:
+                del self.token_counts[token]
+        resume = tokens[-1][0] if tokens else 0
+        for m in TOKEN_RE.finditer(lowered, resume):
+            tokens.append((m.end(), m.group()))
+            self.token_counts[m.group()] = self.token_counts.get(m.group(), 0) + 1
+
+        if previous != lowered:
+            self.updates += 1
+        self.chars_processed += processed
+        self.touched_at = time.monotonic()
+        return processed
+
+    def observe_label(self, label) -> int:
+        """Counts consecutive updates that produced the same (category, priority)."""
+        if label == self.last_label:
+            self.stable_updates += 1
+        else:
+            self.last_label = label
+            self.stable_updates = 0
+        return self.stable_updates
+
+    def llm_result_applies(self) -> bool:
+        """A refinement stays valid unless the draft was largely rewritten since."""
+        if not self.llm_result or not self.llm_text:
+            return False
+        shared = len(os.path.commonprefix([self.llm_text, self.scan.text]))
+        return shared >= len(self.llm_text) // 2
+
+
+class DraftSessionStore:
+    """
+    LRU of DraftSession objects, bounded by count and idle time.
+    """
+
+    def __init__(self, matcher: TaggedKeywordMatcher, max_sessions: int = 1000, ttl_seconds: float = 1800):
+        self.matcher = matcher
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def get(self, draft_id: str) -> DraftSession:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(draft_id)
+            if session is not None and now - session.touched_at > self.ttl_seconds:
+                del self._sessions[draft_id]
+                self.expired += 1
+                session = None
+            if session is None:
+                session = DraftSession(draft_id, self.matcher)
+                self._sessions[draft_id] = session
+                self.created += 1
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._sessions.move_to_end(draft_id)
+            return session
+
+    def discard(self, draft_id: str):
+        with self._lock:
+            self._sessions.pop(draft_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "active": len(sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "created": self.created,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "updates": sum(s.updates for s in sessions),
+            "chars_processed": sum(s.chars_processed for s in sessions),
+            "llm_refined": sum(1 for s in sessions if s.llm_requested)
+        }
@@ -0,0 +1,118 @@
+"""
+SLA escalation policies and tiers (escalation.py runs them).
+
+A policy is keyed by (department, priority); NULL in either column is a
+wildcard. Lookup order: (department, priority), (department, any),
+(any, priority), then the built-in SLA_HOURS with the default thresholds.
+
+Tiers, in SLA terms (assigned at T, SLA of H hours, deadline T + H):
+1 WARN       officer notified at T + warn_pct * H (default 80%)
+2 DEPT_HEAD  department head notified at the deadline (breach)
+3 ADMIN      complaint enters the admin escalation queue at T + admin_multiple * H (default 2x)
+The thresholds are stored on the complaint when its SLA is set
+(sla_warn_at, sla_deadline, sla_admin_at), along with next_escalation_at,
+the threshold of its next tier. That one indexed column finds everything
+due, whatever the tier; each tier then moves it on to the next threshold
+(NEXT_COLUMN). Tiers run highest first, so a complaint found already past
+2x goes straight to the admin queue without the two earlier notices.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+DEFAULT_SLA_HOURS = 120
+DEFAULT_WARN_PCT = 0.8
+DEFAULT_ADMIN_MULTIPLE = 2.0
+
+WARN, DEPT_HEAD, ADMIN = 1, 2, 3
+TIERS = (WARN, DEPT_HEAD, ADMIN)
+TIER_NAMES = {WARN: "officer_warning", DEPT_HEAD: "department_head", ADMIN: "admin_queue"}
+TIER_COLUMNS = {WARN: "sla_warn_at", DEPT_HEAD: "sla_deadline", ADMIN: "sla_admin_at"}
+NEXT_COLUMN = {WARN: "sla_deadline", DEPT_HEAD: "sla_admin_at", ADMIN: None}
+
+# Most senior first: the department head is the senior-most active officer
+DESIGNATION_RANK = {"SE": 0, "EE": 1, "AE": 2, "Supervisor": 3, "Inspector": 4, "JE": 5}
+
+Policy = namedtuple("Policy", ["sla_hours", "warn_pct", "admin_multiple", "source"])
+
+
+class PolicyTable:
+    """Immutable lookup over the escalation_policies rows."""
+
+    def __init__(self, rows, default_hours: dict):
+        """rows: (department_id, priority, sla_hours, warn_pct, admin_multiple); default_hours: priority -> hours."""
+        self.default_hours = dict(default_hours)
+        self.rows = {}
+        for department_id, priority, sla_hours, warn_pct, admin_multiple in rows:
+            key = (department_id, priority)
+            self.rows[key] = Policy(
+                sla_hours,
+                warn_pct if warn_pct is not None else DEFAULT_WARN_PCT,
+                admin_multiple if admin_multiple is not None else DEFAULT_ADMIN_MULTIPLE,
+                "department" if department_id is not None else ("priority" if priority is not None else "global")
+            )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, department_id, priority) -> Policy:
+        priority = priority or "Medium"
+        for key in ((department_id, priority), (department_id, None), (None, priority), (None, None)):
+            policy = self.rows.get(key)
+            if policy is not None:
+                return policy
+        return Policy(self.default_hours.get(priority, DEFAULT_SLA_HOURS), DEFAULT_WARN_PCT, DEFAULT_ADMIN_MULTIPLE, "default")
+
+    def hours_by_priority(self, department_id) -> dict:
+        """priority -> SLA hours in this department (bulk assignment planner)."""
+        return {priority: self.lookup(department_id, priority).sla_hours for priority in self.default_hours}
+
+
+def sla_window(policy: Policy, start: datetime = None) -> dict:
+    """Complaint SLA columns for an assignment made at `start`."""
+    start = start or datetime.utcnow()
+    hours = policy.sla_hours
+    warn_at = start + timedelta(hours=hours * policy.warn_pct)
+    return {
+        "sla_hours": hours,
+        "sla_deadline": start + timedelta(hours=hours),
+        "sla_warn_at": warn_at,
+        "sla_admin_at": start + timedelta(hours=hours * policy.admin_multiple),
+        "escalation_level": 0,
+        "next_escalation_at": warn_at
+    }
+
+
+def pick_head(officers):
+    """officers: (id, designation, ...) of one department's active officers -> the senior-most, lowest id on ties."""
+    return min(officers, key=lambda o: (DESIGNATION_RANK.get(o[1], len(DESIGNATION_RANK)), o[0]), default=None)
+
+
+class TierMetrics:
+    """Running totals of one tier (throughput in /admin/escalations/metrics)."""
+
+    def __init__(self):
+        self.runs = 0
+        self.escalated = 0
+        self.notifications = 0
+        self.seconds = 0.0
+        self.last_run = None
+        self.last_count = 0
+
+    def record(self, escalated: int, notifications: int, seconds: float):
+        self.runs += 1
+        self.escalated += escalated
+        self.notifications += notifications
+        self.seconds += seconds
+        self.last_run = datetime.utcnow()
+        self.last_count = escalated
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "escalated": self.escalated,
+            "notifications": self.notifications,
+            "seconds": round(self.seconds, 3),
+            "per_second": round(self.escalated / self.seconds, 1) if self.seconds else None,
+            "last_run": self.last_run,
+            "last_count": self.last_count
+        }
@@ -0,0 +1,96 @@
+"""
+Declarative rule table for the rule-based summary and priority heuristics.
+Compiled by utils/rule_engine.py; edits are picked up without a restart.
+
+Each rule:
+- id:            stable name, reported in "rules fired"
+- group:         see GROUPS
+- terms:         lower-case words/phrases, matched on word boundaries;
+                 a trailing * also matches the rest of the word ("injur*")
+- categories / priorities / intensified: extra conditions, checked by the caller
+- insight / set_priority: what the rule does
+"""
+
+# "first": only the first firing rule of the group (table order) applies
+# "all":   every firing rule applies, in table order
+GROUPS = {
+    "summary.risk": "first",
+    "summary.location": "first",
+    "summary.priority": "first",
+    "priority": "all",
+}
+
+RULES = [
+    # --- Officer summary: risk ---
+    {
+        "id": "summary.risk.public_safety",
+        "group": "summary.risk",
+        "terms": ["accident*", "injur*", "death*", "casualt*", "hurt*"],
+        "insight": "poses a public safety risk",
+    },
+    {
+        "id": "summary.risk.electrocution",
+        "group": "summary.risk",
+        "terms": ["wire", "wires", "wiring", "shock*", "current", "spark*"],
+        "insight": "presents an electrocution hazard",
+    },
+
+    # --- Officer summary: location severity ---
+    {
+        "id": "summary.location.high_traffic",
+        "group": "summary.location",
+        "terms": ["highway*", "nh16", "nh-16", "national highway", "main road*", "traffic"],
+        "insight": "on a high-traffic route",
+    },
+
+    # --- Officer summary: priority emphasis ---
+    {
+        "id": "summary.priority.critical",
+        "group": "summary.priority",
+        "priorities": ["Critical"],
+        "insight": "requires immediate attention",
+    },
+    {
+        "id": "summary.priority.high",
+        "group": "summary.priority",
+        "priorities": ["High"],
+        "insight": "needs prompt maintenance",
+    },
+
+    # --- Classification priority heuristics (rule-based fallback) ---
+    {
+        "id": "priority.public_safety_floor",
+        "group": "priority",
+        "categories": ["Public Safety & Law Enforcement"],
+        "priorities": ["Low", "Medium"],
+        "set_priority": "High",
+    },
+    {
+        "id": "priority.electrical_hazard",
+        "group": "priority",
+        "categories": ["Electricity & Power Supply"],
+        "priorities": ["Low"],
+        "terms": ["wire", "wires", "wiring", "spark*", "current", "pole", "poles", "hanging"],
+        "set_priority": "High",
+    },
+    {
+        "id": "priority.traffic_control_failure",
+        "group": "priority",
+        "categories": ["Traffic & Road Safety"],
+        "priorities": ["Low"],
+        "terms": ["signal*", "light", "lights", "streetlight*", "not working", "stuck", "jam", "jams", "jammed"],
+        "set_priority": "High",
+    },
+    {
+        # Risk intensifiers ("serious", "major") only boost dangerous categories
+        "id": "priority.intensified_danger",
+        "group": "priority",
+        "categories": [
+            "Roads & Public Works", "Electricity & Power Supply",
+            "Public Safety & Law Enforcement", "Traffic & Road Safety"
+        ],
+        "priorities": ["Medium"],
+        "intensified": True,
+        "set_priority": "High",
+    },
+]
@@ -0,0 +1,178 @@
+import os
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# Tag kinds attached to each keyword
+DEPARTMENT = "department"
+PRIORITY = "priority"
+INTENSIFIER = "intensifier"
+EMERGENCY = "emergency"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword set.
+    Built once; a single pass over the text reports every keyword that occurs
+    as a substring (same semantics as `keyword in text`).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        index = {}
+        for kw in keywords:
+            if kw and kw not in index:
+                index[kw] = len(self.keywords)
+                self.keywords.append(kw)
+
+        # 1. Trie
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for kw_id, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(kw_id)
+
+        # 2. Failure links (BFS), merged outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        order = []
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f][ch] if state and ch in goto[f] else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+        # 3. Full transition table over the keyword alphabet.
+        # Characters outside the alphabet always lead back to the root.
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        for state in order:
+            row = dict(delta[fail[state]])
+            row.update(goto[state])
+            delta[state] = row
+
+        self._delta = delta
+        self._out = [tuple(o) for o in out]
+
+    def find(self, text: str) -> set:
+        """
+        Returns the set of keyword ids found in `text`.
+        Callers are expected to pass already lowercased text.
+        """
+        delta = self._delta
+        out = self._out
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class KeywordHits:
+    """
+    Result of a single scan: matched keywords plus the tags they carry.
+    """
+    __slots__ = ("keywords", "departments", "priorities", "intensified", "emergency")
+
+    def __init__(self):
+        self.keywords = set()
+        self.departments: Dict[str, int] = {}  # dept name -> keyword match score
+        self.priorities = set()  # priority tiers with at least one hit
+        self.intensified = False
+        self.emergency = False
+
+
+class TaggedKeywordMatcher:
+    """
+    Keyword automaton whose keywords carry (kind, value) tags,
+    e.g. ("department", "Water Supply") or ("priority", "High").
+    """
+
+    def __init__(self, tagged_keywords: Iterable[Tuple[str, str, str]]):
+        tags: Dict[str, List[Tuple[str, str]]] = {}
+        for keyword, kind, value in tagged_keywords:
+            tags.setdefault(keyword, []).append((kind, value))
+
+        self.automaton = KeywordAutomaton(tags.keys())
+        self._tags = [tuple(tags[kw]) for kw in self.automaton.keywords]
+
+    def scan(self, text: str) -> KeywordHits:
+        """
+        Single pass over the lowercased text, returning every hit with its tags.
+        """
+        return self.hits_for(self.automaton.find(text.lower()))
+
+    def hits_for(self, keyword_ids) -> KeywordHits:
+        hits = KeywordHits()
+        keywords = self.automaton.keywords
+        for kw_id in keyword_ids:
+            hits.keywords.add(keywords[kw_id])
+            for kind, value in self._tags[kw_id]:
+                if kind == DEPARTMENT:
+                    hits.departments[value] = hits.departments.get(value, 0) + 1
+                elif kind == PRIORITY:
+                    hits.priorities.add(value)
+                elif kind == INTENSIFIER:
+                    hits.intensified = True
+                elif kind == EMERGENCY:
+                    hits.emergency = True
+        return hits
+
+
+class IncrementalScan:
+    """
+    Resumable scan for text that is edited mostly at the end (live typing).
+    Keeps the automaton state after every character and each match's end offset,
+    so update() only rescans from the first changed character.
+    """
+
+    def __init__(self, matcher: TaggedKeywordMatcher):
+        self.matcher = matcher
+        self.text = ""
+        self._states = array("i", [0])  # state after text[:i]
+        self._matches = []  # (end offset, keyword id), in text order
+        self._counts: Dict[int, int] = {}
+
+    def update(self, text: str) -> int:
+        """Moves the scan to `text`; returns the number of characters rescanned."""
+        text = text.lower()
+        start = len(os.path.commonprefix([self.text, text]))
+
+        matches = self._matches
+        while matches and matches[-1][0] > start:
+            _, kw_id = matches.pop()
+            self._counts[kw_id] -= 1
+            if not self._counts[kw_id]:
+                del self._counts[kw_id]
+        del self._states[start + 1:]
+
+        delta = self.matcher.automaton._delta
+        out = self.matcher.automaton._out
+        states = self._states
+        state = states[start]
+        for pos in range(start, len(text)):
+            state = delta[state].get(text[pos], 0)
+            states.append(state)
+            for kw_id in out[state]:
+                matches.append((pos + 1, kw_id))
+                self._counts[kw_id] = self._counts.get(kw_id, 0) + 1
+
+        self.text = text
+        return len(text) - start
+
+    def hits(self) -> KeywordHits:
+        return self.matcher.hits_for(self._counts)
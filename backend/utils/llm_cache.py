@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts", "llm_cache.db"
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case/whitespace-insensitive form so trivially different resubmissions share a key."""
+    return _WHITESPACE.sub(" ", (text or "").lower()).strip().rstrip(".!?, ")
+
+
+def cache_key(text: str, location: str, prompt_version: str) -> str:
+    raw = f"{prompt_version}\x1f{normalize_text(location)}\x1f{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def prompt_version(template: str) -> str:
+    """Content hash of the prompt template; editing the prompt changes every key."""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+class LLMResultCache:
+    """
+    Two-tier cache for parsed LLM classifications.
+    Tier 1: in-process LRU with TTL. Tier 2: SQLite table shared across workers/restarts.
+    Values are the parsed dict (category, priority, confidence, reasoning).
+    """
+
+    FIELDS = ("category", "priority", "confidence", "reasoning")
+
+    def __init__(self, path: str = None, max_entries: int = 2048, ttl_seconds: int = 7 * 24 * 3600):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._purged_version = None
+        self.counters = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    # --- SQLite tier ---
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_classification_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    prompt_version TEXT NOT NULL,
+                    category TEXT,
+                    priority TEXT,
+                    confidence REAL,
+                    reasoning TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_classification_cache (expires_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, value: dict, expires_at: float):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return dict(entry[1])
+                del self._memory[key]
+
+            try:
+                row = self._db().execute(
+                    "SELECT category, priority, confidence, reasoning, expires_at "
+                    "FROM llm_classification_cache WHERE cache_key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[AI Cache] Read failed: {e}")
+                self.counters["errors"] += 1
+                row = None
+
+            if row:
+                value = dict(zip(self.FIELDS, row[:4]))
+                self._remember(key, value, row[4])
+                self.counters["db_hits"] += 1
+                return dict(value)
+
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: dict, version: str):
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        stored = {f: value.get(f) for f in self.FIELDS}
+        if isinstance(stored["reasoning"], (list, dict)):
+            stored["reasoning"] = json.dumps(stored["reasoning"])
+        with self._lock:
+            self._remember(key, stored, expires_at)
+            self.counters["stores"] += 1
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_classification_cache "
+                    "(cache_key, prompt_version, category, priority, confidence, reasoning, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, version, stored["category"], stored["priority"], stored["confidence"],
+                     stored["reasoning"], now, expires_at)
+                )
+                # Entries from older prompt versions can never be hit again; purge once per version
+                if self._purged_version != version:
+                    db.execute("DELETE FROM llm_classification_cache WHERE prompt_version != ? OR expires_at <= ?",
+                               (version, now))
+                    self._purged_version = version
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"[AI Cache] Write failed: {e}")
+                self.counters["errors"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                self._db().execute("DELETE FROM llm_classification_cache")
+                self._db().commit()
+            except sqlite3.Error as e:
+                print(f"[AI Cache] Clear failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.counters["memory_hits"] + self.counters["db_hits"]
+            lookups = hits + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_classification_cache = None
+_init_lock = threading.Lock()
+
+
+def get_classification_cache() -> LLMResultCache:
+    """Process-wide cache configured from Settings (LLM_CACHE_*)."""
+    global _classification_cache
+    if _classification_cache is not None:
+        return _classification_cache
+    with _init_lock:
+        if _classification_cache is not None:
+            return _classification_cache
+        try:
+            from ..config import settings
+            _classification_cache = LLMResultCache(
+                path=settings.LLM_CACHE_PATH,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+            )
+        except Exception:
+            _classification_cache = LLMResultCache()
+    return _classification_cache
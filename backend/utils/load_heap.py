@@ -0,0 +1,120 @@
+"""
+Per-department min-heaps of officer workload (open complaints per officer).
+
+WorkloadTracker keeps every officer's load and, per department, a heap of the
+active officers ordered by (load, officer id), the same order as
+assignment_logic.officer_load_query. Changing a load pushes a fresh entry and
+leaves the old one in place; stale entries are dropped when they reach the top
+(lazy deletion), so updates and least-loaded lookups are O(log n) amortized.
+"""
+import heapq
+import threading
+
+
+class DepartmentHeap:
+    def __init__(self):
+        self._heap = []  # (load, officer id), may hold stale entries
+        self._current = {}  # officer id -> load, active officers only
+
+    def __len__(self):
+        return len(self._current)
+
+    def set(self, officer_id: int, load: int):
+        if self._current.get(officer_id) == load:
+            return
+        self._current[officer_id] = load
+        heapq.heappush(self._heap, (load, officer_id))
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [(l, o) for o, l in self._current.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, officer_id: int):
+        self._current.pop(officer_id, None)
+
+    def peek(self):
+        """(officer id, load) of the least-loaded officer, or None."""
+        heap = self._heap
+        while heap:
+            load, officer_id = heap[0]
+            if self._current.get(officer_id) == load:
+                return officer_id, load
+            heapq.heappop(heap)
+        return None
+
+
+class WorkloadTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loads = {}  # officer id -> open complaints (active or not)
+        self._officers = {}  # officer id -> (department id, active)
+        self._heaps = {}  # department id -> DepartmentHeap
+        self.version = 0  # bumped on every applied change (reconciliation detects races)
+        self.ready = False
+        self.stale = False  # a change could not be applied exactly; rebuild before trusting loads
+
+    def load(self, rows, if_version: int = None) -> bool:
+        """
+        Replaces the state with rows of (officer id, department id, active, load).
+        With if_version, does nothing (returns False) if changes were applied since.
+        """
+        with self._lock:
+            if if_version is not None and if_version != self.version:
+                return False
+            self._loads, self._officers, self._heaps = {}, {}, {}
+            for officer_id, department_id, active, load in rows:
+                self._loads[officer_id] = load
+                self._place(officer_id, department_id, active)
+            self.ready, self.stale = True, False
+            self.version += 1
+            return True
+
+    def _place(self, officer_id, department_id, active):
+        previous = self._officers.get(officer_id)
+        if previous and previous[0] in self._heaps:
+            self._heaps[previous[0]].remove(officer_id)
+        self._officers[officer_id] = (department_id, active)
+        if active:
+            self._heaps.setdefault(department_id, DepartmentHeap()).set(officer_id, self._loads.get(officer_id, 0))
+
+    def least_loaded(self, department_id):
+        with self._lock:
+            heap = self._heaps.get(department_id)
+            return heap.peek() if heap else None
+
+    def adjust(self, officer_id: int, delta: int):
+        with self._lock:
+            self.version += 1
+            if officer_id not in self._loads:
+                self.stale = True
+                return
+            load = self._loads[officer_id] = self._loads[officer_id] + delta
+            if load < 0:
+                self.stale = True
+            department_id, active = self._officers[officer_id]
+            if active:
+                self._heaps[department_id].set(officer_id, load)
+
+    def set_officer(self, officer_id: int, department_id, active: bool):
+        """New officer (load 0) or a changed department / status."""
+        with self._lock:
+            self.version += 1
+            self._loads.setdefault(officer_id, 0)
+            self._place(officer_id, department_id, active)
+
+    def remove_officer(self, officer_id: int):
+        with self._lock:
+            self.version += 1
+            previous = self._officers.pop(officer_id, None)
+            if previous and previous[0] in self._heaps:
+                self._heaps[previous[0]].remove(officer_id)
+            self._loads.pop(officer_id, None)
+
+    def mark_stale(self):
+        with self._lock:
+            self.version += 1
+            self.stale = True
+
+    def snapshot(self) -> dict:
+        """officer id -> (department id, active, load)"""
+        with self._lock:
+            return {o: (d, a, self._loads.get(o, 0)) for o, (d, a) in self._officers.items()}
@@ -0,0 +1,252 @@
+"""
+MinHash signatures + LSH banding index for near-duplicate complaint text.
+
+A signature is NUM_PERM 16-bit minhashes (b-bit MinHash, 128 bytes) over the
+character 5-gram shingles of the normalized text. The fraction of equal
+positions in two signatures estimates the Jaccard similarity of their shingle
+sets. For the index, the signature is split into BANDS bands of ROWS values.
+Two texts become candidates when any band matches exactly. With 16 x 4 a pair
+at Jaccard 0.7 is a candidate with p ~ 0.99, and a pair at 0.3 with p ~ 0.12.
+
+Each band key is the signature's 4 uint16 values viewed as one uint64, so the
+index is NumPy arrays only: per band, the keys sorted once (binary search on
+lookup) plus a small dict for rows added since the last merge. Lookups never
+touch the full set, and the estimate is only computed for candidates.
+"""
+import re
+import threading
+
+import numpy as np
+
+NUM_PERM = 64
+ROWS = 4
+BANDS = NUM_PERM // ROWS
+SHINGLE = 5
+SIGNATURE_BYTES = NUM_PERM * 2
+
+_rng = np.random.RandomState(1729)  # fixed: signatures are stored in the DB
+_A = (_rng.randint(0, 2 ** 62, NUM_PERM, dtype=np.int64).astype(np.uint64) << np.uint64(2)) | np.uint64(1)
+_B = _rng.randint(0, 2 ** 62, NUM_PERM, dtype=np.int64).astype(np.uint64) << np.uint64(2)
+_BYTE = np.uint64(8)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(48)
+
+_NON_WORD = re.compile(r"[\W_]+")
+_WARD = re.compile(r"\bward\s*(?:no\.?\s*)?(\d+)\b")
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """
+    64-bit hashes of the UTF-8 5-byte windows of the normalized text
+    (each window packed into 40 bits, then mixed; repeats are harmless for min()).
+    """
+    data = np.frombuffer(normalize(text).encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(data) == 0:
+        return data
+    if len(data) < SHINGLE:
+        data = np.concatenate([data, np.zeros(SHINGLE - len(data), dtype=np.uint64)])
+    windows = len(data) - SHINGLE + 1
+    packed = data[:windows].copy()
+    for i in range(1, SHINGLE):
+        packed <<= _BYTE
+        packed |= data[i:i + windows]
+    return packed * _MIX
+
+
+def signature(text: str):
+    """uint16[NUM_PERM] MinHash signature, or None for empty text."""
+    h = shingle_hashes(text)
+    if len(h) == 0:
+        return None
+    # Multiply-shift universal hashing; keep the top 16 bits of each minimum
+    return ((h[None, :] * _A[:, None] + _B[:, None]).min(axis=1) >> _SHIFT).astype(np.uint16)
+
+
+def to_bytes(sig) -> bytes:
+    return sig.astype("<u2").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u2").astype(np.uint16)
+
+
+def band_keys(sigs: np.ndarray) -> np.ndarray:
+    """uint64[n, BANDS]: each band's ROWS values packed into one integer."""
+    sigs = np.ascontiguousarray(sigs, dtype="<u2").reshape(-1, NUM_PERM)
+    return sigs.view("<u8").reshape(-1, BANDS)
+
+
+def jaccard(a, b) -> float:
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def ward_key(location: str):
+    """'Ward 12, near market' -> 'ward 12'; otherwise the normalized location."""
+    normalized = normalize(location)
+    if not normalized:
+        return None
+    m = _WARD.search(normalized)
+    return f"ward {m.group(1)}" if m else normalized
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index of complaint signatures with the scope fields
+    (user, department, ward) needed to filter candidates.
+    """
+
+    def __init__(self, merge_every: int = 10000):
+        self.merge_every = merge_every
+        self._lock = threading.Lock()
+        self._n = 0
+        self._sigs = np.zeros((0, NUM_PERM), dtype=np.uint16)
+        self._complaint_ids = np.zeros(0, dtype=np.int64)
+        self._users = np.zeros(0, dtype=np.int64)
+        self._departments = np.zeros(0, dtype=np.int64)
+        self._wards = np.zeros(0, dtype=np.int32)
+        self._ward_ids = {}
+        self._positions = {}  # complaint id -> row
+        self._sorted_keys = [np.zeros(0, dtype=np.uint64)] * BANDS
+        self._sorted_rows = [np.zeros(0, dtype=np.int32)] * BANDS
+        self._merged = 0  # rows covered by the sorted arrays
+        self._indexed = 0  # rows covered by sorted arrays + delta dicts
+        self._delta = [{} for _ in range(BANDS)]
+        self.last_row_id = 0  # highest ComplaintSignature.id loaded (for catching up)
+
+    def __len__(self):
+        return self._n
+
+    def _ward_id(self, location) -> int:
+        key = ward_key(location)
+        if key is None:
+            return -1
+        return self._ward_ids.setdefault(key, len(self._ward_ids))
+
+    def _grow(self, extra: int):
+        need = self._n + extra
+        if need <= len(self._complaint_ids):
+            return
+        capacity = max(need, int(len(self._complaint_ids) * 1.5), 1024)
+        def grown(arr, shape):
+            out = np.zeros(shape, dtype=arr.dtype)
+            out[:self._n] = arr[:self._n]
+            return out
+        self._sigs = grown(self._sigs, (capacity, NUM_PERM))
+        self._complaint_ids = grown(self._complaint_ids, capacity)
+        self._users = grown(self._users, capacity)
+        self._departments = grown(self._departments, capacity)
+        self._wards = grown(self._wards, capacity)
+
+    def add_many(self, complaint_ids, sigs, user_ids, department_ids, locations, defer: bool = False):
+        """
+        Bulk insert; complaint ids already present are skipped. With defer=True
+        the rows are stored but not searchable until merge() (batched loads
+        sort once at the end instead of once per batch).
+        """
+        with self._lock:
+            new = [i for i, cid in enumerate(complaint_ids) if cid not in self._positions]
+            if not new:
+                return
+            start, end = self._n, self._n + len(new)
+            self._grow(len(new))
+            self._sigs[start:end] = np.asarray([sigs[i] for i in new], dtype=np.uint16)
+            self._complaint_ids[start:end] = [complaint_ids[i] for i in new]
+            self._users[start:end] = [-1 if user_ids[i] is None else user_ids[i] for i in new]
+            self._departments[start:end] = [-1 if department_ids[i] is None else department_ids[i] for i in new]
+            self._wards[start:end] = [self._ward_id(locations[i]) for i in new]
+            self._positions.update(zip((complaint_ids[i] for i in new), range(start, end)))
+            self._n = end
+            if not defer:
+                self._index_pending()
+
+    def add(self, complaint_id, sig, user_id=None, department_id=None, location=None):
+        self.add_many([complaint_id], [sig], [user_id], [department_id], [location])
+
+    def merge(self):
+        """Makes rows added with defer=True searchable."""
+        with self._lock:
+            self._index_pending()
+
+    def _index_pending(self):
+        if self._n - self._merged > self.merge_every:
+            self._merge()
+            return
+        keys = band_keys(self._sigs[self._indexed:self._n]).tolist()
+        for row, row_keys in zip(range(self._indexed, self._n), keys):
+            for band, key in enumerate(row_keys):
+                self._delta[band].setdefault(key, []).append(row)
+        self._indexed = self._n
+
+    def _merge(self):
+        """Re-sorts every band over all rows and empties the delta dicts."""
+        keys = band_keys(self._sigs[:self._n])
+        for band in range(BANDS):
+            order = np.argsort(keys[:, band], kind="stable").astype(np.int32)
+            self._sorted_rows[band] = order
+            self._sorted_keys[band] = keys[order, band]
+            self._delta[band] = {}
+        self._merged = self._indexed = self._n
+
+    def _candidates(self, sig) -> np.ndarray:
+        keys = band_keys(sig)[0]
+        found = []
+        for band in range(BANDS):
+            key = keys[band]
+            sorted_keys = self._sorted_keys[band]
+            lo = np.searchsorted(sorted_keys, key, side="left")
+            if lo < len(sorted_keys) and sorted_keys[lo] == key:
+                hi = np.searchsorted(sorted_keys, key, side="right")
+                found.append(self._sorted_rows[band][lo:hi])
+            extra = self._delta[band].get(int(key))
+            if extra:
+                found.append(np.asarray(extra, dtype=np.int32))
+        if not found:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+    def query(self, sig, user_id=None, department_id=None, location=None, exclude_id=None,
+              threshold: float = 0.7, limit: int = 5) -> dict:
+        """
+        Near-duplicates of `sig` with estimated Jaccard >= threshold, best first:
+        {"user": [(complaint_id, jaccard), ...], "ward": [...], "department": [...]}.
+        A match is reported under the narrowest scope it falls in (user > ward > department).
+        """
+        result = {"user": [], "ward": [], "department": []}
+        with self._lock:
+            rows = self._candidates(sig)
+            if len(rows) == 0:
+                return result
+            estimates = np.count_nonzero(self._sigs[rows] == sig, axis=1) / NUM_PERM
+            keep = estimates >= threshold
+            rows, estimates = rows[keep], estimates[keep]
+            ward = self._ward_ids.get(ward_key(location), -2) if location else -2
+            for row, estimate in sorted(zip(rows.tolist(), estimates.tolist()), key=lambda x: -x[1]):
+                complaint_id = int(self._complaint_ids[row])
+                if complaint_id == exclude_id:
+                    continue
+                if user_id is not None and self._users[row] == user_id:
+                    scope = "user"
+                elif self._wards[row] == ward:
+                    scope = "ward"
+                elif department_id is not None and self._departments[row] == department_id:
+                    scope = "department"
+                else:
+                    continue
+                if len(result[scope]) < limit:
+                    result[scope].append((complaint_id, round(estimate, 2)))
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "signatures": self._n,
+                "merged": self._merged,
+                "pending_merge": self._n - self._merged,
+                "wards": len(self._ward_ids),
+                "last_row_id": self.last_row_id,
+                "bytes": int(self._sigs.nbytes + sum(k.nbytes + r.nbytes for k, r in zip(self._sorted_keys, self._sorted_rows)))
+            }
@@ -0,0 +1,38 @@
+"""
+Retrying optimistic-concurrency conflicts on Complaint.
+
+Complaint carries a version column (mapper version_id_col): every ORM
+UPDATE is "... WHERE id = ? AND version = <version read>" and increments
+it. If another session changed the complaint after we read it (another
+uvicorn worker, the enrichment worker, an admin), our flush matches no row
+and raises StaleDataError instead of silently overwriting. The operation
+then runs again from its read, so its checks ("already assigned?") see
+the winner's change.
+"""
+import random
+import time
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from ..config import settings
+
+
+class ConflictError(Exception):
+    """Still conflicting after every attempt."""
+
+
+def retry_on_conflict(db, operation, attempts: int = None):
+    """
+    Runs operation() - which reads, checks, writes and commits - and on a
+    version conflict rolls back and runs it again (short random backoff),
+    up to ASSIGN_CONFLICT_ATTEMPTS times.
+    """
+    attempts = attempts or settings.ASSIGN_CONFLICT_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        try:
+            return operation()
+        except StaleDataError as e:
+            db.rollback()
+            if attempt == attempts:
+                raise ConflictError(f"Complaint changed concurrently {attempts} times: {e}") from e
+            time.sleep(random.uniform(0, 0.005 * attempt))
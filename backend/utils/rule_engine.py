@@ -0,0 +1,253 @@
+"""
+Compiled rule engine for the keyword heuristics in ai_utils.
+
+The rule table (utils/heuristic_rules.py, or Settings.AI_RULES_PATH) is
+compiled once into a single alternation regex with word boundaries. A scan
+is one pass over the text that reports every term hit. evaluate() then checks
+the per-rule conditions (category, priority, intensifier) and returns the
+rules that fired, so callers can explain their decisions.
+
+The table file is re-read when its mtime changes (checked at most every
+AI_RULES_RELOAD_SECONDS) or on reload_rules(); a table that fails to compile
+is rejected and the previous rules stay active.
+"""
+import hashlib
+import os
+import re
+import runpy
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "heuristic_rules.py")
+
+CONDITION_FIELDS = ("categories", "priorities", "intensified")
+ACTION_FIELDS = ("insight", "set_priority")
+RESOLVE_CACHE_SIZE = 10000
+_WORD_END, _STEM_END = "\x00", "\x01"
+
+
+def alternation(terms) -> str:
+    r"""
+    One regex alternation for all terms, factored by common prefix
+    ("wire|wires|wiring" -> wir(?:e(?:s\b|\b)|ing\b)). Longer continuations are
+    tried before a term ends, so each position yields its longest hit.
+    Words in a phrase match across any whitespace; a trailing * continues the word.
+    """
+    root = {}
+    for term in terms:
+        node = root
+        for ch in term.rstrip("*"):
+            node = node.setdefault(ch, {})
+        node[_STEM_END if term.endswith("*") else _WORD_END] = None
+
+    def emit(node):
+        alts = [
+            (r"\s+" if ch == " " else re.escape(ch)) + emit(node[ch])
+            for ch in sorted(k for k in node if k not in (_STEM_END, _WORD_END))
+        ]
+        if _STEM_END in node:
+            alts.append(r"\w*\b")
+        if _WORD_END in node:
+            alts.append(r"\b")
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(root)
+
+
+class RuleHits:
+    """
+    Term hits of one scan: rule id -> matched terms (in text order).
+    A term that starts inside a longer hit is not reported separately
+    (leftmost, longest match; "highway" inside "national highway").
+    """
+    __slots__ = ("terms",)
+
+    def __init__(self):
+        self.terms = {}
+
+    def __contains__(self, rule_id):
+        return rule_id in self.terms
+
+    def add(self, rule_id, term):
+        matched = self.terms.setdefault(rule_id, [])
+        if term not in matched:
+            matched.append(term)
+
+
+class RuleEngine:
+    def __init__(self, rules, groups, source: str = None, version: str = None):
+        self.source = source
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        self.groups = dict(groups)
+        self.rules = [self._check(rule) for rule in rules]
+        self.by_group = {}
+        for rule in self.rules:
+            self.by_group.setdefault(rule["group"], []).append(rule)
+
+        # term -> rule ids; one alternation over all distinct terms
+        owners = {}
+        for rule in self.rules:
+            for term in rule.get("terms") or ():
+                owners.setdefault(" ".join(term.lower().split()), []).append(rule["id"])
+        self.term_count = len(owners)
+        terms = sorted(owners)
+        # The leading character class lets the regex engine skip ahead to
+        # plausible word starts instead of trying the alternation everywhere
+        first_chars = "".join(sorted({re.escape(t[0]) for t in terms}))
+        self._scan = re.compile(
+            "(?=[" + first_chars + r"])\b" + alternation(terms)
+        ) if terms else None
+        # Resolving a matched span back to terms: every literal / stem that also
+        # matches at the same start ("traffic" inside "traffic jam")
+        self._literals = {t: owners[t] for t in terms if not t.endswith("*")}
+        self._stems = {t[:-1]: owners[t] for t in terms if t.endswith("*")}
+        self._literal_lengths = sorted({len(t) for t in self._literals})
+        self._stem_lengths = sorted({len(t) for t in self._stems})
+        self._resolved = {}  # matched span -> (rule id, term) pairs
+
+    def _check(self, rule) -> dict:
+        rule_id = rule.get("id")
+        if not rule_id:
+            raise ValueError(f"Rule without id: {rule}")
+        if rule.get("group") not in self.groups:
+            raise ValueError(f"Rule {rule_id}: unknown group {rule.get('group')!r}")
+        if not any(field in rule for field in ("terms",) + CONDITION_FIELDS):
+            raise ValueError(f"Rule {rule_id}: needs terms or a condition")
+        if not any(field in rule for field in ACTION_FIELDS):
+            raise ValueError(f"Rule {rule_id}: needs one of {ACTION_FIELDS}")
+        if "terms" in rule and (isinstance(rule["terms"], str) or not rule["terms"]):
+            raise ValueError(f"Rule {rule_id}: terms must be a non-empty list")
+        return rule
+
+    def scan(self, text: str) -> RuleHits:
+        """One pass over the (lower-cased) text; returns every rule term hit."""
+        hits = RuleHits()
+        if self._scan is None:
+            return hits
+        resolved = self._resolved
+        for span in self._scan.findall(text.lower()):
+            pairs = resolved.get(span)
+            if pairs is None:
+                pairs = self._resolve(span)
+            for rule_id, term in pairs:
+                hits.add(rule_id, term)
+        return hits
+
+    def _resolve(self, span: str) -> tuple:
+        """(rule id, term) pairs for every literal / stem that matches at the start of a hit."""
+        normalized = " ".join(span.split())
+        n = len(normalized)
+        pairs = []
+        for length in self._literal_lengths:
+            if length > n:
+                break
+            term = normalized[:length]
+            if term in self._literals and (length == n or not (normalized[length].isalnum() or normalized[length] == "_")):
+                pairs.extend((rule_id, term) for rule_id in self._literals[term])
+        for length in self._stem_lengths:
+            if length > n:
+                break
+            stem = normalized[:length]
+            if stem in self._stems:
+                pairs.extend((rule_id, stem + "*") for rule_id in self._stems[stem])
+        if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+            self._resolved.clear()
+        pairs = self._resolved[span] = tuple(pairs)
+        return pairs
+
+    def evaluate(self, group: str, hits: RuleHits, category: str = None, priority: str = None,
+                 intensified: bool = False) -> list:
+        """
+        Rules of `group` that fire, in table order. In "all" groups a rule's
+        set_priority becomes the priority seen by the rules after it.
+        """
+        first_only = self.groups[group] == "first"
+        fired = []
+        for rule in self.by_group.get(group, ()):
+            if "terms" in rule and rule["id"] not in hits:
+                continue
+            if "categories" in rule and category not in rule["categories"]:
+                continue
+            if "priorities" in rule and priority not in rule["priorities"]:
+                continue
+            if rule.get("intensified") and not intensified:
+                continue
+            fired.append(rule)
+            if first_only:
+                break
+            priority = rule.get("set_priority", priority)
+        return fired
+
+    def info(self) -> dict:
+        return {
+            "source": self.source,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "rules": len(self.rules),
+            "terms": self.term_count,
+            "groups": {group: len(self.by_group.get(group, ())) for group in self.groups}
+        }
+
+
+def load_rules(path: str = None) -> RuleEngine:
+    path = path or DEFAULT_RULES_PATH
+    with open(path, "rb") as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+    table = runpy.run_path(path)
+    return RuleEngine(table["RULES"], table["GROUPS"], source=path, version=version)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+_checked_at = 0.0
+_mtime = None
+
+
+def _rules_path() -> str:
+    try:
+        from ..config import settings
+        return settings.AI_RULES_PATH or DEFAULT_RULES_PATH
+    except Exception:
+        return DEFAULT_RULES_PATH
+
+
+def _reload_interval() -> float:
+    try:
+        from ..config import settings
+        return settings.AI_RULES_RELOAD_SECONDS
+    except Exception:
+        return 5.0
+
+
+def reload_rules(force: bool = True) -> RuleEngine:
+    """
+    Recompiles the rule table (if forced or its mtime changed). On a bad table
+    the previous engine is kept; with no previous engine the error is raised.
+    """
+    global _engine, _mtime, _checked_at
+    with _engine_lock:
+        path = _rules_path()
+        mtime = os.path.getmtime(path)
+        _checked_at = time.monotonic()
+        if _engine is not None and not force and mtime == _mtime and path == _engine.source:
+            return _engine
+        try:
+            _engine = load_rules(path)
+            _mtime = mtime
+            print(f"[Rules] Loaded {len(_engine.rules)} rules ({_engine.term_count} terms) from {path} v{_engine.version}")
+        except Exception as e:
+            if _engine is None:
+                raise
+            _mtime = mtime  # don't retry the same broken file on every call
+            print(f"[Rules] Rejected rule table {path}: {e}. Keeping v{_engine.version}")
+        return _engine
+
+
+def get_rule_engine() -> RuleEngine:
+    """Process-wide engine; picks up rule table edits without a restart."""
+    engine = _engine
+    if engine is None or time.monotonic() - _checked_at >= _reload_interval():
+        engine = reload_rules(force=False)
+    return engine
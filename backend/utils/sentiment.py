@@ -0,0 +1,239 @@
+"""
+Pluggable sentiment scoring (polarity -1.0 to 1.0).
+
+Backends:
+- "lexicon" (default): precompiled pattern-style adjective lexicon
+  (sentiment_lexicon.json: word -> [polarity, subjectivity, intensity, is_adverb],
+  emoticon -> polarity)
+  with the same negation / modifier / exclamation rules TextBlob's PatternAnalyzer
+  uses, but no TextBlob import, no per-call object construction and a batch API.
+- "textblob": compatibility backend, TextBlob is imported only when selected.
+
+Settings.SENTIMENT_BACKEND picks the backend.
+Rebuild the lexicon (needs textblob): python -m backend.utils.sentiment compile
+"""
+import json
+import os
+import re
+import sys
+import threading
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentiment_lexicon.json")
+
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+
+# Tokenizer constants mirror pattern's find_tokens (textblob/_text.py)
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_LEADING = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING = _LEADING + (".",)
+_CONTRACTIONS = ("'d", "'m", "'s", "'ll", "'re", "'ve", "n't")
+_CONTRACTION_RE = re.compile("|".join(re.escape(c) for c in _CONTRACTIONS))
+_QUOTES = {"“": " “ ", "”": " ” ", "‘": " ‘ ", "’": " ’ ", "'": " ' ", '"': ' " '}
+_QUOTE_RE = re.compile("|".join(re.escape(q) for q in _QUOTES))
+_SARCASM_RE = re.compile(r"\( ?\! ?\)")
+_ABBR_RES = (
+    re.compile(r"^[A-Za-z]\.$"),  # single letter, "T. De Smedt"
+    re.compile(r"^([A-Za-z]\.)+$"),  # alternating letters, "U.S."
+    re.compile("^[A-Z][" + "|".join("bcdfghjklmnpqrstvwxz") + "]+.$"),  # "Mr."
+)
+_ABBREVIATIONS = frozenset((
+    "a.", "adj.", "adv.", "al.", "a.m.", "c.", "cf.", "comp.", "conf.", "def.", "ed.", "e.g.",
+    "esp.", "etc.", "ex.", "f.", "fig.", "gen.", "id.", "i.e.", "int.", "l.", "m.", "med.",
+    "mil.", "mr.", "n.", "n.q.", "orig.", "pl.", "pred.", "pres.", "p.m.", "ref.", "v.",
+    "vs.", "w/",
+))
+
+
+def tokenize(text: str, emoticons=()) -> list:
+    """Lower-cased tokens, split the way pattern's find_tokens splits them (emoticons kept whole)."""
+    text = _CONTRACTION_RE.sub(lambda m: " " + m.group(0), text)
+    text = _QUOTE_RE.sub(lambda m: _QUOTES[m.group(0)], text)
+    text = _SARCASM_RE.sub(" (!) ", text)
+    tokens = []
+    for t in text.split():
+        if t == "(!)" or t.lower() in emoticons:
+            tokens.append(t)
+            continue
+        tail = []
+        while t.startswith(_LEADING) and t not in _CONTRACTIONS:
+            tokens.append(t[0])
+            t = t[1:]
+        while t.endswith(_TRAILING) and t not in _CONTRACTIONS:
+            if t.endswith(_LEADING):
+                tail.append(t[-1])
+                t = t[:-1]
+            if t.endswith("..."):
+                tail.append("...")
+                t = t[:-3].rstrip(".")
+            if t.endswith("."):
+                if t in _ABBREVIATIONS or any(r.match(t) for r in _ABBR_RES):
+                    break
+                tail.append(t[-1])
+                t = t[:-1]
+        if t != "":
+            tokens.append(t)
+        tokens.extend(reversed(tail))
+    return [t.lower() for t in tokens]
+
+
+class LexiconSentiment:
+    """
+    Pattern-compatible polarity from a compiled word table.
+    """
+
+    name = "lexicon"
+
+    def __init__(self, lexicon: dict, emoticons: dict):
+        self.lexicon = lexicon
+        self.emoticons = emoticons
+
+    @classmethod
+    def load(cls, path: str = None):
+        with open(path or LEXICON_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls({w: (p, s, i, bool(adv)) for w, (p, s, i, adv) in data["words"].items()}, data["emoticons"])
+
+    def polarity(self, text: str) -> float:
+        lexicon = self.lexicon
+        emoticons = self.emoticons
+        scores = []  # [polarity, intensity, negated] per assessment
+        m = None  # preceding modifier (known adverb)
+        n = None  # preceding negation
+        for w in tokenize(text, emoticons):
+            entry = lexicon.get(w)
+            if entry is not None:
+                p, s, i, is_adverb = entry
+                if m is None:
+                    scores.append([p, i, False])
+                else:
+                    # "really good": scale by the modifier's intensity
+                    last = scores[-1]
+                    last[0] = max(-1.0, min(p * last[1], 1.0))
+                    last[1] = i
+                if n is not None:
+                    scores[-1][1] = 1.0 / scores[-1][1]
+                    scores[-1][2] = True
+                m = w if is_adverb else None
+                n = w if w in NEGATIONS else None
+                continue
+
+            if w in NEGATIONS:
+                n = w
+            elif n and len(w.strip("'")) > 1:
+                n = None  # retain negation across small words ("not a good")
+            if n is not None and m is not None and m.endswith("ly"):
+                scores[-1][2] = True  # "really not good"
+                n = None
+            elif m and len(w) > 2:
+                m = None
+            if w == "!" and scores:
+                scores[-1][0] = max(-1.0, min(scores[-1][0] * 1.25, 1.0))
+            if w == "(!)":
+                scores.append([0.0, 1.0, False])
+            if not w.isalpha() and len(w) <= 5 and w not in PUNCTUATION and w in emoticons:
+                scores.append([emoticons[w], 1.0, False])
+
+        if not scores:
+            return 0.0
+        # "not good" = slightly bad, "not bad" = slightly good
+        return sum(p * -0.5 if negated else p for p, _, negated in scores) / len(scores)
+
+    def polarity_many(self, texts) -> list:
+        cache = {}
+        out = []
+        for text in texts:
+            score = cache.get(text)
+            if score is None:
+                score = cache[text] = self.polarity(text)
+            out.append(score)
+        return out
+
+
+class TextBlobSentiment:
+    """Compatibility backend: TextBlob's PatternAnalyzer, imported on first use."""
+
+    name = "textblob"
+
+    def __init__(self):
+        from textblob import TextBlob
+        self._TextBlob = TextBlob
+
+    def polarity(self, text: str) -> float:
+        return self._TextBlob(text).sentiment.polarity
+
+    def polarity_many(self, texts) -> list:
+        cache = {}
+        for text in texts:
+            if text not in cache:
+                cache[text] = self.polarity(text)
+        return [cache[text] for text in texts]
+
+
+BACKENDS = {
+    "lexicon": LexiconSentiment.load,
+    "textblob": TextBlobSentiment,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_sentiment_backend():
+    """Process-wide backend chosen by Settings.SENTIMENT_BACKEND (built on first use)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                try:
+                    from ..config import settings
+                    name = settings.SENTIMENT_BACKEND
+                except Exception:
+                    name = "lexicon"
+                if name not in BACKENDS:
+                    print(f"[Sentiment] Unknown backend '{name}', using lexicon")
+                    name = "lexicon"
+                _backend = BACKENDS[name]()
+    return _backend
+
+
+def polarity(text: str) -> float:
+    return get_sentiment_backend().polarity(text)
+
+
+def polarity_many(texts) -> list:
+    return get_sentiment_backend().polarity_many(texts)
+
+
+def compile_lexicon(path: str = None) -> str:
+    """
+    Builds sentiment_lexicon.json from TextBlob's bundled en-sentiment.xml
+    (scores averaged over senses, plus the derived "-ly" adverbs TextBlob adds on load).
+    """
+    from textblob._text import EMOTICONS
+    from textblob.en import sentiment as pattern_sentiment
+    if not dict.__len__(pattern_sentiment):
+        pattern_sentiment.load()
+    words = {}
+    for word, by_pos in sorted(dict.items(pattern_sentiment)):
+        p, s, i = by_pos[None]
+        words[word] = [p, s, i, int("RB" in by_pos)]
+    emoticons = {}
+    for (_, p), forms in EMOTICONS.items():
+        for form in forms:
+            emoticons.setdefault(form.lower(), p)  # first match wins, as in pattern
+    path = path or LEXICON_PATH
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": "pattern en-sentiment.xml (De Smedt & Daelemans, PDDL) via textblob",
+            "fields": ["polarity", "subjectivity", "intensity", "is_adverb"],
+            "words": words,
+            "emoticons": emoticons
+        }, f, separators=(",", ":"), ensure_ascii=False)
+    return path
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["compile"]:
+        print(f"Wrote {compile_lexicon(sys.argv[2] if len(sys.argv) > 2 else None)}")
+    else:
+        print("Usage: python -m backend.utils.sentiment compile [path]")
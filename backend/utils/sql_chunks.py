@@ -0,0 +1,13 @@
+"""
+Splitting id lists for IN (...) queries.
+
+SQLite caps the bound variables of one statement, so bulk reads and writes
+over many ids run as one statement per chunk.
+"""
+IN_CHUNK = 500  # ids per IN (...) (SQLite variable limit)
+
+
+def chunks(values, size: int = IN_CHUNK):
+    """Consecutive slices of `values` of at most `size` items."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
@@ -0,0 +1,213 @@
+"""
+Hashed-embedding vector index for grouping complaints about the same incident.
+
+A complaint's text becomes a DIM-dimensional vector: lightly stemmed words
+are hashed into signed buckets with sublinear term frequency, then
+L2-normalized, so a dot product is the cosine similarity. No vocabulary or
+fitted model is needed, and vectors from any process agree. Place and time
+filler ("ward", "near the temple", "since", numbers) and pleas ("please help,
+very urgent") are dropped: the partition already pins the location, and those
+words made unrelated issues in one street look alike.
+
+Vectors live in one float32 matrix backed by a memory-mapped scratch file, so
+a large window does not have to stay resident. Rows are partitioned by
+(department, ward); a query scores only its own partition with one
+matrix-vector product and returns the top k. Rows that fall out of the
+window are compacted away (evict_before), so the file follows the window
+instead of every complaint the process has seen.
+"""
+import atexit
+import os
+import re
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from .minhash import ward_key
+
+DIM = 512
+COMPACT_CHUNK = 8192  # rows moved per step while compacting (bounds the temporary copy)
+EPOCH = datetime(1970, 1, 1)
+_TOKEN = re.compile(r"[a-z]+")
+_SUFFIXES = ("ing", "ed", "es", "s")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have in is it its of on or our "
+    "please sir madam the this that there to was we were with my your kindly "
+    "ward near no not area road street main last yesterday day days week since "
+    "opposite behind front next colony lane temple school market "
+    "help urgent very fast act action immediately request problem issue complaint residents people suffering".split()
+)
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def tokens(text: str) -> list:
+    return [_stem(w) for w in _TOKEN.findall((text or "").lower()) if len(w) > 2 and w not in STOPWORDS]
+
+
+def embed(text: str):
+    """float32[DIM] unit vector, or None when the text has no usable words."""
+    features = tokens(text)
+    if not features:
+        return None
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+    # The top hash bit picks the sign, so bucket collisions cancel out on average
+    counts = np.zeros(DIM, dtype=np.float32)
+    np.add.at(counts, hashes % DIM, np.where(hashes >> 31, -1.0, 1.0).astype(np.float32))
+    nonzero = counts != 0
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[nonzero] = np.sign(counts[nonzero]) * (1.0 + np.log(np.abs(counts[nonzero])))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def _timestamp(dt: datetime) -> float:
+    """Seconds since the epoch for a naive UTC datetime (not local time, unlike .timestamp())."""
+    return (dt - EPOCH).total_seconds()
+
+
+class IncidentVectorIndex:
+    """
+    add() appends a row, query() scores a partition. Rows older than the
+    query's `since` are skipped (incidents are recent) and dropped for good
+    by evict_before().
+    """
+
+    def __init__(self, directory: str = None, initial_capacity: int = 4096):
+        fd, self.path = tempfile.mkstemp(prefix="incident_vectors_", suffix=".f32", dir=directory or None)
+        os.close(fd)
+        atexit.register(self.close)
+        self._lock = threading.Lock()
+        self._initial_capacity = initial_capacity
+        self._n = 0
+        self._capacity = 0
+        self._vectors = None
+        self._complaint_ids = np.zeros(0, dtype=np.int64)
+        self._created = np.zeros(0, dtype=np.float64)  # created_at (naive UTC), seconds since the epoch
+        self._partitions = {}  # (department_id, ward) -> [row, ...]
+        self._positions = {}  # complaint id -> row
+        self.last_row_id = 0  # highest ComplaintSignature.id loaded (for catching up)
+        self._resize(initial_capacity)
+
+    def __len__(self):
+        return self._n
+
+    def _resize(self, capacity: int):
+        """Grows or shrinks the file and the per-row arrays (rows >= capacity must be unused)."""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * DIM * 4)
+        self._vectors = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, DIM))
+        if capacity > self._capacity:
+            self._complaint_ids = np.concatenate([self._complaint_ids, np.zeros(capacity - self._capacity, dtype=np.int64)])
+            self._created = np.concatenate([self._created, np.zeros(capacity - self._capacity, dtype=np.float64)])
+        else:
+            self._complaint_ids = self._complaint_ids[:capacity].copy()
+            self._created = self._created[:capacity].copy()
+        self._capacity = capacity
+
+    @staticmethod
+    def partition(department_id, location):
+        return (department_id, ward_key(location))
+
+    def add(self, complaint_id: int, vector, department_id=None, location=None, created_at=None):
+        with self._lock:
+            if complaint_id in self._positions:
+                return
+            if self._n == self._capacity:
+                self._resize(self._capacity * 2)
+            row = self._n
+            self._vectors[row] = vector
+            self._complaint_ids[row] = complaint_id
+            self._created[row] = _timestamp(created_at or datetime.utcnow())
+            self._partitions.setdefault(self.partition(department_id, location), []).append(row)
+            self._positions[complaint_id] = row
+            self._n += 1
+
+    def query(self, vector, department_id=None, location=None, exclude_id=None, since=None, k: int = 5,
+              min_score: float = 0.0) -> list:
+        """Top-k [(complaint_id, cosine)] in the (department, ward) partition, best first."""
+        with self._lock:
+            rows = self._partitions.get(self.partition(department_id, location))
+            if not rows:
+                return []
+            rows = np.asarray(rows, dtype=np.int64)
+            if since is not None:
+                rows = rows[self._created[rows] >= _timestamp(since)]
+            if exclude_id is not None:
+                rows = rows[self._complaint_ids[rows] != exclude_id]
+            if len(rows) == 0:
+                return []
+            scores = self._vectors[rows] @ vector
+            keep = scores >= min_score
+            rows, scores = rows[keep], scores[keep]
+            if len(rows) > k:
+                top = np.argpartition(-scores, k)[:k]
+                rows, scores = rows[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            return [(int(self._complaint_ids[r]), round(float(s), 3)) for r, s in zip(rows[order], scores[order])]
+
+    def evict_before(self, cutoff: datetime, min_fraction: float = 0.25) -> int:
+        """
+        Drops rows created before `cutoff`, once they make up `min_fraction` of
+        the index (so the O(n) compaction is amortized over many adds): the
+        remaining rows move to the front of the file in order, partitions and
+        positions are renumbered and the file shrinks. Returns the rows dropped.
+        """
+        with self._lock:
+            n = self._n
+            kept = np.flatnonzero(self._created[:n] >= _timestamp(cutoff))
+            dropped = n - len(kept)
+            if dropped == 0 or dropped < n * min_fraction:
+                return 0
+            # Forward copy in place: a kept row never moves past where it was
+            for start in range(0, len(kept), COMPACT_CHUNK):
+                chunk = kept[start:start + COMPACT_CHUNK]
+                self._vectors[start:start + len(chunk)] = self._vectors[chunk]
+            self._complaint_ids[:len(kept)] = self._complaint_ids[kept]
+            self._created[:len(kept)] = self._created[kept]
+
+            new_row = np.full(n, -1, dtype=np.int64)
+            new_row[kept] = np.arange(len(kept))
+            partitions = {}
+            for key, rows in self._partitions.items():
+                rows = new_row[np.asarray(rows, dtype=np.int64)]
+                rows = rows[rows >= 0]
+                if len(rows):
+                    partitions[key] = rows.tolist()
+            self._partitions = partitions
+            self._positions = {int(c): row for row, c in enumerate(self._complaint_ids[:len(kept)])}
+            self._n = len(kept)
+
+            capacity = self._capacity
+            while capacity > self._initial_capacity and capacity >= 4 * max(self._n, 1):
+                capacity //= 2
+            if capacity < self._capacity:
+                self._resize(capacity)
+            return dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "vectors": self._n,
+                "partitions": len(self._partitions),
+                "last_row_id": self.last_row_id,
+                "file": self.path,
+                "file_bytes": self._capacity * DIM * 4
+            }
+
+    def close(self):
+        with self._lock:
+            self._vectors = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
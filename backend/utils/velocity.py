@@ -0,0 +1,197 @@
+"""
+Per-user submission velocity for trust scoring (ai_trust).
+
+Every submission is recorded as (timestamp, complaint id) per user. A check
+reads the user's recent events once and counts them for all configured
+windows together (Settings.VELOCITY_WINDOWS, e.g. "1m:2,5m:2,1d:10":
+flag when at least 2 other submissions in the last minute, ...). No DB query.
+
+Backends:
+- "memory" (default): a bounded ring buffer (deque) per user in this process,
+  so a check costs at most VELOCITY_MAX_EVENTS steps. Warmed from the DB at
+  startup. Each worker process only sees what it recorded or warmed.
+- "redis": one sorted set per user, shared by all workers (needs the redis
+  package and VELOCITY_REDIS_URL; imported only when selected).
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+DEFAULT_WINDOWS = "1m:2,5m:2,1d:10"
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_windows(spec: str) -> tuple:
+    """'1m:2,5m:2,1d:10' -> ((60, 2), (300, 2), (86400, 10)), shortest first."""
+    windows = []
+    for part in (spec or DEFAULT_WINDOWS).split(","):
+        span, limit = part.strip().split(":")
+        unit = span[-1] if span[-1] in _UNITS else "s"
+        seconds = int(float(span.rstrip("smhd")) * _UNITS[unit])
+        windows.append((seconds, int(limit)))
+    return tuple(sorted(windows))
+
+
+def window_label(seconds: int) -> str:
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _timestamp(value) -> float:
+    """Epoch seconds, the same clock as time.time(). Naive datetimes are UTC
+    (created_at), not local time as datetime.timestamp() would read them."""
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return (value - EPOCH).total_seconds() if value.tzinfo is None else value.timestamp()
+    return float(value)
+
+
+class MemoryVelocityBackend:
+    """Ring buffer of the newest max_events submissions per user."""
+
+    name = "memory"
+
+    def __init__(self, horizon: int, max_events: int = 64):
+        self.horizon = horizon
+        self.max_events = max_events
+        self._events = {}  # user id -> deque[(timestamp, complaint id)], oldest first
+        self._lock = threading.Lock()
+        self._recorded = 0
+
+    def record(self, user_id, complaint_id, at: float):
+        with self._lock:
+            events = self._events.get(user_id)
+            if events is None:
+                events = self._events[user_id] = deque(maxlen=self.max_events)
+            elif complaint_id is not None and self._contains(events, complaint_id, at):
+                return  # already recorded (warm-up, retried enrichment)
+            if events and at < events[-1][0]:
+                # Out of order (warm-up racing a live submission): keep the buffer sorted
+                items = sorted(list(events) + [(at, complaint_id)])
+                events.clear()
+                events.extend(items[-self.max_events:])
+            else:
+                events.append((at, complaint_id))
+            self._recorded += 1
+            if self._recorded % 1000 == 0:
+                self._evict(at)
+
+    @staticmethod
+    def _contains(events, complaint_id, at: float) -> bool:
+        # A repeat carries the same created_at, so only events at or after `at` need checking
+        for ts, cid in reversed(events):
+            if ts < at:
+                return False
+            if cid == complaint_id:
+                return True
+        return False
+
+    def _evict(self, now: float):
+        cutoff = now - self.horizon
+        for user_id in [u for u, events in self._events.items() if events[-1][0] < cutoff]:
+            del self._events[user_id]
+
+    def recent(self, user_id, since: float, until: float) -> list:
+        """[(timestamp, complaint id)] with since <= timestamp <= until, newest first."""
+        with self._lock:
+            events = self._events.get(user_id)
+            if not events:
+                return []
+            found = []
+            for event in reversed(events):
+                if event[0] < since:
+                    break
+                if event[0] <= until:
+                    found.append(event)
+            return found
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": self.name, "users": len(self._events), "events": sum(len(e) for e in self._events.values())}
+
+
+class RedisVelocityBackend:
+    """Sorted set per user (member: complaint id, score: timestamp), shared across workers."""
+
+    name = "redis"
+
+    def __init__(self, horizon: int, url: str, prefix: str = "velocity:"):
+        import redis
+        self.horizon = horizon
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+
+    def record(self, user_id, complaint_id, at: float):
+        key = f"{self.prefix}{user_id}"
+        member = str(complaint_id) if complaint_id is not None else f"t{at}"
+        pipe = self._redis.pipeline()
+        pipe.zadd(key, {member: at})
+        pipe.zremrangebyscore(key, "-inf", time.time() - self.horizon)
+        pipe.expire(key, self.horizon)
+        pipe.execute()
+
+    def recent(self, user_id, since: float, until: float) -> list:
+        rows = self._redis.zrevrangebyscore(f"{self.prefix}{user_id}", until, since, withscores=True)
+        return [(score, int(member) if member.isdigit() else None) for member, score in rows]
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+class VelocityTracker:
+    def __init__(self, windows=None, backend=None):
+        self.windows = parse_windows(windows) if isinstance(windows, str) or windows is None else tuple(sorted(windows))
+        self.horizon = self.windows[-1][0]
+        self.backend = backend or MemoryVelocityBackend(self.horizon)
+
+    def record(self, user_id, complaint_id=None, created_at=None):
+        if user_id is not None:
+            self.backend.record(user_id, complaint_id, _timestamp(created_at))
+
+    def counts(self, user_id, at=None, exclude_id=None) -> dict:
+        """{window seconds: other submissions in the window ending at `at`} for every window."""
+        until = _timestamp(at)
+        cutoffs = [until - seconds for seconds, _ in self.windows]
+        # One pass, newest first: hits[i] = events inside window i but not window i-1
+        hits = [0] * len(cutoffs)
+        i = 0
+        for ts, cid in self.backend.recent(user_id, cutoffs[-1], until):
+            while ts < cutoffs[i]:
+                i += 1
+            if exclude_id is None or cid != exclude_id:
+                hits[i] += 1
+        counts, total = {}, 0
+        for (seconds, _), hit in zip(self.windows, hits):
+            total += hit
+            counts[seconds] = total
+        return counts
+
+    def exceeded(self, user_id, at=None, exclude_id=None) -> list:
+        """[(window seconds, count, limit)] for the windows at or over their limit, shortest first."""
+        counts = self.counts(user_id, at, exclude_id)
+        return [(seconds, counts[seconds], limit) for seconds, limit in self.windows if counts[seconds] >= limit]
+
+
+BACKENDS = {
+    "memory": lambda horizon, settings: MemoryVelocityBackend(horizon, settings.VELOCITY_MAX_EVENTS),
+    "redis": lambda horizon, settings: RedisVelocityBackend(horizon, settings.VELOCITY_REDIS_URL),
+}
+
+
+def build_tracker(settings=None) -> VelocityTracker:
+    """Tracker configured from Settings (VELOCITY_WINDOWS / VELOCITY_BACKEND)."""
+    if settings is None:
+        return VelocityTracker()
+    windows = parse_windows(settings.VELOCITY_WINDOWS)
+    name = settings.VELOCITY_BACKEND
+    if name not in BACKENDS:
+        print(f"[Velocity] Unknown backend '{name}', using memory")
+        name = "memory"
+    return VelocityTracker(windows, BACKENDS[name](windows[-1][0], settings))
@@ -0,0 +1,289 @@
+"""
+In-memory officer workload for auto-assignment (utils/load_heap.py).
+
+Built at startup from one grouped query. Afterwards it follows the
+committed changes of every SessionLocal session: complaints
+assigned / reassigned / resolved / archived / deleted, and officers added,
+moved or changing status. Those changes are collected from the ORM
+attribute history at flush and applied only after the commit, so every
+route is covered without its own bookkeeping. A change whose old value is
+unknown marks the tracker stale, and the next lookup rebuilds it.
+
+Each process only sees its own commits (and bulk SQL bypasses the ORM), so
+a reconciler thread compares with the DB every WORKLOAD_RECONCILE_SECONDS and
+corrects drift. GET /admin/workload/consistency reports the divergence.
+"""
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import models
+from .utils import commit_hooks
+from .utils.assignment_logic import ACTIVE_STATUSES, all_officer_loads, least_loaded_officer
+from .utils.load_heap import WorkloadTracker
+
+logger = logging.getLogger(__name__)
+
+_tracker = WorkloadTracker()
+_last_report = None
+_UNKNOWN = object()
+
+
+def get_tracker() -> WorkloadTracker:
+    return _tracker
+
+
+def _rows(db: Session) -> list:
+    return [(o, d, status == "Active", load) for o, d, status, load in all_officer_loads(db)]
+
+
+def load_workload(db: Session) -> WorkloadTracker:
+    """Startup: builds the heaps from the DB."""
+    _tracker.load(_rows(db))
+    print(f"[Workload] Loaded {len(_tracker.snapshot())} officers")
+    return _tracker
+
+
+def least_loaded_officer_id(db: Session, department_id: int):
+    """
+    (officer id, load) of the least-loaded active officer in the department, or None.
+    O(log n) from memory; falls back to (or rebuilds from) the grouped DB query.
+    """
+    if not _tracker.ready:
+        best = least_loaded_officer(db, department_id)
+        return (best[0].id, best[1]) if best else None
+    if _tracker.stale:
+        logger.info("Workload tracker stale, rebuilding from DB")
+        _tracker.load(_rows(db))
+    return _tracker.least_loaded(department_id)
+
+
+# ============ CHANGE TRACKING (commit hooks) ============
+
+def _before(history):
+    """Value before this flush, or _UNKNOWN when it was never loaded."""
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return _UNKNOWN
+
+
+def _counts(officer_id, status) -> bool:
+    return bool(officer_id) and status in ACTIVE_STATUSES
+
+
+def _collect(session) -> list:
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, models.Complaint):
+            if _counts(obj.assigned_officer_id, obj.status):
+                changes.append(("adjust", obj.assigned_officer_id, 1))
+        elif isinstance(obj, models.Officer):
+            changes.append(("officer", obj.id, obj.department_id, obj.status == "Active"))
+
+    for obj in session.dirty:
+        if isinstance(obj, models.Complaint):
+            attrs = inspect(obj).attrs
+            officer, status = attrs.assigned_officer_id.history, attrs.status.history
+            if not officer.has_changes() and not status.has_changes():
+                continue
+            old_officer, old_status = _before(officer), _before(status)
+            if old_officer is _UNKNOWN or old_status is _UNKNOWN:
+                changes.append(("stale",))
+                continue
+            if _counts(old_officer, old_status):
+                changes.append(("adjust", old_officer, -1))
+            if _counts(obj.assigned_officer_id, obj.status):
+                changes.append(("adjust", obj.assigned_officer_id, 1))
+        elif isinstance(obj, models.Officer):
+            attrs = inspect(obj).attrs
+            if attrs.status.history.has_changes() or attrs.department_id.history.has_changes():
+                changes.append(("officer", obj.id, obj.department_id, obj.status == "Active"))
+
+    for obj in session.deleted:
+        if isinstance(obj, models.Complaint) and _counts(obj.assigned_officer_id, obj.status):
+            changes.append(("adjust", obj.assigned_officer_id, -1))
+        elif isinstance(obj, models.Officer):
+            changes.append(("remove", obj.id))
+    return changes
+
+
+def _apply(session, changes):
+    reserved = Counter(session.info.pop("workload_reserved", ()))
+    for change in changes:
+        if change[0] == "adjust":
+            if change[2] == 1 and reserved[change[1]] > 0:
+                reserved[change[1]] -= 1  # already counted by reserve()
+                continue
+            _tracker.adjust(change[1], change[2])
+        elif change[0] == "officer":
+            _tracker.set_officer(change[1], change[2], change[3])
+        elif change[0] == "remove":
+            _tracker.remove_officer(change[1])
+        else:
+            _tracker.mark_stale()
+    for officer_id, count in reserved.items():
+        if count:
+            _tracker.adjust(officer_id, -count)  # reserved but not assigned in this commit
+
+
+def _release(session, transaction):
+    """Undoes reservations whose transaction ended without committing an assignment."""
+    if transaction.parent is None:
+        for officer_id in session.info.pop("workload_reserved", ()):
+            _tracker.adjust(officer_id, -1)
+
+
+def reserve(session, officer_id: int):
+    """
+    Counts an assignment about to be committed by `session` right away, so
+    concurrent lookups in this process spread over officers instead of all
+    picking the same least-loaded one. Undone if the transaction does not
+    commit it.
+    """
+    if _tracker.ready:
+        _tracker.adjust(officer_id, 1)
+        session.info.setdefault("workload_reserved", []).append(officer_id)
+
+
+def defer_adjust(session, officer_id: int, delta: int):
+    """
+    Load change written with Core / bulk SQL (no ORM history), applied with
+    the session's other changes once it commits.
+    """
+    commit_hooks.defer(session, "workload", [("adjust", officer_id, delta)])
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+TRACKED_ATTRIBUTES = (
+    models.Complaint.assigned_officer_id, models.Complaint.status,
+    models.Officer.status, models.Officer.department_id
+)
+
+
+def install(session_factory):
+    """Follows commits of sessions made by `session_factory` (idempotent)."""
+    if commit_hooks.is_registered(session_factory, "workload"):
+        return
+    # Load the old value when an expired attribute is overwritten (e.g. after a commit),
+    # so the flush history says which officer loses the complaint
+    for attribute in TRACKED_ATTRIBUTES:
+        if not event.contains(attribute, "set", _keep_old_value):
+            event.listen(attribute, "set", _keep_old_value, active_history=True, retval=True)
+    commit_hooks.register(session_factory, "workload", _collect, _apply)
+    event.listen(session_factory, "after_transaction_end", _release)
+
+
+# ============ RECONCILIATION ============
+
+def check(db: Session, repair: bool = False) -> dict:
+    """
+    Compares the in-memory loads with the DB. With repair, replaces the
+    in-memory state with the DB values (retried if a commit lands meanwhile).
+    """
+    global _last_report
+    for _ in range(3):
+        version = _tracker.version
+        memory = _tracker.snapshot()
+        rows = _rows(db)
+        db.rollback()  # end the read transaction so the next attempt sees new commits
+        if not repair or _tracker.load(rows, if_version=version):
+            break
+    divergent = []
+    for officer_id, department_id, active, load in rows:
+        mem = memory.get(officer_id)
+        if mem != (department_id, active, load):
+            divergent.append({
+                "officer_id": officer_id,
+                "department_id": department_id,
+                "active": active,
+                "db_load": load,
+                "memory_load": mem[2] if mem else None
+            })
+    db_ids = {row[0] for row in rows}
+    divergent += [
+        {"officer_id": o, "department_id": d, "active": a, "db_load": None, "memory_load": l}
+        for o, (d, a, l) in memory.items() if o not in db_ids
+    ]
+    report = {
+        "checked_at": datetime.utcnow(),
+        "officers": len(rows),
+        "divergent_count": len(divergent),
+        "divergent": divergent[:100],
+        "max_drift": max((abs((d["db_load"] or 0) - (d["memory_load"] or 0)) for d in divergent), default=0),
+        "repaired": repair,
+        "last_reconciled": _last_report and {k: _last_report[k] for k in ("checked_at", "divergent_count")}
+    }
+    if repair:
+        _last_report = report
+        if divergent:
+            logger.warning(f"Workload drift corrected for {len(divergent)} officer(s)")
+    return report
+
+
+class Reconciler:
+    """Daemon thread running check(repair=True) every `interval` seconds."""
+
+    def __init__(self, session_factory, interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="workload-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            db = self.session_factory()
+            try:
+                check(db, repair=True)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Workload reconciliation failed: {e}")
+            finally:
+                db.close()
+
+
+_reconciler = None
+
+
+def start(session_factory=None, interval: float = None):
+    """Installs the change listeners, loads the heaps and starts the reconciler (startup)."""
+    global _reconciler
+    from .database import SessionLocal
+    session_factory = session_factory or SessionLocal
+    if interval is None:
+        from .config import settings
+        interval = settings.WORKLOAD_RECONCILE_SECONDS
+    install(session_factory)
+    db = session_factory()
+    try:
+        load_workload(db)
+    finally:
+        db.close()
+    if _reconciler is None and interval > 0:
+        _reconciler = Reconciler(session_factory, interval)
+        _reconciler.start()
+
+
+def stop():
+    if _reconciler is not None:
+        _reconciler.stop()
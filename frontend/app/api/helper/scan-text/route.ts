@@ -1,75 +1,62 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { GoogleGenerativeAI } from '@google/generative-ai';
+import backendAPI from '@/lib/backend-api';
 
 /**
  * 🔍 Scan-Text API Route (Next.js)
- * 
- * Analyzes complaint description and returns Department, Priority, etc.
+ *
+ * Forwards the description (with the form's draft_id / final flag) to the
+ * backend analyzer, which keeps the incremental draft session per draft_id,
+ * and returns its Department, Priority, etc.
+ *
+ * RULE: This route NEVER returns HTTP 500 (the form falls back silently).
  */
+
+const fallback = (reason: string) => ({
+    category: "General",
+    department: "General Grievance Cell",
+    priority: "Medium",
+    ert: "3-5 days",
+    confidence: 0,
+    reasoning: [reason]
+});
+
 export async function POST(request: NextRequest) {
     try {
         const body = await request.json();
-        const { description } = body || {};
+        const { description, draft_id, final } = body || {};
 
         if (!description || description.length < 5) {
-            return NextResponse.json({
-                category: "General",
-                department: "General Grievance Cell",
-                priority: "Medium",
-                ert: "3-5 days",
-                confidence: 0,
-                reasoning: ["Description too short for analysis"]
-            });
-        }
-
-        const apiKey = process.env.GEMINI_API_KEY || process.env.STT_API_KEY;
-        if (!apiKey || apiKey.includes('AIzaSyCX')) {
-            return NextResponse.json({
-                category: "General",
-                department: "General Grievance Cell",
-                priority: "Medium",
-                ert: "3-5 days",
-                confidence: 0,
-                reasoning: ["AI analysis temporarily unavailable due to configuration"]
-            });
+            return NextResponse.json(fallback("Description too short for analysis"));
         }
 
-        const genAI = new GoogleGenerativeAI(apiKey);
-        const model = genAI.getGenerativeModel({ model: 'gemini-flash-latest' });
-
-        const prompt = `
-        Analyze this complaint: "${description}"
-        Return JSON with: category, department, priority, ert (estimated resolution time), confidence (0-100), reasoning (list of strings).
-        Be realistic about priority and department.
-        `;
+        // Safely extract auth header
+        let authHeader: string | null = null;
+        try {
+            authHeader = request.headers.get('authorization');
+        } catch (e) { /* ignore */ }
 
-        const result = await model.generateContent(prompt);
-        const text = result.response.text();
+        const headers: Record<string, string> = {};
+        if (authHeader) {
+            headers['Authorization'] = authHeader;
+        }
 
-        // Basic JSON extraction
-        const jsonMatch = text.match(/\{[\s\S]*\}/);
-        if (jsonMatch) {
-            return NextResponse.json(JSON.parse(jsonMatch[0]));
+        try {
+            const response = await backendAPI.post(
+                '/helper/scan-text',
+                { description, draft_id, final: Boolean(final) },
+                { headers }
+            );
+            if (response && response.data) {
+                return NextResponse.json(response.data);
+            }
+        } catch (apiError: any) {
+            console.error('[SCAN-TEXT] Backend error:', apiError?.message);
         }
 
-        return NextResponse.json({
-            category: "General",
-            department: "General Grievance Cell",
-            priority: "Medium",
-            ert: "3-5 days",
-            confidence: 50,
-            reasoning: ["AI generated non-JSON response"]
-        });
+        return NextResponse.json(fallback("AI analysis temporarily unavailable"));
 
     } catch (error: any) {
         console.error("[SCAN-TEXT] Error:", error);
-        return NextResponse.json({
-            category: "General",
-            department: "General Grievance Cell",
-            priority: "Medium",
-            ert: "3-5 days",
-            confidence: 0,
-            reasoning: ["Internal server error during analysis"]
-        });
+        return NextResponse.json(fallback("Internal server error during analysis"));
     }
 }
@@ -26,6 +26,12 @@ export default function NewComplaintPage() {
     const [aiAnalysis, setAiAnalysis] = useState<any>(null);
     const [analyzing, setAnalyzing] = useState(false);
     const debouncedDescription = useDebounce(description, 800);
+    // Server keeps incremental analysis state per draft (only the edited tail is re-scanned)
+    const draftIdRef = useRef<string>(
+        typeof crypto !== 'undefined' && 'randomUUID' in crypto
+            ? crypto.randomUUID()
+            : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+    );
 
     const [selectedVoiceLang, setSelectedVoiceLang] = useState<string>('en-IN');
     const {
@@ -66,7 +72,10 @@ export default function NewComplaintPage() {
             if (isActive) setAnalyzing(true);
             try {
                 if (!isActive) return;
-                const res = await api.post('/helper/scan-text', { description: debouncedDescription });
+                const res = await api.post('/helper/scan-text', {
+                    description: debouncedDescription,
+                    draft_id: draftIdRef.current
+                });
 
                 if (isActive) {
                     setAiAnalysis(res.data);
@@ -89,6 +98,21 @@ export default function NewComplaintPage() {
         };
     }, [debouncedDescription, priority]);
 
+    // Field left: the draft is done, so the server may run its one LLM refinement now
+    const finalizeAnalysis = async () => {
+        if (description.trim().length < 10) return;
+        try {
+            const res = await api.post('/helper/scan-text', {
+                description,
+                draft_id: draftIdRef.current,
+                final: true
+            });
+            setAiAnalysis(res.data);
+        } catch (err) {
+            console.error("AI Analysis failed silently:", err);
+        }
+    };
+
     // Voice Input Logic
     useEffect(() => {
         if (transcript && transcript !== lastProcessedTranscript) {
@@ -202,6 +226,7 @@ export default function NewComplaintPage() {
                                                 placeholder="Describe the issue in detail..."
                                                 value={description}
                                                 onChange={(e) => setDescription(e.target.value)}
+                                                onBlur={finalizeAnalysis}
                                                 required
                                             />
                                             {isListening && (
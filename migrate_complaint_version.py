@@ -0,0 +1,35 @@
+import sqlite3
+from backend.config import settings
+
+DB_PATH = settings.DATABASE_URL.replace("sqlite:///", "")
+
+def migrate():
+    print(f"Migrating database at: {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Optimistic locking counter (models.Complaint.version, version_id_col)
+        cursor.execute("PRAGMA table_info(complaints)")
+        columns = [info[1] for info in cursor.fetchall()]
+        
+        if "version" not in columns:
+            print("Adding version column...")
+            cursor.execute("ALTER TABLE complaints ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        else:
+            print("version already exists.")
+
+        # Readers no longer block the writer (several uvicorn workers + background workers)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        print(f"journal_mode: {cursor.fetchone()[0]}")
+            
+        conn.commit()
+        print("✅ Migration successful: complaint version column added.")
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,37 @@
+import sqlite3
+from backend.config import settings
+from backend.database import engine
+from backend import models
+
+DB_PATH = settings.DATABASE_URL.replace("sqlite:///", "")
+
+def migrate():
+    print(f"Migrating database at: {DB_PATH}")
+
+    # New tables (incidents, complaint_signatures) are created if missing
+    models.Base.metadata.create_all(bind=engine, tables=[models.Incident.__table__, models.ComplaintSignature.__table__])
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("PRAGMA table_info(complaints)")
+        columns = [info[1] for info in cursor.fetchall()]
+
+        if "incident_id" not in columns:
+            print("Adding incident_id column...")
+            cursor.execute("ALTER TABLE complaints ADD COLUMN incident_id INTEGER REFERENCES incidents(id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_complaints_incident_id ON complaints (incident_id)")
+        else:
+            print("incident_id already exists.")
+
+        conn.commit()
+        print("✅ Migration successful: incident clusters added.")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,32 @@
+import sqlite3
+from backend.config import settings
+
+DB_PATH = settings.DATABASE_URL.replace("sqlite:///", "")
+
+def migrate():
+    print(f"Migrating database at: {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Officer load lookups in assign_to_best_officer (see models.Complaint.__table_args__)
+        cursor.execute("PRAGMA index_list(complaints)")
+        indexes = [info[1] for info in cursor.fetchall()]
+        
+        if "idx_complaints_officer_status" not in indexes:
+            print("Creating idx_complaints_officer_status...")
+            cursor.execute("CREATE INDEX idx_complaints_officer_status ON complaints (assigned_officer_id, status)")
+            cursor.execute("ANALYZE complaints")
+        else:
+            print("idx_complaints_officer_status already exists.")
+            
+        conn.commit()
+        print("✅ Migration successful: officer load index added.")
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,66 @@
+import sqlite3
+from backend.config import settings
+
+DB_PATH = settings.DATABASE_URL.replace("sqlite:///", "")
+
+NEW_COLUMNS = {
+    "sla_warn_at": "DATETIME",
+    "sla_admin_at": "DATETIME",
+    "escalation_level": "INTEGER DEFAULT 0",
+    "next_escalation_at": "DATETIME",
+}
+
+def migrate():
+    print(f"Migrating database at: {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Escalation thresholds on complaints (escalation.py, utils/escalation_policy.py)
+        cursor.execute("PRAGMA table_info(complaints)")
+        columns = [info[1] for info in cursor.fetchall()]
+        
+        for name, column_type in NEW_COLUMNS.items():
+            if name not in columns:
+                print(f"Adding {name} column...")
+                cursor.execute(f"ALTER TABLE complaints ADD COLUMN {name} {column_type}")
+            else:
+                print(f"{name} already exists.")
+
+        # Open complaints with an SLA get the default thresholds (warning at 80%, admin queue at 2x)
+        cursor.execute("""
+            UPDATE complaints SET
+                sla_warn_at = datetime(sla_deadline, '-' || (sla_hours * 0.2 * 3600) || ' seconds'),
+                sla_admin_at = datetime(sla_deadline, '+' || (sla_hours * 3600) || ' seconds'),
+                escalation_level = 0
+            WHERE sla_deadline IS NOT NULL AND sla_hours IS NOT NULL AND sla_warn_at IS NULL
+        """)
+        cursor.execute("""
+            UPDATE complaints SET next_escalation_at = sla_warn_at
+            WHERE sla_warn_at IS NOT NULL AND next_escalation_at IS NULL AND escalation_level = 0
+              AND COALESCE(is_archived, 0) = 0
+              AND status NOT IN ('RESOLVED', 'VERIFIED', 'Closed by Citizen', 'Work Completed', 'Action Completed')
+        """)
+        print(f"Set escalation thresholds on {cursor.rowcount} open complaints.")
+
+        cursor.execute("PRAGMA index_list(complaints)")
+        indexes = [info[1] for info in cursor.fetchall()]
+        if "idx_complaints_next_escalation" not in indexes:
+            print("Creating idx_complaints_next_escalation...")
+            cursor.execute("CREATE INDEX idx_complaints_next_escalation ON complaints (next_escalation_at)")
+            cursor.execute("ANALYZE complaints")
+        else:
+            print("idx_complaints_next_escalation already exists.")
+
+        # escalation_policies and notification_outbox are new tables: created by create_all at startup
+            
+        conn.commit()
+        print("✅ Migration successful: SLA escalation columns added.")
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
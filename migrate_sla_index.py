@@ -0,0 +1,36 @@
+import sqlite3
+from backend.config import settings
+
+DB_PATH = settings.DATABASE_URL.replace("sqlite:///", "")
+
+def migrate():
+    print(f"Migrating database at: {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        # Rows created before the column had a default: the sweeper only looks at sla_breached = 0
+        cursor.execute("UPDATE complaints SET sla_breached = 0 WHERE sla_breached IS NULL")
+        print(f"Set sla_breached = 0 on {cursor.rowcount} complaints.")
+
+        # SLA sweeper catch-up + breached listings (see models.Complaint.__table_args__)
+        cursor.execute("PRAGMA index_list(complaints)")
+        indexes = [info[1] for info in cursor.fetchall()]
+        
+        if "idx_complaints_sla_breached_deadline" not in indexes:
+            print("Creating idx_complaints_sla_breached_deadline...")
+            cursor.execute("CREATE INDEX idx_complaints_sla_breached_deadline ON complaints (sla_breached, sla_deadline)")
+            cursor.execute("ANALYZE complaints")
+        else:
+            print("idx_complaints_sla_breached_deadline already exists.")
+            
+        conn.commit()
+        print("✅ Migration successful: SLA breach index added.")
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
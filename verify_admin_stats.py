@@ -0,0 +1,217 @@
+"""
+Regression + benchmark: GET /admin/stats as one aggregate query
+(dashboard_stats.py) vs the previous implementation (seven COUNT queries
+plus every resolved Complaint loaded to average closed_at - created_at).
+
+1. Parity: both versions on several random datasets with the awkward rows
+   (NULL timestamps, closed before created, NULL flags, every status,
+   closures last month) must return identical numbers.
+2. Benchmark on N complaints (default 1M): time, queries, peak memory.
+3. Burst cache: 20 concurrent requests run the aggregate once.
+4. The Postgres form of the query uses EXTRACT(EPOCH ...).
+Run: python verify_admin_stats.py [--n 1000000]
+"""
+import argparse
+import os
+import random
+import resource
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from backend import dashboard_stats, models
+
+SQL_FMT = "%Y-%m-%d %H:%M:%S.%f"  # how SQLAlchemy stores DateTime on SQLite
+STATUSES = ["NEW", "Assigned", "ASSIGNED", "IN_PROGRESS", "Pending", "RESOLVED", "VERIFIED",
+            "Closed by Citizen", "Work Completed", "Action Completed", "REJECTED"]
+
+
+def old_stats(db):
+    """get_dashboard_stats before the aggregate query (unchanged)."""
+    total = db.query(models.Complaint).count()
+    critical = db.query(models.Complaint).filter(models.Complaint.priority == "Critical").count()
+    sla_breached = db.query(models.Complaint).filter(models.Complaint.sla_breached == True).count()
+    unassigned = db.query(models.Complaint).filter(
+        models.Complaint.assigned_officer_id == None,
+        models.Complaint.is_archived == False
+    ).count()
+    now = datetime.now()
+    first_day_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    first_day_last_month = (first_day_this_month - timedelta(days=1)).replace(day=1)
+    processed_statuses = ["RESOLVED", "Closed by Citizen", "Work Completed", "Action Completed"]
+    total_processed = db.query(models.Complaint).filter(models.Complaint.status.in_(processed_statuses)).count()
+    pending = total - total_processed
+    if pending < 0: pending = 0
+    last_month_processed = db.query(models.Complaint).filter(
+        models.Complaint.status.in_(processed_statuses),
+        models.Complaint.closed_at >= first_day_last_month,
+        models.Complaint.closed_at < first_day_this_month
+    ).count()
+    total_growth = 0
+    if last_month_processed > 0:
+        total_growth = ((total_processed - last_month_processed) / last_month_processed) * 100
+    resolution_rate = 0
+    if total > 0:
+        resolution_rate = (total_processed / total) * 100
+    resolved_complaints = db.query(models.Complaint).filter(
+        models.Complaint.status.in_(processed_statuses),
+        models.Complaint.closed_at != None
+    ).all()
+    total_hours = 0
+    count_with_time = 0
+    for c in resolved_complaints:
+        if c.created_at and c.closed_at:
+            seconds = (c.closed_at - c.created_at).total_seconds()
+            if seconds > 0:
+                total_hours += seconds / 3600
+                count_with_time += 1
+    avg_resolution_time = 0
+    if count_with_time > 0:
+        avg_resolution_time = round(total_hours / count_with_time, 1)
+    return {
+        "total": total,
+        "total_processed": total_processed,
+        "total_growth": round(total_growth, 1),
+        "pending": pending,
+        "resolved": total_processed,
+        "resolution_rate": round(resolution_rate, 1),
+        "avg_resolution_time": avg_resolution_time,
+        "critical": critical,
+        "sla_breached": sla_breached,
+        "unassigned": unassigned,
+        "active_officers": db.query(models.Officer).filter(models.Officer.status == "Active").count()
+    }
+
+
+def rows(n, seed):
+    rng = random.Random(seed)
+    now = datetime.now()
+    last_month = now.replace(day=1) - timedelta(days=10)
+    for i in range(1, n + 1):
+        created = None if rng.random() < 0.01 else now - timedelta(days=rng.uniform(0, 400))
+        status = rng.choice(STATUSES)
+        closed = None
+        if rng.random() < 0.7:
+            base = created or now
+            roll = rng.random()
+            if roll < 0.05:
+                closed = base - timedelta(hours=rng.uniform(0, 5))  # clock skew
+            elif roll < 0.08:
+                closed = base  # zero duration
+            elif roll < 0.25:
+                closed = last_month + timedelta(hours=rng.uniform(-200, 200))
+            else:
+                closed = base + timedelta(hours=rng.uniform(0.01, 900))
+        yield (
+            i, "c", "d", 1, status, rng.choice(["Critical", "High", "Medium", "Low", None]),
+            rng.choice([0, 1, None]), rng.choice([0, 0, 0, 1, None]),
+            None if rng.random() < 0.3 else 1,
+            created.strftime(SQL_FMT) if created else None, closed.strftime(SQL_FMT) if closed else None
+        )
+
+
+def build(path, n, seed):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, email, role) VALUES (1, 'citizen@example.com', 'USER')")
+    conn.executemany("INSERT INTO officers (id, employee_id, name, status) VALUES (?, ?, ?, ?)",
+                     [(i, f"E{i}", f"O{i}", "Active" if i % 3 else "On Leave") for i in range(1, 31)])
+    conn.executemany(
+        "INSERT INTO complaints (id, title, description, user_id, status, priority, sla_breached, is_archived, "
+        "assigned_officer_id, created_at, closed_at, version) VALUES (?,?,?,?,?,?,?,?,?,?,?,1)", rows(n, seed)
+    )
+    conn.commit()
+    conn.close()
+    return engine
+
+
+def counting(engine):
+    counter = [0]
+    event.listen(engine, "before_cursor_execute", lambda *args: counter.__setitem__(0, counter[0] + 1))
+    return counter
+
+
+def main(n):
+    workdir = tempfile.mkdtemp()
+
+    # 1. Parity
+    mismatches = []
+    for seed in range(5):
+        path = os.path.join(workdir, f"parity{seed}.db")
+        engine = build(path, 4000, seed)
+        db = sessionmaker(bind=engine)()
+        old, new = old_stats(db), dashboard_stats.compute_stats(db)
+        if old != new:
+            mismatches.append((seed, {k: (old[k], new[k]) for k in old if old[k] != new[k]}))
+        db.close()
+        engine.dispose()
+        os.remove(path)
+    print(f"{'✅' if not mismatches else '❌'} Same numbers as the previous implementation on 5 datasets"
+          + (f": {mismatches}" if mismatches else ""))
+
+    # 2. Benchmark
+    path = os.path.join(workdir, "stats.db")
+    start = time.perf_counter()
+    engine = build(path, n, 99)
+    print(f"Seeded {n} complaints in {time.perf_counter() - start:.1f} s")
+    queries = counting(engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    results = {}
+    for label, fn in (("Aggregate", dashboard_stats.compute_stats), ("Previous", old_stats)):
+        queries[0] = 0
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        results[label] = fn(db)
+        elapsed = time.perf_counter() - start
+        grown = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+        print(f"{label:10} {elapsed:7.2f} s, {queries[0]} queries, peak memory +{grown:.0f} MB")
+        db.expunge_all()
+    same = results["Aggregate"] == results["Previous"]
+    print(f"{'✅' if same else '❌'} Same numbers at {n} rows: {results['Aggregate']}")
+    db.close()
+
+    # 3. Burst cache (empty: everything above called compute_stats directly)
+    queries[0] = 0
+    answers = []
+
+    def request():
+        own = Session()
+        try:
+            answers.append(dashboard_stats.get_stats(own))
+        finally:
+            own.close()
+
+    threads = [threading.Thread(target=request) for _ in range(20)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    ok = queries[0] == 1 and len(answers) == 20 and all(a == answers[0] for a in answers)
+    print(f"{'✅' if ok else '❌'} Burst of 20 requests: {queries[0]} query, {elapsed:.2f} s in total")
+
+    # 4. Postgres
+    sql = str(dashboard_stats.stats_query("postgresql", datetime.now()).compile(dialect=postgresql.dialect()))
+    ok = "EXTRACT(epoch FROM" in sql and "julianday" not in sql
+    print(f"{'✅' if ok else '❌'} Postgres query uses EXTRACT(EPOCH FROM closed_at - created_at)")
+
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1000000)
+    args = parser.parse_args()
+    main(args.n)
@@ -0,0 +1,95 @@
+"""
+Load test: /helper/ping latency must stay flat while 50 transcriptions are in flight.
+
+Default mode starts the app in-process with uvicorn and replaces the Gemini call
+with a 3s blocking sleep (simulating a slow transcription), so no API key is needed.
+Use --url to point at a running server with real Gemini calls instead.
+
+Run: python verify_ai_async_load.py [--url http://127.0.0.1:8000] [--transcriptions 50]
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import httpx
+
+SIMULATED_TRANSCRIBE_SECONDS = 3.0
+
+
+def start_inprocess_server(port: int):
+    import uvicorn
+    from backend.routes import ai_routes
+
+    def slow_transcribe(audio_bytes, lang="en-IN", **kwargs):
+        time.sleep(SIMULATED_TRANSCRIBE_SECONDS)  # blocking, like the Gemini SDK
+        return "simulated transcript"
+
+    ai_routes.transcribe_audio = slow_transcribe
+
+    config = uvicorn.Config("backend.app:app", host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def ping_latencies(client, base_url, duration, interval=0.05):
+    samples = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        r = await client.get(f"{base_url}/helper/ping")
+        r.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def transcribe(client, base_url):
+    files = {"audio": ("clip.webm", b"\x1aE\xdf\xa3" + b"\x00" * 32000, "audio/webm")}
+    r = await client.post(f"{base_url}/helper/transcribe", files=files, data={"lang": "en-IN"}, timeout=120)
+    return r.status_code
+
+
+def summarize(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} n={len(samples):4d}  median={statistics.median(samples):7.2f} ms  "
+          f"p95={p95:7.2f} ms  max={samples[-1]:7.2f} ms")
+    return statistics.median(samples), p95
+
+
+async def main(base_url, n_transcriptions, duration):
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=n_transcriptions + 10)) as client:
+        print("--- BASELINE (idle) ---")
+        base_median, base_p95 = summarize("ping", await ping_latencies(client, base_url, 2.0))
+
+        print(f"\n--- UNDER LOAD ({n_transcriptions} transcriptions in flight) ---")
+        started = time.perf_counter()
+        jobs = [asyncio.ensure_future(transcribe(client, base_url)) for _ in range(n_transcriptions)]
+        await asyncio.sleep(0.2)
+        load_median, load_p95 = summarize("ping", await ping_latencies(client, base_url, duration))
+        statuses = await asyncio.gather(*jobs)
+        print(f"transcriptions: {statuses.count(200)}/{len(statuses)} OK in {time.perf_counter() - started:.1f}s")
+
+    flat = load_p95 < max(50.0, base_p95 * 5)
+    print("\n✅ /helper/ping latency stayed flat" if flat else "\n❌ /helper/ping latency degraded under load")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="Running server (default: in-process with simulated Gemini)")
+    parser.add_argument("--transcriptions", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to sample ping under load")
+    args = parser.parse_args()
+
+    url = args.url
+    if not url:
+        port = 8765
+        start_inprocess_server(port)
+        url = f"http://127.0.0.1:{port}"
+    asyncio.run(main(url, args.transcriptions, args.duration))
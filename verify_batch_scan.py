@@ -0,0 +1,65 @@
+"""
+Parity check + throughput benchmark for /helper/scan-text/batch.
+Compares generate_analysis_responses (batch) against generate_analysis_response
+called once per description. The LLM is disabled for both paths so results
+are deterministic (local model -> rules).
+
+Uses the trained local classifier artifact if present, otherwise trains one
+in memory from the synthetic samples.
+Run: python verify_batch_scan.py [--n 2000]
+"""
+import argparse
+import time
+
+from backend import ai_model, ai_utils, llm_provider
+from verify_keyword_matcher import build_corpus
+
+
+def setup():
+    # Unconfigured provider: both paths fall back to rules below the confidence threshold
+    llm_provider._provider = llm_provider.LLMProvider(api_key="", model_name="disabled")
+    if ai_model.load_model() is None:
+        print("(no artifact; training local classifier in memory)")
+        classifier, _ = ai_model.train(ai_model.synthetic_samples())
+        ai_model._model = classifier
+
+
+def main(n):
+    setup()
+    corpus = [t for t in build_corpus(n) if t and len(t.strip()) >= 5][:n]
+
+    print(f"--- PER-ITEM ({len(corpus)} descriptions) ---")
+    start = time.perf_counter()
+    single = [ai_utils.generate_analysis_response(text) for text in corpus]
+    per_item = time.perf_counter() - start
+    print(f"{per_item:7.2f}s  ({len(corpus) / per_item:8.0f} complaints/s)")
+
+    print("\n--- BATCH ---")
+    start = time.perf_counter()
+    batch = ai_utils.generate_analysis_responses(corpus)
+    batched = time.perf_counter() - start
+    print(f"{batched:7.2f}s  ({len(corpus) / batched:8.0f} complaints/s)  speedup {per_item / batched:.1f}x")
+    for stage, fn in [
+        ("keyword scan", lambda: [ai_utils.scan_keywords(text) for text in corpus]),
+        ("local model", lambda: ai_model.predict_batch(corpus)),
+        ("sentiment", lambda: ai_utils.sentiment_scores(corpus)),
+    ]:
+        start = time.perf_counter()
+        fn()
+        print(f"   {stage:<14} {time.perf_counter() - start:7.3f}s")
+
+    print("\n--- PARITY ---")
+    mismatches = 0
+    for text, a, b in zip(corpus, single, batch):
+        if a != b:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"❌ MISMATCH for {text[:60]!r}: single={a} batch={b}")
+    print("✅ All results identical" if mismatches == 0 else f"❌ {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.n)
@@ -0,0 +1,177 @@
+"""
+Benchmark + checks for bulk auto-assignment (bulk_assignment.py).
+
+Builds a city: D departments x 50 officers spread over 25 wards, a load of
+already-assigned open complaints, and an unassigned backlog of N complaints
+(mixed priorities, most with a ward in the location, a few without a department).
+
+1. One-at-a-time: the current admin flow per complaint (least-loaded query,
+   assign, history + audit + timeline rows, summary job, commit), timed on a
+   sample and extrapolated to the backlog.
+2. Bulk: dry run (must write nothing), then plan + apply in one transaction.
+   Checks: every planned complaint assigned once to an active officer of its
+   department, one history / audit / timeline row each, workload heaps
+   consistent after commit; reports balance and ward matches.
+Run: python verify_bulk_assignment.py [--n 50000] [--departments 10] [--sample 300]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from backend import bulk_assignment, models, summaries, workload
+from backend.utils.assignment_logic import SLA_HOURS, least_loaded_officer
+
+PRIORITIES = ["Critical", "High", "Medium", "Medium", "Medium", "Low"]
+
+
+def build_city(n, departments, seed=3):
+    path = os.path.join(tempfile.mkdtemp(), "bulk.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    raw = engine.raw_connection()
+    cur = raw.cursor()
+    cur.execute("INSERT INTO users (id, email, role) VALUES (1, 'admin@gov.in', 'ADMIN')")
+    cur.executemany("INSERT INTO departments (id, name) VALUES (?, ?)", [(d, f"Dept {d}") for d in range(1, departments + 1)])
+    officers = []
+    for d in range(1, departments + 1):
+        for i in range(50):
+            oid = len(officers) + 1
+            status = "Active" if rng.random() < 0.9 else "On Leave"
+            officers.append((oid, f"E{oid}", f"Officer {oid}", "JE", d, f"Ward {rng.randint(1, 25)}", status))
+    cur.executemany(
+        "INSERT INTO officers (id, employee_id, name, designation, department_id, ward, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        officers
+    )
+    now = datetime.utcnow()
+    existing = [
+        (f"old {i}", "d", "IN_PROGRESS", rng.choice(PRIORITIES), rng.choice(officers)[0], rng.randint(1, departments), 1, 0,
+         now - timedelta(days=rng.random() * 10))
+        for i in range(n * 2)
+    ]
+    backlog = [
+        (f"new {i}", "d", "NEW", rng.choice(PRIORITIES), None, rng.randint(1, departments) if rng.random() > 0.01 else None, 1, 0,
+         now - timedelta(hours=rng.random() * 72), f"Ward {rng.randint(1, 25)}, main road" if rng.random() < 0.9 else "near bus stand")
+        for i in range(n)
+    ]
+    cur.executemany(
+        "INSERT INTO complaints (title, description, status, priority, assigned_officer_id, department_id, user_id, is_archived, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", existing
+    )
+    cur.executemany(
+        "INSERT INTO complaints (title, description, status, priority, assigned_officer_id, department_id, user_id, is_archived, created_at, location)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", backlog
+    )
+    raw.commit()
+    cur.execute("ANALYZE")
+    raw.close()
+    return engine, sessionmaker(bind=engine, autoflush=False), path
+
+
+def one_at_a_time(db, admin, ids):
+    """The per-complaint admin flow (assign_complaint with the least-loaded officer)."""
+    for complaint_id in ids:
+        complaint = db.query(models.Complaint).filter(models.Complaint.id == complaint_id).first()
+        best = least_loaded_officer(db, complaint.department_id) if complaint.department_id else None
+        if not best:
+            continue
+        officer = best[0]
+        complaint.assigned_officer_id = officer.id
+        complaint.assigned_at = datetime.utcnow()
+        complaint.assigned_by_admin_id = admin.id
+        complaint.status = "ASSIGNED"
+        complaint.sla_hours = SLA_HOURS.get(complaint.priority or "Medium", 120)
+        complaint.sla_deadline = datetime.utcnow() + timedelta(hours=complaint.sla_hours)
+        db.add(models.ComplaintHistory(complaint_id=complaint_id, action=f"Assigned to {officer.name}", performed_by=admin.email))
+        db.add(models.AdminAuditLog(admin_id=admin.id, action=f"Assigned complaint #{complaint_id}", target_resource=f"complaint:{complaint_id}"))
+        db.add(models.GrievanceTimeline(complaint_id=complaint_id, status="ASSIGNED", updated_by="ADMIN"))
+        summaries.enqueue_summary(db, complaint)
+        db.commit()
+
+
+def count(db, model, *criteria):
+    return db.query(func.count()).select_from(model).filter(*criteria).scalar()
+
+
+def main(n, departments, sample):
+    print(f"--- ONE AT A TIME (sample of {sample}) ---")
+    engine, Session, path = build_city(n, departments)
+    db = Session()
+    admin = db.get(models.User, 1)
+    ids = [i for (i,) in db.query(models.Complaint.id).filter(models.Complaint.assigned_officer_id == None).limit(sample)]
+    start = time.perf_counter()
+    one_at_a_time(db, admin, ids)
+    per = (time.perf_counter() - start) / len(ids)
+    print(f"{per * 1e3:.1f} ms per complaint -> {per * n / 60:.1f} min for {n}")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+    print(f"\n--- BULK ({n} unassigned, {departments * 50} officers) ---")
+    engine, Session, path = build_city(n, departments)
+    workload.start(Session, interval=0)
+    db = Session()
+    admin = db.get(models.User, 1)
+
+    start = time.perf_counter()
+    plan, officers = bulk_assignment.plan_backlog(db)
+    dry = plan.to_dict(limit=100)
+    dry_time = time.perf_counter() - start
+    untouched = count(db, models.Complaint, models.Complaint.assigned_officer_id == None) == n
+    print(f"Dry run: {dry_time:.2f} s (planning {plan.planning_ms:.0f} ms), {dry['assigned']} planned, skipped {dry['skipped']}")
+    print(f"{'✅' if untouched else '❌'} Dry run wrote nothing")
+
+    start = time.perf_counter()
+    plan, officers = bulk_assignment.plan_backlog(db)
+    written = bulk_assignment.apply_plan(db, plan, officers, admin)
+    db.commit()
+    bulk_time = time.perf_counter() - start
+    print(f"Plan + apply + commit: {bulk_time:.2f} s for {written} complaints ({bulk_time / max(written, 1) * 1e6:.0f} µs each)")
+
+    planned = {cid: oid for cid, oid, _, _ in plan.assignments}
+    rows = db.query(models.Complaint.id, models.Complaint.assigned_officer_id, models.Complaint.department_id,
+                    models.Complaint.status).filter(models.Complaint.id.in_(list(planned))).all()
+    active = {o: info[0] for o, info in officers.items()}
+    ok = len(rows) == len(planned) and all(
+        officer == planned[cid] and active.get(officer) == dept and status == "ASSIGNED" for cid, officer, dept, status in rows
+    )
+    print(f"{'✅' if ok else '❌'} Every planned complaint assigned to an active officer of its department")
+    per_row = [
+        count(db, models.ComplaintHistory), count(db, models.GrievanceTimeline),
+        count(db, models.AdminAuditLog, models.AdminAuditLog.target_id != None)
+    ]
+    print(f"{'✅' if per_row == [written] * 3 else '❌'} History / timeline / audit rows: {per_row}")
+    report = workload.check(db)
+    print(f"{'✅' if report['divergent_count'] == 0 else '❌'} Workload heaps match the DB after commit")
+
+    spreads = []
+    by_dept = defaultdict(list)
+    for officer_id, stats in plan.officers.items():
+        by_dept[stats["department_id"]].append(stats["load_units"])
+    for loads in by_dept.values():
+        spreads.append(max(loads) - min(loads))
+    matches = sum(1 for a in plan.assignments if a[3])
+    print(f"Load spread per department (max - min, Medium units): median {statistics.median(spreads):.1f}, "
+          f"max {max(spreads):.1f}")
+    print(f"Ward matches: {matches}/{written} ({matches / max(written, 1):.0%})")
+    print(f"Speed-up vs one at a time: {per * n / bulk_time:,.0f}x")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50000)
+    parser.add_argument("--departments", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=300)
+    args = parser.parse_args()
+    main(args.n, args.departments, args.sample)
@@ -0,0 +1,274 @@
+"""
+Concurrency stress test for complaint assignment (Complaint.version + retries,
+FOR UPDATE SKIP LOCKED on Postgres).
+
+T threads (default 32) race over the same unassigned complaints:
+0. Unguarded read-check-write (no version check): shows the race is real here.
+1. Auto-assignment (assign_to_best_officer) from every thread.
+2. Admin assign_complaint with random officers from every thread.
+3. Concurrent reassign_complaint: no lost reassignment_count increments.
+4. Bulk auto-assign (a few threads) racing single auto-assignment.
+A double-assignment is a complaint for which more than one call reported
+success, or whose final officer is not the one the successful call chose.
+Run: python verify_concurrent_assignment.py [--threads 32] [--complaints 300]
+     python verify_concurrent_assignment.py --url postgresql://user:pw@host/empty_test_db
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, func, update
+from sqlalchemy.orm import sessionmaker
+
+from backend import bulk_assignment, models, schemas, workload
+from backend.routes import admin_routes
+from backend.utils.assignment_logic import assign_to_best_officer
+
+OFFICERS = 8
+
+
+def make_engine(url, threads):
+    if url:
+        return create_engine(url, pool_size=threads + 4, max_overflow=0), None
+    path = os.path.join(tempfile.mkdtemp(), "concurrency.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60},
+                           pool_size=threads + 4, max_overflow=0)
+
+    @event.listens_for(engine, "connect")
+    def _wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    return engine, path
+
+
+def seed(Session, complaints):
+    db = Session()
+    db.add(models.User(id=1, email="admin@gov.in", role="ADMIN"))
+    db.add(models.Department(id=1, name="Dept 1"))
+    for i in range(1, OFFICERS + 1):
+        db.add(models.Officer(id=i, employee_id=f"E{i}", name=f"Officer {i}", designation="JE", department_id=1, status="Active"))
+    for i in range(complaints):
+        db.add(models.Complaint(title=f"c{i}", description="d", user_id=1, department_id=1, status="NEW", priority="Medium"))
+    db.commit()
+    ids = [i for (i,) in db.query(models.Complaint.id)]
+    db.close()
+    return ids
+
+
+def reset(Session):
+    db = Session()
+    db.execute(update(models.Complaint.__table__).values(
+        assigned_officer_id=None, status="NEW", reassignment_count=0, version=models.Complaint.__table__.c.version + 1
+    ))
+    for model in (models.GrievanceTimeline, models.ComplaintHistory, models.AdminAuditLog, models.BackgroundJob):
+        db.query(model).delete()
+    db.commit()
+    workload.load_workload(db)
+    db.close()
+
+
+def run_threads(count, target):
+    errors = []
+
+    def wrapped(n):
+        try:
+            target(n)
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=wrapped, args=(n,)) for n in range(count)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, errors
+
+
+def check(Session, successes, label, elapsed, errors):
+    """successes: complaint id -> [officer ids reported by successful calls]"""
+    db = Session()
+    final = dict(db.query(models.Complaint.id, models.Complaint.assigned_officer_id))
+    db.close()
+    doubles = [cid for cid, officers in successes.items() if len(officers) > 1 or final[cid] != officers[0]]
+    assigned = sum(1 for o in final.values() if o)
+    loads = Counter(o for o in final.values() if o)
+    spread = max(loads.values()) - min(loads.values()) if loads else 0
+    status = "✅" if not doubles and not errors else "❌"
+    print(f"{status} {label}: {elapsed:.1f} s, {assigned}/{len(final)} assigned, "
+          f"{len(doubles)} double-assignments, officer load spread {spread}"
+          + (f", {len(errors)} thread errors e.g. {errors[0]}" if errors else ""))
+    return not doubles and not errors
+
+
+def main(url, threads, complaints):
+    engine, path = make_engine(url, threads)
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    ids = seed(Session, complaints)
+    workload.start(Session, interval=0)
+    print(f"--- {engine.dialect.name}, {threads} threads, {complaints} complaints, {OFFICERS} officers ---")
+    ok = True
+
+    # 0. Baseline without a version check
+    successes = defaultdict(list)
+    lock = threading.Lock()
+
+    def unguarded(n):
+        rng = random.Random(n)
+        order = ids[:]
+        rng.shuffle(order)
+        with engine.connect() as conn:
+            table = models.Complaint.__table__
+            for cid in order:
+                current = conn.execute(table.select().with_only_columns(table.c.assigned_officer_id)
+                                       .where(table.c.id == cid)).scalar()
+                if current is None:
+                    time.sleep(0.0005)
+                    officer = rng.randint(1, OFFICERS)
+                    conn.execute(update(table).where(table.c.id == cid).values(assigned_officer_id=officer))
+                    conn.commit()
+                    with lock:
+                        successes[cid].append(officer)
+                else:
+                    conn.rollback()
+
+    elapsed, errors = run_threads(threads, unguarded)
+    doubles = sum(1 for officers in successes.values() if len(officers) > 1)
+    print(f"   Unguarded read-check-write (baseline): {doubles} double-assignments in {elapsed:.1f} s")
+    reset(Session)
+
+    # 1. Auto-assignment
+    successes = defaultdict(list)
+
+    def auto(n):
+        order = ids[:]
+        random.Random(n).shuffle(order)
+        db = Session()
+        try:
+            for cid in order:
+                officer = assign_to_best_officer(db, cid, 1)
+                if officer:
+                    with lock:
+                        successes[cid].append(officer)
+        finally:
+            db.close()
+
+    elapsed, errors = run_threads(threads, auto)
+    ok &= check(Session, successes, "Auto-assignment", elapsed, errors)
+    db = Session()
+    report = workload.check(db)
+    db.close()
+    print(f"{'✅' if report['divergent_count'] == 0 else '❌'} Workload heaps match the DB ({report['divergent_count']} divergent)")
+    ok &= report["divergent_count"] == 0
+
+    # 2. Admin assign_complaint
+    reset(Session)
+    successes = defaultdict(list)
+    admin = models.User(id=1, email="admin@gov.in", role="ADMIN")
+    conflicts = Counter()
+
+    def manual(n):
+        rng = random.Random(100 + n)
+        order = ids[:]
+        rng.shuffle(order)
+        db = Session()
+        try:
+            for cid in order:
+                officer = rng.randint(1, OFFICERS)
+                try:
+                    admin_routes.assign_complaint(cid, schemas.AssignComplaintRequest(officer_id=officer), db, admin)
+                    with lock:
+                        successes[cid].append(officer)
+                except HTTPException as e:
+                    db.rollback()
+                    with lock:
+                        conflicts[e.status_code] += 1
+        finally:
+            db.close()
+
+    elapsed, errors = run_threads(threads, manual)
+    ok &= check(Session, successes, "Admin assign_complaint", elapsed, errors)
+    print(f"   Rejected calls by status: {dict(conflicts)} (400 = already assigned, 409 = gave up after retries)")
+
+    # 3. Concurrent reassignment: every successful call must be counted
+    done = Counter()
+    target_ids = ids[:20]  # few complaints, many threads: lots of contention
+
+    def reassign(n):
+        rng = random.Random(200 + n)
+        db = Session()
+        try:
+            for _ in range(10):
+                cid = rng.choice(target_ids)
+                request = schemas.ReassignComplaintRequest(new_officer_id=rng.randint(1, OFFICERS), reason="Load balancing test")
+                try:
+                    admin_routes.reassign_complaint(cid, request, db, admin)
+                    with lock:
+                        done[cid] += 1
+                except HTTPException:
+                    db.rollback()
+        finally:
+            db.close()
+
+    elapsed, errors = run_threads(threads, reassign)
+    db = Session()
+    counts = dict(db.query(models.Complaint.id, models.Complaint.reassignment_count).filter(models.Complaint.id.in_(target_ids)))
+    db.close()
+    lost = sum(done[cid] - counts[cid] for cid in target_ids)
+    status = "✅" if lost == 0 and not errors else "❌"
+    print(f"{status} Concurrent reassign: {sum(done.values())} reassignments in {elapsed:.1f} s, {lost} lost updates"
+          + (f", {len(errors)} thread errors e.g. {errors[0]}" if errors else ""))
+    ok &= lost == 0 and not errors
+
+    # 4. Bulk auto-assign racing single auto-assignment
+    reset(Session)
+    successes = defaultdict(list)
+    bulk_conflicts = [0]
+
+    def mixed(n):
+        if n < 4:
+            db = Session()
+            try:
+                for _ in range(3):
+                    plan, officers = bulk_assignment.plan_backlog(db, claim=True)
+                    try:
+                        bulk_assignment.apply_plan(db, plan, officers, admin)
+                        db.commit()
+                    except bulk_assignment.BacklogChanged:
+                        db.rollback()
+                        with lock:
+                            bulk_conflicts[0] += 1
+                        continue
+                    with lock:
+                        for cid, officer, _, _ in plan.assignments:
+                            successes[cid].append(officer)
+            finally:
+                db.close()
+        else:
+            auto(n)
+
+    elapsed, errors = run_threads(threads, mixed)
+    ok &= check(Session, successes, "Bulk + single auto-assignment", elapsed, errors)
+    print(f"   Bulk runs rolled back because the backlog changed: {bulk_conflicts[0]}")
+
+    print(f"\n{'✅ No double-assignments' if ok else '❌ Failures above'}")
+    if url:
+        models.Base.metadata.drop_all(engine)
+    engine.dispose()
+    if path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="Empty Postgres test database (default: temp SQLite file in WAL mode)")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--complaints", type=int, default=300)
+    args = parser.parse_args()
+    main(args.url, args.threads, args.complaints)
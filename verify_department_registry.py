@@ -0,0 +1,146 @@
+"""
+Parity + benchmark: cached department registry (departments.py) vs the
+previous resolve_department, which ran up to three Department queries
+(one of them on func.lower(name), which no index serves).
+
+Seeds the real department list (seed_departments.py) plus some legacy
+DEPARTMENT_MAP names, then resolves AI names (full names in mixed case,
+categories, unknown names, None) x complaint texts with both versions.
+Also checks invalidation: a committed new / renamed department is seen by
+the next lookup, a rolled-back one is not.
+Run: python verify_department_registry.py [--n 20000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from backend import departments, models
+from backend.ai_utils import INDIA_GOVT_DEPARTMENTS
+from backend.utils.assignment_logic import DEPARTMENT_MAP, resolve_department
+
+SEEDED = [
+    "Public Works Department (PWD)", "Roads & Bridges Department", "Water Supply & Sewerage Board",
+    "Department of Street Lighting", "Electricity Department", "General Grievance Cell",
+    "Sanitation & Waste Management Department", "Public Health Engineering Department (PHED)",
+    "Department of Public Health", "Public Safety & Vigilance Department", "Town Planning Department",
+    "Property Tax Department", "Horticulture Department", "Traffic Engineering Cell",
+    # Legacy DEPARTMENT_MAP targets some databases still have
+    "Roads & Infrastructure", "Street Lighting"
+]
+TEXTS = [
+    "Water leaking from the main pipe", "Huge pothole on the road", "Garbage not collected",
+    "Street light not working, very dark", "Theft reported near the market", "Electric wire hanging",
+    "Stray dogs near the school", "Traffic signal broken, lots of waste around", "Clean the park please", ""
+]
+
+
+def old_resolve(db, ai_department_name, complaint_text):
+    """resolve_department before the registry (three queries at most)."""
+    department = None
+    if ai_department_name:
+        department = db.query(models.Department).filter(
+            func.lower(models.Department.name) == ai_department_name.lower()
+        ).first()
+    if department:
+        return department
+    text_lower = complaint_text.lower()
+    dept_name = None
+    for keyword, name in DEPARTMENT_MAP.items():
+        if keyword in text_lower:
+            dept_name = name
+            break
+    if dept_name:
+        department = db.query(models.Department).filter(models.Department.name == dept_name).first()
+        if department:
+            return department
+    return db.query(models.Department).filter(models.Department.name == "General Grievance Cell").first()
+
+
+def cases(n, seed=4):
+    rng = random.Random(seed)
+    names = SEEDED + [info["full_name"] for info in INDIA_GOVT_DEPARTMENTS.values()]
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.5:
+            name = rng.choice(names)
+            name = rng.choice([name, name.upper(), name.lower()])
+        elif roll < 0.65:
+            name = rng.choice(list(INDIA_GOVT_DEPARTMENTS))
+        elif roll < 0.85:
+            name = rng.choice(["Ministry of Magic", "Roads", "general grievance", ""])
+        else:
+            name = None
+        yield name, rng.choice(TEXTS)
+
+
+def main(n):
+    path = os.path.join(tempfile.mkdtemp(), "departments.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    queries = [0]
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.__setitem__(0, queries[0] + 1))
+
+    db = Session()
+    for name in SEEDED:
+        db.add(models.Department(name=name))
+    db.commit()
+    departments.load_department_registry(db)
+
+    items = list(cases(n))
+    same = alias_only = 0
+    old_time = new_time = 0.0
+    old_queries = new_queries = 0
+    for name, text in items:
+        queries[0] = 0
+        start = time.perf_counter()
+        old = old_resolve(db, name, text)
+        old_time += time.perf_counter() - start
+        old_queries += queries[0]
+
+        queries[0] = 0
+        start = time.perf_counter()
+        new = resolve_department(db, name, text)
+        new_time += time.perf_counter() - start
+        new_queries += queries[0]
+
+        if (old.id if old else None) == (new.id if new else None):
+            same += 1
+        elif name and name.lower() in {c.lower() for c in INDIA_GOVT_DEPARTMENTS}:
+            alias_only += 1  # category name: the registry's alias finds its department, the old code fell through
+    print(f"{n} resolutions")
+    print(f"{'✅' if same + alias_only == n else '❌'} Same department as the queries: {same}/{n} "
+          f"(+{alias_only} category names now resolved through the alias map)")
+    print(f"Old (queries):  {old_time / n * 1e6:8.1f} µs/call, {old_queries / n:.2f} queries/call")
+    print(f"Registry:       {new_time / n * 1e6:8.1f} µs/call, {new_queries / n:.2f} queries/call")
+
+    # Invalidation
+    other = Session()
+    other.add(models.Department(name="Water Supply Department"))
+    other.rollback()
+    rolled_back = resolve_department(db, None, "no water since morning").name == "General Grievance Cell"
+    other.add(models.Department(name="Water Supply Department"))
+    other.commit()
+    created = resolve_department(db, None, "no water since morning").name == "Water Supply Department"
+    dept = other.query(models.Department).filter(models.Department.name == "Horticulture Department").first()
+    dept.name = "Parks & Gardens Department"
+    other.commit()
+    renamed = resolve_department(db, "parks & gardens department", "").id == dept.id
+    print(f"{'✅' if rolled_back and created and renamed else '❌'} Invalidation: rollback ignored {rolled_back}, "
+          f"create seen {created}, rename seen {renamed}")
+    other.close()
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.n)
@@ -0,0 +1,136 @@
+"""
+Clustering check + benchmark for incident clusters (utils/vector_index.py).
+
+Simulates a window of complaints: background reports across departments and
+wards, plus incident bursts (the same issue reworded by many citizens in one
+ward). Each complaint is linked the way enrichment does it: top-k cosine in its
+(department, ward) partition, linked when >= threshold.
+Reports how many burst complaints joined their incident (recall), how many
+unrelated complaints were wrongly linked, and query latency compared with
+scoring every vector in the window. Then streams complaints through a 72h
+window and checks that eviction keeps the index bounded without changing
+any match.
+Run: python verify_incident_clusters.py [--n 200000] [--threshold 0.45]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.utils import vector_index
+
+ISSUES = {
+    1: ["transformer blew up, no power", "power cut after transformer blast", "no electricity, transformer burst with sound",
+        "transformer sparking and current gone", "whole colony without power, transformer damaged"],
+    2: ["garbage pile not collected, stinking", "garbage not cleared for days, bad smell", "huge garbage dump not lifted",
+        "waste bins overflowing, garbage everywhere", "garbage collection van did not come, pile stinking"],
+    3: ["water pipeline burst, water wasted", "pipe leaking badly, water flowing on road", "drinking water pipeline broken",
+        "water leakage from main pipe", "no water supply, pipeline damaged"],
+}
+OTHER = ["pothole causing accidents", "stray dogs chasing children", "street light not working at night",
+         "drainage overflowing into houses", "illegal parking blocking gate", "tree fallen on footpath",
+         "mosquito breeding in stagnant water", "loud music late at night", "broken footpath tiles", "open manhole"]
+FILLER = ["please help", "kindly act fast", "very urgent", "residents suffering", "since yesterday", "near the school",
+          "opposite the temple", "behind market", "children at risk", ""]
+
+
+def phrase(rng, base):
+    return f"{base} {rng.choice(FILLER)} {rng.choice(FILLER)}".strip()
+
+
+def build(n, bursts, burst_size, seed=3):
+    rng = random.Random(seed)
+    rows = []  # (text, department, ward, incident or None)
+    for _ in range(n):
+        dept = rng.choice(list(ISSUES))
+        rows.append((phrase(rng, rng.choice(OTHER)), dept, f"Ward {rng.randint(1, 150)}", None))
+    for b in range(bursts):
+        dept = rng.choice(list(ISSUES))
+        ward = f"Ward {rng.randint(1, 150)}"
+        for _ in range(burst_size):
+            rows.append((phrase(rng, rng.choice(ISSUES[dept])), dept, ward, b))
+    rng.shuffle(rows)
+    return rows
+
+
+def main(n, threshold, bursts=200, burst_size=15):
+    rows = build(n, bursts, burst_size)
+    print(f"{len(rows)} complaints ({bursts} incidents x {burst_size} reports)")
+
+    start = time.perf_counter()
+    vectors = [vector_index.embed(text) for text, _, _, _ in rows]
+    elapsed = time.perf_counter() - start
+    print(f"Embedding:          {elapsed / len(rows) * 1e6:6.1f} µs/complaint")
+
+    index = vector_index.IncidentVectorIndex()
+    linked_to = {}  # row -> incident label of the complaint it was linked to
+    latencies = []
+    try:
+        for i, ((text, dept, ward, _), vector) in enumerate(zip(rows, vectors)):
+            start = time.perf_counter()
+            matches = index.query(vector, dept, ward, k=5, min_score=threshold)
+            latencies.append(time.perf_counter() - start)
+            if matches:
+                linked_to[i] = rows[matches[0][0]][3]
+            index.add(i, vector, dept, ward)
+
+        burst_rows = [i for i, r in enumerate(rows) if r[3] is not None]
+        followups = len(burst_rows) - bursts  # the first report of each incident has nothing to join
+        joined = sum(1 for i in burst_rows if i in linked_to and linked_to[i] == rows[i][3])
+        wrong = sum(1 for i, label in linked_to.items() if label != rows[i][3])
+        print(f"\n--- CLUSTERING (threshold {threshold}) ---")
+        print(f"Follow-up reports joined their incident: {joined}/{followups} ({joined / followups:.1%})")
+        print(f"Complaints linked to an unrelated one:   {wrong}/{len(rows)} ({wrong / len(rows):.2%})")
+
+        stats = index.stats()
+        print(f"\n--- QUERY ({stats['partitions']} partitions, {stats['file_bytes'] / 2 ** 20:.0f} MiB memory-mapped) ---")
+        print(f"Partition top-k:     p50 {np.percentile(latencies, 50) * 1e3:.3f} ms   p99 {np.percentile(latencies, 99) * 1e3:.3f} ms")
+        matrix = np.vstack(vectors)
+        start = time.perf_counter()
+        for vector in vectors[:50]:
+            scores = matrix @ vector
+            np.argpartition(-scores, 5)[:5]
+        print(f"Scan whole window:   {(time.perf_counter() - start) / 50 * 1e3:.3f} ms/query")
+    finally:
+        index.close()
+
+    # Long-running worker: one complaint a minute, 72h window, evicted as it syncs
+    stream = min(len(rows), 50000)
+    window = timedelta(hours=72)
+    base = datetime(2026, 1, 1)
+    evicting, reference = vector_index.IncidentVectorIndex(), vector_index.IncidentVectorIndex()
+    largest, same, checked = 0, True, 0
+    try:
+        for i in range(stream):
+            text, dept, ward, _ = rows[i]
+            now = base + timedelta(minutes=i)
+            evicting.evict_before(now - window)
+            if vectors[i] is not None:
+                if i % 97 == 0:
+                    got = evicting.query(vectors[i], dept, ward, since=now - window, k=5, min_score=threshold)
+                    want = reference.query(vectors[i], dept, ward, since=now - window, k=5, min_score=threshold)
+                    same &= got == want
+                    checked += 1
+                evicting.add(i, vectors[i], dept, ward, now)
+                reference.add(i, vectors[i], dept, ward, now)
+            largest = max(largest, len(evicting))
+        stats, full = evicting.stats(), reference.stats()
+        bounded = largest <= 72 * 60 / 0.75 + 1 and stats["file_bytes"] < full["file_bytes"]
+        print(f"\n--- WINDOW EVICTION ({stream} complaints, 1/min, 72h window) ---")
+        print(f"Vectors held: at most {largest} (window {72 * 60}), file {stats['file_bytes'] / 2 ** 20:.0f} MiB "
+              f"vs {full['file_bytes'] / 2 ** 20:.0f} MiB without eviction")
+        print(f"{'✅' if bounded else '❌'} Index stays bounded by the window")
+        print(f"{'✅' if same else '❌'} Same matches as an index that never evicts ({checked} queries)")
+    finally:
+        evicting.close()
+        reference.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--threshold", type=float, default=0.45)
+    args = parser.parse_args()
+    main(args.n, args.threshold)
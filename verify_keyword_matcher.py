@@ -0,0 +1,134 @@
+"""
+Parity check + microbenchmark for the compiled keyword matcher in ai_utils.
+Compares against the previous per-keyword `in` scans.
+Run: python verify_keyword_matcher.py
+"""
+import random
+import sqlite3
+import timeit
+
+from backend.ai_utils import (
+    INDIA_GOVT_DEPARTMENTS, PRIORITY_KEYWORDS, RISK_INTENSIFIERS, EMERGENCY_KEYWORDS,
+    classify_priority, categorize_department, scan_keywords
+)
+
+# --- Legacy implementations (reference) ---
+def legacy_classify_priority(text):
+    text_lower = text.lower()
+    for tier in ["Critical", "High", "Medium"]:
+        for keyword in PRIORITY_KEYWORDS[tier]:
+            if keyword in text_lower:
+                return tier
+    return "Low"
+
+def legacy_categorize_department(text):
+    text_lower = text.lower()
+    max_score = 0
+    detected_dept = None
+    for dept_name, dept_info in INDIA_GOVT_DEPARTMENTS.items():
+        score = sum(1 for keyword in dept_info["keywords"] if keyword in text_lower)
+        if score > max_score:
+            max_score = score
+            detected_dept = {
+                "category": dept_name,
+                "full_name": dept_info["full_name"],
+                "officer": dept_info["officer"],
+                "confidence": min(0.95, 0.5 + (score * 0.15))
+            }
+    if not detected_dept:
+        detected_dept = {"category": "General", "full_name": "General Grievance Cell",
+                         "officer": "Municipal Officer", "confidence": 0.3}
+    return detected_dept
+
+def legacy_keywords_found(text, category):
+    text_lower = text.lower()
+    found = []
+    for kw in INDIA_GOVT_DEPARTMENTS.get(category, {}).get("keywords", []):
+        if kw in text_lower:
+            found.append(kw)
+            if len(found) >= 3: break
+    return found
+
+def legacy_intensified(text):
+    return any(w in text.lower() for w in RISK_INTENSIFIERS)
+
+def legacy_emergency(text):
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in EMERGENCY_KEYWORDS)
+
+# --- Corpus ---
+def build_corpus(n=5000, seed=42):
+    rng = random.Random(seed)
+    vocab = [kw for d in INDIA_GOVT_DEPARTMENTS.values() for kw in d["keywords"]]
+    vocab += [kw for kws in PRIORITY_KEYWORDS.values() for kw in kws]
+    vocab += RISK_INTENSIFIERS + EMERGENCY_KEYWORDS
+    filler = ["the", "near", "my", "house", "since", "yesterday", "please", "sir", "ward", "colony",
+              "Main", "ROAD", "cabinet", "powerful", "tapestry", "streetlight", "shocking", "helpful"]
+    corpus = [
+        "Urgent! Open electric wire hanging near school. Immediate danger to children.",
+        "Major water pipeline burst on Main Road. Severe flooding and damage.",
+        "Garbage not collected for 3 days. Bin is overflowing.",
+        "Small pothole on residential street near house 42.",
+        "Someone is following me near the bus stop, please help me",
+        "",
+    ]
+    for _ in range(n):
+        words = [rng.choice(vocab if rng.random() < 0.4 else filler) for _ in range(rng.randint(3, 40))]
+        corpus.append(" ".join(w.upper() if rng.random() < 0.1 else w for w in words))
+
+    try:
+        conn = sqlite3.connect("grievance_enterprise_v3.db")
+        corpus += [f"{t} {d}" for t, d in conn.execute("SELECT title, description FROM complaints")]
+        conn.close()
+    except Exception as e:
+        print(f"(skipping DB corpus: {e})")
+    return corpus
+
+def check_parity(corpus):
+    mismatches = 0
+    for text in corpus:
+        hits = scan_keywords(text)
+        dept = categorize_department(text)
+        checks = [
+            (classify_priority(text), legacy_classify_priority(text)),
+            (dept, legacy_categorize_department(text)),
+            ([kw for kw in INDIA_GOVT_DEPARTMENTS.get(dept["category"], {}).get("keywords", [])
+              if kw in hits.keywords][:3], legacy_keywords_found(text, dept["category"])),
+            (hits.intensified, legacy_intensified(text)),
+            (hits.emergency, legacy_emergency(text)),
+        ]
+        for new, old in checks:
+            if new != old:
+                mismatches += 1
+                print(f"❌ MISMATCH for {text[:60]!r}: new={new} old={old}")
+    return mismatches
+
+def benchmark(corpus, repeat=3):
+    def legacy_all():
+        for text in corpus:
+            dept = legacy_categorize_department(text)
+            legacy_classify_priority(text)
+            legacy_intensified(text)
+            legacy_keywords_found(text, dept["category"])
+            legacy_emergency(text)
+
+    def compiled_all():
+        for text in corpus:
+            hits = scan_keywords(text)
+            # mirrors what analyze_complaint/generate_analysis_response derive from one scan
+            _ = hits.priorities, hits.departments, hits.intensified, hits.emergency
+
+    old = min(timeit.repeat(legacy_all, number=1, repeat=repeat))
+    new = min(timeit.repeat(compiled_all, number=1, repeat=repeat))
+    per_old = old / len(corpus) * 1e6
+    per_new = new / len(corpus) * 1e6
+    print(f"Legacy scans:   {per_old:8.1f} µs/complaint")
+    print(f"Compiled scan:  {per_new:8.1f} µs/complaint  ({old / new:.1f}x)")
+
+if __name__ == "__main__":
+    corpus = build_corpus()
+    print(f"--- PARITY ({len(corpus)} texts) ---")
+    mismatches = check_parity(corpus)
+    print("✅ All results identical" if mismatches == 0 else f"❌ {mismatches} mismatches")
+    print("\n--- MICROBENCHMARK ---")
+    benchmark(corpus)
@@ -0,0 +1,138 @@
+"""
+Benchmark + recall check for near-duplicate detection (utils/minhash.py).
+
+Builds N synthetic complaints (default 1M), signs them, loads the LSH index
+the way startup does, then queries with edited copies of known complaints
+(reworded, words dropped, punctuation / case changed). Compared against:
+- the previous check: exact `description = ? AND user_id = ?` on an
+  unindexed SQLite column (full table scan)
+- a brute-force MinHash scan over every signature (what LSH avoids)
+Run: python verify_near_duplicates.py [--n 1000000] [--queries 1000]
+"""
+import argparse
+import random
+import sqlite3
+import time
+
+import numpy as np
+
+from backend.utils import minhash
+
+ISSUES = [
+    "garbage has not been collected", "streetlight is not working", "water pipeline is leaking",
+    "there is a huge pothole", "drainage is overflowing", "electric wire is hanging low",
+    "stray dogs are attacking people", "sewage water is entering houses", "road is broken",
+    "public toilet is not cleaned", "traffic signal is not working", "no water supply",
+]
+PLACES = ["near the temple", "opposite the school", "on main road", "behind the market", "at the bus stop",
+          "in our colony", "near the hospital", "at the junction", "next to the park", "in lane"]
+SINCE = ["since yesterday", "for two weeks", "for the last month", "since monday", "for 10 days", "again"]
+EXTRA = ("please take action immediately children and elderly are suffering the smell is unbearable "
+         "we have complained many times nobody came it is dangerous at night residents are worried "
+         "kindly send the concerned officer vehicles are getting damaged mosquitoes are breeding").split()
+
+
+def build_texts(n, seed=5):
+    rng = random.Random(seed)
+    texts, users, wards = [], [], []
+    for i in range(n):
+        words = rng.sample(EXTRA, rng.randint(4, 14))
+        texts.append(
+            f"{rng.choice(ISSUES).capitalize()} {rng.choice(PLACES)} {rng.randint(1, 400)} "
+            f"{rng.choice(SINCE)}. {' '.join(words)}."
+        )
+        users.append(rng.randint(1, n // 5 + 1))
+        wards.append(f"Ward {rng.randint(1, 200)}")
+    return texts, users, wards
+
+
+def edit(text, rng):
+    """A near-duplicate resubmission: drop a word or two, swap a word, change punctuation/case."""
+    words = text.replace(".", "").split()
+    for _ in range(rng.randint(0, 2)):
+        if len(words) > 6:
+            words.pop(rng.randrange(len(words)))
+    if rng.random() < 0.5:
+        words[rng.randrange(len(words))] = rng.choice(EXTRA)
+    out = " ".join(words)
+    return out.upper() + "!!" if rng.random() < 0.3 else out + "."
+
+
+def true_jaccard(a, b):
+    def shingles(t):
+        t = minhash.normalize(t)
+        return {t[i:i + minhash.SHINGLE] for i in range(max(1, len(t) - minhash.SHINGLE + 1))}
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def percentile(values, p):
+    return sorted(values)[min(len(values) - 1, int(len(values) * p))]
+
+
+def main(n, queries):
+    print(f"Generating {n} complaints...")
+    texts, users, wards = build_texts(n)
+
+    start = time.perf_counter()
+    sigs = np.empty((n, minhash.NUM_PERM), dtype=np.uint16)
+    for i, text in enumerate(texts):
+        sigs[i] = minhash.signature(text)
+    elapsed = time.perf_counter() - start
+    print(f"Signing:            {elapsed:7.1f}s  ({elapsed / n * 1e6:.1f} µs/complaint, {minhash.SIGNATURE_BYTES} bytes each)")
+
+    index = minhash.NearDuplicateIndex()
+    start = time.perf_counter()
+    chunk = 50000  # startup loads in 50k-row batches (ai_trust._sync), then sorts once
+    for s in range(0, n, chunk):
+        e = min(n, s + chunk)
+        index.add_many(list(range(s + 1, e + 1)), sigs[s:e], users[s:e], [None] * (e - s), wards[s:e], defer=True)
+    index.merge()
+    print(f"Index build:        {time.perf_counter() - start:7.1f}s  ({index.stats()['bytes'] / 2 ** 20:.0f} MiB)")
+
+    rng = random.Random(9)
+    picks = [rng.randrange(n) for _ in range(queries)]
+    edited = [edit(texts[i], rng) for i in picks]
+    query_sigs = [minhash.signature(t) for t in edited]
+
+    latencies, found_user, found_ward, jaccards = [], 0, 0, []
+    for i, sig in zip(picks, query_sigs):
+        start = time.perf_counter()
+        as_user = index.query(sig, user_id=users[i], threshold=0.5)
+        latencies.append(time.perf_counter() - start)
+        found_user += any(cid == i + 1 for cid, _ in as_user["user"])
+        as_neighbour = index.query(sig, user_id=-5, location=wards[i], threshold=0.5)
+        found_ward += any(cid == i + 1 for cid, _ in as_neighbour["ward"])
+    for i, text, sig in list(zip(picks, edited, query_sigs))[:200]:
+        jaccards.append((true_jaccard(texts[i], text), minhash.jaccard(sigs[i], sig)))
+
+    print(f"\n--- LSH QUERY ({queries} edited resubmissions) ---")
+    print(f"Latency:            p50 {percentile(latencies, 0.5) * 1e3:.2f} ms   p99 {percentile(latencies, 0.99) * 1e3:.2f} ms")
+    print(f"Found (same user):  {found_user}/{queries} ({found_user / queries:.1%})")
+    print(f"Found (same ward):  {found_ward}/{queries} ({found_ward / queries:.1%})")
+    errors = [abs(t - e) for t, e in jaccards]
+    print(f"Jaccard estimate:   mean |error| {np.mean(errors):.3f}  (true J mean {np.mean([t for t, _ in jaccards]):.2f})")
+
+    print("\n--- BASELINES ---")
+    start = time.perf_counter()
+    probes = query_sigs[:20]
+    for sig in probes:
+        np.count_nonzero(sigs == sig, axis=1)
+    print(f"Brute-force MinHash scan:        {(time.perf_counter() - start) / len(probes) * 1e3:8.2f} ms/query")
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE complaints (id INTEGER PRIMARY KEY, description TEXT, user_id INTEGER)")
+    conn.executemany("INSERT INTO complaints VALUES (?, ?, ?)", ((i + 1, t, u) for i, (t, u) in enumerate(zip(texts, users))))
+    exact_found = 0
+    start = time.perf_counter()
+    for i, text in zip(picks[:20], edited[:20]):
+        exact_found += conn.execute("SELECT id FROM complaints WHERE description = ? AND user_id = ?", (text, users[i])).fetchone() is not None
+    print(f"Exact match (unindexed SQLite):  {(time.perf_counter() - start) / 20 * 1e3:8.2f} ms/query, found {exact_found}/20 edited resubmissions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.n, args.queries)
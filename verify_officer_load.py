@@ -0,0 +1,122 @@
+"""
+Benchmark: officer load lookup in assign_to_best_officer.
+
+Before: every active officer of the department loaded, then one COUNT query
+per officer (N+1), with no index on complaints.assigned_officer_id.
+After: one grouped query (officers LEFT JOIN active complaints, GROUP BY
+officer, ORDER BY load, officer id) on idx_complaints_officer_status.
+Both variants are also timed with the other index state, and both must pick
+the same officer.
+Run: python verify_officer_load.py [--officers 500] [--complaints 1000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend import models
+from backend.utils.assignment_logic import ACTIVE_STATUSES, least_loaded_officer
+
+STATUSES = ACTIVE_STATUSES + ["RESOLVED", "Closed by Citizen", "Work Completed"]
+
+
+def legacy_least_loaded(db, department_id):
+    """The previous implementation (one COUNT per officer)."""
+    officers = db.query(models.Officer).filter(
+        models.Officer.department_id == department_id,
+        models.Officer.status == "Active"
+    ).all()
+    best_officer, min_load = None, float('inf')
+    for officer in officers:
+        load = db.query(models.Complaint).filter(
+            models.Complaint.assigned_officer_id == officer.id,
+            models.Complaint.status.in_(ACTIVE_STATUSES)
+        ).count()
+        if load < min_load:
+            min_load, best_officer = load, officer
+    return best_officer, min_load
+
+
+def populate(engine, officers, complaints, departments=5, seed=7):
+    rng = random.Random(seed)
+    raw = engine.raw_connection()
+    cur = raw.cursor()
+    cur.executemany("INSERT INTO departments (id, name) VALUES (?, ?)", [(d, f"Dept {d}") for d in range(1, departments + 1)])
+    # Department 1 holds the officers under test; the rest share the table with it
+    rows = []
+    for i in range(1, officers * departments + 1):
+        dept = 1 if i <= officers else 2 + (i % (departments - 1))
+        rows.append((i, f"EMP-{i}", f"Officer {i}", dept, "Active" if rng.random() < 0.95 else "On Leave"))
+    cur.executemany("INSERT INTO officers (id, employee_id, name, department_id, status) VALUES (?, ?, ?, ?, ?)", rows)
+    total_officers = len(rows)
+    batch = []
+    for i in range(1, complaints + 1):
+        officer = rng.randint(1, total_officers) if rng.random() < 0.9 else None
+        batch.append((i, "t", "d", rng.choice(STATUSES), officer, 1))
+        if len(batch) == 50000:
+            cur.executemany("INSERT INTO complaints (id, title, description, status, assigned_officer_id, user_id) VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        cur.executemany("INSERT INTO complaints (id, title, description, status, assigned_officer_id, user_id) VALUES (?, ?, ?, ?, ?, ?)", batch)
+    raw.commit()
+    cur.execute("ANALYZE")
+    raw.close()
+
+
+def measure(Session, fn, counter, repeats):
+    db = Session()
+    try:
+        counter["n"] = 0
+        start = time.perf_counter()
+        for _ in range(repeats):
+            officer, load = fn(db, 1)
+            result = (officer.id, load)
+            db.expire_all()
+        elapsed = (time.perf_counter() - start) / repeats
+        return result, counter["n"] // repeats, elapsed
+    finally:
+        db.close()
+
+
+def main(officers, complaints, repeats):
+    path = os.path.join(tempfile.mkdtemp(), "officer_load.db")
+    engine = create_engine(f"sqlite:///{path}")
+    counter = {"n": 0}
+    event.listen(engine, "before_cursor_execute", lambda *args: counter.__setitem__("n", counter["n"] + 1))
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    print(f"Populating {officers} officers (department under test) and {complaints} complaints...")
+    populate(engine, officers, complaints)
+
+    def run():
+        results = {}
+        for name, fn in (("N+1 COUNT per officer", legacy_least_loaded), ("Grouped query", least_loaded_officer)):
+            (officer_id, load), queries, elapsed = measure(Session, fn, counter, repeats)
+            results[name] = (officer_id, load)
+            print(f"  {name:<22} {queries:>4} queries  {elapsed * 1000:9.1f} ms   -> officer #{officer_id} (load {load})")
+        same = len(set(results.values())) == 1
+        print(f"  {'✅' if same else '❌'} Same officer picked")
+
+    print("\n--- WITH idx_complaints_officer_status (after) ---")
+    run()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX idx_complaints_officer_status")
+        conn.exec_driver_sql("ANALYZE")
+    print("\n--- WITHOUT the composite index (before) ---")
+    run()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--officers", type=int, default=500)
+    parser.add_argument("--complaints", type=int, default=1000000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(args.officers, args.complaints, args.repeats)
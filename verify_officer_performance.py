@@ -0,0 +1,237 @@
+"""
+Regression + benchmark: officer performance analytics as one grouped query
+(officer_performance.py) vs the previous per-officer loop (4 queries per
+officer + 1, resolved complaints loaded to average resolution time).
+
+1. Parity: assigned / resolved / breached counts and average hours equal
+   the previous implementation for every officer (list + single endpoint
+   functions); p90 equals numpy's (linear) percentile of the same hours.
+2. Sorting, department filter and pagination agree with doing it in Python,
+   and so does the fallback for dialects without a duration expression.
+3. Benchmark with N complaints over OFFICERS officers: time and queries
+   (4N+1 -> 1), then a cached call (0 queries).
+4. The Postgres form of the query uses EXTRACT(EPOCH ...) and window functions.
+Run: python verify_officer_performance.py [--n 500000] [--officers 2000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from backend import models, officer_performance, schemas
+from backend.dashboard_stats import duration_seconds
+
+SQL_FMT = "%Y-%m-%d %H:%M:%S.%f"  # how SQLAlchemy stores DateTime on SQLite
+STATUSES = ["NEW", "ASSIGNED", "IN_PROGRESS", "RESOLVED", "RESOLVED", "Closed by Citizen",
+            "Action Completed", "Work Completed", "VERIFIED"]
+
+
+def old_all(db):
+    """get_all_officer_performance before the grouped query (unchanged)."""
+    officers = db.query(models.Officer).all()
+    results = []
+    for officer in officers:
+        assigned_count = db.query(models.Complaint).filter(
+            models.Complaint.assigned_officer_id == officer.id
+        ).count()
+        resolved_count = db.query(models.Complaint).filter(
+            models.Complaint.assigned_officer_id == officer.id,
+            models.Complaint.status.in_(["RESOLVED", "Closed by Citizen", "Action Completed"])
+        ).count()
+        sla_breach_count = db.query(models.Complaint).filter(
+            models.Complaint.assigned_officer_id == officer.id,
+            models.Complaint.sla_breached == True
+        ).count()
+        resolved_complaints = db.query(models.Complaint).filter(
+            models.Complaint.assigned_officer_id == officer.id,
+            models.Complaint.status.in_(["RESOLVED", "Closed by Citizen"]),
+            models.Complaint.closed_at != None
+        ).all()
+        total_hours = 0
+        count_with_time = 0
+        for c in resolved_complaints:
+            if c.created_at and c.closed_at:
+                diff = c.closed_at - c.created_at
+                total_hours += diff.total_seconds() / 3600
+                count_with_time += 1
+        avg_hours = round(total_hours / count_with_time, 1) if count_with_time > 0 else 0
+        results.append(schemas.OfficerPerformance(
+            officer_id=officer.id,
+            officer_name=officer.name,
+            designation=officer.designation,
+            assigned_count=assigned_count,
+            resolved_count=resolved_count,
+            avg_resolution_hours=avg_hours,
+            sla_breach_count=sla_breach_count
+        ))
+    return results
+
+
+def build(path, n, officers, seed):
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, email, role) VALUES (1, 'citizen@example.com', 'USER')")
+    conn.executemany("INSERT INTO departments (id, name) VALUES (?, ?)", [(d, f"Dept {d}") for d in range(1, 21)])
+    conn.executemany(
+        "INSERT INTO officers (id, employee_id, name, designation, department_id, status) VALUES (?,?,?,?,?,?)",
+        [(i, f"E{i}", f"Officer {rng.randint(1, officers)}", rng.choice(["JE", "AE", "EE"]), rng.randint(1, 20), "Active")
+         for i in range(1, officers + 1)]
+    )
+    now = datetime.utcnow()
+
+    def rows():
+        for i in range(1, n + 1):
+            created = None if rng.random() < 0.01 else now - timedelta(days=rng.uniform(0, 300))
+            closed = None
+            if rng.random() < 0.6:
+                base = created or now
+                closed = base + timedelta(hours=rng.uniform(-3, 400))  # a few negative (clock skew)
+            officer = None if rng.random() < 0.05 else int(rng.paretovariate(1.2)) % officers + 1
+            yield (i, "c", "d", 1, rng.choice(STATUSES), rng.choice([0, 1, None]), officer,
+                   created.strftime(SQL_FMT) if created else None, closed.strftime(SQL_FMT) if closed else None)
+
+    conn.executemany(
+        "INSERT INTO complaints (id, title, description, user_id, status, sla_breached, assigned_officer_id, "
+        "created_at, closed_at, version) VALUES (?,?,?,?,?,?,?,?,?,1)", rows()
+    )
+    conn.commit()
+    conn.close()
+    return engine
+
+
+def expected_p90(db):
+    """officer id -> numpy p90 of the hours the average uses."""
+    hours = {}
+    for officer_id, created, closed in db.query(
+        models.Complaint.assigned_officer_id, models.Complaint.created_at, models.Complaint.closed_at
+    ).filter(
+        models.Complaint.assigned_officer_id != None,
+        models.Complaint.status.in_(officer_performance.TIMED_STATUSES),
+        models.Complaint.closed_at != None, models.Complaint.created_at != None
+    ):
+        hours.setdefault(officer_id, []).append((closed - created).total_seconds() / 3600)
+    return {o: round(float(np.percentile(h, 90)), 1) for o, h in hours.items()}
+
+
+def main(n, officers):
+    workdir = tempfile.mkdtemp()
+
+    # 1 + 2. Parity, sorting, filters, pages
+    path = os.path.join(workdir, "parity.db")
+    engine = build(path, 20000, 150, 1)
+    db = sessionmaker(bind=engine)()
+    old = {r.officer_id: r.model_dump() for r in old_all(db)}
+    new = {r["officer_id"]: r for r in officer_performance.compute_performance(db)}
+    fields = ("officer_name", "designation", "assigned_count", "resolved_count", "avg_resolution_hours", "sla_breach_count")
+    diff = [o for o in old if any(old[o][f] != new[o][f] for f in fields)]
+    p90 = expected_p90(db)
+    p90_diff = [o for o in new if abs(new[o]["p90_resolution_hours"] - p90.get(o, 0.0)) > 0.05]
+    single = all(officer_performance.compute_performance(db, officer_id=o)[0] == new[o] for o in list(new)[:20])
+    ok = not diff and not p90_diff and single and len(old) == len(new)
+    print(f"{'✅' if ok else '❌'} Same as the per-officer queries for {len(old)} officers "
+          f"({len(diff)} differ, {len(p90_diff)} p90 off from numpy, single-officer rows match {single})")
+
+    rows = list(new.values())
+    ok = True
+    for sort in officer_performance.SORT_KEYS:
+        for descending in (False, True):
+            want = sorted(rows, key=lambda r: r["officer_id"])
+            want.sort(key=lambda r: r[sort], reverse=descending)
+            got = officer_performance.compute_performance(db, sort=sort, descending=descending)
+            if [r["officer_id"] for r in got] != [r["officer_id"] for r in want]:
+                # Ties on rounded values: compare the sort keys only
+                ok &= [r[sort] for r in got] == [r[sort] for r in want]
+    pages = [officer_performance.compute_performance(db, sort="resolved_count", descending=True, skip=s, limit=40)
+             for s in range(0, len(rows), 40)]
+    ok &= [r for page in pages for r in page] == officer_performance.compute_performance(db, sort="resolved_count", descending=True)
+    department = officer_performance.compute_performance(db, department_id=3)
+    ok &= sorted(r["officer_id"] for r in department) == sorted(r["officer_id"] for r in rows if r["department_id"] == 3)
+    print(f"{'✅' if ok else '❌'} Sorting by every metric, pagination and department filter")
+
+    # Dialect without a duration expression: times read in Python, same answers
+    cases = [dict(), dict(department_id=3), dict(officer_id=rows[0]["officer_id"]),
+             dict(sort="resolved_count", descending=True, skip=10, limit=25)]
+    cases += [dict(sort=key, descending=True, skip=5, limit=30) for key in officer_performance.TIME_KEYS]
+    expected = [officer_performance.compute_performance(db, **params) for params in cases]
+    officer_performance.duration_seconds = lambda start, end, dialect_name: None
+    try:
+        got = [officer_performance.compute_performance(db, **params) for params in cases]
+    finally:
+        officer_performance.duration_seconds = duration_seconds
+    same = all(
+        [(r["officer_id"], r["avg_resolution_hours"], r["p90_resolution_hours"], r["assigned_count"]) for r in g]
+        == [(r["officer_id"], r["avg_resolution_hours"], r["p90_resolution_hours"], r["assigned_count"]) for r in e]
+        or [r[p.get("sort", "officer_id")] for r in g] == [r[p.get("sort", "officer_id")] for r in e]  # rounding ties
+        for g, e, p in zip(got, expected, cases)
+    )
+    print(f"{'✅' if same else '❌'} Unknown dialect falls back to Python times ({len(cases)} parameter sets match)")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+    # 3. Benchmark
+    path = os.path.join(workdir, "bench.db")
+    start = time.perf_counter()
+    engine = build(path, n, officers, 2)
+    print(f"Seeded {n} complaints over {officers} officers in {time.perf_counter() - start:.1f} s")
+    queries = [0]
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.__setitem__(0, queries[0] + 1))
+    db = sessionmaker(bind=engine)()
+
+    queries[0] = 0
+    start = time.perf_counter()
+    old_all(db)
+    old_time, old_queries = time.perf_counter() - start, queries[0]
+    db.expunge_all()
+
+    queries[0] = 0
+    start = time.perf_counter()
+    officer_performance.compute_performance(db)
+    new_time, new_queries = time.perf_counter() - start, queries[0]
+
+    queries[0] = 0
+    start = time.perf_counter()
+    page = officer_performance.compute_performance(db, sort="sla_breach_count", descending=True, limit=50)
+    page_time, page_queries = time.perf_counter() - start, queries[0]
+
+    officer_performance.get_performance(db)  # cache empty so far: compute_performance above
+    queries[0] = 0
+    start = time.perf_counter()
+    officer_performance.get_performance(db)
+    cached_time, cached_queries = time.perf_counter() - start, queries[0]
+
+    print(f"Per-officer loop: {old_time:7.2f} s, {old_queries} queries (4N+1 = {4 * officers + 1})")
+    print(f"Grouped query:    {new_time:7.2f} s, {new_queries} query")
+    print(f"Top 50 by breaches: {page_time:5.2f} s, {page_queries} query ({len(page)} rows)")
+    print(f"Cached:           {cached_time * 1e3:7.3f} ms, {cached_queries} queries")
+    ok = new_queries == 1 and page_queries == 1 and cached_queries == 0 and old_queries == 4 * officers + 1
+    print(f"{'✅' if ok else '❌'} Queries per dashboard load: {old_queries} -> {new_queries}")
+
+    db.close()
+    engine.dispose()
+    os.remove(path)
+    os.rmdir(workdir)
+
+    # 4. Postgres
+    sql = str(officer_performance.performance_query("postgresql", department_id=1, sort="p90_resolution_hours",
+                                                    limit=20).compile(dialect=postgresql.dialect()))
+    ok = "EXTRACT(epoch FROM" in sql and "row_number() OVER" in sql and "julianday" not in sql
+    print(f"{'✅' if ok else '❌'} Postgres query uses EXTRACT(EPOCH ...) and window functions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=500000)
+    parser.add_argument("--officers", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.n, args.officers)
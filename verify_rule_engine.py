@@ -0,0 +1,238 @@
+"""
+Agreement report + benchmark: compiled heuristic rule engine vs the previous
+hard-coded `any(w in text for w in [...])` chains (officer summary insights and
+the rule-based priority heuristics), over synthetic complaints.
+Also checks hot reload: an edited table is picked up, a broken one is rejected.
+
+Differences are expected where the old substring test matched inside another
+word ("currently" -> current, "pajama" -> jam, "wireless" -> wire) or missed an
+inflection ("injured", "accidents"): the engine matches on word boundaries.
+Run: python verify_rule_engine.py [--n 100000]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from backend.utils import rule_engine
+
+CATEGORIES = [
+    "Electricity & Power Supply", "Traffic & Road Safety", "Public Safety & Law Enforcement",
+    "Roads & Public Works", "Water Supply & Sewerage", "Sanitation & Waste Management",
+]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+
+
+# --- Legacy implementations (reference) ---
+def legacy_summary_insights(complaint):
+    text = f"{complaint.title}. {complaint.description}".lower()
+    insights = []
+    if any(w in text for w in ["accident", "injury", "death", "casualty", "hurt"]):
+        insights.append("poses a public safety risk")
+    elif any(w in text for w in ["wire", "shock", "current", "spark"]):
+        insights.append("presents an electrocution hazard")
+    if any(w in text for w in ["highway", "nh16", "nh-16", "national highway", "main road", "traffic"]):
+        insights.append("on a high-traffic route")
+    if complaint.priority == "Critical":
+        insights.append("requires immediate attention")
+    elif complaint.priority == "High":
+        insights.append("needs prompt maintenance")
+    return insights
+
+
+def legacy_priority(category, priority, text, intensified):
+    if category == "Public Safety & Law Enforcement" and priority in ["Low", "Medium"]:
+        priority = "High"
+    if category == "Electricity & Power Supply" and priority == "Low":
+        if any(w in text.lower() for w in ["wire", "spark", "current", "pole", "hanging"]):
+            priority = "High"
+    if category == "Traffic & Road Safety" and priority == "Low":
+        if any(w in text.lower() for w in ["signal", "light", "not working", "stuck", "jam"]):
+            priority = "High"
+    dangerous = ["Roads & Public Works", "Electricity & Power Supply", "Public Safety & Law Enforcement", "Traffic & Road Safety"]
+    if category in dangerous and priority == "Medium" and intensified:
+        priority = "High"
+    return priority
+
+
+# --- Engine paths (what ai_utils does) ---
+def engine_summary_insights(engine, complaint):
+    hits = engine.scan(f"{complaint.title}. {complaint.description}")
+    return [
+        rule["insight"]
+        for group in ("summary.risk", "summary.location", "summary.priority")
+        for rule in engine.evaluate(group, hits, priority=complaint.priority)
+    ]
+
+
+def engine_priority(engine, category, priority, text, intensified):
+    for rule in engine.evaluate("priority", engine.scan(text), category, priority, intensified):
+        priority = rule["set_priority"]
+    return priority
+
+
+# --- Corpus ---
+def build_complaints(n, seed=13):
+    rng = random.Random(seed)
+    terms = [
+        "accident", "accidents", "injury", "injured", "death", "casualty", "hurt", "hurting",
+        "wire", "wires", "wiring", "shock", "shocked", "current", "spark", "sparking", "pole", "hanging",
+        "highway", "nh16", "NH-16", "national highway", "main road", "traffic",
+        "signal", "signals", "light", "streetlight", "not working", "stuck", "jam", "jammed",
+    ]
+    lookalikes = ["currently", "pajama", "wireless", "spotlight", "polite", "delighted", "dust"]
+    filler = ["the", "near", "my", "house", "since", "yesterday", "please", "sir", "ward", "colony",
+              "garbage", "water", "pipe", "leak", "school", "market", "bus", "stop", "is", "broken"]
+    complaints = []
+    for i in range(n):
+        def sentence(k):
+            words = []
+            for _ in range(k):
+                r = rng.random()
+                words.append(rng.choice(terms) if r < 0.12 else rng.choice(lookalikes) if r < 0.15 else rng.choice(filler))
+            return " ".join(w.capitalize() if rng.random() < 0.05 else w for w in words)
+        complaints.append(SimpleNamespace(
+            title=sentence(rng.randint(2, 6)),
+            description=sentence(rng.randint(8, 60)) + rng.choice([".", "!", "", "..."]),
+            location=f"Ward {rng.randint(1, 40)}",
+            priority=rng.choice(PRIORITIES),
+            category=rng.choice(CATEGORIES),
+            intensified=rng.random() < 0.2,
+        ))
+    return complaints
+
+
+def agreement(engine, complaints):
+    summary_same = priority_same = 0
+    diffs = Counter()
+    for c in complaints:
+        text = f"{c.title}. {c.description}"
+        if legacy_summary_insights(c) == engine_summary_insights(engine, c):
+            summary_same += 1
+        else:
+            diffs["summary"] += 1
+        if legacy_priority(c.category, c.priority, text, c.intensified) == engine_priority(engine, c.category, c.priority, text, c.intensified):
+            priority_same += 1
+        else:
+            diffs["priority"] += 1
+    n = len(complaints)
+    print(f"Summary insights identical:  {summary_same}/{n} ({summary_same / n:.2%})")
+    print(f"Priority identical:          {priority_same}/{n} ({priority_same / n:.2%})")
+    return diffs
+
+
+def explain_differences(engine, complaints, limit=5):
+    shown = 0
+    for c in complaints:
+        old, new = legacy_summary_insights(c), engine_summary_insights(engine, c)
+        if old != new:
+            hits = engine.scan(f"{c.title}. {c.description}")
+            print(f"  legacy={old}\n  engine={new}\n  terms={hits.terms}\n  text={(c.title + '. ' + c.description)[:100]!r}\n")
+            shown += 1
+            if shown >= limit:
+                break
+
+
+def benchmark(engine, complaints):
+    for name, fn in [
+        ("Legacy any() chains", lambda c, t: (legacy_summary_insights(c), legacy_priority(c.category, c.priority, t, c.intensified))),
+        ("Rule engine", lambda c, t: (engine_summary_insights(engine, c), engine_priority(engine, c.category, c.priority, t, c.intensified))),
+    ]:
+        start = time.perf_counter()
+        for c in complaints:
+            fn(c, f"{c.title}. {c.description}")
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed:6.2f}s  {elapsed / len(complaints) * 1e6:7.1f} µs/complaint")
+
+    start = time.perf_counter()
+    for c in complaints:
+        engine.scan(f"{c.title}. {c.description}")
+    elapsed = time.perf_counter() - start
+    print(f"{'  (scan only)':<22} {elapsed:6.2f}s  {elapsed / len(complaints) * 1e6:7.1f} µs/complaint")
+
+    start = time.perf_counter()
+    rule_engine.load_rules()
+    print(f"Compile rule table     {(time.perf_counter() - start) * 1000:6.1f} ms")
+
+
+def scaling(complaints, sizes=(30, 300, 1000)):
+    """Cost of evaluating every rule as the table grows: one any() chain per rule vs one scan."""
+    rng = random.Random(7)
+    words = sorted({w for c in complaints[:2000] for w in f"{c.title} {c.description}".lower().split()})
+    synthetic = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9))) for _ in range(max(sizes))]
+    texts = [f"{c.title}. {c.description}" for c in complaints]
+    for size in sizes:
+        terms = (words + synthetic)[:size]
+        groups = [terms[i:i + 5] for i in range(0, len(terms), 5)]  # 5 terms per rule
+        engine = rule_engine.RuleEngine(
+            [{"id": f"r{i}", "group": "priority", "terms": g, "set_priority": "High"} for i, g in enumerate(groups)],
+            {"priority": "all"}
+        )
+        start = time.perf_counter()
+        for text in texts:
+            lowered = text.lower()
+            [any(w in lowered for w in g) for g in groups]
+        legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        for text in texts:
+            engine.scan(text)
+        compiled = time.perf_counter() - start
+        print(f"{len(groups):>4} rules / {size:>4} terms:  any() chains {legacy / len(texts) * 1e6:7.1f} µs   "
+              f"engine scan {compiled / len(texts) * 1e6:6.1f} µs")
+
+
+def check_reload():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "rules.py")
+    shutil.copy(rule_engine.DEFAULT_RULES_PATH, path)
+    original_path, original_interval = rule_engine._rules_path, rule_engine._reload_interval
+    rule_engine._rules_path = lambda: path
+    rule_engine._reload_interval = lambda: 0
+    try:
+        before = rule_engine.reload_rules()
+        with open(path, "a") as f:
+            f.write('\nRULES.append({"id": "summary.location.school", "group": "summary.location", '
+                    '"terms": ["school*"], "insight": "near a school"})\n')
+        os.utime(path, (time.time() + 1, time.time() + 1))
+        after = rule_engine.get_rule_engine()
+        picked_up = after is not before and "summary.location.school" in after.scan("near the school gate")
+
+        with open(path, "a") as f:
+            f.write('\nRULES.append({"id": "broken", "group": "no-such-group", "terms": ["x"], "insight": "x"})\n')
+        os.utime(path, (time.time() + 2, time.time() + 2))
+        kept = rule_engine.get_rule_engine() is after
+    finally:
+        rule_engine._rules_path, rule_engine._reload_interval = original_path, original_interval
+        rule_engine.reload_rules()
+        shutil.rmtree(tmp)
+    print(f"{'✅' if picked_up else '❌'} Edited rule table picked up without restart")
+    print(f"{'✅' if kept else '❌'} Broken rule table rejected, previous rules kept")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    args = parser.parse_args()
+
+    engine = rule_engine.load_rules()
+    print(f"Rule table v{engine.version}: {len(engine.rules)} rules, {engine.term_count} terms")
+    complaints = build_complaints(args.n)
+
+    print(f"\n--- AGREEMENT ({len(complaints)} complaints) ---")
+    diffs = agreement(engine, complaints)
+    if diffs:
+        print("Sample differences (word-boundary matching):")
+        explain_differences(engine, complaints)
+
+    print("\n--- BENCHMARK ---")
+    benchmark(engine, complaints)
+
+    print("\n--- SCALING (all rules evaluated, 20k complaints) ---")
+    scaling(complaints[:20000])
+
+    print("\n--- HOT RELOAD ---")
+    check_reload()
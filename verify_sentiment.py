@@ -0,0 +1,73 @@
+"""
+Agreement report + benchmark: compiled lexicon sentiment vs TextBlob.
+Uses the complaint corpus from verify_keyword_matcher (synthetic + local DB).
+Requires textblob (the compatibility backend) to be installed.
+Run: python verify_sentiment.py [--n 5000]
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from backend.utils.sentiment import LexiconSentiment, TextBlobSentiment
+from verify_keyword_matcher import build_corpus
+
+
+def agreement(corpus, lexicon, textblob):
+    exact, same_label, worst = 0, 0, (0.0, "")
+
+    def label(score):
+        return "Negative" if score < -0.1 else "Positive" if score > 0.1 else "Neutral"
+
+    for text in corpus:
+        a, b = textblob.polarity(text), lexicon.polarity(text)
+        diff = abs(a - b)
+        exact += diff < 1e-9
+        same_label += label(a) == label(b)
+        if diff > worst[0]:
+            worst = (diff, text)
+    n = len(corpus)
+    print(f"Identical polarity:  {exact}/{n} ({exact / n:.2%})")
+    print(f"Same label:          {same_label}/{n} ({same_label / n:.2%})")
+    if worst[0]:
+        print(f"Largest difference:  {worst[0]:.4f} for {worst[1][:60]!r}")
+    return exact == n
+
+
+def benchmark(corpus, lexicon, textblob):
+    for name, fn in [
+        ("TextBlob per call", lambda: [textblob.polarity(t) for t in corpus]),
+        ("Lexicon per call", lambda: [lexicon.polarity(t) for t in corpus]),
+        ("Lexicon batch", lambda: lexicon.polarity_many(corpus)),
+    ]:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} {elapsed / len(corpus) * 1e6:8.1f} µs/complaint")
+
+
+def import_time(module):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return float(out.stdout.strip()) * 1000 if out.returncode == 0 else float("nan")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=5000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.n)
+    lexicon = LexiconSentiment.load()
+    textblob = TextBlobSentiment()
+
+    print(f"--- AGREEMENT ({len(corpus)} texts) ---")
+    ok = agreement(corpus, lexicon, textblob)
+    print("✅ Lexicon matches TextBlob" if ok else "⚠️ Lexicon differs from TextBlob on some texts")
+
+    print("\n--- BENCHMARK ---")
+    benchmark(corpus, lexicon, textblob)
+
+    print("\n--- IMPORT TIME ---")
+    print(f"textblob                  {import_time('textblob'):8.1f} ms")
+    print(f"backend.utils.sentiment   {import_time('backend.utils.sentiment'):8.1f} ms")
@@ -0,0 +1,258 @@
+"""
+Benchmark + correctness: tiered SLA escalation (escalation.py).
+
+Seeds N assigned open complaints (default 200k) whose thresholds put them
+in every tier, then:
+1. Dry-run report vs the run that follows (same counts per tier).
+2. Set-based pipeline (one UPDATE ... RETURNING per tier batch + batched
+   outbox / history inserts) vs escalating one complaint at a time (load,
+   decide in Python, update, insert, commit), on a copy of the first
+   BASELINE complaints.
+3. Every complaint ends at the tier its thresholds call for, with exactly
+   one notification for it; nothing is escalated twice, also with two
+   pipelines racing; a second run escalates nothing.
+4. A tick with nothing due, with and without idx_complaints_next_escalation.
+5. Policies: a department / priority policy changes the SLA of the next
+   assignment; reassignment resets the tiers. Outbox delivery throughput.
+Run: python verify_sla_escalation.py [--n 200000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from backend import escalation, models
+from backend.utils.escalation_policy import ADMIN, DEPT_HEAD, TIER_NAMES, WARN
+
+SQL_FMT = "%Y-%m-%d %H:%M:%S.%f"  # how SQLAlchemy stores DateTime on SQLite
+DEPARTMENTS = 10
+BASELINE = 5000
+
+
+def make_engine(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60})
+
+    @event.listens_for(engine, "connect")
+    def _wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    return engine
+
+
+def seed(path, n, now):
+    """Raw executemany. Returns complaint id -> expected tier."""
+    rng = random.Random(23)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, email, role) VALUES (1, 'admin@gov.in', 'ADMIN')")
+    officers = []
+    for d in range(1, DEPARTMENTS + 1):
+        conn.execute("INSERT INTO departments (id, name) VALUES (?, ?)", (d, f"Dept {d}"))
+        for k, designation in enumerate(["JE", "JE", "AE", "EE", "JE"]):
+            officer_id = d * 10 + k
+            officers.append((officer_id, d))
+            conn.execute("INSERT INTO officers (id, employee_id, name, designation, department_id, status, email) "
+                         "VALUES (?, ?, ?, ?, ?, 'Active', ?)",
+                         (officer_id, f"E{officer_id}", f"Officer {officer_id}", designation, d, f"o{officer_id}@gov.in"))
+    rows, expected = [], {}
+    for i in range(1, n + 1):
+        officer_id, department_id = rng.choice(officers)
+        hours = rng.choice([24, 48, 120, 168])
+        elapsed = rng.choice([0.3, 0.5, 0.7, 0.85, 0.95, 1.2, 1.6, 2.5]) * hours  # share of the SLA used so far
+        assigned_at = now - timedelta(hours=elapsed)
+        deadline = assigned_at + timedelta(hours=hours)
+        warn_at = assigned_at + timedelta(hours=hours * 0.8)
+        admin_at = assigned_at + timedelta(hours=hours * 2)
+        closed = rng.random() < 0.05
+        status = "RESOLVED" if closed else "ASSIGNED"
+        expected[i] = 0 if closed else (ADMIN if admin_at <= now else DEPT_HEAD if deadline <= now else WARN if warn_at <= now else 0)
+        rows.append((i, f"Complaint {i}", "d", 1, department_id, officer_id, status, "Medium", hours,
+                     assigned_at.strftime(SQL_FMT), deadline.strftime(SQL_FMT), warn_at.strftime(SQL_FMT),
+                     admin_at.strftime(SQL_FMT), warn_at.strftime(SQL_FMT)))
+    conn.executemany(
+        "INSERT INTO complaints (id, title, description, user_id, department_id, assigned_officer_id, status, priority, "
+        "sla_hours, assigned_at, sla_deadline, sla_warn_at, sla_admin_at, next_escalation_at, sla_breached, is_archived, "
+        "escalation_level, version) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,0,0,0,1)", rows
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return expected
+
+
+def one_at_a_time(db, now):
+    """Baseline: every open complaint loaded and escalated on its own."""
+    officers, heads = escalation._recipients(db)
+    complaints = db.query(models.Complaint).filter(
+        models.Complaint.sla_deadline != None, models.Complaint.status != "RESOLVED"
+    ).all()
+    escalated = 0
+    for c in complaints:
+        tier = ADMIN if c.sla_admin_at <= now else DEPT_HEAD if c.sla_deadline <= now else WARN if c.sla_warn_at <= now else 0
+        if tier <= (c.escalation_level or 0):
+            continue
+        c.escalation_level = tier
+        row = (c.id, c.assigned_officer_id, c.department_id, c.title, c.priority, c.sla_hours, c.sla_deadline)
+        n = escalation._notification(tier, row, officers, heads, now)
+        db.add(models.NotificationOutbox(**n))
+        db.add(models.ComplaintHistory(complaint_id=c.id, action=f"SLA escalation: {n['subject']}", performed_by="SYSTEM"))
+        db.commit()
+        escalated += 1
+    return escalated
+
+
+def main(n):
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "escalation.db")
+    engine = make_engine(path)
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    now = datetime.utcnow()
+
+    start = time.perf_counter()
+    expected = seed(path, n, now)
+    print(f"Seeded {n} complaints in {time.perf_counter() - start:.1f} s")
+    want = Counter(TIER_NAMES[t] for t in expected.values() if t)
+
+    # Baseline on a copy holding the first BASELINE complaints
+    base_path = os.path.join(workdir, "baseline.db")
+    shutil.copy(path, base_path)
+    conn = sqlite3.connect(base_path)
+    conn.execute("DELETE FROM complaints WHERE id > ?", (BASELINE,))
+    conn.commit()
+    conn.close()
+    base_engine = make_engine(base_path)
+    base_db = sessionmaker(bind=base_engine, autoflush=False)()
+    start = time.perf_counter()
+    base_count = one_at_a_time(base_db, now)
+    base_time = time.perf_counter() - start
+    base_db.close()
+    base_engine.dispose()
+
+    # 1. Dry run
+    db = Session()
+    report = escalation.report(db, now=now)
+    predicted = {name: tier["count"] for name, tier in report["tiers"].items()}
+
+    # 2. Pipeline
+    start = time.perf_counter()
+    escalated = escalation.run_pipeline(db, now)
+    run_time = time.perf_counter() - start
+    total = sum(escalated.values())
+    print(f"Escalated per tier: {escalated}")
+    print(f"{'✅' if predicted == escalated == dict(want) else '❌'} Dry-run report = run = expected: {predicted}")
+    per_one = base_time / max(base_count, 1)
+    print(f"One at a time:  {per_one * 1e3:7.2f} ms/complaint ({base_count} escalated of {BASELINE}) "
+          f"-> ~{per_one * total:.0f} s for {total}")
+    print(f"Set-based:      {run_time / max(total, 1) * 1e3:7.3f} ms/complaint, {total} in {run_time:.2f} s "
+          f"({total / run_time:,.0f}/s)")
+    for name, stats in escalation.metrics_report()["tiers"].items():
+        print(f"   {name:16} {stats['escalated']:7} in {stats['runs']} batches, {stats['per_second']}/s")
+
+    # 3. Correctness
+    levels = dict(db.query(models.Complaint.id, models.Complaint.escalation_level))
+    wrong = sum(1 for cid, tier in expected.items() if levels[cid] != tier)
+    notes = Counter(cid for (cid,) in db.query(models.NotificationOutbox.complaint_id))
+    duplicated = sum(1 for count in notes.values() if count > 1)
+    missing = sum(1 for cid, tier in expected.items() if tier and notes[cid] != 1)
+    heads = Counter(r for (r,) in db.query(models.NotificationOutbox.recipient_officer_id).filter(
+        models.NotificationOutbox.kind == TIER_NAMES[DEPT_HEAD]))
+    head_ok = all(officer_id % 10 == 3 for officer_id in heads)  # the EE of each department
+    ok = wrong == 0 and duplicated == 0 and missing == 0 and head_ok
+    print(f"{'✅' if ok else '❌'} Levels: {wrong} wrong; notifications: {duplicated} duplicated, {missing} missing; "
+          f"department head notices all to the senior officer: {head_ok}")
+    again = escalation.run_pipeline(db, now)
+    print(f"{'✅' if not any(again.values()) else '❌'} Second run escalates nothing: {again}")
+
+    # Two pipelines racing over newly due complaints
+    later = now + timedelta(hours=30)
+    due_later = {cid for cid, in db.query(models.Complaint.id).filter(
+        models.Complaint.next_escalation_at <= later, models.Complaint.status != "RESOLVED")}
+    results = []
+
+    def race():
+        own = Session()
+        try:
+            results.append(escalation.run_pipeline(own, later))
+        except Exception as e:
+            results.append(repr(e))
+        finally:
+            own.close()
+
+    threads = [threading.Thread(target=race) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    raced = sum(sum(r.values()) for r in results if isinstance(r, dict))
+    dupes = db.query(models.NotificationOutbox.complaint_id, models.NotificationOutbox.kind).group_by(
+        models.NotificationOutbox.complaint_id, models.NotificationOutbox.kind
+    ).having(func.count(models.NotificationOutbox.id) > 1).count()
+    errors = [r for r in results if not isinstance(r, dict)]
+    print(f"{'✅' if dupes == 0 and not errors else '❌'} Two racing pipelines: {raced} escalations "
+          f"({len(due_later)} complaints due), {dupes} duplicate notifications" + (f", errors {errors}" if errors else ""))
+
+    # 4. Idle tick
+    conn = sqlite3.connect(path)
+    tick_sql = ("SELECT id FROM complaints WHERE next_escalation_at <= ? AND escalation_level < 1 AND sla_warn_at <= ? "
+                "AND is_archived = 0 AND status NOT IN ('RESOLVED') LIMIT 1000")
+    args = (now.strftime(SQL_FMT), now.strftime(SQL_FMT))
+    timings = {}
+    for label in ("with index", "without index"):
+        if label == "without index":
+            conn.execute("DROP INDEX idx_complaints_next_escalation")
+        start = time.perf_counter()
+        for _ in range(5):
+            conn.execute(tick_sql, args).fetchall()
+        timings[label] = (time.perf_counter() - start) / 5
+    conn.execute("CREATE INDEX idx_complaints_next_escalation ON complaints (next_escalation_at)")
+    conn.commit()
+    conn.close()
+    print(f"Idle tick (nothing due): {timings['with index'] * 1e3:.2f} ms with the index, "
+          f"{timings['without index'] * 1e3:.2f} ms without")
+
+    # 5. Policies, reassignment, delivery
+    db.add(models.EscalationPolicy(department_id=1, priority="Medium", sla_hours=10, warn_pct=0.5, admin_multiple=3.0))
+    db.commit()
+    complaint = db.query(models.Complaint).filter(models.Complaint.department_id == 1,
+                                                   models.Complaint.escalation_level == ADMIN).first()
+    start_at = datetime.utcnow()
+    window = escalation.apply_sla(db, complaint, start_at)
+    db.commit()
+    ok = (window["sla_hours"] == 10 and complaint.sla_warn_at == start_at + timedelta(hours=5)
+          and complaint.sla_admin_at == start_at + timedelta(hours=30) and complaint.escalation_level == 0)
+    other = escalation.get_policies(db).lookup(2, "Medium").sla_hours
+    print(f"{'✅' if ok and other == 120 else '❌'} Policy (dept 1, Medium) = 10h used on reassignment, tiers reset; "
+          f"dept 2 keeps {other}h")
+
+    escalation.send = lambda notification: None  # no provider: measure the outbox itself
+    start = time.perf_counter()
+    sent = 0
+    while True:
+        batch = escalation.deliver_outbox(db, limit=500)
+        sent += batch
+        if not batch:
+            break
+    elapsed = time.perf_counter() - start
+    left = escalation.pending_notifications(db)
+    print(f"{'✅' if left == 0 else '❌'} Outbox delivered {sent} notifications in {elapsed:.2f} s "
+          f"({sent / max(elapsed, 1e-9):,.0f}/s), {left} pending")
+
+    db.close()
+    engine.dispose()
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.n)
@@ -0,0 +1,189 @@
+"""
+Benchmark + correctness: SLA breach sweeper (sla.py) on N open complaints
+(default 1M), against polling the complaints table for due deadlines.
+
+1. Loads every open deadline into the schedule (time, memory).
+2. "When is the next deadline?": schedule vs SELECT MIN(sla_deadline), and
+   one polling tick (SELECT due complaints) with and without
+   idx_complaints_sla_breached_deadline.
+3. Sweeps the overdue complaints (OVERDUE share of N): UPDATE ... RETURNING
+   batches, history + timeline rows. Breached set must equal the open
+   complaints past their deadline; closed / archived ones are never flagged.
+4. Change pickup: ORM assign with a passed deadline, reassign to a later
+   deadline, closing, a row written by "another process" (catch-up) and the
+   sweeper thread waking up for a deadline 2 s away.
+Run: python verify_sla_sweeper.py [--n 1000000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from backend import models, sla
+from backend.summaries import CLOSED_STATUSES
+
+OVERDUE = 0.05
+CLOSED = 0.10
+SQL_FMT = "%Y-%m-%d %H:%M:%S.%f"  # how SQLAlchemy stores DateTime on SQLite
+
+
+def seed(path, n, now):
+    """Raw executemany: ORM inserts of 1M rows would take minutes."""
+    rng = random.Random(22)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, email, role) VALUES (1, 'citizen@example.com', 'CITIZEN')")
+    conn.execute("INSERT INTO departments (id, name) VALUES (1, 'Dept 1')")
+    conn.execute("INSERT INTO officers (id, employee_id, name, designation, department_id, status) "
+                 "VALUES (1, 'E1', 'Officer 1', 'JE', 1, 'Active'), (2, 'E2', 'Officer 2', 'JE', 1, 'Active')")
+    rows = []
+    for i in range(1, n + 1):
+        hours = rng.choice([24, 48, 120, 168])
+        if rng.random() < OVERDUE:
+            deadline = now - timedelta(seconds=rng.randint(1, 72 * 3600))
+        else:
+            deadline = now + timedelta(seconds=rng.randint(60, hours * 3600))
+        closed = rng.random() < CLOSED
+        status = rng.choice(sorted(CLOSED_STATUSES)) if closed else rng.choice(["ASSIGNED", "IN_PROGRESS"])
+        rows.append((i, "c", "d", 1, 1, 1, status, "Medium", hours, deadline.strftime(SQL_FMT), 0, 0, 1))
+    conn.executemany(
+        "INSERT INTO complaints (id, title, description, user_id, department_id, assigned_officer_id, status, priority, "
+        "sla_hours, sla_deadline, sla_breached, is_archived, version) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main(n):
+    path = os.path.join(tempfile.mkdtemp(), "sla.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    now = datetime.utcnow()
+
+    start = time.perf_counter()
+    seed(path, n, now)
+    print(f"Seeded {n} complaints in {time.perf_counter() - start:.1f} s")
+    conn = sqlite3.connect(path)
+    conn.execute("ANALYZE")
+    expected = {i for (i,) in conn.execute(
+        f"SELECT id FROM complaints WHERE sla_deadline <= ? AND status NOT IN ({','.join('?' * len(CLOSED_STATUSES))})",
+        [now.strftime(SQL_FMT), *CLOSED_STATUSES]
+    )}
+
+    # 1. Load
+    db = Session()
+    load_time, schedule = timed(lambda: sla.load_schedule(db))
+    stats = schedule.stats()
+    print(f"Load: {load_time:.2f} s for {stats['bulk']} open deadlines, {stats['bytes'] / 1e6:.1f} MB")
+
+    # 2. Next deadline / polling tick
+    next_time, _ = timed(schedule.next_deadline, 10000)
+    placeholders = ",".join("?" * len(CLOSED_STATUSES))
+    min_sql = f"SELECT MIN(sla_deadline) FROM complaints WHERE sla_breached = 0 AND status NOT IN ({placeholders})"
+    due_sql = (f"SELECT id FROM complaints WHERE sla_breached = 0 AND sla_deadline <= ? "
+               f"AND status NOT IN ({placeholders})")
+    tick = [(now - timedelta(hours=80)).strftime(SQL_FMT), *CLOSED_STATUSES]  # an ordinary tick: nothing due
+    results = {}
+    for label in ("with index", "without index"):
+        if label == "without index":
+            conn.execute("DROP INDEX idx_complaints_sla_breached_deadline")
+        min_time, _ = timed(lambda: conn.execute(min_sql, list(CLOSED_STATUSES)).fetchone(), 5)
+        tick_time, _ = timed(lambda: conn.execute(due_sql, tick).fetchall(), 5)
+        results[label] = (min_time, tick_time)
+    conn.execute("CREATE INDEX idx_complaints_sla_breached_deadline ON complaints (sla_breached, sla_deadline)")
+    print(f"Next deadline from the schedule: {next_time * 1e6:10.2f} µs")
+    for label, (min_time, tick_time) in results.items():
+        print(f"SQL {label:14}  MIN(sla_deadline) {min_time * 1e3:8.2f} ms, polling tick {tick_time * 1e3:8.2f} ms")
+
+    # 3. Sweep
+    sweep_time, flipped = timed(lambda: sla.sweep_due(db, now))
+    print(f"Sweep: {flipped} complaints flagged in {sweep_time:.2f} s ({flipped / max(sweep_time, 1e-9):,.0f}/s)")
+    breached = {i for (i,) in db.query(models.Complaint.id).filter(models.Complaint.sla_breached == True)}
+    history = db.query(func.count(models.ComplaintHistory.id)).scalar()
+    events = db.query(func.count(models.GrievanceTimeline.id)).filter(
+        models.GrievanceTimeline.status == sla.BREACH_STATUS).scalar()
+    ok = breached == expected and history == events == len(expected)
+    print(f"{'✅' if ok else '❌'} Breached = open complaints past their deadline: {len(breached)} vs {len(expected)} "
+          f"expected, {history} history rows, {events} timeline events")
+    closed_flagged = db.query(func.count(models.Complaint.id)).filter(
+        models.Complaint.sla_breached == True, models.Complaint.status.in_(CLOSED_STATUSES)).scalar()
+    print(f"{'✅' if closed_flagged == 0 else '❌'} Closed complaints flagged: {closed_flagged}")
+    again = sla.sweep_due(db, now)
+    print(f"{'✅' if again == 0 else '❌'} Second sweep flags nothing: {again}")
+    db.close()
+    conn.close()
+
+    # 4. Change pickup (ORM events, catch-up, sweeper thread)
+    sla.install(Session)
+    db = Session()
+    open_ids = [i for (i,) in db.query(models.Complaint.id).filter(
+        models.Complaint.sla_breached == False, models.Complaint.status.notin_(CLOSED_STATUSES)).limit(4)]
+    passed, moved, closed = (db.get(models.Complaint, i) for i in open_ids[:3])
+    unseen = open_ids[3]
+    passed.sla_deadline = datetime.utcnow() - timedelta(minutes=5)  # e.g. reassigned with a short SLA
+    moved.sla_deadline = datetime.utcnow() - timedelta(minutes=5)
+    closed.sla_deadline = datetime.utcnow() - timedelta(minutes=5)
+    db.commit()
+    moved.sla_deadline = datetime.utcnow() + timedelta(hours=48)  # reassigned again before the sweep
+    closed.status = "RESOLVED"
+    db.commit()
+
+    other = sqlite3.connect(path)  # another worker process assigns a complaint
+    other.execute("UPDATE complaints SET sla_deadline = ? WHERE id = ?",
+                  ((datetime.utcnow() - timedelta(minutes=1)).strftime(SQL_FMT), unseen))
+    other.commit()
+    other.close()
+    sla.sweep_due(db)
+    missed_before = not db.get(models.Complaint, unseen).sla_breached
+    caught = sla.catch_up(db)
+    sla.sweep_due(db)
+    db.expire_all()
+    state = {c.id: c.sla_breached for c in db.query(models.Complaint).filter(models.Complaint.id.in_(open_ids))}
+    ok = state[passed.id] and not state[moved.id] and not state[closed.id] and missed_before and state[unseen]
+    print(f"{'✅' if ok else '❌'} Changes picked up: passed deadline flagged {state[passed.id]}, "
+          f"moved later not flagged {not state[moved.id]}, closed not flagged {not state[closed.id]}, "
+          f"other process caught up {state[unseen]} ({caught} found)")
+
+    sweeper = sla.SLASweeper(Session, max_sleep=30.0, rescan_every=0)
+    sla._sweeper = sweeper
+    sweeper.start()
+    soon = db.query(models.Complaint).filter(
+        models.Complaint.sla_breached == False, models.Complaint.status.notin_(CLOSED_STATUSES)).first()
+    soon.sla_deadline = datetime.utcnow() + timedelta(seconds=2)
+    db.commit()
+    committed = time.time()
+    flagged_after = None
+    while time.time() - committed < 10:
+        time.sleep(0.1)
+        db.expire_all()
+        if db.get(models.Complaint, soon.id).sla_breached:
+            flagged_after = time.time() - committed
+            break
+    sla.stop()
+    ok = flagged_after is not None and flagged_after < 4
+    print(f"{'✅' if ok else '❌'} Sweeper thread flagged a deadline 2 s away after "
+          f"{flagged_after if flagged_after is None else round(flagged_after, 2)} s")
+
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1000000)
+    args = parser.parse_args()
+    main(args.n)
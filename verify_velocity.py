@@ -0,0 +1,98 @@
+"""
+Parity + benchmark: in-memory sliding-window velocity tracker (utils/velocity.py)
+vs the previous per-submission COUNT query on complaints(user_id, created_at).
+
+Replays a synthetic day of submissions (a few bursty users among many regular
+ones) in time order. Before recording each one, it compares the tracker's
+counts for every window (1m / 5m / 1d) with the same COUNT in SQLite.
+Also checks that warming from rows replays to the same counts, and that
+naive UTC datetimes land on the time.time() clock in any host time zone.
+Run: python verify_velocity.py [--n 200000]
+"""
+import argparse
+import random
+import sqlite3
+import time
+from datetime import datetime
+
+from backend.utils import velocity
+
+WINDOWS = "1m:2,5m:2,1d:10"
+
+
+def build_submissions(n, seed=11):
+    rng = random.Random(seed)
+    users = max(10, n // 2)  # ~2 submissions per citizen per day
+    t = 1_700_000_000.0
+    rows = []
+    for i in range(n):
+        t += rng.expovariate(n / 86400.0)
+        if rng.random() < 0.1:
+            user = rng.randint(1, 20)  # spammers: many submissions close together
+        else:
+            user = rng.randint(1, users)
+        rows.append((i + 1, user, t))
+    return rows
+
+
+def main(n, checks):
+    rows = build_submissions(n)
+    windows = velocity.parse_windows(WINDOWS)
+    tracker = velocity.VelocityTracker(windows, velocity.MemoryVelocityBackend(windows[-1][0], max_events=64))
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE complaints (id INTEGER PRIMARY KEY, user_id INTEGER, created_at REAL)")
+    conn.execute("CREATE INDEX ix_user_created ON complaints (user_id, created_at)")
+
+    rng = random.Random(5)
+    check_at = set(rng.sample(range(n), min(checks, n)))
+    mismatches = 0
+    sql_time = tracker_time = 0.0
+    for i, (complaint_id, user_id, ts) in enumerate(rows):
+        if i in check_at:
+            start = time.perf_counter()
+            counts = tracker.counts(user_id, at=ts)
+            tracker_time += time.perf_counter() - start
+            start = time.perf_counter()
+            expected = {
+                seconds: conn.execute(
+                    "SELECT COUNT(*) FROM complaints WHERE user_id = ? AND created_at >= ? AND created_at <= ?",
+                    (user_id, ts - seconds, ts)
+                ).fetchone()[0]
+                for seconds, _ in windows
+            }
+            sql_time += time.perf_counter() - start
+            # The ring buffer holds the newest max_events per user: counts saturate there
+            expected = {s: min(c, tracker.backend.max_events) for s, c in expected.items()}
+            if counts != expected:
+                mismatches += 1
+        tracker.record(user_id, complaint_id, ts)
+        conn.execute("INSERT INTO complaints VALUES (?, ?, ?)", (complaint_id, user_id, ts))
+
+    checked = len(check_at)
+    print(f"{n} submissions, {checked} checks ({len(windows)} windows each)")
+    print(f"{'✅' if mismatches == 0 else '❌'} Tracker counts match COUNT queries: {checked - mismatches}/{checked}")
+    print(f"COUNT queries (indexed SQLite, in memory): {sql_time / checked * 1e6:7.1f} µs/check")
+    print(f"Velocity tracker:                          {tracker_time / checked * 1e6:7.1f} µs/check")
+
+    warmed = velocity.VelocityTracker(windows)
+    end = rows[-1][2]
+    for complaint_id, user_id, ts in rows:
+        if ts >= end - windows[-1][0]:
+            warmed.record(user_id, complaint_id, ts)
+    same = all(warmed.counts(u, at=end) == tracker.counts(u, at=end) for u in {r[1] for r in rows[-5000:]})
+    print(f"{'✅' if same else '❌'} Warm-up from the last day of rows gives the same counts")
+    print(f"Memory backend: {tracker.backend.stats()}")
+
+    # created_at is naive UTC; the redis backend trims with time.time(). Both must
+    # be the same clock whatever the host's time zone (e.g. TZ=Asia/Kolkata).
+    drift = abs(velocity._timestamp(datetime.utcnow()) - time.time())
+    print(f"{'✅' if drift < 1 else '❌'} Naive UTC timestamps on the time.time() clock (off by {drift:.3f} s, TZ={time.tzname[0]})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--checks", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.n, args.checks)